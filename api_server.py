@@ -0,0 +1,894 @@
+"""
+Headless JSON API over func.py, so many clients can share one connection pool
+instead of each desktop client opening its own MySQL connections.
+
+    python api_server.py --port 8080
+    python api_server.py --port 8080 --max-concurrency 32 --reuse-port   # one of several workers
+
+Stdlib only: an asyncio HTTP/1.1 server with keep-alive. Every request runs
+its func.py call on a worker thread; at most --max-concurrency run at once
+(default: the DB pool size, so a worker never waits for a connection) and a
+request that can't get a slot within --queue-timeout gets 503 + Retry-After.
+
+Log in with POST /login {"email", "password"} and send the returned token as
+`Authorization: Bearer <token>`. Tokens are signed with EMS_API_SECRET; set the
+same secret on every instance behind a load balancer (without it each process
+picks a random one and tokens only work against that process).
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import func as db
+
+TOKEN_TTL = int(os.environ.get("EMS_API_TOKEN_TTL", 12 * 3600))
+_SECRET = os.environ.get("EMS_API_SECRET", "").encode() or os.urandom(32)
+
+MAX_LINE = 16 * 1024          # request line / single header
+MAX_HEADERS = 100
+MAX_BODY = 1024 * 1024
+HEADER_TIMEOUT = 10.0         # seconds to send the rest of a request once it started
+EVENTS_PAGE_MAX = 200
+FEEDBACK_PAGE_MAX = 200
+
+TICKET_TYPES = ("regular", "vip", "student")
+PAYMENT_METHODS = ("credit_card", "debit_card", "paypal", "upi")
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body", "params", "user", "server")
+
+    def __init__(self, method, target, headers, body):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = unquote(parts.path).rstrip("/") or "/"
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+        self.params = {}
+        self.user = None
+        self.server = None
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return data
+
+
+# ----------------- Tokens -----------------
+def issue_token(user_id, role):
+    payload = f"{user_id}:{role}:{int(time.time()) + TOKEN_TTL}"
+    signature = hmac.new(_SECRET, payload.encode(), hashlib.sha256).hexdigest()
+    return base64.urlsafe_b64encode(f"{payload}:{signature}".encode()).decode()
+
+
+def read_token(token):
+    """Returns (user_id, role) for a valid, unexpired token, else None."""
+    try:
+        payload, signature = base64.urlsafe_b64decode(token.encode()).decode().rsplit(":", 1)
+        user_id, role, expires = payload.split(":")
+        expected = hmac.new(_SECRET, payload.encode(), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(signature, expected) or int(expires) < time.time():
+            return None
+        return int(user_id), role
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+# ----------------- Routing -----------------
+ROUTES = []  # (method, compiled path, handler, role, inline)
+
+
+def route(method, pattern, role=None, inline=False):
+    """
+    Registers a handler. `{name}` segments match integers and end up in
+    request.params. role None = public, "user" = any logged-in user,
+    "attendee"/"organizer" = that role only. Inline handlers run on the event
+    loop and must not touch the database.
+    """
+    regex = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>\\d+)", pattern) + "$")
+
+    def register(handler):
+        ROUTES.append((method, regex, handler, role, inline))
+        return handler
+    return register
+
+
+def match(request):
+    allowed = []
+    for method, regex, handler, role, inline in ROUTES:
+        found = regex.match(request.path)
+        if not found:
+            continue
+        if method != request.method:
+            allowed.append(method)
+            continue
+        request.params = {key: int(value) for key, value in found.groupdict().items()}
+        return handler, role, inline
+    if allowed:
+        raise HTTPError(405, "Method not allowed", {"Allow": ", ".join(sorted(set(allowed)))})
+    raise HTTPError(404, "Not found")
+
+
+def authenticate(request, role):
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    user = read_token(token.strip()) if scheme.lower() == "bearer" else None
+    if user is None:
+        raise HTTPError(401, "Login required", {"WWW-Authenticate": "Bearer"})
+    if role != "user" and user[1] != role:
+        raise HTTPError(403, f"Only {role}s can do this")
+    request.user = user[0]
+
+
+# ----------------- Helpers -----------------
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _rows(rows, *columns):
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def _field(data, name, kind=str, required=True, default=None, choices=None):
+    """Reads and converts one body field, answering 400 if it is missing or malformed."""
+    value = data.get(name)
+    if value is None or value == "":
+        if required:
+            raise HTTPError(400, f"'{name}' is required")
+        return default
+    try:
+        if kind is date:
+            value = date.fromisoformat(str(value))
+        elif kind is datetime:
+            value = datetime.fromisoformat(str(value))
+        elif kind is str:
+            value = str(value).strip()
+        else:
+            value = kind(value)
+    except (TypeError, ValueError, ArithmeticError):
+        raise HTTPError(400, f"'{name}' is not a valid {kind.__name__}")
+    if choices and value not in choices:
+        raise HTTPError(400, f"'{name}' must be one of: {', '.join(choices)}")
+    return value
+
+
+def _query_int(request, name, default, maximum):
+    try:
+        value = int(request.query.get(name, default))
+    except ValueError:
+        raise HTTPError(400, f"'{name}' must be an integer")
+    return max(1, min(value, maximum))
+
+
+def _page_cursor(request):
+    """The (date, id) keyset cursor a list endpoint got as ?cursor=YYYY-MM-DD,id, or None."""
+    if not request.query.get("cursor"):
+        return None
+    last_date, _, last_id = request.query["cursor"].partition(",")
+    try:
+        return date.fromisoformat(last_date), int(last_id)
+    except ValueError:
+        raise HTTPError(400, "Malformed cursor")
+
+
+def _format_cursor(cursor):
+    return f"{cursor[0].isoformat()},{cursor[1]}" if cursor else None
+
+
+def _result(result, created=False):
+    """Maps func.py's (ok, message) convention onto a response."""
+    ok, message = result[0], result[1]
+    if not ok:
+        raise HTTPError(409, message)
+    return (201 if created else 200), {"message": message}
+
+
+def _own_event(request, event_id):
+    if not db.check_event_ownership(event_id, request.user):
+        raise HTTPError(404, "Event not found")
+
+
+def _attended(request, event_id):
+    if not any(row[0] == event_id for row in db.get_attended_events(request.user)):
+        raise HTTPError(403, "You can only review events you attended")
+
+
+# ----------------- Service -----------------
+@route("GET", "/health", inline=True)
+def health(request):
+    server = request.server
+    return {
+        "status": "ok",
+        "uptime": round(time.monotonic() - server.started, 1),
+        "api": dict(server.stats, max_concurrency=server.max_concurrency),
+        "pool": db.pool_stats(),
+        "caches": db.cache_stats(),
+    }
+
+
+@route("GET", "/metrics", inline=True)
+def metrics(request):
+    """func.py counters in the Prometheus text format, for scraping."""
+    return db.metrics_prometheus()
+
+
+@route("GET", "/metrics/queries", role="organizer", inline=True)
+def query_metrics(request):
+    """Per-function counters and the slow-query log (parameters redacted)."""
+    return {"functions": db.query_stats(), "slow_queries": db.slow_queries()}
+
+
+@route("POST", "/login")
+def login(request):
+    data = request.json()
+    password_hash = hashlib.sha256(_field(data, "password").encode()).hexdigest()
+    user = db.login_user(_field(data, "email"), password_hash)
+    if not user:
+        raise HTTPError(401, "Invalid email or password")
+    return {
+        "token": issue_token(user["user_id"], user["role"]),
+        "expires_in": TOKEN_TTL,
+        "user_id": user["user_id"],
+        "role": user["role"],
+        "name": f"{user['first_name']} {user['last_name']}",
+    }
+
+
+@route("POST", "/users")
+def sign_up(request):
+    data = request.json()
+    password_hash = hashlib.sha256(_field(data, "password").encode()).hexdigest()
+    return _result(db.register_user(
+        _field(data, "first_name"), _field(data, "last_name"), _field(data, "email"), password_hash,
+        _field(data, "phone", required=False, default=""),
+        _field(data, "role", choices=("attendee", "organizer")),
+    ), created=True)
+
+
+# ----------------- Events -----------------
+@route("GET", "/events")
+def list_events(request):
+    rows, next_cursor = db.get_events_page(
+        after=_page_cursor(request),
+        limit=_query_int(request, "limit", db.EVENTS_PAGE_SIZE, EVENTS_PAGE_MAX),
+        date_from=_field(request.query, "date_from", date, required=False),
+        date_to=_field(request.query, "date_to", date, required=False),
+        city=request.query.get("city") or None,
+        available_only=request.query.get("available_only", "").lower() in ("1", "true", "yes"),
+    )
+    return {
+        "events": _rows(rows, "event_id", "event_name", "event_date", "city"),
+        "next_cursor": _format_cursor(next_cursor),
+    }
+
+
+@route("GET", "/events/search")
+def search_events(request):
+    text = request.query.get("q", "")
+    rows = db.search_events(
+        text,
+        limit=_query_int(request, "limit", db.SEARCH_RESULTS_LIMIT, EVENTS_PAGE_MAX),
+        date_from=_field(request.query, "date_from", date, required=False),
+        date_to=_field(request.query, "date_to", date, required=False),
+        city=request.query.get("city") or None,
+        available_only=request.query.get("available_only", "").lower() in ("1", "true", "yes"),
+    )
+    return {"query": text, "events": _rows(rows, "event_id", "event_name", "event_date", "city")}
+
+
+@route("GET", "/events/cities")
+def event_cities(request):
+    return {"cities": db.get_event_cities()}
+
+
+@route("GET", "/events/{event_id}")
+def event_details(request):
+    details = db.get_event_details(request.params["event_id"])
+    if not details:
+        raise HTTPError(404, "Event not found")
+    return dict(details, event_id=request.params["event_id"])
+
+
+@route("GET", "/events/{event_id}/tickets")
+def event_tickets(request):
+    return {"tickets": _rows(db.get_tickets_for_event(request.params["event_id"]), "ticket_type", "price")}
+
+
+@route("GET", "/me/events", role="organizer")
+def my_events(request):
+    return {"events": _rows(db.get_organizer_events(request.user),
+                            "event_id", "event_name", "event_date", "description", "location_id")}
+
+
+@route("POST", "/events", role="organizer")
+def create_event(request):
+    data = request.json()
+    location_name = _field(data, "location_name")
+    location_id = db.find_location_id(location_name)
+    if location_id is None:
+        # New venue: the desktop client prompts for these, the API needs them up front
+        location_id = db.create_location(location_name, _field(data, "address"), _field(data, "city"),
+                                         _field(data, "state"), _field(data, "zip_code"))
+    ok, message, event_id = db.create_event(request.user, _field(data, "name"),
+                                            _field(data, "description", required=False, default=""),
+                                            _field(data, "date", date), location_id)
+    if not ok:
+        raise HTTPError(409, message)
+    return 201, {"message": message, "event_id": event_id}
+
+
+@route("PUT", "/events/{event_id}", role="organizer")
+def update_event(request):
+    event_id = request.params["event_id"]
+    _own_event(request, event_id)
+    data = request.json()
+    return _result(db.update_event(event_id, _field(data, "name"),
+                                   _field(data, "description", required=False, default=""),
+                                   _field(data, "date", date)))
+
+
+@route("DELETE", "/events/{event_id}", role="organizer")
+def delete_event(request):
+    event_id = request.params["event_id"]
+    _own_event(request, event_id)
+    return _result(db.delete_event_cascading(event_id))
+
+
+@route("POST", "/events/{event_id}/tickets", role="organizer")
+def add_ticket_type(request):
+    event_id = request.params["event_id"]
+    _own_event(request, event_id)
+    data = request.json()
+    quantity = _field(data, "quantity", int)
+    price = _field(data, "price", Decimal)
+    if quantity < 1 or price < 0:
+        raise HTTPError(400, "'quantity' must be positive and 'price' not negative")
+    return _result(db.add_ticket_type(event_id, _field(data, "ticket_type", choices=TICKET_TYPES),
+                                      price, quantity), created=True)
+
+
+@route("GET", "/events/{event_id}/stats", role="organizer")
+def event_stats(request):
+    event_id = request.params["event_id"]
+    _own_event(request, event_id)
+    return db.get_event_stats(event_id) or {"event_id": event_id}
+
+
+@route("GET", "/events/{event_id}/revenue", role="organizer")
+def event_revenue(request):
+    ok, value = db.get_event_revenue(request.params["event_id"], request.user)
+    if not ok:
+        raise HTTPError(404, value)
+    return {"event_id": request.params["event_id"], "revenue": value}
+
+
+# ----------------- Registrations -----------------
+@route("POST", "/events/{event_id}/registrations", role="attendee")
+def register(request):
+    ticket_type = _field(request.json(), "ticket_type", choices=TICKET_TYPES)
+    return _result(db.register_for_event(request.user, request.params["event_id"], ticket_type), created=True)
+
+
+@route("POST", "/events/{event_id}/holds", role="attendee")
+def hold(request):
+    ticket_type = _field(request.json(), "ticket_type", choices=TICKET_TYPES)
+    ok, result = db.hold_ticket(request.user, request.params["event_id"], ticket_type)
+    if not ok:
+        raise HTTPError(409, result)
+    return 201, {"hold_id": result, "expires_in": db.HOLD_SECONDS}
+
+
+@route("POST", "/holds/{hold_id}/confirm", role="attendee")
+def confirm_hold(request):
+    return _result(db.confirm_hold(request.params["hold_id"], request.user), created=True)
+
+
+@route("DELETE", "/holds/{hold_id}", role="attendee")
+def release_hold(request):
+    return _result(db.release_hold(request.params["hold_id"], request.user))
+
+
+@route("POST", "/events/{event_id}/waitlist", role="attendee")
+def join_waitlist(request):
+    ticket_type = _field(request.json(), "ticket_type", choices=TICKET_TYPES)
+    ok, message, position = db.join_waitlist(request.user, request.params["event_id"], ticket_type)
+    if not ok:
+        raise HTTPError(409, message)
+    return 201, {"message": message, "position": position}
+
+
+@route("DELETE", "/events/{event_id}/waitlist", role="attendee")
+def leave_waitlist(request):
+    return _result(db.leave_waitlist(request.user, request.params["event_id"]))
+
+
+@route("GET", "/me/waitlist", role="attendee")
+def my_waitlist(request):
+    return {"waitlist": _rows(db.get_user_waitlist(request.user), "event_id", "event_name", "ticket_type",
+                              "position", "joined_at")}
+
+
+@route("GET", "/me/summary", role="attendee")
+def attendee_summary(request):
+    return db.get_attendee_summary(request.user)
+
+
+@route("GET", "/me/registrations", role="attendee")
+def my_registrations(request):
+    unpaid = request.query.get("unpaid", "").lower() in ("1", "true", "yes")
+    rows = db.get_unpaid_registrations(request.user) if unpaid else db.get_user_registrations(request.user)
+    return {"registrations": _rows(rows, "registration_id", "event_name", "ticket_type", "ticket_id",
+                                   "status", "price")}
+
+
+@route("PUT", "/registrations/{registration_id}", role="attendee")
+def change_ticket(request):
+    ticket_id = _field(request.json(), "ticket_id", int)
+    return _result(db.update_registration_ticket(request.params["registration_id"], request.user, ticket_id))
+
+
+@route("DELETE", "/registrations/{registration_id}", role="attendee")
+def cancel_registration(request):
+    return _result(db.delete_registration(request.params["registration_id"], request.user))
+
+
+# ----------------- Check-in -----------------
+def _checkin_enabled():
+    if not db.checkin_enabled():
+        raise HTTPError(503, db.CHECKIN_DISABLED)
+
+
+@route("GET", "/registrations/{registration_id}/code", role="attendee")
+def door_code(request):
+    _checkin_enabled()
+    registration_id = request.params["registration_id"]
+    ok, message, code = db.get_registration_code(registration_id, request.user)
+    if not ok:
+        raise HTTPError(404, message)
+    return {"registration_id": registration_id, "code": code}
+
+
+@route("GET", "/events/{event_id}/checkin-list", role="organizer")
+def checkin_list(request):
+    """The ids a scanner needs to check people in while offline; see checkin.py."""
+    _checkin_enabled()
+    event_id = request.params["event_id"]
+    result = db.get_checkin_list(event_id, request.user)
+    if result is None:
+        raise HTTPError(404, "Event not found")
+    valid, checked_in = result
+    return {"event_id": event_id, "registration_ids": valid, "checked_in": checked_in}
+
+
+@route("POST", "/events/{event_id}/checkins", role="organizer")
+def record_checkins(request):
+    """
+    Uploads scans made at the door: {"checkins": [{"code": ..., "scanned_at": ...}]},
+    scanned_at defaulting to now. Codes are verified here, so a scanner
+    never sends bare registration ids; rejected codes are listed back.
+    """
+    _checkin_enabled()
+    event_id = request.params["event_id"]
+    _own_event(request, event_id)
+    entries = request.json().get("checkins")
+    if not isinstance(entries, list):
+        raise HTTPError(400, "'checkins' must be a list")
+    checkins, rejected = [], []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise HTTPError(400, "Each check-in must be an object")
+        code = _field(entry, "code")
+        scanned_at = _field(entry, "scanned_at", datetime, required=False) or datetime.now()
+        registration_id = db.parse_registration_code(code, event_id)
+        if registration_id is None:
+            rejected.append(code)
+        else:
+            checkins.append((registration_id, scanned_at.strftime("%Y-%m-%d %H:%M:%S")))
+    ok, message, stamped = db.sync_checkins(event_id, request.user, checkins)
+    if not ok:
+        raise HTTPError(409, message)
+    return {"message": message, "checked_in": stamped, "rejected": rejected}
+
+
+# ----------------- Payments -----------------
+@route("POST", "/registrations/{registration_id}/payment", role="attendee")
+def pay(request):
+    """
+    Charges the ticket price on record. Clients should send an Idempotency-Key
+    header and repeat it on retries: a replay answers 200 with the original
+    amount instead of charging again.
+    """
+    registration_id = request.params["registration_id"]
+    method = _field(request.json(), "payment_method", choices=PAYMENT_METHODS)
+    key = request.headers.get("idempotency-key") or None
+    ok, message, amount = db.make_payment(request.user, registration_id, method, key)
+    if not ok:
+        raise HTTPError(404 if message == db.PAYMENT_NOT_FOUND else 409, message)
+    return (200 if message == db.PAYMENT_REPLAYED else 201), {"message": message, "amount": amount}
+
+
+# ----------------- Feedback -----------------
+@route("GET", "/me/attended", role="attendee")
+def attended_events(request):
+    return {"events": _rows(db.get_attended_events(request.user), "event_id", "event_name")}
+
+
+@route("GET", "/events/{event_id}/feedback", role="attendee")
+def my_feedback(request):
+    found = db.get_user_feedback(request.user, request.params["event_id"])
+    if not found:
+        raise HTTPError(404, "No feedback for this event")
+    return {"event_id": request.params["event_id"], "rating": found[0], "comments": found[1]}
+
+
+def _rating(data):
+    rating = _field(data, "rating", int)
+    if not 1 <= rating <= 5:
+        raise HTTPError(400, "'rating' must be between 1 and 5")
+    return rating
+
+
+@route("POST", "/events/{event_id}/feedback", role="attendee")
+def give_feedback(request):
+    event_id = request.params["event_id"]
+    data = request.json()
+    rating = _rating(data)
+    _attended(request, event_id)
+    if db.get_user_feedback(request.user, event_id):
+        raise HTTPError(409, "Feedback already given; use PUT to change it")
+    return _result(db.give_feedback(request.user, event_id, rating,
+                                    _field(data, "comments", required=False, default="")), created=True)
+
+
+@route("PUT", "/events/{event_id}/feedback", role="attendee")
+def update_feedback(request):
+    data = request.json()
+    return _result(db.update_feedback(request.user, request.params["event_id"], _rating(data),
+                                      _field(data, "comments", required=False, default="")))
+
+
+@route("DELETE", "/events/{event_id}/feedback", role="attendee")
+def delete_feedback(request):
+    return _result(db.delete_feedback(request.user, request.params["event_id"]))
+
+
+@route("GET", "/feedback", role="organizer")
+def organizer_feedback(request):
+    filters = dict(
+        after=_page_cursor(request),
+        limit=_query_int(request, "limit", db.FEEDBACK_PAGE_SIZE, FEEDBACK_PAGE_MAX),
+        min_rating=_field(request.query, "min_rating", int, required=False),
+        max_rating=_field(request.query, "max_rating", int, required=False),
+        date_from=_field(request.query, "date_from", date, required=False),
+        date_to=_field(request.query, "date_to", date, required=False),
+    )
+    event_id = _field(request.query, "event_id", int, required=False)
+    if event_id is None:
+        rows, next_cursor = db.get_organizer_feedback_page(request.user, **filters)
+    else:
+        rows, next_cursor = db.get_event_feedback_page(event_id, request.user, **filters)
+    return {
+        "feedback": _rows(rows, "user_id", "user_name", "event_id", "event_name", "rating", "comments",
+                          "feedback_date", "feedback_id"),
+        "next_cursor": _format_cursor(next_cursor),
+    }
+
+
+# ----------------- Schedules -----------------
+@route("GET", "/events/{event_id}/schedules", role="organizer")
+def schedules(request):
+    return {"schedules": db.get_event_schedules(request.params["event_id"], request.user)}
+
+
+@route("POST", "/events/{event_id}/schedules", role="organizer")
+def add_schedule(request):
+    event_id = request.params["event_id"]
+    _own_event(request, event_id)
+    data = request.json()
+    return _result(db.manage_schedule(event_id, _field(data, "start_time", datetime), _field(data, "activity_name"),
+                                      _field(data, "description", required=False, default="")), created=True)
+
+
+def _own_schedule(request):
+    """update_schedule/delete_schedule don't check ownership, so do it here."""
+    schedule_id = request.params["schedule_id"]
+    owned = db.get_event_schedules(request.params["event_id"], request.user)
+    if not any(row["schedule_id"] == schedule_id for row in owned):
+        raise HTTPError(404, "Schedule not found")
+    return schedule_id
+
+
+@route("PUT", "/events/{event_id}/schedules/{schedule_id}", role="organizer")
+def update_schedule(request):
+    schedule_id = _own_schedule(request)
+    data = request.json()
+    return _result(db.update_schedule(schedule_id, _field(data, "start_time", datetime),
+                                      _field(data, "activity_name"),
+                                      _field(data, "description", required=False, default="")))
+
+
+@route("DELETE", "/events/{event_id}/schedules/{schedule_id}", role="organizer")
+def delete_schedule(request):
+    return _result(db.delete_schedule(_own_schedule(request)))
+
+
+# ----------------- Sponsors -----------------
+@route("GET", "/sponsors", role="organizer")
+def sponsors(request):
+    return {"sponsors": _rows(db.get_all_sponsors(), "sponsor_id", "sponsor_name", "contact_person", "email")}
+
+
+@route("POST", "/sponsors", role="organizer")
+def create_sponsor(request):
+    data = request.json()
+    ok, result = db.create_new_sponsor(_field(data, "name"), _field(data, "contact_person"),
+                                       _field(data, "email"), _field(data, "phone", required=False, default=""))
+    if not ok:
+        raise HTTPError(409, result)
+    return 201, {"message": "Sponsor created", "sponsor_id": result}
+
+
+@route("GET", "/me/sponsors", role="organizer")
+def my_sponsors(request):
+    return {"sponsors": _rows(db.view_organizer_sponsors(request.user), "event_id", "event_name", "sponsor_id",
+                              "sponsor_name", "contact_person", "email", "phone_no", "amount_contributed")}
+
+
+@route("POST", "/events/{event_id}/sponsors", role="organizer")
+def assign_sponsor(request):
+    data = request.json()
+    return _result(db.assign_sponsor(request.user, request.params["event_id"], _field(data, "sponsor_id", int),
+                                     _field(data, "amount", Decimal)), created=True)
+
+
+@route("PUT", "/events/{event_id}/sponsors/{sponsor_id}", role="organizer")
+def update_sponsor_amount(request):
+    amount = _field(request.json(), "amount", Decimal)
+    return _result(db.update_event_sponsor_amount(request.params["event_id"], request.params["sponsor_id"],
+                                                  request.user, amount))
+
+
+@route("DELETE", "/events/{event_id}/sponsors/{sponsor_id}", role="organizer")
+def remove_sponsor(request):
+    return _result(db.delete_event_sponsor(request.params["event_id"], request.params["sponsor_id"], request.user))
+
+
+# ----------------- Analytics -----------------
+@route("GET", "/analytics", role="organizer")
+def analytics(request):
+    return {"events": db.get_organizer_analytics(request.user)}
+
+
+@route("GET", "/analytics/summary", role="organizer")
+def analytics_summary(request):
+    return db.get_organizer_summary(request.user)
+
+
+@route("GET", "/analytics/sponsorship", role="organizer")
+def sponsorship_coverage(request):
+    target = _field(request.query, "target", float, required=False, default=db.SPONSORSHIP_TARGET)
+    status = _field(request.query, "status", required=False,
+                    choices=(db.COVERAGE_NONE, db.COVERAGE_BELOW, db.COVERAGE_ABOVE))
+    return {"target": target, "events": db.get_sponsorship_coverage(request.user, target, status)}
+
+
+# ----------------- HTTP server -----------------
+class APIServer:
+    def __init__(self, max_concurrency, queue_timeout, keepalive_timeout, max_requests):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.max_requests = max_requests
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ems-api")
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.started = time.monotonic()
+        self.stats = {"connections": 0, "open_connections": 0, "requests": 0, "in_flight": 0,
+                      "rejected": 0, "errors": 0}
+
+    async def handle_connection(self, reader, writer):
+        self.stats["connections"] += 1
+        self.stats["open_connections"] += 1
+        served = 0
+        try:
+            while served < self.max_requests:
+                try:
+                    request = await self.read_request(reader)
+                except HTTPError as err:
+                    await self.write_response(writer, err.status, {"error": err.message}, False, err.headers)
+                    break
+                if request is None:
+                    break
+                served += 1
+                keep_alive = self.wants_keep_alive(request) and served < self.max_requests
+                status, payload, headers = await self.dispatch(request)
+                await self.write_response(writer, status, payload, keep_alive, headers)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.stats["open_connections"] -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def read_request(self, reader):
+        """Parses one request; None when the client closed or idled past the keep-alive timeout."""
+        try:
+            line = await asyncio.wait_for(reader.readline(), self.keepalive_timeout)
+        except asyncio.TimeoutError:
+            return None
+        except ValueError:  # longer than the stream limit
+            raise HTTPError(414, "Request line too long")
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {"_version": version}
+        try:
+            while True:
+                raw = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+                if raw in (b"\r\n", b"\n", b""):
+                    break
+                if len(headers) > MAX_HEADERS:
+                    raise HTTPError(431, "Too many headers")
+                name, _, value = raw.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                raise HTTPError(411, "Chunked bodies are not supported; send Content-Length")
+            length = int(headers.get("content-length") or 0)
+            if length < 0 or length > MAX_BODY:
+                raise HTTPError(413, "Body too large")
+            body = await asyncio.wait_for(reader.readexactly(length), HEADER_TIMEOUT) if length else b""
+        except asyncio.TimeoutError:
+            raise HTTPError(408, "Request timed out")
+        except ValueError:
+            raise HTTPError(400, "Malformed headers")
+        return Request(method.upper(), target, headers, body)
+
+    @staticmethod
+    def wants_keep_alive(request):
+        connection = request.headers.get("connection", "").lower()
+        if request.headers["_version"] == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    async def dispatch(self, request):
+        """Returns (status, payload, extra headers); never raises."""
+        self.stats["requests"] += 1
+        request.server = self
+        try:
+            handler, role, inline = match(request)
+            if role:
+                authenticate(request, role)
+            if inline:
+                result = handler(request)
+            else:
+                result = await self.run(handler, request)
+        except HTTPError as err:
+            return err.status, {"error": err.message}, err.headers
+        except db.PoolError as err:
+            self.stats["errors"] += 1
+            return 503, {"error": str(err)}, {"Retry-After": "1"}
+        except Exception as err:
+            self.stats["errors"] += 1
+            print(f"{request.method} {request.path} failed: {err!r}", file=sys.stderr)
+            return 500, {"error": "Internal server error"}, {}
+        if isinstance(result, tuple):
+            return result[0], result[1], {}
+        return 200, result, {}
+
+    async def run(self, handler, request):
+        """Runs a blocking handler on the worker pool once a concurrency slot is free."""
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise HTTPError(503, "Server busy, retry shortly", {"Retry-After": "1"})
+        self.stats["in_flight"] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, handler, request)
+        finally:
+            self.stats["in_flight"] -= 1
+            self.slots.release()
+
+    async def write_response(self, writer, status, payload, keep_alive, headers):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, default=_json_default).encode(), "application/json; charset=utf-8"
+        lines = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+        ]
+        if keep_alive:
+            lines += ["Connection: keep-alive", f"Keep-Alive: timeout={int(self.keepalive_timeout)}"]
+        else:
+            lines.append("Connection: close")
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(args):
+    api = APIServer(args.max_concurrency, args.queue_timeout, args.keepalive_timeout, args.max_requests)
+    server = await asyncio.start_server(api.handle_connection, args.host, args.port, limit=MAX_LINE,
+                                        backlog=args.backlog, reuse_port=args.reuse_port or None)
+    print(f"EMS API listening on http://{args.host}:{args.port} "
+          f"(max concurrency {args.max_concurrency}, keep-alive {args.keepalive_timeout:g}s)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    _, pool_settings = db.load_db_config()
+    parser = argparse.ArgumentParser(description="JSON HTTP API for the Event Management System.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default %(default)s)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default %(default)s)")
+    parser.add_argument("--max-concurrency", type=int, default=pool_settings["size"],
+                        help="requests running func.py at once (default: DB pool size, %(default)s)")
+    parser.add_argument("--queue-timeout", type=float, default=5.0,
+                        help="seconds a request may wait for a slot before 503 (default %(default)s)")
+    parser.add_argument("--keepalive-timeout", type=float, default=15.0,
+                        help="seconds an idle keep-alive connection stays open (default %(default)s)")
+    parser.add_argument("--max-requests", type=int, default=1000,
+                        help="requests served per connection before closing it (default %(default)s)")
+    parser.add_argument("--backlog", type=int, default=1024, help="listen backlog (default %(default)s)")
+    parser.add_argument("--reuse-port", action="store_true",
+                        help="set SO_REUSEPORT so several processes can share the port")
+    args = parser.parse_args(argv)
+
+    if not os.environ.get("EMS_API_SECRET"):
+        print("EMS_API_SECRET is not set: tokens will only be valid for this process.", file=sys.stderr)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.close_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
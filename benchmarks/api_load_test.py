@@ -0,0 +1,151 @@
+"""
+HTTP load test for api_server.py. Opens --connections keep-alive connections
+and has each send requests back to back for --duration seconds, cycling
+through the read endpoints a browsing client hits (event pages, ticket lists,
+event details, and the user's registrations when --email/--password are given).
+
+    python api_server.py --port 8080 &
+    python benchmarks/api_load_test.py --url http://127.0.0.1:8080 --connections 64 --duration 20
+
+Prints throughput, latency percentiles and the status code mix. Exit code 1
+if any request failed with a 5xx or a dropped connection.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, token=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode() if body is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(data)}\r\n"
+        if token:
+            head += f"Authorization: Bearer {token}\r\n"
+        self.writer.write(head.encode() + b"\r\n" + data)
+        await self.writer.drain()
+
+        status = int((await self.reader.readuntil(b"\r\n")).split()[1])
+        length, close = 0, False
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "connection":
+                close = value.strip().lower() == "close"
+        payload = await self.reader.readexactly(length)
+        if close:
+            self.close()
+        return status, json.loads(payload) if payload else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+async def discover(client, token):
+    """Event ids to spread the detail / ticket requests over."""
+    status, page = await client.request("GET", "/events?limit=200", token=token)
+    if status != 200:
+        raise SystemExit(f"GET /events answered {status}: {page}")
+    return [event["event_id"] for event in page["events"]] or [1]
+
+
+def paths(event_ids, with_user):
+    i = 0
+    while True:
+        event_id = event_ids[i % len(event_ids)]
+        yield "/events?limit=50"
+        yield f"/events/{event_id}/tickets"
+        yield f"/events/{event_id}"
+        if with_user:
+            yield "/me/registrations"
+        i += 1
+
+
+async def worker(host, port, token, event_ids, deadline, latencies, statuses, offset):
+    client = Client(host, port)
+    source = paths(event_ids[offset:] + event_ids[:offset], token is not None)
+    try:
+        while time.perf_counter() < deadline:
+            path = next(source)
+            start = time.perf_counter()
+            try:
+                status, _ = await client.request("GET", path, token=token)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                statuses["dropped"] += 1
+                client.close()
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        client.close()
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    setup = Client(host, port)
+    token = None
+    if args.email:
+        status, reply = await setup.request("POST", "/login", {"email": args.email, "password": args.password})
+        if status != 200:
+            raise SystemExit(f"Login failed ({status}): {reply}")
+        token = reply["token"]
+    event_ids = await discover(setup, token)
+    setup.close()
+
+    latencies, statuses = [], Counter()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        worker(host, port, token, event_ids, deadline, latencies, statuses, i % len(event_ids))
+        for i in range(args.connections)
+    ))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep-alive HTTP load test for api_server.py.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="server base URL")
+    parser.add_argument("--connections", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--email", help="log in as this user to include /me/registrations")
+    parser.add_argument("--password", default="password123")
+    args = parser.parse_args(argv)
+
+    latencies, statuses, elapsed = asyncio.run(run(args))
+    latencies.sort()
+    total = sum(statuses.values())
+    print(f"{total} requests over {args.connections} connections in {elapsed:.1f}s "
+          f"({total / elapsed:.0f} req/s)")
+    if latencies:
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+        print(f"latency p50={pct(0.50):.1f}ms p95={pct(0.95):.1f}ms p99={pct(0.99):.1f}ms "
+              f"max={latencies[-1] * 1000:.1f}ms")
+    print("status: " + ", ".join(f"{code}={count}" for code, count in sorted(statuses.items(), key=str)))
+    failed = statuses["dropped"] + sum(count for code, count in statuses.items()
+                                       if isinstance(code, int) and code >= 500)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""
+Times every func.py operation against the synthetic dataset from
+generate_dataset.py and stores the results per commit, so a change can be
+compared with the commit before it.
+
+    python benchmarks/generate_dataset.py generate --scale medium
+    python benchmarks/benchmark_suite.py run                     # all cases, saved under benchmarks/results/
+    python benchmarks/benchmark_suite.py run -k registrations -k feedback --repeat 20
+    python benchmarks/benchmark_suite.py compare 3fffd2b         # that commit's results vs the newest run
+    python benchmarks/benchmark_suite.py compare old.json new.json --threshold 1.1
+    python benchmarks/benchmark_suite.py list
+
+Each case runs once to warm up and then --repeat times; min, median, p95 and
+mean are recorded along with the statements and rows per call (from the
+func.py instrumentation). Caches are cleared before every call so the
+database work is measured; pass --warm to measure the cached path instead.
+Write cases undo their change after each call (untimed), so the dataset is
+the same before and after a run.
+
+Results are written to benchmarks/results/<commit>[-dirty]-<scale>.json with
+the dataset size, so only runs against the same dataset should be compared.
+`compare` exits with 1 when a case got slower than --threshold times its
+baseline median.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+sys.path.insert(0, ROOT)
+
+from generate_dataset import DOMAIN, dataset_counts  # noqa: E402
+
+
+class Case:
+    """
+    One timed operation; undo(result) restores the data after each call and
+    is not timed. The name starts with the func.py function being timed, which
+    is how its statement and row counts are looked up.
+    """
+
+    def __init__(self, name, run, undo=None):
+        self.name = name
+        self.function = name.split(" (")[0]
+        self.run = run
+        self.undo = undo
+
+
+class Samples:
+    """Ids from the synthetic dataset that make each case do a realistic amount of work."""
+
+    def __init__(self, db):
+        self.db = db
+        like = f"%@{DOMAIN}"
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT s.event_id, e.organizer_id, e.event_date
+                FROM Event_Stats s JOIN Events e ON e.event_id = s.event_id
+                JOIN Users u ON u.user_id = e.organizer_id
+                WHERE u.email LIKE %s ORDER BY s.registration_count DESC LIMIT 1
+            """, (like,))
+            row = cursor.fetchone()
+            if row is None:
+                cursor.close()
+                raise SystemExit("No synthetic dataset found; run benchmarks/generate_dataset.py generate first.")
+            self.event_id, self.event_organizer, self.event_date = row
+            cursor.execute("""
+                SELECT e.organizer_id FROM Events e JOIN Users u ON u.user_id = e.organizer_id
+                WHERE u.email LIKE %s GROUP BY e.organizer_id ORDER BY COUNT(*) DESC LIMIT 1
+            """, (like,))
+            self.organizer_id = cursor.fetchone()[0]
+            # A busy attendee: the one with the most registrations among the first thousand
+            cursor.execute("""
+                SELECT r.user_id, u.email FROM Registrations r JOIN Users u ON u.user_id = r.user_id
+                WHERE u.email LIKE %s AND u.user_id <= (SELECT MIN(user_id) + 1000 FROM Users WHERE email LIKE %s)
+                GROUP BY r.user_id, u.email ORDER BY COUNT(*) DESC LIMIT 1
+            """, (like, like))
+            self.user_id, self.email = cursor.fetchone()
+            cursor.execute("""
+                SELECT registration_id, ticket_id FROM Registrations WHERE user_id = %s ORDER BY registration_id LIMIT 1
+            """, (self.user_id,))
+            self.registration_id, self.ticket_id = cursor.fetchone()
+            cursor.execute("SELECT ticket_id FROM Tickets WHERE event_id = %s", (self.event_id,))
+            self.ticket_ids = [r[0] for r in cursor.fetchall()]
+            cursor.execute("SELECT location_id, city FROM Locations WHERE location_name LIKE 'Synthetic Venue %' LIMIT 1")
+            self.location_id, self.city = cursor.fetchone()
+            cursor.close()
+
+        # A scratch event the write cases register for, review and schedule
+        ok, msg, self.scratch_event = db.create_event(self.organizer_id, "Benchmark scratch event",
+                                                      "benchmark_suite.py write cases",
+                                                      date.today() + timedelta(days=365), self.location_id)
+        if not ok:
+            raise SystemExit(f"Could not create the scratch event: {msg}")
+        db.add_ticket_type(self.scratch_event, "regular", 100, 1_000_000)
+
+    def execute(self, sql, params):
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            conn.commit()
+            cursor.close()
+
+    def close(self):
+        self.db.delete_event_cascading(self.scratch_event)
+
+
+def build_cases(db, s):
+    middle = (s.event_date, s.event_id)
+    day = datetime.combine(date.today() + timedelta(days=365), datetime.min.time())
+    return [
+        # Attendee reads
+        Case("login_user", lambda: db.login_user(s.email, "x")),
+        Case("get_events_page", lambda: db.get_events_page(None, 50)),
+        Case("get_events_page (deep page)", lambda: db.get_events_page(middle, 50)),
+        Case("get_events_page (filtered)",
+             lambda: db.get_events_page(None, 50, "2024-01-01", "2027-12-31", s.city, True)),
+        Case("get_event_cities", lambda: db.get_event_cities()),
+        Case("search_events", lambda: db.search_events("python summ")),
+        Case("search_events (filtered)", lambda: db.search_events("jazz", city=s.city)),
+        Case("get_events", lambda: db.get_events()),
+        Case("get_event_details", lambda: db.get_event_details(s.event_id)),
+        Case("get_tickets_for_event", lambda: db.get_tickets_for_event(s.event_id)),
+        Case("get_ticket_prices", lambda: db.get_ticket_prices(s.ticket_ids)),
+        Case("get_user_registrations", lambda: db.get_user_registrations(s.user_id)),
+        Case("get_unpaid_registrations", lambda: db.get_unpaid_registrations(s.user_id)),
+        Case("get_ticket_options_for_registration",
+             lambda: db.get_ticket_options_for_registration(s.registration_id)),
+        Case("get_attended_events", lambda: db.get_attended_events(s.user_id)),
+        Case("get_attendee_summary", lambda: db.get_attendee_summary(s.user_id)),
+        Case("get_user_waitlist", lambda: db.get_user_waitlist(s.user_id)),
+        Case("get_user_feedback", lambda: db.get_user_feedback(s.user_id, s.event_id)),
+
+        # Organizer reads
+        Case("get_organizer_events", lambda: db.get_organizer_events(s.organizer_id)),
+        Case("get_organizer_analytics", lambda: db.get_organizer_analytics(s.organizer_id, use_cache=False)),
+        Case("get_organizer_summary", lambda: db.get_organizer_summary(s.organizer_id)),
+        Case("get_events_with_no_sponsors", lambda: db.get_events_with_no_sponsors(s.organizer_id)),
+        Case("get_sponsorship_coverage", lambda: db.get_sponsorship_coverage(s.organizer_id)),
+        Case("get_organizer_feedback_page", lambda: db.get_organizer_feedback_page(s.event_organizer)),
+        Case("get_event_feedback_page (busiest event)",
+             lambda: db.get_event_feedback_page(s.event_id, s.event_organizer)),
+        Case("get_event_feedback_page (low ratings)",
+             lambda: db.get_event_feedback_page(s.event_id, s.event_organizer, max_rating=2)),
+        Case("view_organizer_sponsors", lambda: db.view_organizer_sponsors(s.organizer_id)),
+        Case("get_all_sponsors", lambda: db.get_all_sponsors()),
+        Case("get_event_stats", lambda: db.get_event_stats(s.event_id)),
+        Case("get_event_revenue", lambda: db.get_event_revenue(s.event_id, s.event_organizer)),
+        Case("get_event_schedules", lambda: db.get_event_schedules(s.event_id, s.event_organizer)),
+        Case("verify_event_stats (busiest event)", lambda: db.verify_event_stats(s.event_id)),
+        Case("get_checkin_list (busiest event)", lambda: db.get_checkin_list(s.event_id, s.event_organizer)),
+
+        # Writes, each undone after the call
+        Case("register_for_event", lambda: db.register_for_event(s.user_id, s.scratch_event, "regular"),
+             lambda result: s.execute("DELETE FROM Registrations WHERE user_id = %s AND event_id = %s",
+                                      (s.user_id, s.scratch_event))),
+        Case("hold_ticket", lambda: db.hold_ticket(s.user_id, s.scratch_event, "regular"),
+             lambda result: db.release_hold(result[1]) if result[0] else None),
+        Case("give_feedback", lambda: db.give_feedback(s.user_id, s.scratch_event, 5, "benchmark"),
+             lambda result: db.delete_feedback(s.user_id, s.scratch_event)),
+        Case("add_event_schedule",
+             lambda: db.add_event_schedule(s.scratch_event, day, day + timedelta(hours=1), "Benchmark", ""),
+             lambda result: s.execute("DELETE FROM Event_Schedule WHERE event_id = %s", (s.scratch_event,))),
+        Case("create_event",
+             lambda: db.create_event(s.organizer_id, "Benchmark event", "", date.today(), s.location_id),
+             lambda result: db.delete_event_cascading(result[2]) if result[0] else None),
+        Case("update_event",
+             lambda: db.update_event(s.scratch_event, "Benchmark scratch event", "updated", day.date())),
+    ]
+
+
+def measure(db, case, repeat, warm):
+    def call():
+        if not warm:
+            db.clear_caches()
+        started = time.perf_counter()
+        result = case.run()
+        elapsed = time.perf_counter() - started
+        if case.undo:
+            case.undo(result)
+        return elapsed
+
+    call()  # warm-up: connections, statement parsing, buffer pool
+    db.reset_query_stats()
+    times = sorted(call() for _ in range(repeat))
+    # Statements and rows of the timed function itself; undo work is counted
+    # under the names of the functions it calls
+    counters = db.query_stats().get(case.function, {})
+    calls = counters.get("calls") or 1
+    return {
+        "min_ms": times[0] * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+        "mean_ms": statistics.fmean(times) * 1000,
+        "repeat": repeat,
+        "queries": counters.get("queries", 0) / calls,
+        "rows": counters.get("rows", 0) / calls,
+    }
+
+
+def git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def scale_label(counts):
+    return f"{counts['users'] // 1000}ku-{counts['events'] // 1000}ke-{counts['registrations'] // 1000}kr"
+
+
+def run(db, args):
+    counts = dataset_counts(db)
+    samples = Samples(db)
+    cases = [c for c in build_cases(db, samples)
+             if not args.k or any(k.lower() in c.name.lower() for k in args.k)]
+    results = {}
+    try:
+        print(f"{len(cases)} cases, {args.repeat} repeats, {'warm' if args.warm else 'cold'} caches, "
+              f"dataset {scale_label(counts)}")
+        print(f"{'case':<40} {'median':>10} {'p95':>10} {'queries':>8} {'rows':>10}")
+        for case in cases:
+            entry = results[case.name] = measure(db, case, args.repeat, args.warm)
+            print(f"{case.name:<40} {entry['median_ms']:>8.2f}ms {entry['p95_ms']:>8.2f}ms "
+                  f"{entry['queries']:>8.1f} {entry['rows']:>10.0f}")
+    finally:
+        samples.close()
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "subject": git("log", "-1", "--format=%s"),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "warm": args.warm,
+        "dataset": counts,
+        "cases": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = args.output or os.path.join(
+        RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}-{scale_label(counts)}{'-warm' if args.warm else ''}.json")
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Saved {os.path.relpath(path, ROOT)}")
+    return 0
+
+
+def find_result(ref):
+    """A results file by path or by commit prefix (newest match)."""
+    if os.path.isfile(ref):
+        return ref
+    matches = sorted(glob.glob(os.path.join(RESULTS_DIR, f"{ref}*.json")), key=os.path.getmtime)
+    if not matches:
+        raise SystemExit(f"No results for {ref!r} in {os.path.relpath(RESULTS_DIR, ROOT)}")
+    return matches[-1]
+
+
+def newest_result():
+    matches = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), key=os.path.getmtime)
+    if not matches:
+        raise SystemExit("No stored results yet; run the suite first.")
+    return matches[-1]
+
+
+def compare(args):
+    base_path = find_result(args.base)
+    head_path = find_result(args.head) if args.head else newest_result()
+    with open(base_path, encoding="utf-8") as handle:
+        base = json.load(handle)
+    with open(head_path, encoding="utf-8") as handle:
+        head = json.load(handle)
+    print(f"base {base['commit']} {base['subject']!r}\nhead {head['commit']}{' (dirty)' if head['dirty'] else ''} "
+          f"{head['subject']!r}")
+    if base["dataset"] != head["dataset"]:
+        print(f"warning: different datasets ({scale_label(base['dataset'])} vs {scale_label(head['dataset'])})")
+    if base.get("warm") != head.get("warm"):
+        print("warning: one run used warm caches and the other did not")
+
+    regressions = 0
+    print(f"{'case':<40} {'base':>10} {'head':>10} {'ratio':>7}")
+    for name, entry in head["cases"].items():
+        before = base["cases"].get(name)
+        if before is None:
+            print(f"{name:<40} {'-':>10} {entry['median_ms']:>8.2f}ms {'new':>7}")
+            continue
+        ratio = entry["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        flag = ""
+        if ratio > args.threshold:
+            flag, regressions = "  SLOWER", regressions + 1
+        elif ratio < 1 / args.threshold:
+            flag = "  faster"
+        print(f"{name:<40} {before['median_ms']:>8.2f}ms {entry['median_ms']:>8.2f}ms {ratio:>6.2f}x{flag}")
+    print(f"{regressions} case(s) slower than {args.threshold:g}x")
+    return 1 if regressions else 0
+
+
+def list_results(args):
+    for name in sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), key=os.path.getmtime):
+        with open(name, encoding="utf-8") as handle:
+            report = json.load(handle)
+        print(f"{os.path.basename(name):<48} {report['created']}  {len(report['cases'])} cases  {report['subject']}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark func.py against the synthetic dataset.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="time every case and store the results")
+    p_run.add_argument("-k", action="append", help="only cases whose name contains this (repeatable)")
+    p_run.add_argument("--repeat", type=int, default=10, help="timed calls per case")
+    p_run.add_argument("--warm", action="store_true", help="keep caches between calls")
+    p_run.add_argument("--output", help="results file (default: benchmarks/results/<commit>-<dataset>.json)")
+
+    p_compare = sub.add_parser("compare", help="compare two stored runs")
+    p_compare.add_argument("base", help="results file or commit prefix")
+    p_compare.add_argument("head", nargs="?", help="results file or commit prefix (default: newest run)")
+    p_compare.add_argument("--threshold", type=float, default=1.2, help="median ratio counted as a regression")
+
+    sub.add_parser("list", help="list stored runs")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return compare(args)
+    if args.command == "list":
+        return list_results(args)
+
+    import func as db
+    if not db.INSTRUMENT:
+        print("note: EMS_INSTRUMENT=0, so statement and row counts are not recorded")
+    try:
+        return run(db, args)
+    finally:
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
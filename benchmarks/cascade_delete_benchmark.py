@@ -0,0 +1,189 @@
+"""
+Compares the old single-transaction delete_event_cascading (registration ids
+fetched into Python, one big IN list for Payments) with the batched,
+join-based one in func.py. Builds two identical synthetic events, each with
+--registrations paid registrations plus feedback, deletes one with each
+implementation and reports the total time and the longest transaction (how
+long locks were held in one go).
+
+    python benchmarks/cascade_delete_benchmark.py --registrations 100000 --batch-size 1000
+    python benchmarks/cascade_delete_benchmark.py --registrations 20000 --archive
+
+Runs against the database configured for the app, after `python migrate.py`.
+The synthetic users and location are removed at the end unless --keep.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def legacy_delete(db, event_id):
+    """delete_event_cascading as it was before batching, minus cache hooks."""
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM Event_Schedule WHERE event_id = %s", (event_id,))
+            cursor.execute("DELETE FROM Event_Sponsors WHERE event_id = %s", (event_id,))
+            cursor.execute("SELECT registration_id FROM Registrations WHERE event_id = %s", (event_id,))
+            registration_ids = [row[0] for row in cursor.fetchall()]
+            if registration_ids:
+                cursor.execute(
+                    f"DELETE FROM Payments WHERE registration_id IN ({','.join(['%s'] * len(registration_ids))})",
+                    tuple(registration_ids)
+                )
+            cursor.execute("DELETE FROM Registrations WHERE event_id = %s", (event_id,))
+            cursor.execute("DELETE FROM Tickets WHERE event_id = %s", (event_id,))
+            cursor.execute("DELETE FROM Feedback WHERE event_id = %s", (event_id,))
+            cursor.execute("DELETE FROM Events WHERE event_id = %s", (event_id,))
+            conn.commit()
+            return True, "deleted"
+        except db.DatabaseError as err:
+            conn.rollback()
+            return False, str(err)
+        finally:
+            cursor.close()
+
+
+def create_users(db, tag, count):
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, count, 5000):
+            cursor.executemany("""
+                INSERT INTO Users (first_name, last_name, email, password, phone_no, role)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, [("Bench", f"User{i}", f"cascade-{tag}-{i}@example.test", "x", "0000000000", "attendee")
+                  for i in range(start, min(start + 5000, count))])
+            conn.commit()
+        cursor.execute("""
+            INSERT INTO Users (first_name, last_name, email, password, phone_no, role)
+            VALUES ('Bench', 'Organizer', %s, 'x', '0000000000', 'organizer')
+        """, (f"cascade-{tag}-organizer@example.test",))
+        organizer_id = cursor.lastrowid
+        cursor.execute(
+            "INSERT INTO Locations (location_name, address, city, state, zip_code) VALUES (%s,%s,%s,%s,%s)",
+            (f"Cascade bench {tag}", "-", "Bench City", "-", "00000")
+        )
+        location_id = cursor.lastrowid
+        conn.commit()
+        cursor.close()
+    return organizer_id, location_id
+
+
+def create_event(db, tag, label, organizer_id, location_id, registrations):
+    """One event with a paid registration and a feedback row for each synthetic user."""
+    ok, msg, event_id = db.create_event(organizer_id, f"Cascade bench {tag} {label}", "cascade delete benchmark",
+                                        "2099-01-01", location_id)
+    if not ok:
+        raise SystemExit(f"Could not create event: {msg}")
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        # Unsharded on purpose: the registration trigger takes seats from Tickets
+        cursor.execute("""
+            INSERT INTO Tickets (event_id, ticket_type, price, quantity_available)
+            VALUES (%s, 'regular', 10.00, %s)
+        """, (event_id, registrations))
+        ticket_id = cursor.lastrowid
+        cursor.execute("""
+            INSERT INTO Registrations (user_id, event_id, ticket_id, registration_date, status)
+            SELECT user_id, %s, %s, CURDATE(), 'registered'
+            FROM Users WHERE email LIKE %s AND role = 'attendee'
+        """, (event_id, ticket_id, f"cascade-{tag}-%"))
+        cursor.execute("""
+            INSERT INTO Payments (registration_id, amount, payment_date, payment_method, status)
+            SELECT registration_id, 10.00, CURDATE(), 'upi', 'completed'
+            FROM Registrations WHERE event_id = %s
+        """, (event_id,))
+        cursor.execute("""
+            INSERT INTO Feedback (user_id, event_id, rating, comments, feedback_date)
+            SELECT user_id, event_id, 1 + MOD(registration_id, 5), 'benchmark', CURDATE()
+            FROM Registrations WHERE event_id = %s
+        """, (event_id,))
+        conn.commit()
+        cursor.close()
+    return event_id
+
+
+def cleanup(db, tag, event_ids, location_id, archive):
+    for event_id in event_ids:
+        db.delete_event_cascading(event_id)  # whatever a failed run left behind
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        if archive:
+            for event_id in event_ids:
+                cursor.execute("""
+                    DELETE ap FROM Archived_Payments ap
+                    JOIN Archived_Registrations ar ON ar.registration_id = ap.registration_id
+                    WHERE ar.event_id = %s
+                """, (event_id,))
+                for table in ("Archived_Registrations", "Archived_Tickets", "Archived_Feedback",
+                              "Archived_Event_Schedule", "Archived_Event_Sponsors", "Archived_Events"):
+                    cursor.execute(f"DELETE FROM {table} WHERE event_id = %s", (event_id,))
+        cursor.execute("DELETE FROM Locations WHERE location_id = %s", (location_id,))
+        while True:
+            cursor.execute("DELETE FROM Users WHERE email LIKE %s LIMIT 5000", (f"cascade-{tag}-%",))
+            conn.commit()
+            if cursor.rowcount < 5000:
+                break
+        cursor.close()
+
+
+def timed(label, delete):
+    """Runs delete(progress) and reports wall time and the longest gap between commits."""
+    marks = [time.perf_counter()]
+
+    def progress(table, done, total):
+        marks.append(time.perf_counter())
+
+    ok, msg = delete(progress)
+    marks.append(time.perf_counter())
+    longest = max(b - a for a, b in zip(marks, marks[1:]))
+    print(f"{label:<9} {marks[-1] - marks[0]:8.2f}s total, longest transaction {longest:.2f}s "
+          f"({len(marks) - 2} progress callbacks)")
+    if not ok:
+        print(f"  FAILED: {msg}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark delete_event_cascading against the old version.")
+    parser.add_argument("--registrations", type=int, default=20000, help="registrations per event")
+    parser.add_argument("--batch-size", type=int, default=None, help="rows per batch (default func.DELETE_BATCH_SIZE)")
+    parser.add_argument("--archive", action="store_true", help="benchmark archive mode instead of plain delete")
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic users in place")
+    args = parser.parse_args(argv)
+
+    import func as db
+    batch_size = args.batch_size or db.DELETE_BATCH_SIZE
+    tag = uuid.uuid4().hex[:8]
+    organizer_id, location_id = create_users(db, tag, args.registrations)
+    event_ids = []
+    try:
+        print(f"Building two events with {args.registrations} paid registrations each...")
+        old_event = create_event(db, tag, "old", organizer_id, location_id, args.registrations)
+        event_ids.append(old_event)
+        new_event = create_event(db, tag, "new", organizer_id, location_id, args.registrations)
+        event_ids.append(new_event)
+
+        ok = timed("legacy", lambda progress: legacy_delete(db, old_event))
+        ok = timed("batched", lambda progress: db.delete_event_cascading(
+            new_event, progress, args.archive, batch_size)) and ok
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM Registrations WHERE event_id IN (%s, %s)", (old_event, new_event))
+            left = cursor.fetchone()[0]
+            cursor.close()
+        if left:
+            print(f"FAIL: {left} registrations left behind")
+        return 0 if ok and not left else 1
+    finally:
+        if not args.keep:
+            cleanup(db, tag, event_ids, location_id, args.archive)
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
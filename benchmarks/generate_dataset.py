@@ -0,0 +1,381 @@
+"""
+Fills the configured database with a synthetic dataset large enough to show
+how func.py behaves at volume, next to (not instead of) the sample data.
+
+    python benchmarks/generate_dataset.py generate --scale small
+    python benchmarks/generate_dataset.py generate --scale large --seed 7
+    python benchmarks/generate_dataset.py generate --users 300000 --events 20000 --registrations 3000000
+    python benchmarks/generate_dataset.py describe
+    python benchmarks/generate_dataset.py drop
+
+Scales (users / organizers / events / registrations):
+
+    tiny     2,000 /    50 /    200 /     20,000
+    small   20,000 /   200 /  2,000 /    200,000
+    medium 200,000 / 1,000 / 10,000 /  2,000,000
+    large 1,000,000 / 5,000 / 50,000 / 10,000,000
+
+Event popularity is skewed (a few events get most registrations, like real
+ticket sales), about 60% of registrations are paid, and about a third of
+those attendees leave feedback. Every row goes through the normal triggers,
+so seats, Event_Stats and payment statuses stay consistent; that is also why
+the large scale takes a while. The same --seed always produces the same
+data. Synthetic users and sponsors use @ems-bench.test addresses and venues
+are named "Synthetic Venue N", which is how `drop` and the benchmark suite
+find them. Run `python migrate.py` first.
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DOMAIN = "ems-bench.test"
+VENUE_PREFIX = "Synthetic Venue"
+
+SCALES = {
+    "tiny": dict(users=2_000, organizers=50, events=200, registrations=20_000),
+    "small": dict(users=20_000, organizers=200, events=2_000, registrations=200_000),
+    "medium": dict(users=200_000, organizers=1_000, events=10_000, registrations=2_000_000),
+    "large": dict(users=1_000_000, organizers=5_000, events=50_000, registrations=10_000_000),
+}
+
+FIRST_NAMES = ("Aarav", "Ananya", "Rohan", "Isha", "Vikram", "Sneha", "Arjun", "Kavya", "Karan", "Meera",
+               "Nikhil", "Pooja", "Rahul", "Riya", "Sahil", "Tanvi", "Varun", "Zoya", "Dev", "Nisha")
+LAST_NAMES = ("Sharma", "Mehta", "Verma", "Iyer", "Reddy", "Kapoor", "Nair", "Gupta", "Joshi", "Bose",
+              "Singh", "Das", "Patel", "Rao", "Khan", "Menon", "Pillai", "Chopra", "Malhotra", "Sen")
+CITIES = (("Mumbai", "Maharashtra"), ("Pune", "Maharashtra"), ("Bengaluru", "Karnataka"),
+          ("Chennai", "Tamil Nadu"), ("Hyderabad", "Telangana"), ("Delhi", "Delhi"),
+          ("Kolkata", "West Bengal"), ("Ahmedabad", "Gujarat"), ("Jaipur", "Rajasthan"),
+          ("Kochi", "Kerala"), ("Goa", "Goa"), ("Lucknow", "Uttar Pradesh"))
+ADJECTIVES = ("Global", "Annual", "Indie", "Open", "Future", "Modern", "Classic", "Winter", "Summer",
+              "Digital", "Grand", "Urban")
+TOPICS = ("Python", "Jazz", "Startup", "Cloud", "Design", "Food", "Film", "Robotics", "Poetry", "Fintech",
+          "Yoga", "Photography", "Data", "Theatre", "Blockchain", "Gaming")
+KINDS = ("Summit", "Festival", "Meetup", "Conference", "Workshop", "Expo", "Hackathon", "Concert")
+COMMENTS = ("Great event!", "Well organised.", "Too crowded.", "Loved the speakers.",
+            "Could be shorter.", "Amazing venue.", "Will come again.", "Sound was poor.")
+TICKET_MIX = (("regular", 70, 500), ("student", 20, 250), ("vip", 10, 2000))  # type, share %, price
+BATCH = 5000
+EVENTS_PER_STEP = 200  # events whose payments/feedback are derived per statement
+
+
+def resolve_scale(args):
+    config = dict(SCALES[args.scale])
+    for key in config:
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+    if config["organizers"] >= config["users"]:
+        raise SystemExit("--organizers must be smaller than --users")
+    return config
+
+
+def plan_events(rng, events, registrations, attendees):
+    """Registrations per event on a Zipf-like curve, capped at the number of attendees."""
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(events)]
+    rng.shuffle(weights)
+    total = sum(weights)
+    return [min(attendees, int(round(registrations * w / total))) for w in weights]
+
+
+def ticket_counts(count):
+    """Seats sold per ticket type for an event with `count` registrations."""
+    sold, left = {}, count
+    for ticket_type, share, _ in TICKET_MIX[:-1]:
+        sold[ticket_type] = count * share // 100
+        left -= sold[ticket_type]
+    sold[TICKET_MIX[-1][0]] = left
+    return sold
+
+
+def insert_batches(conn, cursor, sql, rows, label=None):
+    """executemany in BATCH-row chunks, one commit per chunk."""
+    done = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            cursor.executemany(sql, batch)
+            conn.commit()
+            done += len(batch)
+            batch = []
+            if label and done % (BATCH * 20) == 0:
+                print(f"  {label}: {done:,}")
+    if batch:
+        cursor.executemany(sql, batch)
+        conn.commit()
+        done += len(batch)
+    return done
+
+
+def synthetic_ids(cursor, sql, params=()):
+    cursor.execute(sql, params)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def generate(db, args):
+    config = resolve_scale(args)
+    rng = random.Random(args.seed)
+    password = hashlib.sha256(b"password123").hexdigest()
+    started = time.perf_counter()
+
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM Users WHERE email LIKE %s", (f"%@{DOMAIN}",))
+        if cursor.fetchone()[0]:
+            cursor.close()
+            raise SystemExit("A synthetic dataset already exists; run `drop` first.")
+
+        print(f"Generating {config['users']:,} users, {config['events']:,} events and "
+              f"~{config['registrations']:,} registrations (seed {args.seed})")
+        attendee_count = config["users"] - config["organizers"]
+
+        def users():
+            for n in range(config["users"]):
+                role = "organizer" if n < config["organizers"] else "attendee"
+                local = f"org{n}" if role == "organizer" else f"user{n - config['organizers']}"
+                yield (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), f"{local}@{DOMAIN}", password,
+                       f"9{rng.randrange(10 ** 9):09d}", role)
+
+        insert_batches(conn, cursor, """
+            INSERT INTO Users (first_name, last_name, email, password, phone_no, role)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, users(), "users")
+        organizers = synthetic_ids(cursor, "SELECT user_id FROM Users WHERE email LIKE %s AND role = 'organizer' "
+                                           "ORDER BY user_id", (f"%@{DOMAIN}",))
+        attendees = synthetic_ids(cursor, "SELECT user_id FROM Users WHERE email LIKE %s AND role = 'attendee' "
+                                          "ORDER BY user_id", (f"%@{DOMAIN}",))
+
+        venues = max(10, config["events"] // 20)
+        insert_batches(conn, cursor, """
+            INSERT INTO Locations (location_name, address, city, state, zip_code) VALUES (%s, %s, %s, %s, %s)
+        """, ((f"{VENUE_PREFIX} {n}", f"{n} Bench Road", *rng.choice(CITIES), f"{400000 + n}")
+              for n in range(venues)))
+        locations = synthetic_ids(cursor, "SELECT location_id FROM Locations WHERE location_name LIKE %s "
+                                          "ORDER BY location_id", (f"{VENUE_PREFIX} %",))
+
+        first_day = date(2024, 1, 1)
+        plan = plan_events(rng, config["events"], config["registrations"], attendee_count)
+
+        def events():
+            for n in range(config["events"]):
+                topic = rng.choice(TOPICS)
+                name = f"{rng.choice(ADJECTIVES)} {topic} {rng.choice(KINDS)} {n}"
+                description = " ".join(rng.choice(TOPICS + KINDS + ADJECTIVES).lower() for _ in range(12))
+                day = first_day + timedelta(days=rng.randrange(4 * 365))
+                # Organizers own events unevenly too: a few run dozens, most run a handful
+                organizer = organizers[min(len(organizers) - 1, int(rng.paretovariate(1.2)) - 1)
+                                       if rng.random() < 0.3 else rng.randrange(len(organizers))]
+                yield (name, f"{topic} {description}", day, rng.choice(locations), organizer)
+
+        insert_batches(conn, cursor, """
+            INSERT INTO Events (event_name, description, event_date, location_id, organizer_id)
+            VALUES (%s, %s, %s, %s, %s)
+        """, events(), "events")
+        cursor.execute("""
+            SELECT e.event_id, e.event_date FROM Events e JOIN Users u ON u.user_id = e.organizer_id
+            WHERE u.email LIKE %s ORDER BY e.event_id
+        """, (f"%@{DOMAIN}",))
+        event_rows = cursor.fetchall()
+
+        # Tickets sized to what will be sold plus 10-40% unsold seats
+        def tickets():
+            for (event_id, _), count in zip(event_rows, plan):
+                sold_by_type = ticket_counts(count)
+                for ticket_type, _, price in TICKET_MIX:
+                    sold = sold_by_type[ticket_type]
+                    yield event_id, ticket_type, price, sold + int(sold * rng.uniform(0.1, 0.4)) + 5
+
+        insert_batches(conn, cursor, """
+            INSERT INTO Tickets (event_id, ticket_type, price, quantity_available) VALUES (%s, %s, %s, %s)
+        """, tickets())
+        cursor.execute("""
+            SELECT t.event_id, t.ticket_type, t.ticket_id FROM Tickets t
+            JOIN Events e ON e.event_id = t.event_id JOIN Users u ON u.user_id = e.organizer_id
+            WHERE u.email LIKE %s
+        """, (f"%@{DOMAIN}",))
+        ticket_ids = {(event_id, ticket_type): ticket_id for event_id, ticket_type, ticket_id in cursor.fetchall()}
+
+        def registrations():
+            for (event_id, event_date), count in zip(event_rows, plan):
+                types = [t for t, n in ticket_counts(count).items() for _ in range(n)]
+                rng.shuffle(types)
+                for index, ticket_type in zip(rng.sample(range(len(attendees)), count), types):
+                    yield (attendees[index], event_id, ticket_ids[(event_id, ticket_type)],
+                           event_date - timedelta(days=rng.randrange(1, 90)))
+
+        registered = insert_batches(conn, cursor, """
+            INSERT INTO Registrations (user_id, event_id, ticket_id, registration_date, status)
+            VALUES (%s, %s, %s, %s, 'registered')
+        """, registrations(), "registrations")
+
+        # Payments and feedback are derived in SQL a range of events at a time;
+        # the payment trigger marks each paid registration 'attended'
+        event_ids = [row[0] for row in event_rows]
+        for start in range(0, len(event_ids), EVENTS_PER_STEP):
+            low, high = event_ids[start], event_ids[min(start + EVENTS_PER_STEP, len(event_ids)) - 1]
+            cursor.execute("""
+                INSERT INTO Payments (registration_id, amount, payment_date, payment_method, status)
+                SELECT r.registration_id, t.price, r.registration_date,
+                       ELT(1 + MOD(r.registration_id, 4), 'credit_card', 'debit_card', 'paypal', 'upi'),
+                       'completed'
+                FROM Registrations r JOIN Tickets t ON t.ticket_id = r.ticket_id
+                WHERE r.event_id BETWEEN %s AND %s AND MOD(r.registration_id, 10) < 6
+            """, (low, high))
+            cursor.execute("""
+                INSERT INTO Feedback (user_id, event_id, rating, comments, feedback_date)
+                SELECT r.user_id, r.event_id, 1 + MOD(r.registration_id * 7, 5),
+                       ELT(1 + MOD(r.registration_id, 8), %s, %s, %s, %s, %s, %s, %s, %s), e.event_date
+                FROM Registrations r JOIN Events e ON e.event_id = r.event_id
+                WHERE r.event_id BETWEEN %s AND %s AND r.status = 'attended' AND MOD(r.registration_id, 3) = 0
+            """, (*COMMENTS, low, high))
+            cursor.execute("""
+                INSERT INTO Event_Schedule (event_id, start_time, end_time, activity_name, description)
+                SELECT e.event_id, TIMESTAMP(e.event_date, MAKETIME(9 + 2 * n.slot, 0, 0)),
+                       TIMESTAMP(e.event_date, MAKETIME(10 + 2 * n.slot, 30, 0)),
+                       CONCAT('Session ', n.slot + 1), 'Synthetic schedule entry'
+                FROM Events e CROSS JOIN (SELECT 0 AS slot UNION ALL SELECT 1 UNION ALL SELECT 2) n
+                WHERE e.event_id BETWEEN %s AND %s
+            """, (low, high))
+            conn.commit()
+            if (start // EVENTS_PER_STEP) % 25 == 0:
+                print(f"  payments/feedback: {min(start + EVENTS_PER_STEP, len(event_ids)):,} events")
+
+        # Sponsors: one for every 25 events, each backing a handful of events;
+        # about a fifth of the events end up without a sponsor
+        sponsor_count = max(5, config["events"] // 25)
+        insert_batches(conn, cursor, """
+            INSERT INTO Sponsors (sponsor_name, contact_person, email, phone_no) VALUES (%s, %s, %s, %s)
+        """, ((f"Synthetic Sponsor {n}", f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+               f"sponsor{n}@{DOMAIN}", f"8{rng.randrange(10 ** 9):09d}") for n in range(sponsor_count)))
+        sponsors = synthetic_ids(cursor, "SELECT sponsor_id FROM Sponsors WHERE email LIKE %s",
+                                 (f"%@{DOMAIN}",))
+
+        def sponsorships():
+            for event_id in event_ids:
+                if rng.random() < 0.8:
+                    for sponsor_id in rng.sample(sponsors, min(len(sponsors), rng.randint(1, 3))):
+                        yield event_id, sponsor_id, rng.randrange(50_000, 1_000_000)
+
+        insert_batches(conn, cursor, """
+            INSERT INTO Event_Sponsors (event_id, sponsor_id, amount_contributed) VALUES (%s, %s, %s)
+        """, sponsorships())
+        cursor.close()
+
+    db.clear_caches()
+    print(f"Done: {registered:,} registrations in {time.perf_counter() - started:.0f}s. "
+          f"Log in as user0@{DOMAIN} or org0@{DOMAIN} with password123.")
+    return 0
+
+
+def describe(db, args):
+    """Row counts of the synthetic dataset."""
+    counts = dataset_counts(db)
+    if not counts["users"]:
+        print("No synthetic dataset found.")
+        return 1
+    for name, count in counts.items():
+        print(f"{name:<14} {count:>12,}")
+    return 0
+
+
+def dataset_counts(db):
+    """{table: synthetic row count}; used by the benchmark suite to label results."""
+    like = f"%@{DOMAIN}"
+    queries = {
+        "users": ("SELECT COUNT(*) FROM Users WHERE email LIKE %s", (like,)),
+        "events": ("SELECT COUNT(*) FROM Events e JOIN Users u ON u.user_id = e.organizer_id "
+                   "WHERE u.email LIKE %s", (like,)),
+        "registrations": ("SELECT COALESCE(SUM(s.registration_count), 0) FROM Event_Stats s "
+                          "JOIN Events e ON e.event_id = s.event_id JOIN Users u ON u.user_id = e.organizer_id "
+                          "WHERE u.email LIKE %s", (like,)),
+        "feedback": ("SELECT COALESCE(SUM(s.rating_count), 0) FROM Event_Stats s "
+                     "JOIN Events e ON e.event_id = s.event_id JOIN Users u ON u.user_id = e.organizer_id "
+                     "WHERE u.email LIKE %s", (like,)),
+        "sponsors": ("SELECT COUNT(*) FROM Sponsors WHERE email LIKE %s", (like,)),
+    }
+    counts = {}
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        for name, (sql, params) in queries.items():
+            cursor.execute(sql, params)
+            counts[name] = int(cursor.fetchone()[0])
+        cursor.close()
+    return counts
+
+
+def drop(db, args):
+    like = f"%@{DOMAIN}"
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        event_ids = synthetic_ids(cursor, "SELECT e.event_id FROM Events e JOIN Users u ON u.user_id = e.organizer_id "
+                                          "WHERE u.email LIKE %s", (like,))
+        cursor.close()
+    print(f"Deleting {len(event_ids):,} synthetic events...")
+    for n, event_id in enumerate(event_ids, 1):
+        ok, msg = db.delete_event_cascading(event_id)
+        if not ok:
+            print(f"  event {event_id}: {msg}")
+            return 1
+        if n % 1000 == 0:
+            print(f"  {n:,} events")
+
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        for sql, params in (
+            ("DELETE FROM Ticket_Holds WHERE user_id IN (SELECT user_id FROM Users WHERE email LIKE %s)", (like,)),
+            ("DELETE es FROM Event_Sponsors es JOIN Sponsors s ON s.sponsor_id = es.sponsor_id "
+             "WHERE s.email LIKE %s", (like,)),
+            ("DELETE FROM Sponsors WHERE email LIKE %s", (like,)),
+            ("DELETE FROM Locations WHERE location_name LIKE %s", (f"{VENUE_PREFIX} %",)),
+        ):
+            cursor.execute(sql, params)
+            conn.commit()
+        # Registrations and feedback of synthetic users on real events go too
+        cursor.execute("""
+            DELETE p FROM Payments p JOIN Registrations r ON r.registration_id = p.registration_id
+            JOIN Users u ON u.user_id = r.user_id WHERE u.email LIKE %s
+        """, (like,))
+        for table in ("Registrations", "Feedback"):
+            cursor.execute(f"DELETE t FROM {table} t JOIN Users u ON u.user_id = t.user_id WHERE u.email LIKE %s",
+                           (like,))
+        conn.commit()
+        while True:
+            cursor.execute("DELETE FROM Users WHERE email LIKE %s LIMIT %s", (like, BATCH))
+            conn.commit()
+            if cursor.rowcount < BATCH:
+                break
+        cursor.close()
+    db.clear_caches()
+    print("Synthetic dataset removed.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate or remove a synthetic benchmark dataset.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_generate = sub.add_parser("generate", help="insert a synthetic dataset")
+    p_generate.add_argument("--scale", choices=sorted(SCALES), default="small")
+    p_generate.add_argument("--users", type=int, help="override the scale's user count")
+    p_generate.add_argument("--organizers", type=int, help="override the scale's organizer count")
+    p_generate.add_argument("--events", type=int, help="override the scale's event count")
+    p_generate.add_argument("--registrations", type=int, help="override the scale's registration count")
+    p_generate.add_argument("--seed", type=int, default=1, help="random seed (same seed, same data)")
+    sub.add_parser("describe", help="print row counts of the synthetic dataset")
+    sub.add_parser("drop", help="delete every synthetic row")
+    args = parser.parse_args(argv)
+
+    import func as db
+    try:
+        return {"generate": generate, "describe": describe, "drop": drop}[args.command](db, args)
+    finally:
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Per-call latency of the func.py lookups that run as prepared statements,
+with func.PREPARED_STATEMENTS off (the statement text is sent and parsed on
+every call) and on (prepared once per pooled connection, after that only
+the parameters go out and rows come back in the binary protocol).
+
+    python benchmarks/prepared_statement_benchmark.py
+    python benchmarks/prepared_statement_benchmark.py --calls 5000 -k login -k ticket
+
+Uses the synthetic dataset from generate_dataset.py. Caches are cleared
+before every call (untimed) so each call reaches the database. Calls run on
+one thread, so the pool keeps handing out the same warm connection, as it
+does in a running app. The two modes alternate in rounds so that any drift
+in the server's load affects both alike.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmark_suite import Samples  # noqa: E402
+
+
+def build_cases(db, s):
+    return [
+        ("login_user", lambda: db.login_user(s.email, "x")),
+        ("get_ticket_price", lambda: db.get_ticket_price(s.ticket_id)),
+        ("get_user_feedback", lambda: db.get_user_feedback(s.user_id, s.event_id)),
+        ("check_event_ownership", lambda: db.check_event_ownership(s.event_id, s.event_organizer)),
+        ("get_event_details", lambda: db.get_event_details(s.event_id)),
+        ("get_tickets_for_event", lambda: db.get_tickets_for_event(s.event_id)),
+        ("get_event_stats", lambda: db.get_event_stats(s.event_id)),
+        ("get_user_registrations", lambda: db.get_user_registrations(s.user_id)),
+        ("get_unpaid_registrations", lambda: db.get_unpaid_registrations(s.user_id)),
+        ("get_ticket_options_for_registration",
+         lambda: db.get_ticket_options_for_registration(s.registration_id)),
+    ]
+
+
+def time_calls(db, call, count):
+    timings = []
+    for _ in range(count):
+        db.clear_caches()
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark prepared statements against plain text queries.")
+    parser.add_argument("--calls", type=int, default=2000, help="timed calls per case and mode")
+    parser.add_argument("--rounds", type=int, default=10, help="alternations between the two modes")
+    parser.add_argument("-k", action="append", help="only cases whose name contains this (repeatable)")
+    args = parser.parse_args(argv)
+
+    import func as db
+    enabled = db.PREPARED_STATEMENTS
+    samples = Samples(db)
+    try:
+        cases = [case for case in build_cases(db, samples)
+                 if not args.k or any(k in case[0] for k in args.k)]
+        per_round = max(1, args.calls // args.rounds)
+        print(f"{len(cases)} cases, {per_round * args.rounds} calls per mode, backend {db.get_backend().name}")
+        print(f"{'case':<38} {'text':>9} {'prepared':>9} {'change':>8} {'p95 text':>9} {'p95 prep':>9}")
+        totals = {False: 0.0, True: 0.0}
+        for name, call in cases:
+            timings = {False: [], True: []}
+            for mode in (False, True):  # warm up: the first prepared call pays for PREPARE
+                db.PREPARED_STATEMENTS = mode
+                time_calls(db, call, 20)
+            for _ in range(args.rounds):
+                for mode in (False, True):
+                    db.PREPARED_STATEMENTS = mode
+                    timings[mode] += time_calls(db, call, per_round)
+            text, prepared = (statistics.median(timings[mode]) * 1000 for mode in (False, True))
+            totals[False] += text
+            totals[True] += prepared
+            change = (prepared - text) / text * 100 if text else 0.0
+            print(f"{name:<38} {text:>7.3f}ms {prepared:>7.3f}ms {change:>+7.1f}% "
+                  f"{percentile(timings[False], 0.95) * 1000:>7.3f}ms "
+                  f"{percentile(timings[True], 0.95) * 1000:>7.3f}ms")
+        if totals[False]:
+            change = (totals[True] - totals[False]) / totals[False] * 100
+            print(f"{'sum of medians':<38} {totals[False]:>7.3f}ms {totals[True]:>7.3f}ms {change:>+7.1f}%")
+        print("prepared statement cache:", db.prepared_statement_stats())
+        return 0
+    finally:
+        db.PREPARED_STATEMENTS = enabled
+        samples.close()
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
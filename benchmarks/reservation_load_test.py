@@ -0,0 +1,165 @@
+"""
+Concurrency load test for the ticket reservation engine (func.py, Ticket
+Reservations). Creates a throwaway event with one sharded ticket type,
+fires many concurrent register_for_event / hold_ticket calls at it and
+checks that nothing was oversold and Event_Stats stayed consistent.
+
+    python benchmarks/reservation_load_test.py --capacity 500 --attempts 2000 --workers 32
+
+Runs against the database configured for the app (db_config.ini / EMS_DB_*),
+after `python migrate.py`. Everything it creates is removed unless --keep.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def setup(db, capacity, users, slots):
+    tag = uuid.uuid4().hex[:8]
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO Users (first_name, last_name, email, password, phone_no, role)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, [("Load", f"User{i}", f"load-{tag}-{i}@example.test", "x", "0000000000",
+               "organizer" if i == users else "attendee")
+              for i in range(users + 1)])
+        conn.commit()
+        cursor.execute("SELECT user_id FROM Users WHERE email LIKE %s ORDER BY user_id", (f"load-{tag}-%",))
+        user_ids = [row[0] for row in cursor.fetchall()]
+        organizer_id = user_ids.pop()
+        cursor.execute(
+            "INSERT INTO Locations (location_name, address, city, state, zip_code) VALUES (%s,%s,%s,%s,%s)",
+            (f"Load test {tag}", "-", "Load City", "-", "00000")
+        )
+        location_id = cursor.lastrowid
+        conn.commit()
+        cursor.close()
+
+    ok, msg, event_id = db.create_event(organizer_id, f"Load test {tag}", "reservation load test",
+                                        "2099-01-01", location_id)
+    if not ok:
+        raise SystemExit(f"Could not create event: {msg}")
+    ok, msg = db.add_ticket_type(event_id, "regular", 10.0, capacity)
+    if not ok:
+        raise SystemExit(f"Could not add ticket type: {msg}")
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT ticket_id FROM Tickets WHERE event_id = %s", (event_id,))
+        ticket_id = cursor.fetchone()[0]
+        cursor.close()
+    db.shard_ticket_inventory(ticket_id, slots)
+    return user_ids + [organizer_id], event_id, ticket_id, location_id
+
+
+def cleanup(db, user_ids, event_id, location_id):
+    db.delete_event_cascading(event_id)
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM Locations WHERE location_id = %s", (location_id,))
+        for start in range(0, len(user_ids), 500):
+            chunk = user_ids[start:start + 500]
+            cursor.execute(
+                f"DELETE FROM Users WHERE user_id IN ({', '.join(['%s'] * len(chunk))})", chunk
+            )
+        conn.commit()
+        cursor.close()
+
+
+def run(db, user_ids, event_id, attempts, workers, hold_every):
+    def attempt(i):
+        user_id = user_ids[i % len(user_ids)]
+        if hold_every and i % hold_every == 0:
+            ok, hold_id = db.hold_ticket(user_id, event_id, "regular")
+            if not ok:
+                return "hold_failed", 0.0
+            # Every other hold is abandoned to exercise release_hold
+            if (i // hold_every) % 2:
+                db.release_hold(hold_id, user_id)
+                return "released", 0.0
+            start = time.perf_counter()
+            ok, _ = db.confirm_hold(hold_id, user_id)
+            return ("registered" if ok else "failed"), time.perf_counter() - start
+        start = time.perf_counter()
+        ok, _ = db.register_for_event(user_id, event_id, "regular")
+        return ("registered" if ok else "failed"), time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(attempt, range(attempts)))
+    return results, time.perf_counter() - started
+
+
+def check(db, event_id, ticket_id, capacity, results):
+    registered = sum(1 for outcome, _ in results if outcome == "registered")
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT quantity_available FROM Ticket_Inventory WHERE ticket_id = %s", (ticket_id,))
+        remaining = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM Ticket_Holds WHERE ticket_id = %s", (ticket_id,))
+        held = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM Registrations WHERE event_id = %s", (event_id,))
+        rows = cursor.fetchone()[0]
+        cursor.close()
+
+    problems = []
+    if rows != registered:
+        problems.append(f"{rows} registration rows but {registered} successful calls")
+    if registered + remaining + held != capacity:
+        problems.append(f"sold {registered} + left {remaining} + held {held} != capacity {capacity}")
+    if remaining < 0:
+        problems.append(f"negative inventory ({remaining})")
+    drift = db.verify_event_stats(event_id)
+    if drift:
+        problems.append(f"Event_Stats drift: {drift}")
+    return registered, remaining, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent registration load test.")
+    parser.add_argument("--capacity", type=int, default=500, help="seats in the ticket type")
+    parser.add_argument("--attempts", type=int, default=2000, help="registration attempts")
+    parser.add_argument("--users", type=int, default=2000, help="synthetic users (one registration each)")
+    parser.add_argument("--workers", type=int, default=32, help="concurrent threads")
+    parser.add_argument("--slots", type=int, default=8, help="inventory slots to shard the ticket into")
+    parser.add_argument("--hold-every", type=int, default=10,
+                        help="every Nth attempt goes through hold/confirm (0 = never)")
+    parser.add_argument("--keep", action="store_true", help="leave the synthetic data in place")
+    args = parser.parse_args(argv)
+
+    # The pool is created on first use, so size it for the workers up front
+    os.environ.setdefault("EMS_POOL_SIZE", str(min(args.workers, 32)))
+    import func as db
+
+    all_user_ids, event_id, ticket_id, location_id = setup(db, args.capacity, args.users, args.slots)
+    user_ids = all_user_ids[:-1]  # the last one organizes the event
+    try:
+        results, elapsed = run(db, user_ids, event_id, args.attempts, args.workers, args.hold_every)
+        registered, remaining, problems = check(db, event_id, ticket_id, args.capacity, results)
+        latencies = sorted(t for outcome, t in results if outcome == "registered")
+        print(f"{args.attempts} attempts, {args.workers} workers, {args.slots} slots: "
+              f"{registered} registered, {remaining} left in {elapsed:.2f}s "
+              f"({args.attempts / elapsed:.0f} attempts/s)")
+        if latencies:
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            print(f"registration latency p50={p50:.1f}ms p99={p99:.1f}ms")
+        expected = min(args.capacity, len(set(user_ids[i % len(user_ids)] for i in range(args.attempts))))
+        if registered != expected and not args.hold_every:
+            problems.append(f"expected {expected} registrations, got {registered}")
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        return 1 if problems else 0
+    finally:
+        if not args.keep:
+            cleanup(db, all_user_ids, event_id, location_id)
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
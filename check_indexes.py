@@ -0,0 +1,162 @@
+"""
+EXPLAIN-based check that the func.py read queries are served by an index.
+
+    python check_indexes.py            # exit code 1 if a query has no usable index
+    python check_indexes.py --strict   # also fail when MySQL chose a full scan anyway
+    python check_indexes.py -v         # print every plan row
+
+The real func.py helpers are called against the configured database, so the
+SQL checked is exactly the SQL the app runs: each SELECT they issue is first
+run through EXPLAIN on the same connection. A table access with type=ALL and
+no possible_keys is a failure. A full scan where an index was available is
+only a warning, because on the small sample data MySQL often prefers scanning
+a few rows; use --strict on a realistically sized database.
+
+Argument defaults refer to rows in the sample data; override them with
+--user-id / --organizer-id / --event-id / --email if your data differs.
+"""
+import argparse
+import sys
+from contextlib import contextmanager
+
+import func as db
+
+
+class _ExplainingCursor:
+    """Wraps a cursor and EXPLAINs each SELECT before running it."""
+
+    def __init__(self, conn, cursor, plans):
+        self._conn = conn
+        self._cursor = cursor
+        self._plans = plans
+
+    def execute(self, sql, params=()):
+        if sql.lstrip().upper().startswith("SELECT"):
+            explain = self._conn.cursor(dictionary=True, buffered=True)
+            try:
+                explain.execute("EXPLAIN " + sql, params)
+                self._plans.append((" ".join(sql.split()), explain.fetchall()))
+            finally:
+                explain.close()
+        return self._cursor.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _ExplainingConnection:
+    def __init__(self, conn, plans):
+        self._conn = conn
+        self._plans = plans
+
+    def cursor(self, *args, **kwargs):
+        return _ExplainingCursor(self._conn, self._conn.cursor(*args, **kwargs), self._plans)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def build_checks(args):
+    """(label, callable, allowed_scans) for every read helper worth checking."""
+    u, o, e = args.user_id, args.organizer_id, args.event_id
+    return [
+        ("login_user", lambda: db.login_user(args.email, "x"), ()),
+        ("get_events_page", lambda: db.get_events_page(None, 50), ()),
+        ("get_events_page (next page)", lambda: db.get_events_page(("2025-10-15", e), 50), ()),
+        ("get_events_page (filtered)",
+         lambda: db.get_events_page(None, 50, "2025-01-01", "2026-12-31", "Bengaluru", True), ()),
+        # DISTINCT over every city is a scan of the small Locations table by design
+        ("get_event_cities", lambda: db.get_event_cities(), ("l", "Locations")),
+        # Needs migrations/0005; without it the fallback scans Events on purpose and fails here
+        ("search_events", lambda: db.search_events("conf"), ()),
+        ("get_tickets_for_event", lambda: db.get_tickets_for_event(e), ()),
+        ("get_user_registrations", lambda: db.get_user_registrations(u), ()),
+        ("get_unpaid_registrations", lambda: db.get_unpaid_registrations(u), ()),
+        ("get_ticket_options_for_registration", lambda: db.get_ticket_options_for_registration(1), ()),
+        ("get_ticket_prices", lambda: db.get_ticket_prices([1, 2, 3]), ()),
+        ("get_user_feedback", lambda: db.get_user_feedback(u, e), ()),
+        ("get_attended_events", lambda: db.get_attended_events(u), ()),
+        ("get_user_waitlist", lambda: db.get_user_waitlist(u), ()),
+        ("find_location_id", lambda: db.find_location_id("Grand Convention Center"), ()),
+        ("get_organizer_events", lambda: db.get_organizer_events(o), ()),
+        ("get_event_details", lambda: db.get_event_details(e), ()),
+        ("check_event_ownership", lambda: db.check_event_ownership(e, o), ()),
+        ("get_organizer_feedback_page", lambda: db.get_organizer_feedback_page(o), ()),
+        ("get_event_feedback_page (next page)",
+         lambda: db.get_event_feedback_page(e, o, ("2025-10-15", 1000)), ()),
+        ("view_organizer_sponsors", lambda: db.view_organizer_sponsors(o), ()),
+        # The sponsor picker lists every sponsor
+        ("get_all_sponsors", lambda: db.get_all_sponsors(), ("Sponsors",)),
+        ("get_organizer_analytics", lambda: db.get_organizer_analytics(o, use_cache=False), ()),
+        ("get_sponsorship_coverage", lambda: db.get_sponsorship_coverage(o), ()),
+        ("get_event_schedules", lambda: db.get_event_schedules(e, o), ()),
+        ("get_checkin_list", lambda: db.get_checkin_list(e, o), ()),
+        ("get_event_stats", lambda: db.get_event_stats(e), ()),
+    ]
+
+
+def evaluate(plans, allowed_scans):
+    """Returns (failures, warnings) as lists of human-readable strings."""
+    failures, warnings = [], []
+    for sql, rows in plans:
+        for row in rows:
+            table = row.get("table") or ""
+            if row.get("type") != "ALL" or table.startswith("<") or table in allowed_scans:
+                continue
+            if row.get("possible_keys"):
+                warnings.append(f"{table}: full scan chosen over {row['possible_keys']}  [{sql[:90]}...]")
+            else:
+                failures.append(f"{table}: no usable index  [{sql[:90]}...]")
+    return failures, warnings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that func.py queries use indexes.")
+    parser.add_argument("--strict", action="store_true", help="treat chosen full scans as failures")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan row")
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--organizer-id", type=int, default=2)
+    parser.add_argument("--event-id", type=int, default=1)
+    parser.add_argument("--email", default="rahul.sharma@example.com")
+    args = parser.parse_args(argv)
+
+    if db.get_backend().name != "mysql":
+        print("check_indexes reads MySQL EXPLAIN output; run it against the MySQL backend.")
+        return 2
+
+    plans = []
+    original = db.connection
+
+    @contextmanager
+    def explaining_connection():
+        with original() as conn:
+            yield _ExplainingConnection(conn, plans)
+
+    db.connection = explaining_connection
+    failed = False
+    try:
+        for label, call, allowed in build_checks(args):
+            plans.clear()
+            db.clear_caches()  # a cache hit would skip the query being checked
+            call()
+            failures, warnings = evaluate(plans, allowed)
+            if args.strict:
+                failures, warnings = failures + warnings, []
+            state = "FAIL" if failures else ("WARN" if warnings else "ok")
+            print(f"{state:<5} {label}")
+            for msg in failures + warnings:
+                print(f"      {msg}")
+            if args.verbose:
+                for sql, rows in plans:
+                    for row in rows:
+                        print(f"      {row.get('table')}: type={row.get('type')} key={row.get('key')} "
+                              f"rows={row.get('rows')} extra={row.get('Extra')}")
+            failed = failed or bool(failures)
+    finally:
+        db.connection = original
+        db.close_pool()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Door check-in for one event that keeps working without the database.
+
+download() saves the event's check-in list as <CHECKIN_DIR>/event-<id>.bin:
+a header, then the ascending ids of the registrations that may enter and
+of those already checked in, as unsigned 64-bit integers. The file is
+memory-mapped, so a scan is a code signature check and two binary searches
+with no database or network round trip. Accepted scans are appended to
+event-<id>.queue.jsonl before scan() returns; sync() hands them to
+func.sync_checkins and, once they are recorded, moves them from the queue
+into the checked-in ids of the local list. While the database is
+unreachable scans just queue up, and a session opened later (say after a
+restart) picks the queue up again.
+
+    session = CheckinSession(event_id, organizer_id)
+    session.download()
+    status, registration_id = session.scan(code)
+    ok, msg = session.sync()
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+import func as db
+
+CHECKIN_DIR = os.environ.get("EMS_CHECKIN_DIR",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkin"))
+
+SCAN_OK = "ok"
+SCAN_DUPLICATE = "duplicate"  # already checked in, here or at another door
+SCAN_UNKNOWN = "unknown"      # a genuine code that is not on the list: cancelled, or newer than the download
+SCAN_INVALID = "invalid"      # malformed, forged or for another event
+
+_MAGIC = b"EMSCHK01"
+_HEADER = struct.Struct("=8sQQQd")  # magic, event_id, valid count, checked-in count, downloaded at
+_ID = "Q"
+
+
+class CheckinSession:
+    def __init__(self, event_id, organizer_id, directory=CHECKIN_DIR):
+        self.event_id = event_id
+        self.organizer_id = organizer_id
+        self.directory = directory
+        self.list_path = os.path.join(directory, f"event-{event_id}.bin")
+        self.queue_path = os.path.join(directory, f"event-{event_id}.queue.jsonl")
+        self.downloaded_at = None
+        self._lock = threading.Lock()
+        self._map = self._view = self._valid = self._checked_in = None
+        self._pending = []  # (registration_id, scanned_at) not yet synced, in queue file order
+        self._seen = set()  # scanned in this session or waiting in the queue
+        os.makedirs(directory, exist_ok=True)
+        self._load_queue()
+        self._open_list()
+
+    # ----------------- Check-in list -----------------
+    def download(self):
+        """Fetches the event's check-in list and replaces the local copy. Returns (ok, message)."""
+        try:
+            result = db.get_checkin_list(self.event_id, self.organizer_id)
+        except db.DatabaseError as err:
+            return False, f"Could not download the check-in list: {err}"
+        if result is None:
+            return False, "Permission Denied: You can only check in attendees of events you organize."
+        valid, checked_in = result
+        with self._lock:
+            self._write_list(valid, checked_in, time.time())
+        return True, f"{len(valid)} registrations on the list, {len(checked_in)} already checked in"
+
+    def _write_list(self, valid, checked_in, downloaded_at):
+        """Replaces the list file (and its mapping) with these ascending ids. Call with the lock held."""
+        tmp = self.list_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.event_id, len(valid), len(checked_in), downloaded_at))
+            f.write(_pack(valid))
+            f.write(_pack(checked_in))
+        self._close_list()
+        os.replace(tmp, self.list_path)
+        self._open_list()
+
+    def _open_list(self):
+        if not os.path.exists(self.list_path):
+            return
+        with open(self.list_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, event_id, n_valid, n_checked, downloaded_at = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or event_id != self.event_id \
+                or len(self._map) != _HEADER.size + 8 * (n_valid + n_checked):
+            self._close_list()
+            return
+        self._view = memoryview(self._map)[_HEADER.size:].cast(_ID)
+        self._valid = self._view[:n_valid]
+        self._checked_in = self._view[n_valid:]
+        self.downloaded_at = downloaded_at
+
+    def _close_list(self):
+        # the mmap refuses to close while memoryviews of it are alive
+        for view in (self._valid, self._checked_in, self._view):
+            if view is not None:
+                view.release()
+        if self._map is not None:
+            self._map.close()
+        self._map = self._view = self._valid = self._checked_in = None
+        self.downloaded_at = None
+
+    @property
+    def ready(self):
+        return self._map is not None
+
+    @property
+    def size(self):
+        return len(self._valid) if self._valid is not None else 0
+
+    # ----------------- Scanning -----------------
+    def scan(self, code):
+        """Checks a door code against the local list. Returns (status, registration_id or None)."""
+        registration_id = db.parse_registration_code(code, self.event_id)
+        if registration_id is None:
+            return SCAN_INVALID, None
+        with self._lock:
+            if not self.ready or not _contains(self._valid, registration_id):
+                return SCAN_UNKNOWN, registration_id
+            if registration_id in self._seen or _contains(self._checked_in, registration_id):
+                return SCAN_DUPLICATE, registration_id
+            scanned_at = time.strftime("%Y-%m-%d %H:%M:%S")
+            with open(self.queue_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"registration_id": registration_id, "scanned_at": scanned_at}) + "\n")
+            self._seen.add(registration_id)
+            self._pending.append((registration_id, scanned_at))
+        return SCAN_OK, registration_id
+
+    def pending(self):
+        """Number of accepted scans not yet synced."""
+        return len(self._pending)
+
+    def _load_queue(self):
+        if not os.path.exists(self.queue_path):
+            return
+        with open(self.queue_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    scan = (int(entry["registration_id"]), entry["scanned_at"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # a line cut short by a crash mid-write
+                self._pending.append(scan)
+                self._seen.add(scan[0])
+
+    # ----------------- Sync -----------------
+    def sync(self):
+        """
+        Sends the queued scans to the database. Scans made while it runs stay
+        queued for the next sync. On failure nothing is dropped. Returns
+        (ok, message).
+
+        The synced ids are added to the local list's checked-in ids before
+        they leave the queue, so after a restart they still scan as
+        duplicates without a new download.
+        """
+        with self._lock:
+            batch = list(self._pending)
+        if not batch:
+            return True, "Nothing to sync"
+        try:
+            ok, msg, _ = db.sync_checkins(self.event_id, self.organizer_id, batch)
+        except db.DatabaseError as err:
+            ok, msg = False, f"Database unreachable: {err}"
+        if not ok:
+            return False, msg
+        with self._lock:
+            if self.ready:
+                synced = {registration_id for registration_id, _ in batch}
+                checked_in = sorted(synced.union(self._checked_in).intersection(self._valid))
+                self._write_list(list(self._valid), checked_in, self.downloaded_at)
+            del self._pending[:len(batch)]
+            tmp = self.queue_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for registration_id, scanned_at in self._pending:
+                    f.write(json.dumps({"registration_id": registration_id, "scanned_at": scanned_at}) + "\n")
+            os.replace(tmp, self.queue_path)
+        return True, msg
+
+    def close(self):
+        with self._lock:
+            self._close_list()
+
+
+def _pack(ids):
+    return struct.pack(f"={len(ids)}{_ID}", *ids)
+
+
+def _contains(ids, registration_id):
+    i = bisect.bisect_left(ids, registration_id)
+    return i < len(ids) and ids[i] == registration_id
@@ -609,6 +609,5 @@ END //
 
 DELIMITER ;
 
-
-
-
+-- Indexes and later schema changes are versioned under migrations/.
+-- After running this script, apply them with: python migrate.py
@@ -0,0 +1,457 @@
+-- Schema for the embedded SQLite backend (storage.SQLiteBackend).
+--
+-- The same tables, keys and indexes as event_management_database.sql with
+-- every migration in migrations/ applied, and triggers that reproduce the
+-- MySQL triggers and the take_ticket_seat procedure. SQLite triggers have no
+-- IF/CALL, so each branch is a statement with the branch condition in its
+-- WHERE clause, in the order the MySQL version runs them. The session
+-- variables @ems_inventory_move / @ems_inventory_reserved are read through
+-- ems_session(), which the backend registers on every connection.
+--
+-- ENUM columns are TEXT with a CHECK constraint. Applied automatically the
+-- first time the backend opens an empty database file; PRAGMA user_version
+-- records which version of this file it was, and storage.SQLITE_UPGRADES
+-- brings a database created from an older version up to date.
+
+CREATE TABLE Users (
+    user_id INTEGER PRIMARY KEY,
+    first_name VARCHAR(50) NOT NULL,
+    last_name VARCHAR(50) NOT NULL,
+    email VARCHAR(100) NOT NULL UNIQUE,
+    password VARCHAR(255) NOT NULL,
+    phone_no VARCHAR(20),
+    role TEXT NOT NULL CHECK (role IN ('attendee', 'organizer'))
+);
+
+CREATE TABLE Locations (
+    location_id INTEGER PRIMARY KEY,
+    location_name VARCHAR(100) NOT NULL,
+    address VARCHAR(255) NOT NULL,
+    city VARCHAR(50) NOT NULL,
+    state VARCHAR(50) NOT NULL,
+    zip_code VARCHAR(20)
+);
+
+CREATE TABLE Events (
+    event_id INTEGER PRIMARY KEY,
+    event_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    event_date DATE NOT NULL,
+    location_id INT NOT NULL REFERENCES Locations(location_id),
+    organizer_id INT NOT NULL REFERENCES Users(user_id)
+);
+
+CREATE TABLE Tickets (
+    ticket_id INTEGER PRIMARY KEY,
+    event_id INT NOT NULL REFERENCES Events(event_id),
+    ticket_type TEXT NOT NULL CHECK (ticket_type IN ('regular', 'vip', 'student')),
+    price DECIMAL(10,2) NOT NULL,
+    quantity_available INT NOT NULL
+);
+
+CREATE TABLE Registrations (
+    registration_id INTEGER PRIMARY KEY,
+    user_id INT NOT NULL REFERENCES Users(user_id),
+    event_id INT NOT NULL REFERENCES Events(event_id),
+    ticket_id INT NOT NULL REFERENCES Tickets(ticket_id),
+    registration_date DATE NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('registered', 'cancelled', 'attended')),
+    checked_in_at DATETIME
+);
+
+CREATE TABLE Payments (
+    payment_id INTEGER PRIMARY KEY,
+    registration_id INT NOT NULL REFERENCES Registrations(registration_id),
+    amount DECIMAL(10,2) NOT NULL,
+    payment_date DATE NOT NULL,
+    payment_method TEXT NOT NULL CHECK (payment_method IN ('credit_card', 'debit_card', 'paypal', 'upi')),
+    status TEXT NOT NULL CHECK (status IN ('pending', 'completed', 'failed')),
+    idempotency_key VARCHAR(64)
+);
+
+CREATE TABLE Sponsors (
+    sponsor_id INTEGER PRIMARY KEY,
+    sponsor_name VARCHAR(100) NOT NULL,
+    contact_person VARCHAR(100),
+    email VARCHAR(100),
+    phone_no VARCHAR(20)
+);
+
+CREATE TABLE Event_Sponsors (
+    event_id INT NOT NULL REFERENCES Events(event_id),
+    sponsor_id INT NOT NULL REFERENCES Sponsors(sponsor_id),
+    amount_contributed DECIMAL(15,2) DEFAULT 0.00,
+    PRIMARY KEY (event_id, sponsor_id)
+);
+
+CREATE TABLE Feedback (
+    feedback_id INTEGER PRIMARY KEY,
+    user_id INT NOT NULL REFERENCES Users(user_id),
+    event_id INT NOT NULL REFERENCES Events(event_id),
+    rating INT NOT NULL,
+    comments TEXT,
+    feedback_date DATE NOT NULL
+);
+
+CREATE TABLE Event_Schedule (
+    schedule_id INTEGER PRIMARY KEY,
+    event_id INT NOT NULL REFERENCES Events(event_id),
+    start_time DATETIME NOT NULL,
+    end_time DATETIME NOT NULL,
+    activity_name VARCHAR(100) NOT NULL,
+    description TEXT
+);
+
+-- migrations/0002
+CREATE TABLE Event_Stats (
+    event_id INT PRIMARY KEY REFERENCES Events(event_id) ON DELETE CASCADE,
+    registration_count INT NOT NULL DEFAULT 0,
+    attended_count INT NOT NULL DEFAULT 0,
+    tickets_remaining INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(15,2) NOT NULL DEFAULT 0.00,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- migrations/0003
+CREATE TABLE Ticket_Slots (
+    ticket_id INT NOT NULL REFERENCES Tickets(ticket_id) ON DELETE CASCADE,
+    slot_no SMALLINT NOT NULL,
+    quantity_available INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (ticket_id, slot_no)
+);
+
+CREATE TABLE Ticket_Holds (
+    hold_id INTEGER PRIMARY KEY,
+    ticket_id INT NOT NULL REFERENCES Tickets(ticket_id) ON DELETE CASCADE,
+    slot_no SMALLINT NOT NULL,
+    user_id INT NOT NULL REFERENCES Users(user_id),
+    event_id INT NOT NULL REFERENCES Events(event_id) ON DELETE CASCADE,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL
+);
+CREATE UNIQUE INDEX uq_holds_user_event ON Ticket_Holds (user_id, event_id);
+CREATE INDEX idx_holds_expires ON Ticket_Holds (expires_at);
+CREATE INDEX idx_holds_ticket ON Ticket_Holds (ticket_id);
+
+-- migrations/0008
+CREATE TABLE Waitlist (
+    waitlist_id INTEGER PRIMARY KEY,
+    ticket_id INT NOT NULL REFERENCES Tickets(ticket_id) ON DELETE CASCADE,
+    event_id INT NOT NULL REFERENCES Events(event_id) ON DELETE CASCADE,
+    user_id INT NOT NULL REFERENCES Users(user_id),
+    joined_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE UNIQUE INDEX uq_waitlist_user_event ON Waitlist (user_id, event_id);
+CREATE INDEX idx_waitlist_ticket_queue ON Waitlist (ticket_id, waitlist_id);
+
+CREATE VIEW Ticket_Inventory AS
+SELECT t.ticket_id, t.event_id, t.ticket_type, t.price,
+       t.quantity_available
+         + IFNULL((SELECT SUM(s.quantity_available)
+                   FROM Ticket_Slots s WHERE s.ticket_id = t.ticket_id), 0) AS quantity_available
+FROM Tickets t;
+
+-- migrations/0001 (plus the foreign-key indexes InnoDB creates by itself)
+CREATE UNIQUE INDEX uq_registrations_user_event ON Registrations (user_id, event_id);
+CREATE UNIQUE INDEX uq_feedback_user_event ON Feedback (user_id, event_id);
+CREATE UNIQUE INDEX uq_tickets_event_type ON Tickets (event_id, ticket_type);
+CREATE INDEX idx_events_organizer_date ON Events (organizer_id, event_date);
+CREATE INDEX idx_events_date_id ON Events (event_date, event_id);
+CREATE INDEX idx_events_location ON Events (location_id);
+CREATE INDEX idx_payments_registration_status ON Payments (registration_id, status, amount);
+-- migrations/0006
+CREATE UNIQUE INDEX uq_payments_idempotency_key ON Payments (idempotency_key);
+-- migrations/0007 (replaces the foreign-key index on Feedback.event_id)
+CREATE INDEX idx_feedback_event_date ON Feedback (event_id, feedback_date, feedback_id);
+CREATE INDEX idx_locations_name ON Locations (location_name);
+CREATE INDEX idx_registrations_event ON Registrations (event_id);
+CREATE INDEX idx_registrations_ticket ON Registrations (ticket_id);
+CREATE INDEX idx_schedule_event ON Event_Schedule (event_id);
+CREATE INDEX idx_event_sponsors_sponsor ON Event_Sponsors (sponsor_id);
+
+-- migrations/0004 (plus the columns 0010 adds)
+CREATE TABLE Archived_Events (
+    event_id INT PRIMARY KEY,
+    event_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    event_date DATE NOT NULL,
+    location_id INT NOT NULL,
+    organizer_id INT NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_archived_events_organizer ON Archived_Events (organizer_id);
+
+CREATE TABLE Archived_Tickets (
+    ticket_id INT PRIMARY KEY,
+    event_id INT NOT NULL,
+    ticket_type VARCHAR(20) NOT NULL,
+    price DECIMAL(10,2) NOT NULL,
+    quantity_available INT NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_archived_tickets_event ON Archived_Tickets (event_id);
+
+CREATE TABLE Archived_Registrations (
+    registration_id INT PRIMARY KEY,
+    user_id INT NOT NULL,
+    event_id INT NOT NULL,
+    ticket_id INT NOT NULL,
+    registration_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    checked_in_at DATETIME,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_archived_registrations_event ON Archived_Registrations (event_id);
+CREATE INDEX idx_archived_registrations_user ON Archived_Registrations (user_id);
+
+CREATE TABLE Archived_Payments (
+    payment_id INT PRIMARY KEY,
+    registration_id INT NOT NULL,
+    amount DECIMAL(10,2) NOT NULL,
+    payment_date DATE NOT NULL,
+    payment_method VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    idempotency_key VARCHAR(64),
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_archived_payments_registration ON Archived_Payments (registration_id);
+
+CREATE TABLE Archived_Feedback (
+    feedback_id INT PRIMARY KEY,
+    user_id INT NOT NULL,
+    event_id INT NOT NULL,
+    rating INT NOT NULL,
+    comments TEXT,
+    feedback_date DATE NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_archived_feedback_event ON Archived_Feedback (event_id);
+
+CREATE TABLE Archived_Event_Schedule (
+    schedule_id INT PRIMARY KEY,
+    event_id INT NOT NULL,
+    start_time DATETIME NOT NULL,
+    end_time DATETIME NOT NULL,
+    activity_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_archived_schedule_event ON Archived_Event_Schedule (event_id);
+
+CREATE TABLE Archived_Event_Sponsors (
+    event_id INT NOT NULL,
+    sponsor_id INT NOT NULL,
+    amount_contributed DECIMAL(15,2),
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (event_id, sponsor_id)
+);
+
+-- ==================== triggers ====================
+-- Everything below is created after the sample data is loaded (see
+-- SQLiteBackend.initialize), the same way the MySQL script inserts its
+-- sample rows before creating its triggers.
+
+-- prevent_duplicate_registration, then CheckTicketAvailability /
+-- take_ticket_seat: a seat comes from the unsharded remainder in Tickets
+-- (whose stats trigger adjusts Event_Stats) or else from a slot (which has
+-- no stats trigger, so Event_Stats is adjusted here). With
+-- @ems_inventory_reserved the engine already took the seat.
+CREATE TRIGGER CheckTicketAvailability
+BEFORE INSERT ON Registrations
+BEGIN
+    SELECT RAISE(ABORT, 'User already registered for this event')
+    WHERE EXISTS (SELECT 1 FROM Registrations WHERE user_id = NEW.user_id AND event_id = NEW.event_id);
+
+    SELECT RAISE(ABORT, 'Registration failed: Ticket type is sold out.')
+    WHERE ems_session('ems_inventory_reserved') IS NOT 1
+      AND NOT EXISTS (SELECT 1 FROM Tickets WHERE ticket_id = NEW.ticket_id AND quantity_available > 0)
+      AND NOT EXISTS (SELECT 1 FROM Ticket_Slots WHERE ticket_id = NEW.ticket_id AND quantity_available > 0);
+
+    UPDATE Event_Stats SET tickets_remaining = tickets_remaining - 1
+    WHERE event_id = NEW.event_id
+      AND (ems_session('ems_inventory_reserved') IS 1
+           OR NOT EXISTS (SELECT 1 FROM Tickets WHERE ticket_id = NEW.ticket_id AND quantity_available > 0));
+
+    UPDATE Ticket_Slots SET quantity_available = quantity_available - 1
+    WHERE ems_session('ems_inventory_reserved') IS NOT 1
+      AND NOT EXISTS (SELECT 1 FROM Tickets WHERE ticket_id = NEW.ticket_id AND quantity_available > 0)
+      AND rowid = (SELECT rowid FROM Ticket_Slots
+                   WHERE ticket_id = NEW.ticket_id AND quantity_available > 0 LIMIT 1);
+
+    UPDATE Tickets SET quantity_available = quantity_available - 1
+    WHERE ems_session('ems_inventory_reserved') IS NOT 1
+      AND ticket_id = NEW.ticket_id AND quantity_available > 0;
+END;
+
+-- trg_ticket_change: give the old seat back, take one of the new type
+CREATE TRIGGER trg_ticket_change
+AFTER UPDATE OF ticket_id ON Registrations
+WHEN NEW.ticket_id <> OLD.ticket_id
+BEGIN
+    UPDATE Tickets SET quantity_available = quantity_available + 1 WHERE ticket_id = OLD.ticket_id;
+
+    SELECT RAISE(ABORT, 'Registration failed: Ticket type is sold out.')
+    WHERE ems_session('ems_inventory_reserved') IS NOT 1
+      AND NOT EXISTS (SELECT 1 FROM Tickets WHERE ticket_id = NEW.ticket_id AND quantity_available > 0)
+      AND NOT EXISTS (SELECT 1 FROM Ticket_Slots WHERE ticket_id = NEW.ticket_id AND quantity_available > 0);
+
+    UPDATE Event_Stats SET tickets_remaining = tickets_remaining - 1
+    WHERE event_id = NEW.event_id
+      AND (ems_session('ems_inventory_reserved') IS 1
+           OR NOT EXISTS (SELECT 1 FROM Tickets WHERE ticket_id = NEW.ticket_id AND quantity_available > 0));
+
+    UPDATE Ticket_Slots SET quantity_available = quantity_available - 1
+    WHERE ems_session('ems_inventory_reserved') IS NOT 1
+      AND NOT EXISTS (SELECT 1 FROM Tickets WHERE ticket_id = NEW.ticket_id AND quantity_available > 0)
+      AND rowid = (SELECT rowid FROM Ticket_Slots
+                   WHERE ticket_id = NEW.ticket_id AND quantity_available > 0 LIMIT 1);
+
+    UPDATE Tickets SET quantity_available = quantity_available - 1
+    WHERE ems_session('ems_inventory_reserved') IS NOT 1
+      AND ticket_id = NEW.ticket_id AND quantity_available > 0;
+END;
+
+CREATE TRIGGER trg_registration_cancel
+AFTER UPDATE OF status ON Registrations
+WHEN NEW.status = 'cancelled' AND OLD.status <> 'cancelled'
+BEGIN
+    UPDATE Tickets SET quantity_available = quantity_available + 1 WHERE ticket_id = OLD.ticket_id;
+END;
+
+CREATE TRIGGER trg_registration_delete
+AFTER DELETE ON Registrations
+BEGIN
+    UPDATE Tickets SET quantity_available = quantity_available + 1 WHERE ticket_id = OLD.ticket_id;
+END;
+
+CREATE TRIGGER update_status_after_payment
+AFTER INSERT ON Payments
+BEGIN
+    UPDATE Registrations SET status = 'attended' WHERE registration_id = NEW.registration_id;
+END;
+
+-- Event_Stats (trg_stats_* in the MySQL script)
+CREATE TRIGGER trg_stats_event_insert
+AFTER INSERT ON Events
+BEGIN
+    INSERT INTO Event_Stats (event_id) VALUES (NEW.event_id);
+END;
+
+CREATE TRIGGER trg_stats_touch
+AFTER UPDATE ON Event_Stats
+WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE Event_Stats SET updated_at = CURRENT_TIMESTAMP WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER trg_stats_ticket_insert
+AFTER INSERT ON Tickets
+BEGIN
+    UPDATE Event_Stats SET tickets_remaining = tickets_remaining + NEW.quantity_available
+    WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER trg_stats_ticket_update
+AFTER UPDATE ON Tickets
+WHEN ems_session('ems_inventory_move') IS NOT 1
+BEGIN
+    UPDATE Event_Stats
+    SET tickets_remaining = tickets_remaining + NEW.quantity_available - OLD.quantity_available
+    WHERE event_id = NEW.event_id AND NEW.event_id = OLD.event_id
+      AND NEW.quantity_available <> OLD.quantity_available;
+    UPDATE Event_Stats SET tickets_remaining = tickets_remaining - OLD.quantity_available
+    WHERE event_id = OLD.event_id AND NEW.event_id <> OLD.event_id;
+    UPDATE Event_Stats SET tickets_remaining = tickets_remaining + NEW.quantity_available
+    WHERE event_id = NEW.event_id AND NEW.event_id <> OLD.event_id;
+END;
+
+CREATE TRIGGER trg_stats_ticket_delete
+AFTER DELETE ON Tickets
+BEGIN
+    UPDATE Event_Stats SET tickets_remaining = tickets_remaining - OLD.quantity_available
+    WHERE event_id = OLD.event_id;
+END;
+
+CREATE TRIGGER trg_stats_registration_insert
+AFTER INSERT ON Registrations
+BEGIN
+    UPDATE Event_Stats
+    SET registration_count = registration_count + (NEW.status <> 'cancelled'),
+        attended_count = attended_count + (NEW.status = 'attended')
+    WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER trg_stats_registration_update
+AFTER UPDATE ON Registrations
+WHEN NEW.event_id <> OLD.event_id OR NEW.status <> OLD.status
+BEGIN
+    UPDATE Event_Stats
+    SET registration_count = registration_count - (OLD.status <> 'cancelled'),
+        attended_count = attended_count - (OLD.status = 'attended')
+    WHERE event_id = OLD.event_id;
+    UPDATE Event_Stats
+    SET registration_count = registration_count + (NEW.status <> 'cancelled'),
+        attended_count = attended_count + (NEW.status = 'attended')
+    WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER trg_stats_registration_delete
+AFTER DELETE ON Registrations
+BEGIN
+    UPDATE Event_Stats
+    SET registration_count = registration_count - (OLD.status <> 'cancelled'),
+        attended_count = attended_count - (OLD.status = 'attended')
+    WHERE event_id = OLD.event_id;
+END;
+
+CREATE TRIGGER trg_stats_payment_insert
+AFTER INSERT ON Payments
+WHEN NEW.status = 'completed'
+BEGIN
+    UPDATE Event_Stats SET revenue = revenue + NEW.amount
+    WHERE event_id = (SELECT event_id FROM Registrations WHERE registration_id = NEW.registration_id);
+END;
+
+CREATE TRIGGER trg_stats_payment_update
+AFTER UPDATE ON Payments
+BEGIN
+    UPDATE Event_Stats SET revenue = revenue - OLD.amount
+    WHERE OLD.status = 'completed'
+      AND event_id = (SELECT event_id FROM Registrations WHERE registration_id = OLD.registration_id);
+    UPDATE Event_Stats SET revenue = revenue + NEW.amount
+    WHERE NEW.status = 'completed'
+      AND event_id = (SELECT event_id FROM Registrations WHERE registration_id = NEW.registration_id);
+END;
+
+CREATE TRIGGER trg_stats_payment_delete
+AFTER DELETE ON Payments
+WHEN OLD.status = 'completed'
+BEGIN
+    UPDATE Event_Stats SET revenue = revenue - OLD.amount
+    WHERE event_id = (SELECT event_id FROM Registrations WHERE registration_id = OLD.registration_id);
+END;
+
+CREATE TRIGGER trg_stats_feedback_insert
+AFTER INSERT ON Feedback
+BEGIN
+    UPDATE Event_Stats SET rating_sum = rating_sum + NEW.rating, rating_count = rating_count + 1
+    WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER trg_stats_feedback_update
+AFTER UPDATE ON Feedback
+BEGIN
+    UPDATE Event_Stats SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1
+    WHERE event_id = OLD.event_id;
+    UPDATE Event_Stats SET rating_sum = rating_sum + NEW.rating, rating_count = rating_count + 1
+    WHERE event_id = NEW.event_id;
+END;
+
+CREATE TRIGGER trg_stats_feedback_delete
+AFTER DELETE ON Feedback
+BEGIN
+    UPDATE Event_Stats SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1
+    WHERE event_id = OLD.event_id;
+END;
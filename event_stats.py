@@ -0,0 +1,55 @@
+"""
+Maintenance command for the Event_Stats summary table.
+
+    python event_stats.py verify [--event-id ID]    # exit code 1 if drift is found
+    python event_stats.py rebuild [--event-id ID]
+    python event_stats.py rebuild --if-drift        # verify, then rebuild only if needed
+"""
+import argparse
+import sys
+
+import func as db
+
+
+def verify(event_id=None):
+    drift = db.verify_event_stats(event_id)
+    if not drift:
+        print("Event_Stats is consistent with the raw tables.")
+        return 0
+    print(f"{len(drift)} mismatching value(s):")
+    for d in drift:
+        print(f"  event {d['event_id']:>6}  {d['column']:<20} stored={d['stored']}  actual={d['actual']}")
+    return 1
+
+
+def rebuild(event_id=None, if_drift=False):
+    if if_drift and not db.verify_event_stats(event_id):
+        print("No drift found; nothing to rebuild.")
+        return 0
+    ok, msg = db.rebuild_event_stats(event_id)
+    print(msg)
+    return 0 if ok else 2
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify or rebuild the Event_Stats summary table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_verify = sub.add_parser("verify", help="compare Event_Stats with a fresh aggregate")
+    p_verify.add_argument("--event-id", type=int, help="only check this event")
+
+    p_rebuild = sub.add_parser("rebuild", help="recompute Event_Stats from the raw tables")
+    p_rebuild.add_argument("--event-id", type=int, help="only rebuild this event")
+    p_rebuild.add_argument("--if-drift", action="store_true", help="skip the rebuild if verify finds nothing")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "verify":
+            return verify(args.event_id)
+        return rebuild(args.event_id, args.if_drift)
+    finally:
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,358 +1,2188 @@
-import mysql.connector
+import os
+import json
+import time
+import re
+import hmac
+import hashlib
+import math
+import bisect
+import random
+import logging
+import functools
+import inspect
+import threading
+import weakref
+import configparser
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+import storage
+
+# ----------------- Database Configuration -----------------
+# Settings are resolved in this order: built-in defaults, then the INI file
+# (db_config.ini next to this module, or the path in EMS_DB_CONFIG), then
+# EMS_* environment variables. See db_config.example.ini for the format.
+# backend = sqlite runs on the embedded database file at `path` instead of a
+# MySQL server (see storage.py); the host/user settings are then unused.
+DEFAULT_DB_CONFIG = {
+    "backend": "mysql",
+    "path": "event_management.sqlite3",
+    "host": "localhost",
+    "port": 3306,
+    "user": "root",
+    "password": "Your_db_password",
+    "database": "event_management",
+}
+
+DEFAULT_POOL_CONFIG = {
+    "size": 5,                # max connections open at once
+    "checkout_timeout": 10.0, # seconds to wait for a free connection
+    "idle_timeout": 300.0,    # close connections idle longer than this
+    "max_lifetime": 3600.0,   # recycle connections older than this
+    "ping_after": 30.0,       # ping connections idle longer than this on checkout
+}
+
+_ENV_DB_KEYS = {
+    "backend": "EMS_DB_BACKEND",
+    "path": "EMS_DB_PATH",
+    "host": "EMS_DB_HOST",
+    "port": "EMS_DB_PORT",
+    "user": "EMS_DB_USER",
+    "password": "EMS_DB_PASSWORD",
+    "database": "EMS_DB_NAME",
+}
+
+_ENV_POOL_KEYS = {
+    "size": "EMS_POOL_SIZE",
+    "checkout_timeout": "EMS_POOL_CHECKOUT_TIMEOUT",
+    "idle_timeout": "EMS_POOL_IDLE_TIMEOUT",
+    "max_lifetime": "EMS_POOL_MAX_LIFETIME",
+    "ping_after": "EMS_POOL_PING_AFTER",
+}
+
+
+def _coerce(value, default):
+    """Cast a config string to the type of its default value."""
+    if isinstance(default, bool):
+        return str(value).strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    return value
+
+
+def load_db_config(path=None):
+    """Returns (db_settings, pool_settings) dicts built from file + environment."""
+    db_settings = dict(DEFAULT_DB_CONFIG)
+    pool_settings = dict(DEFAULT_POOL_CONFIG)
+
+    path = path or os.environ.get(
+        "EMS_DB_CONFIG",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "db_config.ini")
+    )
+    parser = configparser.ConfigParser()
+    if parser.read(path):
+        for key, default in DEFAULT_DB_CONFIG.items():
+            if parser.has_option("database", key):
+                db_settings[key] = _coerce(parser.get("database", key), default)
+        for key, default in DEFAULT_POOL_CONFIG.items():
+            if parser.has_option("pool", key):
+                pool_settings[key] = _coerce(parser.get("pool", key), default)
+
+    for key, env in _ENV_DB_KEYS.items():
+        if env in os.environ:
+            db_settings[key] = _coerce(os.environ[env], DEFAULT_DB_CONFIG[key])
+    for key, env in _ENV_POOL_KEYS.items():
+        if env in os.environ:
+            pool_settings[key] = _coerce(os.environ[env], DEFAULT_POOL_CONFIG[key])
+
+    return db_settings, pool_settings
+
 
 # ----------------- Database Connection -----------------
+# What to catch around database calls: storage.Error from the embedded
+# backend, plus mysql.connector.Error when the connector is installed
+DatabaseError = storage.error_types()
+PoolError = storage.PoolError
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Returns the storage backend named in the config, created on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                db_settings, _ = load_db_config()
+                _backend = storage.create_backend(db_settings)
+    return _backend
+
+
 def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="Your_db_password",
-        database="event_management"
+    """Opens a brand-new (unpooled) connection. Prefer `with connection() as conn:`."""
+    return get_backend().connect()
+
+
+class _PooledEntry:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Bounded pool of database connections, opened by calling `connect`.
+
+    Connections are handed out LIFO so the warmest ones are reused first.
+    On checkout a connection is evicted if it has been idle longer than
+    idle_timeout or is older than max_lifetime, and pinged if it has been idle
+    longer than ping_after. On release any open transaction is rolled back so
+    the next borrower always starts clean.
+    """
+
+    def __init__(self, connect, size=5, checkout_timeout=10.0,
+                 idle_timeout=300.0, max_lifetime=3600.0, ping_after=30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.connect = connect
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+
+        self._cond = threading.Condition()
+        self._idle = []        # _PooledEntry objects ready for checkout
+        self._checked_out = {} # id(conn) -> _PooledEntry
+        self._total = 0        # open + currently-connecting connections
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "timeouts": 0,
+            "connects": 0,
+            "connect_time": 0.0,
+            "connect_failures": 0,
+            "evicted_idle": 0,
+            "evicted_lifetime": 0,
+            "evicted_unhealthy": 0,
+        }
+
+    # --- internals ---
+    def _expiry_reason(self, entry, now):
+        if self.max_lifetime and now - entry.created_at > self.max_lifetime:
+            return "evicted_lifetime"
+        if self.idle_timeout and now - entry.last_used > self.idle_timeout:
+            return "evicted_idle"
+        return None
+
+    def _close_quietly(self, conn):
+        _drop_prepared(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _connect(self):
+        start = time.perf_counter()
+        try:
+            conn = self.connect()
+        except Exception:
+            with self._cond:
+                self._stats["connect_failures"] += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self._stats["connects"] += 1
+            self._stats["connect_time"] += elapsed
+        return _PooledEntry(conn)
+
+    def _is_healthy(self, entry, now):
+        if now - entry.last_used <= self.ping_after:
+            return True
+        try:
+            entry.conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, entry, reason):
+        self._close_quietly(entry.conn)
+        with self._cond:
+            self._total -= 1
+            self._stats[reason] += 1
+            self._cond.notify()
+
+    # --- public API ---
+    def acquire(self):
+        """Checks out a connection, opening one if the pool is below its size."""
+        start = time.monotonic()
+        waited = False
+        while True:
+            entry = None
+            expired = []
+            with self._cond:
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+                while True:
+                    now = time.monotonic()
+                    while self._idle:
+                        candidate = self._idle.pop()
+                        reason = self._expiry_reason(candidate, now)
+                        if reason is None:
+                            entry = candidate
+                            break
+                        expired.append((candidate, reason))
+                    if entry is not None or self._total - len(expired) < self.size:
+                        break
+                    remaining = self.checkout_timeout - (now - start)
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolError(
+                            f"No database connection available after {self.checkout_timeout}s "
+                            f"(pool size {self.size})"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                if entry is None:
+                    self._total += 1  # reserve a slot for the new connection
+
+            for old, reason in expired:
+                self._discard(old, reason)
+
+            if entry is None:
+                try:
+                    entry = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(entry, time.monotonic()):
+                self._discard(entry, "evicted_unhealthy")
+                continue
+            break
+
+        with self._cond:
+            self._checked_out[id(entry.conn)] = entry
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time"] += time.monotonic() - start
+        return entry.conn
+
+    def release(self, conn):
+        """Returns a connection to the pool, rolling back anything left uncommitted."""
+        with self._cond:
+            entry = self._checked_out.pop(id(conn), None)
+        if entry is None:
+            self._close_quietly(conn)
+            return
+
+        try:
+            conn.rollback()
+        except Exception:
+            self._discard(entry, "evicted_unhealthy")
+            return
+
+        now = time.monotonic()
+        if self._closed:
+            self._close_quietly(conn)
+            with self._cond:
+                self._total -= 1
+            return
+        if self.max_lifetime and now - entry.created_at > self.max_lifetime:
+            self._discard(entry, "evicted_lifetime")
+            return
+
+        entry.last_used = now
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def prune(self):
+        """Closes idle connections that have passed idle_timeout or max_lifetime."""
+        now = time.monotonic()
+        with self._cond:
+            keep, expired = [], []
+            for entry in self._idle:
+                reason = self._expiry_reason(entry, now)
+                (keep if reason is None else expired).append((entry, reason))
+            self._idle = [entry for entry, _ in keep]
+        for entry, reason in expired:
+            self._discard(entry, reason)
+        return len(expired)
+
+    def close(self):
+        """Closes all idle connections; checked-out ones are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_quietly(entry.conn)
+
+    def stats(self):
+        """Snapshot of pool counters, useful for sizing the pool under load."""
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot["size"] = self.size
+            snapshot["open"] = self._total
+            snapshot["idle"] = len(self._idle)
+            snapshot["in_use"] = len(self._checked_out)
+        snapshot["avg_connect_ms"] = (
+            snapshot["connect_time"] / snapshot["connects"] * 1000 if snapshot["connects"] else 0.0
+        )
+        snapshot["avg_wait_ms"] = (
+            snapshot["wait_time"] / snapshot["waits"] * 1000 if snapshot["waits"] else 0.0
+        )
+        return snapshot
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the shared pool, creating it from load_db_config() on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _, pool_settings = load_db_config()
+                _pool = ConnectionPool(get_backend().connect, **pool_settings)
+    return _pool
+
+
+def close_pool():
+    """Closes the shared pool; the next connection() call builds a fresh one."""
+    global _pool, _backend
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+        _backend = None
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+@contextmanager
+def connection():
+    """Borrows a pooled connection for the duration of a `with` block."""
+    pool = get_pool()
+    started = time.perf_counter()
+    conn = pool.acquire()
+    if INSTRUMENT:
+        _record(_current_function(), acquires=1, acquire_seconds=time.perf_counter() - started)
+    try:
+        yield _InstrumentedConnection(conn) if INSTRUMENT else conn
+    finally:
+        pool.release(conn)
+
+# ----------------- Query Instrumentation -----------------
+# The public functions of this module are wrapped with @instrumented (see
+# the end of the file) and connection() hands out connections whose cursors
+# time every statement. Per function we count calls, exceptions, wall time
+# (nested calls included), time spent waiting for a pooled connection,
+# statements, their execution time and the rows they returned or changed.
+# Statements slower than SLOW_QUERY_MS go to the "ems.slow_query" logger and
+# a short in-memory list, with parameters replaced by their type so no
+# emails, names or password hashes end up in logs. Export with
+# metrics_prometheus() or metrics_json(); EMS_INSTRUMENT=0 turns it all off.
+INSTRUMENT = _coerce(os.environ.get("EMS_INSTRUMENT", "1"), True)
+SLOW_QUERY_MS = float(os.environ.get("EMS_SLOW_QUERY_MS", 200))
+SLOW_QUERY_LOG_SIZE = 100
+
+slow_query_log = logging.getLogger("ems.slow_query")
+
+_STAT_KEYS = ("calls", "errors", "seconds", "max_seconds", "acquires", "acquire_seconds",
+              "queries", "query_errors", "query_seconds", "rows", "slow_queries")
+_metrics_lock = threading.Lock()
+_function_stats = {}  # function name -> counters
+_slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_call_context = threading.local()  # .stack: instrumented calls running on this thread
+_DIRECT = "(direct)"  # statements run outside any instrumented function
+
+
+def _current_function():
+    stack = getattr(_call_context, "stack", None)
+    return stack[-1] if stack else _DIRECT
+
+
+def _record(name, **amounts):
+    with _metrics_lock:
+        stats = _function_stats.get(name)
+        if stats is None:
+            stats = _function_stats[name] = dict.fromkeys(_STAT_KEYS, 0)
+        for key, amount in amounts.items():
+            stats[key] += amount
+
+
+def _redact(params):
+    """Parameters reduced to their types, e.g. ['<int>', '<str>']."""
+    if params is None:
+        return []
+    if isinstance(params, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in params.items()}
+    return [f"<{type(value).__name__}>" for value in params]
+
+
+def instrumented(func):
+    """Counts calls, exceptions and wall time of a function; its statements are attributed to it."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_call_context, "stack", None)
+        if stack is None:
+            stack = _call_context.stack = []
+        stack.append(name)
+        started = time.perf_counter()
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - started
+            _record(name, calls=1, errors=int(failed), seconds=elapsed)
+            with _metrics_lock:
+                stats = _function_stats[name]
+                stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+class _InstrumentedCursor:
+    """Cursor proxy that times execute/executemany and counts rows."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=None, *args, **kwargs):
+        return self._timed(self._cursor.execute, sql, params, False, *args, **kwargs)
+
+    def executemany(self, sql, seq_params, *args, **kwargs):
+        return self._timed(self._cursor.executemany, sql, seq_params, True, *args, **kwargs)
+
+    def _timed(self, run, sql, params, many, *args, **kwargs):
+        name = _current_function()
+        started = time.perf_counter()
+        try:
+            return run(sql, params, *args, **kwargs)
+        except Exception:
+            _record(name, query_errors=1)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            rows = max(self._cursor.rowcount or 0, 0)  # buffered cursors know it right away
+            slow = elapsed * 1000 >= SLOW_QUERY_MS
+            _record(name, queries=1, query_seconds=elapsed, rows=rows, slow_queries=int(slow))
+            if slow:
+                entry = {
+                    "at": time.time(),
+                    "function": name,
+                    "ms": round(elapsed * 1000, 1),
+                    "rows": rows,
+                    "sql": " ".join(sql.split())[:1000],
+                    "params": f"<{len(params)} rows>" if many else _redact(params),
+                }
+                with _metrics_lock:
+                    _slow_queries.append(entry)
+                slow_query_log.warning("%.1f ms in %s (%d rows): %s %s", entry["ms"], name, rows,
+                                       entry["sql"], entry["params"])
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _InstrumentedConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return _InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def query_stats():
+    """Per-function counters keyed by function name, with derived averages in ms."""
+    with _metrics_lock:
+        snapshot = {name: dict(stats) for name, stats in _function_stats.items()}
+    for stats in snapshot.values():
+        stats["avg_ms"] = stats["seconds"] / stats["calls"] * 1000 if stats["calls"] else 0.0
+        stats["avg_query_ms"] = stats["query_seconds"] / stats["queries"] * 1000 if stats["queries"] else 0.0
+    return snapshot
+
+
+def slow_queries():
+    """The last SLOW_QUERY_LOG_SIZE slow statements, newest first."""
+    with _metrics_lock:
+        return list(reversed(_slow_queries))
+
+
+def reset_query_stats():
+    with _metrics_lock:
+        _function_stats.clear()
+        _slow_queries.clear()
+
+
+def metrics_json():
+    """Function counters, slow statements, pool and cache counters as a JSON document."""
+    return json.dumps({
+        "functions": query_stats(),
+        "slow_queries": slow_queries(),
+        "pool": _pool.stats() if _pool is not None else None,
+        "caches": cache_stats(),
+    }, default=str, indent=2)
+
+
+# (counter key, metric name, help text)
+_PROMETHEUS_FUNCTION_METRICS = (
+    ("calls", "ems_function_calls_total", "Calls of each func.py function"),
+    ("errors", "ems_function_errors_total", "Calls that raised an exception"),
+    ("seconds", "ems_function_seconds_total", "Wall time in each function, nested calls included"),
+    ("acquires", "ems_connection_acquires_total", "Connections borrowed from the pool"),
+    ("acquire_seconds", "ems_connection_acquire_seconds_total", "Time spent waiting for a pooled connection"),
+    ("queries", "ems_queries_total", "Statements executed"),
+    ("query_errors", "ems_query_errors_total", "Statements that failed"),
+    ("query_seconds", "ems_query_seconds_total", "Time spent executing statements"),
+    ("rows", "ems_query_rows_total", "Rows returned or changed by statements"),
+    ("slow_queries", "ems_slow_queries_total", "Statements slower than EMS_SLOW_QUERY_MS"),
+)
+
+
+def metrics_prometheus():
+    """The same counters in the Prometheus text exposition format."""
+    stats = query_stats()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+    for key, name, help_text in _PROMETHEUS_FUNCTION_METRICS:
+        metric(name, "counter", help_text,
+               [(f'{{function="{function}"}}', stats[function][key]) for function in sorted(stats)])
+    if _pool is not None:
+        pool = _pool.stats()
+        for key in ("size", "open", "idle", "in_use"):
+            metric(f"ems_pool_{key}", "gauge", f"Connection pool {key.replace('_', ' ')}", [("", pool[key])])
+        for key in ("checkouts", "waits", "timeouts", "connects", "connect_failures"):
+            metric(f"ems_pool_{key}_total", "counter", f"Connection pool {key.replace('_', ' ')}",
+                   [("", pool[key])])
+    caches = cache_stats()
+    for key in ("hits", "misses", "evictions"):
+        metric(f"ems_cache_{key}_total", "counter", f"Cache {key}",
+               [(f'{{cache="{cache}"}}', caches[cache][key]) for cache in sorted(caches)])
+    metric("ems_cache_entries", "gauge", "Entries held per cache",
+           [(f'{{cache="{cache}"}}', caches[cache]["size"]) for cache in sorted(caches)])
+    return "\n".join(lines) + "\n"
+
+# ----------------- Prepared Statements -----------------
+# The hottest single-row lookups run as server-side prepared statements.
+# Pooled connections live for minutes, so each one keeps its prepared
+# cursors, keyed by SQL text, for as long as it is open: a repeat call sends
+# only the parameters and gets its rows back in the binary protocol instead
+# of shipping and re-parsing the statement text. Each connection keeps at
+# most PREPARED_CACHE_SIZE statements (the server caps the total at
+# max_prepared_stmt_count); the least recently used one is closed beyond
+# that. sqlite3 already caches compiled statements per connection, so on
+# the embedded backend this only reuses the cursor. EMS_PREPARED_STATEMENTS=0
+# turns it off.
+PREPARED_STATEMENTS = _coerce(os.environ.get("EMS_PREPARED_STATEMENTS", "1"), True)
+PREPARED_CACHE_SIZE = int(os.environ.get("EMS_PREPARED_CACHE_SIZE", 32))
+
+_prepared_lock = threading.Lock()
+_prepared_cursors = weakref.WeakKeyDictionary()  # connection -> OrderedDict(sql -> cursor)
+_prepared_stats = {"executions": 0, "prepares": 0, "evictions": 0, "failures": 0}
+
+
+def _prepared_cursor(conn, sql):
+    """The connection's prepared cursor for `sql`, created on first use."""
+    with _prepared_lock:
+        cursors = _prepared_cursors.get(conn)
+        if cursors is None:
+            cursors = _prepared_cursors[conn] = OrderedDict()
+        cursor = cursors.get(sql)
+        if cursor is not None:
+            cursors.move_to_end(sql)
+            _prepared_stats["executions"] += 1
+            return cursor
+        evicted = []
+        while len(cursors) >= PREPARED_CACHE_SIZE:
+            evicted.append(cursors.popitem(last=False)[1])
+        _prepared_stats["prepares"] += 1
+        _prepared_stats["executions"] += 1
+        _prepared_stats["evictions"] += len(evicted)
+    for old in evicted:
+        _close_cursor_quietly(old)
+    # A connection opened with buffered=True would otherwise ask for a
+    # buffered prepared cursor, which the connector doesn't offer
+    cursor = conn.cursor(prepared=True, buffered=False)
+    with _prepared_lock:
+        cursors[sql] = cursor
+    return cursor
+
+
+def _drop_prepared(conn):
+    """Forgets a connection's prepared cursors; they close with the connection."""
+    with _prepared_lock:
+        _prepared_cursors.pop(conn, None)
+
+
+def _forget_prepared(conn, sql):
+    with _prepared_lock:
+        cursors = _prepared_cursors.get(conn)
+        cursor = cursors.pop(sql, None) if cursors is not None else None
+        _prepared_stats["failures"] += 1
+    if cursor is not None:
+        _close_cursor_quietly(cursor)
+
+
+def _close_cursor_quietly(cursor):
+    try:
+        cursor.close()
+    except Exception:
+        pass
+
+
+def _prepared_query(conn, sql, params=(), dictionary=False):
+    """
+    Runs a read through `conn`'s prepared statement for `sql` and returns
+    all its rows, as tuples or (dictionary=True) dicts. The rows are always
+    read in full: an unread result would break the connection's next statement.
+    """
+    if not PREPARED_STATEMENTS:
+        cursor = conn.cursor(dictionary=dictionary)
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    instrumented_conn = isinstance(conn, _InstrumentedConnection)
+    raw = conn._conn if instrumented_conn else conn
+    cursor = _prepared_cursor(raw, sql)
+    timed = _InstrumentedCursor(cursor) if instrumented_conn else cursor
+    try:
+        timed.execute(sql, params)
+        counted = max(cursor.rowcount or 0, 0)
+        rows = cursor.fetchall()
+    except Exception:
+        # The statement may be gone with the session; prepare afresh next time
+        _forget_prepared(raw, sql)
+        raise
+    if instrumented_conn and len(rows) > counted:
+        # An unbuffered cursor only knows its row count once the rows are read
+        _record(_current_function(), rows=len(rows) - counted)
+    if dictionary:
+        names = cursor.column_names
+        rows = [dict(zip(names, row)) for row in rows]
+    return rows
+
+
+def prepared_statement_stats():
+    """Counters of the prepared statement cache, plus how many are open now."""
+    with _prepared_lock:
+        snapshot = dict(_prepared_stats)
+        snapshot["connections"] = len(_prepared_cursors)
+        snapshot["open"] = sum(len(cursors) for cursors in _prepared_cursors.values())
+    snapshot["reuse_rate"] = (
+        1 - snapshot["prepares"] / snapshot["executions"] if snapshot["executions"] else 0.0
     )
+    return snapshot
+
+
+# ----------------- Caching -----------------
+# Small in-process read-through caches for data that is read far more often
+# than it changes (ticket types, sponsors, event details, locations, the
+# organizer's event list, analytics). Entries expire after a TTL and the
+# least recently used ones are evicted beyond maxsize. The write functions
+# below call the matching invalidate_* hook after they commit, so a user
+# always sees their own change; the TTL bounds staleness from other clients.
+REFERENCE_CACHE_TTL = float(os.environ.get("EMS_CACHE_TTL", 300))
+REFERENCE_CACHE_SIZE = int(os.environ.get("EMS_CACHE_SIZE", 256))
+# Ticket lists hide sold-out types, so they go stale faster than the rest
+TICKET_CACHE_TTL = min(REFERENCE_CACHE_TTL, 30)
+
+_caches = {}
+
+
+class TTLCache:
+    """Thread-safe TTL + LRU mapping with hit/miss counters. ttl <= 0 disables it."""
+
+    def __init__(self, name, ttl, maxsize=REFERENCE_CACHE_SIZE):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so a load that started before it
+        # can't store a value read before the write
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+        _caches[name] = self
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        """Returns (True, value) on a hit, (False, None) otherwise."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._data.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return True, entry[1]
+                del self._data[key]
+                self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return False, None
+
+    def put(self, key, value, generation=None):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key=None):
+        """Drops one key, or everything if key is None."""
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = len(self._data)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
+
+
+def _cached(cache, key, load, copy=list):
+    """Read-through helper: returns a copy of the cached value or loads and stores it."""
+    hit, value = cache.get(key)
+    if not hit:
+        generation = cache.generation
+        value = load()
+        cache.put(key, value, generation)
+    return copy(value) if value is not None else None
+
+
+def cache_stats():
+    """Hit/miss counters of every cache, keyed by cache name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def clear_caches():
+    for cache in _caches.values():
+        cache.invalidate()
+
+
+_ticket_cache = TTLCache("tickets", TICKET_CACHE_TTL)
+_sponsor_cache = TTLCache("sponsors", REFERENCE_CACHE_TTL)
+_event_details_cache = TTLCache("event_details", REFERENCE_CACHE_TTL)
+_organizer_events_cache = TTLCache("organizer_events", REFERENCE_CACHE_TTL)
+_location_cache = TTLCache("locations", REFERENCE_CACHE_TTL)
+
+_ALL_SPONSORS = "all"  # _sponsor_cache key of the sponsor catalogue; organizer ids key assignments
+
+
+def invalidate_tickets(event_id=None):
+    _ticket_cache.invalidate(event_id)
+
+
+def invalidate_sponsors(organizer_id=None):
+    """Drops one organizer's sponsor assignments, or the whole sponsor cache if None."""
+    _sponsor_cache.invalidate(organizer_id)
+
+
+def invalidate_event(event_id=None, organizer_id=None):
+    """
+    Drops the cached details of an event (all events if both are None) and
+    the cached event lists and sponsorship coverage (only organizer_id's if
+    given).
+    """
+    if event_id is not None or organizer_id is None:
+        _event_details_cache.invalidate(event_id)
+    _organizer_events_cache.invalidate(organizer_id)
+    invalidate_sponsorship_coverage(organizer_id)
+    invalidate_search()
 
 # ----------------- User Login -----------------
 def login_user(email, password_hash):
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM Users WHERE email=%s AND password=%s", (email, password_hash))
-    user = cursor.fetchone()
-    conn.close()
-    return user
+    with connection() as conn:
+        rows = _prepared_query(conn, "SELECT * FROM Users WHERE email=%s AND password=%s",
+                               (email, password_hash), dictionary=True)
+    return rows[0] if rows else None
 
 # ----------------- Events -----------------
 def get_events():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT event_id, event_name, event_date FROM Events")
-    rows = cursor.fetchall()
-    conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT event_id, event_name, event_date FROM Events")
+        rows = cursor.fetchall()
     return rows
 
+EVENTS_PAGE_SIZE = 50
+
+def get_events_page(after=None, limit=EVENTS_PAGE_SIZE, date_from=None, date_to=None,
+                    city=None, available_only=False):
+    """
+    One page of the event catalogue ordered by (event_date, event_id).
+
+    `after` is the (event_date, event_id) cursor returned by the previous page;
+    it seeks past the last row seen instead of using OFFSET, so every page
+    costs the same no matter how deep the user scrolls. Filters: inclusive
+    date range, exact city (via Locations) and "has a ticket type with seats
+    left". Returns (rows, next_cursor); next_cursor is None on the last page.
+    Rows are (event_id, event_name, event_date, city).
+    """
+    where, params = _event_filters(date_from, date_to, city, available_only)
+    if after is not None:
+        last_date, last_id = after
+        # Expanded form of (event_date, event_id) > (%s, %s) so MySQL can
+        # range-scan the (event_date, event_id) index
+        where.insert(0, "(e.event_date > %s OR (e.event_date = %s AND e.event_id > %s))")
+        params[:0] = [last_date, last_date, last_id]
+
+    sql = """
+        SELECT e.event_id, e.event_name, e.event_date, l.city
+        FROM Events e
+        JOIN Locations l ON l.location_id = e.location_id
+    """
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    # Fetch one extra row to know whether another page exists
+    sql += " ORDER BY e.event_date, e.event_id LIMIT %s"
+    params.append(limit + 1)
+
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, tuple(params))
+        rows = cursor.fetchall()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last[2], last[0])
+    return rows, None
+
+def _event_filters(date_from=None, date_to=None, city=None, available_only=False):
+    """WHERE clauses (on Events e / Locations l) and params for the browse filters."""
+    where, params = [], []
+    if date_from:
+        where.append("e.event_date >= %s")
+        params.append(date_from)
+    if date_to:
+        where.append("e.event_date <= %s")
+        params.append(date_to)
+    if city:
+        where.append("l.city = %s")
+        params.append(city)
+    if available_only:
+        where.append("EXISTS (SELECT 1 FROM Ticket_Inventory t WHERE t.event_id = e.event_id AND t.quantity_available > 0)")
+    return where, params
+
+def get_event_cities():
+    """Distinct cities that have at least one event, for the browse filter."""
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT l.city
+            FROM Locations l
+            JOIN Events e ON e.location_id = l.location_id
+            ORDER BY l.city
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
 def register_for_event(user_id, event_id, ticket_type):
-    conn = get_connection()
-    cursor = conn.cursor()
+    """Registers a user through the reservation engine (see Ticket Reservations)."""
+    return reserve_and_register(user_id, event_id, ticket_type)
+
+# ----------------- Event Search -----------------
+# search_events ranks events by how well their name and description match
+# the words typed; every word must match and counts as a prefix, so "jaz
+# fest" finds "Jazz Festival" while the user is still typing. It runs on the
+# FULLTEXT indexes from migrations/0005. A database without them (a local or
+# test copy) falls back to an inverted index built in Python from the Events
+# table and cached like the other reference data.
+SEARCH_RESULTS_LIMIT = 50
+SEARCH_CACHE_TTL = min(REFERENCE_CACHE_TTL, 30)
+_FULLTEXT_MISSING_ERRNOS = (1191, 1214)  # no matching FULLTEXT index / engine without FULLTEXT
+_WORD_RE = re.compile(r"\w+")
+
+_search_cache = TTLCache("search", SEARCH_CACHE_TTL)
+_search_index_cache = TTLCache("search_index", REFERENCE_CACHE_TTL, maxsize=1)
+_fulltext_retry_at = 0.0  # until then search straight from the Python index
+
+
+def invalidate_search():
+    _search_cache.invalidate()
+    _search_index_cache.invalidate()
+
+
+def _search_words(text):
+    """Lower-cased words of text, the tokenizer of both search paths."""
+    return _WORD_RE.findall(text.lower()) if text else []
+
+
+class InvertedIndex:
+    """
+    Word -> {event_id: weight} postings over event names and descriptions,
+    with a sorted vocabulary for prefix lookups. A word in the name weighs
+    NAME_WEIGHT times one in the description, and rarer words weigh more.
+    """
+    NAME_WEIGHT = 3
+
+    def __init__(self, events):
+        """events: (event_id, event_name, description, event_date, city) rows."""
+        self.events = {}  # event_id -> (event_id, event_name, event_date, city)
+        counts = {}
+        for event_id, name, description, event_date, city in events:
+            self.events[event_id] = (event_id, name, event_date, city)
+            for words, weight in ((_search_words(name), self.NAME_WEIGHT), (_search_words(description), 1)):
+                for word in words:
+                    postings = counts.setdefault(word, {})
+                    postings[event_id] = postings.get(event_id, 0) + weight
+        total = len(self.events)
+        self.postings = {
+            word: {event_id: tf * math.log(1 + total / len(postings)) for event_id, tf in postings.items()}
+            for word, postings in counts.items()
+        }
+        self.vocabulary = sorted(self.postings)
+
+    def _prefix_scores(self, prefix):
+        """Best score per event over every indexed word starting with prefix."""
+        scores = {}
+        i = bisect.bisect_left(self.vocabulary, prefix)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(prefix):
+            for event_id, weight in self.postings[self.vocabulary[i]].items():
+                if weight > scores.get(event_id, 0):
+                    scores[event_id] = weight
+            i += 1
+        return scores
+
+    def search(self, words):
+        """Event ids matching every word as a prefix, best match first."""
+        totals = None
+        for word in dict.fromkeys(words):
+            scores = self._prefix_scores(word)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {event_id: totals[event_id] + score
+                          for event_id, score in scores.items() if event_id in totals}
+            if not totals:
+                return []
+        return sorted(totals, key=lambda event_id: (-totals[event_id], str(self.events[event_id][2]), event_id))
+
+
+def _build_search_index():
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT e.event_id, e.event_name, e.description, e.event_date, l.city
+            FROM Events e
+            JOIN Locations l ON l.location_id = e.location_id
+        """)
+        return InvertedIndex(cursor.fetchall())
+
+
+def _fulltext_search(words, limit, filters):
+    against = " ".join(f"+{word}*" for word in words)
+    where, params = _event_filters(*filters)
+    sql = f"""
+        SELECT e.event_id, e.event_name, e.event_date, l.city,
+               MATCH(e.event_name) AGAINST (%s IN BOOLEAN MODE) * 2
+                 + MATCH(e.event_name, e.description) AGAINST (%s IN BOOLEAN MODE) AS score
+        FROM Events e
+        JOIN Locations l ON l.location_id = e.location_id
+        WHERE MATCH(e.event_name, e.description) AGAINST (%s IN BOOLEAN MODE)
+        {"".join(" AND " + clause for clause in where)}
+        ORDER BY score DESC, e.event_date, e.event_id
+        LIMIT %s
+    """
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, (against, against, against, *params, limit))
+        return [row[:4] for row in cursor.fetchall()]
+
+
+def _index_search(words, limit, date_from, date_to, city, available_only):
+    index = _cached(_search_index_cache, "events", _build_search_index, copy=lambda index: index)
+    ranked = index.search(words)
+    available = None
+    if available_only and ranked:
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT event_id FROM Ticket_Inventory WHERE quantity_available > 0")
+            available = {row[0] for row in cursor.fetchall()}
+    date_from = str(date_from) if date_from else None
+    date_to = str(date_to) if date_to else None
+
+    rows = []
+    for event_id in ranked:
+        row = index.events[event_id]
+        if ((date_from and str(row[2]) < date_from) or (date_to and str(row[2]) > date_to)
+                or (city and row[3] != city) or (available is not None and event_id not in available)):
+            continue
+        rows.append(row)
+        if len(rows) == limit:
+            break
+    return rows
+
+
+def search_events(text, limit=SEARCH_RESULTS_LIMIT, date_from=None, date_to=None, city=None,
+                  available_only=False):
+    """
+    Events whose name or description contains every word of `text` (each as
+    a prefix), best match first, with the same filters as get_events_page.
+    Rows are (event_id, event_name, event_date, city); [] if text has no words.
+    """
+    words = _search_words(text)
+    if not words:
+        return []
+    filters = (date_from, date_to, city, available_only)
+
+    def load():
+        global _fulltext_retry_at
+        if time.monotonic() >= _fulltext_retry_at:
+            try:
+                return _fulltext_search(words, limit, filters)
+            except DatabaseError as err:
+                if err.errno not in _FULLTEXT_MISSING_ERRNOS:
+                    raise
+                # Don't pay for the failing query on every keystroke; look
+                # again later in case the migration has been applied since
+                _fulltext_retry_at = time.monotonic() + REFERENCE_CACHE_TTL
+        return _index_search(words, limit, *filters)
+    return _cached(_search_cache, (tuple(words), limit) + filters, load)
+
+# ----------------- Ticket Reservations -----------------
+# A ticket's seats can be sharded across INVENTORY_SLOTS rows of Ticket_Slots
+# so concurrent buyers decrement different rows. A seat is always taken with
+# one conditional UPDATE (... WHERE quantity_available > 0) on a randomly
+# chosen slot, falling back to the unsharded remainder in Tickets. Nothing
+# is read and then written, so there is nothing to oversell or deadlock on.
+# Holds park a seat for a user until it expires or is confirmed.
+#
+# The session variables @ems_inventory_move / @ems_inventory_reserved tell the
+# triggers (migrations/0003) that the engine has already moved or taken the
+# seat; they are always cleared before the connection goes back to the pool.
+INVENTORY_SLOTS = 8
+INVENTORY_SHARD_MIN = 50  # add_ticket_type shards ticket types at least this large
+HOLD_SECONDS = 600
+REMAINDER_SLOT = -1       # Ticket_Holds.slot_no for a seat taken from Tickets
+_RETRYABLE_ERRNOS = (1205, 1213)  # lock wait timeout, deadlock
+_RESERVE_ATTEMPTS = 3
+
+def _clear_inventory_flags(cursor):
+    cursor.execute("SET @ems_inventory_move = NULL, @ems_inventory_reserved = NULL")
+
+def _take_seat(cursor, ticket_id):
+    """
+    Takes one seat of ticket_id inside the caller's transaction without
+    touching Event_Stats. Returns the slot it came from, REMAINDER_SLOT, or
+    None if the ticket is sold out.
+    """
+    cursor.execute("SET @ems_inventory_move = 1")
+    # Plain (non-locking) read just to skip empty slots; the UPDATE decides
+    cursor.execute(
+        "SELECT slot_no FROM Ticket_Slots WHERE ticket_id = %s AND quantity_available > 0",
+        (ticket_id,)
+    )
+    slots = [row[0] for row in cursor.fetchall()]
+    random.shuffle(slots)
+    for slot_no in slots:
+        cursor.execute("""
+            UPDATE Ticket_Slots SET quantity_available = quantity_available - 1
+            WHERE ticket_id = %s AND slot_no = %s AND quantity_available > 0
+        """, (ticket_id, slot_no))
+        if cursor.rowcount == 1:
+            return slot_no
+
+    cursor.execute("""
+        UPDATE Tickets SET quantity_available = quantity_available - 1
+        WHERE ticket_id = %s AND quantity_available > 0
+    """, (ticket_id,))
+    if cursor.rowcount == 1:
+        return REMAINDER_SLOT
+    return None
+
+def _return_seat(cursor, ticket_id, slot_no):
+    """Puts a held seat back where it came from (caller's transaction)."""
+    cursor.execute("SET @ems_inventory_move = 1")
+    if slot_no == REMAINDER_SLOT:
+        cursor.execute(
+            "UPDATE Tickets SET quantity_available = quantity_available + 1 WHERE ticket_id = %s",
+            (ticket_id,)
+        )
+    else:
+        cursor.execute("""
+            UPDATE Ticket_Slots SET quantity_available = quantity_available + 1
+            WHERE ticket_id = %s AND slot_no = %s
+        """, (ticket_id, slot_no))
+
+def _insert_reserved_registration(cursor, user_id, event_id, ticket_id):
+    """Inserts a registration for a seat the engine already owns."""
+    cursor.execute("SET @ems_inventory_move = NULL, @ems_inventory_reserved = 1")
+    cursor.execute("""
+        INSERT INTO Registrations (user_id, event_id, ticket_id, registration_date, status)
+        VALUES (%s, %s, %s, CURDATE(), 'registered')
+    """, (user_id, event_id, ticket_id))
+    return cursor.lastrowid
+
+def _ticket_id_for(cursor, event_id, ticket_type):
+    cursor.execute(
+        "SELECT ticket_id FROM Tickets WHERE event_id = %s AND ticket_type = %s",
+        (event_id, ticket_type)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def _with_retries(work):
+    """Runs work(conn, cursor) in a transaction, retrying deadlocks/lock timeouts."""
+    for attempt in range(_RESERVE_ATTEMPTS):
+        with connection() as conn:
+            cursor = conn.cursor()
+            try:
+                result = work(conn, cursor)
+                return result
+            except DatabaseError as err:
+                conn.rollback()
+                if err.errno in _RETRYABLE_ERRNOS and attempt + 1 < _RESERVE_ATTEMPTS:
+                    time.sleep(0.01 * (attempt + 1) * random.random())
+                    continue
+                raise
+            finally:
+                try:
+                    _clear_inventory_flags(cursor)
+                finally:
+                    cursor.close()
+
+def _registration_error(err):
+    if err.errno == 1062:  # uq_registrations_user_event
+        return "Registration failed: User already registered for this event"
+    return f"Registration failed: {err}"
+
+def reserve_and_register(user_id, event_id, ticket_type):
+    """Takes a seat and writes the registration in one short transaction."""
+    def work(conn, cursor):
+        ticket_id = _ticket_id_for(cursor, event_id, ticket_type)
+        if ticket_id is None:
+            return False, "Registration failed: Ticket not found"
+        if _take_seat(cursor, ticket_id) is None:
+            conn.rollback()
+            invalidate_tickets(event_id)  # stop offering it
+            return False, "Registration failed: Ticket sold out"
+        _insert_reserved_registration(cursor, user_id, event_id, ticket_id)
+        _leave_waitlist(cursor, user_id, event_id)
+        conn.commit()
+        return True, "Registered successfully!"
+
+    try:
+        return _with_retries(work)
+    except DatabaseError as err:
+        return False, _registration_error(err)
+
+def hold_ticket(user_id, event_id, ticket_type, hold_seconds=HOLD_SECONDS):
+    """
+    Sets a seat aside for the user for hold_seconds.
+    Returns (True, hold_id) or (False, message).
+    """
+    def work(conn, cursor):
+        ticket_id = _ticket_id_for(cursor, event_id, ticket_type)
+        if ticket_id is None:
+            return False, "Ticket not found"
+        slot_no = _take_seat(cursor, ticket_id)
+        if slot_no is None:
+            conn.rollback()
+            return False, ticket_id
+        cursor.execute("""
+            INSERT INTO Ticket_Holds (ticket_id, slot_no, user_id, event_id, expires_at)
+            VALUES (%s, %s, %s, %s, NOW() + INTERVAL %s SECOND)
+        """, (ticket_id, slot_no, user_id, event_id, int(hold_seconds)))
+        hold_id = cursor.lastrowid
+        conn.commit()
+        return True, hold_id
+
     try:
-        cursor.callproc('register_user_for_event', (user_id, event_id, ticket_type))
+        ok, result = _with_retries(work)
+        # Seats parked in expired holds may be all that is left
+        if not ok and result != "Ticket not found":
+            if expire_holds(ticket_id=result):
+                ok, result = _with_retries(work)
+            if not ok and result != "Ticket not found":
+                invalidate_tickets(event_id)
+                result = "Ticket sold out"
+        return ok, result
+    except DatabaseError as err:
+        if err.errno == 1062:  # uq_holds_user_event
+            return False, "You already have a hold for this event"
+        return False, f"Could not hold ticket: {err}"
+
+def confirm_hold(hold_id, user_id):
+    """Turns an unexpired hold into a registration. Returns (ok, message)."""
+    def work(conn, cursor):
+        cursor.execute("""
+            SELECT ticket_id, event_id FROM Ticket_Holds
+            WHERE hold_id = %s AND user_id = %s AND expires_at >= NOW()
+            FOR UPDATE
+        """, (hold_id, user_id))
+        row = cursor.fetchone()
+        if not row:
+            conn.rollback()
+            return False, "Hold not found or expired"
+        ticket_id, event_id = row
+        cursor.execute("DELETE FROM Ticket_Holds WHERE hold_id = %s", (hold_id,))
+        _insert_reserved_registration(cursor, user_id, event_id, ticket_id)
+        _leave_waitlist(cursor, user_id, event_id)
         conn.commit()
         return True, "Registered successfully!"
-    except mysql.connector.Error as err:
-        return False, f"Registration failed: {err}"
-    finally:
-        conn.close()
 
-# ----------------- Payments -----------------
-def make_payment(user_id, registration_id, amount):
-    conn = get_connection()
-    cursor = conn.cursor()
     try:
+        return _with_retries(work)
+    except DatabaseError as err:
+        return False, _registration_error(err)
+
+def release_hold(hold_id, user_id=None):
+    """Gives a held seat back before it expires."""
+    def work(conn, cursor):
+        sql = "SELECT ticket_id, slot_no FROM Ticket_Holds WHERE hold_id = %s"
+        params = (hold_id,)
+        if user_id is not None:
+            sql += " AND user_id = %s"
+            params += (user_id,)
+        cursor.execute(sql + " FOR UPDATE", params)
+        row = cursor.fetchone()
+        if not row:
+            conn.rollback()
+            return False, "Hold not found"
+        cursor.execute("DELETE FROM Ticket_Holds WHERE hold_id = %s", (hold_id,))
+        _return_seat(cursor, row[0], row[1])
+        _promote_waiters(cursor, row[0])
+        conn.commit()
+        invalidate_tickets()  # the type may be back on sale
+        return True, "Hold released"
+
+    try:
+        return _with_retries(work)
+    except DatabaseError as err:
+        return False, f"Could not release hold: {err}"
+
+def expire_holds(ticket_id=None, limit=500):
+    """Returns the seats of expired holds to inventory. Returns how many were freed."""
+    def work(conn, cursor):
+        sql = "SELECT hold_id, ticket_id, slot_no FROM Ticket_Holds WHERE expires_at < NOW()"
+        params = ()
+        if ticket_id is not None:
+            sql += " AND ticket_id = %s"
+            params = (ticket_id,)
+        cursor.execute(sql + " LIMIT %s", params + (limit,))
+        freed = 0
+        for hold_id, hold_ticket_id, slot_no in cursor.fetchall():
+            # Conditional delete: a concurrent confirm/release may have won
+            cursor.execute(
+                "DELETE FROM Ticket_Holds WHERE hold_id = %s AND expires_at < NOW()", (hold_id,)
+            )
+            if cursor.rowcount == 1:
+                _return_seat(cursor, hold_ticket_id, slot_no)
+                _promote_waiters(cursor, hold_ticket_id)
+                freed += 1
+        conn.commit()
+        if freed:
+            invalidate_tickets()
+        return freed
+
+    return _with_retries(work)
+
+def shard_ticket_inventory(ticket_id, slots=INVENTORY_SLOTS):
+    """
+    Spreads all unsold, unheld seats of a ticket evenly over `slots` rows of
+    Ticket_Slots (re-sharding moves seats out of dropped slots too).
+    """
+    def work(conn, cursor):
+        cursor.execute("SET @ems_inventory_move = 1")
+        cursor.execute("SELECT quantity_available FROM Tickets WHERE ticket_id = %s FOR UPDATE", (ticket_id,))
+        row = cursor.fetchone()
+        if not row:
+            conn.rollback()
+            return False, "Ticket not found"
+        cursor.execute(
+            "SELECT IFNULL(SUM(quantity_available), 0) FROM Ticket_Slots WHERE ticket_id = %s FOR UPDATE",
+            (ticket_id,)
+        )
+        total = int(row[0]) + int(cursor.fetchone()[0])
+        base, extra = divmod(total, slots)
+        cursor.execute("DELETE FROM Ticket_Slots WHERE ticket_id = %s AND slot_no >= %s", (ticket_id, slots))
+        cursor.executemany("""
+            INSERT INTO Ticket_Slots (ticket_id, slot_no, quantity_available) VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE quantity_available = VALUES(quantity_available)
+        """, [(ticket_id, n, base + (n < extra)) for n in range(slots)])
+        cursor.execute("UPDATE Tickets SET quantity_available = 0 WHERE ticket_id = %s", (ticket_id,))
+        conn.commit()
+        return True, f"{total} seats spread over {slots} slots"
+
+    try:
+        return _with_retries(work)
+    except DatabaseError as err:
+        return False, f"Could not shard ticket inventory: {err}"
+
+# ----------------- Waitlist -----------------
+# A user can queue for a sold-out ticket type. Each ticket's queue is served
+# in waitlist_id order (idx_waitlist_ticket_queue, migrations/0008). Every
+# write that gives a seat back (deleting or cancelling a registration,
+# switching ticket type, releasing or expiring a hold) calls
+# _promote_waiters before it commits, so the seat goes to the head of the
+# queue in the same transaction and is never on sale while someone waits.
+WAITLIST_JOINED = "Added to the waitlist"
+
+def _promote_waiters(cursor, ticket_id, seats=1):
+    """
+    Registers up to `seats` waiters of ticket_id, oldest first, inside the
+    caller's transaction. Returns the (user_id, event_id) pairs promoted.
+    """
+    promoted = []
+    while len(promoted) < seats:
         cursor.execute("""
-            INSERT INTO Payments (registration_id, amount, payment_date, payment_method, status)
-            VALUES (%s, %s, NOW(), 'upi', 'completed')
-        """, (registration_id, amount))
+            SELECT waitlist_id, user_id, event_id FROM Waitlist
+            WHERE ticket_id = %s ORDER BY waitlist_id LIMIT 1 FOR UPDATE
+        """, (ticket_id,))
+        row = cursor.fetchone()
+        if row is None:
+            break
+        waitlist_id, user_id, event_id = row
+        # Locking read: sees a registration committed after this transaction began
+        cursor.execute(
+            "SELECT 1 FROM Registrations WHERE user_id = %s AND event_id = %s FOR UPDATE",
+            (user_id, event_id)
+        )
+        if cursor.fetchone() is None:
+            if _take_seat(cursor, ticket_id) is None:
+                break
+            _insert_reserved_registration(cursor, user_id, event_id, ticket_id)
+            promoted.append((user_id, event_id))
+        cursor.execute("DELETE FROM Waitlist WHERE waitlist_id = %s", (waitlist_id,))
+    return promoted
+
+def _leave_waitlist(cursor, user_id, event_id):
+    cursor.execute("DELETE FROM Waitlist WHERE user_id = %s AND event_id = %s", (user_id, event_id))
+
+def join_waitlist(user_id, event_id, ticket_type):
+    """
+    Queues the user for a sold-out ticket type, or registers them straight
+    away if a seat is free by now. Returns (ok, message, position); position
+    is the user's place in the queue, None when they were registered.
+    """
+    def work(conn, cursor):
+        ticket_id = _ticket_id_for(cursor, event_id, ticket_type)
+        if ticket_id is None:
+            return False, "Ticket not found", None
+        cursor.execute("SELECT 1 FROM Registrations WHERE user_id = %s AND event_id = %s", (user_id, event_id))
+        if cursor.fetchone():
+            conn.rollback()
+            return False, "You are already registered for this event", None
+        if _take_seat(cursor, ticket_id) is not None:
+            _insert_reserved_registration(cursor, user_id, event_id, ticket_id)
+            _leave_waitlist(cursor, user_id, event_id)
+            conn.commit()
+            return True, "Registered successfully!", None
+        cursor.execute("INSERT INTO Waitlist (ticket_id, event_id, user_id) VALUES (%s, %s, %s)",
+                       (ticket_id, event_id, user_id))
+        cursor.execute("SELECT COUNT(*) FROM Waitlist WHERE ticket_id = %s AND waitlist_id <= %s",
+                       (ticket_id, cursor.lastrowid))
+        position = cursor.fetchone()[0]
         conn.commit()
-        return True, "Payment successful!"
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
+        return True, WAITLIST_JOINED, position
+
+    try:
+        return _with_retries(work)
+    except DatabaseError as err:
+        if err.errno == 1062:  # uq_waitlist_user_event / uq_registrations_user_event
+            return False, "You are already waiting for or registered for this event", None
+        return False, f"Could not join waitlist: {err}", None
+
+def leave_waitlist(user_id, event_id):
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            _leave_waitlist(cursor, user_id, event_id)
+            conn.commit()
+            if cursor.rowcount == 0:
+                return False, "You are not on the waitlist for this event"
+            return True, "Removed from the waitlist"
+        except DatabaseError as err:
+            return False, f"Could not leave waitlist: {err}"
+        finally:
+            cursor.close()
+
+def get_user_waitlist(user_id):
+    """The user's places in line: (event_id, event_name, ticket_type, position, joined_at)."""
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT W.event_id, E.event_name, T.ticket_type,
+                   (SELECT COUNT(*) FROM Waitlist A
+                    WHERE A.ticket_id = W.ticket_id AND A.waitlist_id <= W.waitlist_id) AS position,
+                   W.joined_at
+            FROM Waitlist W
+            JOIN Events E ON E.event_id = W.event_id
+            JOIN Tickets T ON T.ticket_id = W.ticket_id
+            WHERE W.user_id = %s
+            ORDER BY W.waitlist_id
+        """, (user_id,))
+        return cursor.fetchall()
+
+def get_sold_out_ticket_types(event_id):
+    """Ticket types of the event with no seat left, (ticket_type, price): the ones to queue for."""
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT ticket_type, price FROM Ticket_Inventory WHERE event_id = %s AND quantity_available <= 0",
+            (event_id,)
+        )
+        return cursor.fetchall()
+
+# ----------------- Check-in -----------------
+# Every registration has a door code "EMS-<registration_id>-<mac>", the mac
+# being an HMAC of the registration and event ids under CHECKIN_SECRET, so a
+# scanner can tell a genuine code for its event without the database.
+# checkin.py keeps the event's check-in list on local disk, accepts scans
+# against it and hands them to sync_checkins, which stamps
+# Registrations.checked_in_at (migrations/0009) in batches.
+# There is no built-in fallback: a key in the source would let anyone forge
+# codes, and a random one per install would not match between the machine
+# that issues a code and the one at the door. Until EMS_CHECKIN_SECRET is
+# set, codes are neither issued nor accepted.
+CHECKIN_SECRET = os.environ.get("EMS_CHECKIN_SECRET", "")
+CHECKIN_DISABLED = ("Door check-in is disabled: set EMS_CHECKIN_SECRET to the same value "
+                    "wherever codes are issued or scanned")
+CHECKIN_SYNC_BATCH = 500
+CHECKIN_STATUSES = ("registered", "attended")  # who may enter: anything not cancelled
+_CHECKIN_CODE_RE = re.compile(r"EMS-(\d+)-([0-9a-f]{12})", re.I)
+
+def checkin_enabled():
+    return bool(CHECKIN_SECRET)
+
+def _checkin_mac(registration_id, event_id):
+    if not CHECKIN_SECRET:
+        raise RuntimeError(CHECKIN_DISABLED)
+    message = f"{registration_id}:{event_id}".encode()
+    return hmac.new(CHECKIN_SECRET.encode(), message, hashlib.sha256).hexdigest()[:12]
+
+def registration_code(registration_id, event_id):
+    """The door code of a registration. Raises RuntimeError while check-in is disabled."""
+    return f"EMS-{registration_id}-{_checkin_mac(registration_id, event_id)}"
+
+def parse_registration_code(code, event_id):
+    """
+    The registration id of a door code for event_id, or None if it is
+    malformed, forged or for another event. Raises RuntimeError while
+    check-in is disabled.
+    """
+    match = _CHECKIN_CODE_RE.fullmatch(code.strip())
+    if not match:
+        return None
+    registration_id = int(match.group(1))
+    if not hmac.compare_digest(match.group(2).lower(), _checkin_mac(registration_id, event_id)):
+        return None
+    return registration_id
+
+def get_registration_code(registration_id, user_id):
+    """The door code of one of the user's registrations: (ok, message, code)."""
+    if not checkin_enabled():
+        return False, CHECKIN_DISABLED, None
+    with connection() as conn:
+        rows = _prepared_query(conn, "SELECT event_id, status FROM Registrations WHERE registration_id=%s AND user_id=%s",
+                               (registration_id, user_id))
+    if not rows:
+        return False, "Registration not found or doesn't belong to you", None
+    if rows[0][1] not in CHECKIN_STATUSES:
+        return False, "Cancelled registrations have no door code", None
+    return True, "Door code issued", registration_code(registration_id, rows[0][0])
+
+def get_checkin_list(event_id, organizer_id):
+    """
+    What a scanner needs to work offline: (valid, checked_in), the ascending
+    ids of the event's registrations that may enter and of those already
+    checked in. None if the organizer doesn't own the event.
+    """
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM Events WHERE event_id=%s AND organizer_id=%s", (event_id, organizer_id))
+        if not cursor.fetchone():
+            return None
+        cursor.execute(f"""
+            SELECT registration_id, checked_in_at IS NOT NULL
+            FROM Registrations
+            WHERE event_id = %s AND status IN ({_in_clause(CHECKIN_STATUSES)})
+            ORDER BY registration_id
+        """, (event_id,) + CHECKIN_STATUSES)
+        rows = cursor.fetchall()
+    return [row[0] for row in rows], [row[0] for row in rows if row[1]]
+
+def sync_checkins(event_id, organizer_id, checkins, batch_size=CHECKIN_SYNC_BATCH):
+    """
+    Records scans made at the door. `checkins` is an iterable of
+    (registration_id, scanned_at). Each batch is one UPDATE and one commit.
+    A registration keeps its first check-in time, so sending the same scans
+    again (say after a sync that failed half way) changes nothing. Returns
+    (ok, message, stamped), stamped being the registrations newly checked in.
+    """
+    if not check_event_ownership(event_id, organizer_id):
+        return False, "Permission Denied: You can only check in attendees of events you organize.", 0
+    stamped = 0
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            for chunk in _chunks(checkins, batch_size):
+                ids = [registration_id for registration_id, _ in chunk]
+                cursor.execute(f"""
+                    UPDATE Registrations
+                    SET checked_in_at = CASE registration_id {" ".join(["WHEN %s THEN %s"] * len(chunk))} END
+                    WHERE event_id = %s AND status IN ({_in_clause(CHECKIN_STATUSES)})
+                      AND checked_in_at IS NULL AND registration_id IN ({_in_clause(ids)})
+                """, tuple(value for pair in chunk for value in pair) + (event_id,) + CHECKIN_STATUSES + tuple(ids))
+                stamped += cursor.rowcount
+                conn.commit()
+            return True, f"{stamped} check-ins recorded", stamped
+        except DatabaseError as err:
+            conn.rollback()
+            return False, f"Check-in sync failed: {err}", stamped
+        finally:
+            cursor.close()
+
+# ----------------- Bulk Registration Import -----------------
+# Imports many registrations for one event (e.g. a corporate attendee list)
+# without going through register_for_event once per person. Rows are
+# validated a chunk at a time, then one transaction locks each ticket type
+# once, takes all the seats it needs and writes the registrations with
+# multi-row INSERTs. Every input row gets an entry in the returned report.
+IMPORT_CHUNK_SIZE = 500
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _in_clause(values):
+    return ", ".join(["%s"] * len(values))
+
+def _take_seats(cursor, ticket_id, wanted):
+    """
+    Takes up to `wanted` seats of a ticket in one locked step (caller's
+    transaction). Returns how many were taken.
+    """
+    cursor.execute("SET @ems_inventory_move = 1")
+    cursor.execute("SELECT quantity_available FROM Tickets WHERE ticket_id = %s FOR UPDATE", (ticket_id,))
+    remainder = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT slot_no, quantity_available FROM Ticket_Slots
+        WHERE ticket_id = %s ORDER BY slot_no FOR UPDATE
+    """, (ticket_id,))
+    slots = cursor.fetchall()
+
+    taken = min(wanted, remainder)
+    if taken:
+        cursor.execute(
+            "UPDATE Tickets SET quantity_available = quantity_available - %s WHERE ticket_id = %s",
+            (taken, ticket_id)
+        )
+    slot_updates = []
+    for slot_no, available in slots:
+        if taken == wanted:
+            break
+        n = min(wanted - taken, available)
+        if n:
+            slot_updates.append((available - n, ticket_id, slot_no))
+            taken += n
+    if slot_updates:
+        cursor.executemany(
+            "UPDATE Ticket_Slots SET quantity_available = %s WHERE ticket_id = %s AND slot_no = %s",
+            slot_updates
+        )
+    return taken
+
+def bulk_register(event_id, rows, chunk_size=IMPORT_CHUNK_SIZE, all_or_nothing=False):
+    """
+    Registers many users for one event in a single transaction.
+
+    `rows` is any iterable of dicts with "email" and "ticket_type" keys (a
+    csv.DictReader works as-is); it is consumed once, chunk by chunk.
+    Returns (ok, message, report): report has one dict per input row with
+    line, email, ticket_type, status ('registered' or 'rejected') and message.
+    With all_or_nothing=True nothing is written if any row is rejected.
+    """
+    report = []
+    accepted = []  # (user_id, ticket_id, report entry)
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT organizer_id FROM Events WHERE event_id = %s", (event_id,))
+        event = cursor.fetchone()
+        if not event:
+            cursor.close()
+            return False, "Event not found", report
+        organizer_id = event[0]
+        cursor.execute("SELECT ticket_type, ticket_id FROM Tickets WHERE event_id = %s", (event_id,))
+        ticket_ids = dict(cursor.fetchall())
+
+        seen = set()
+        line = 1  # header
+        for chunk in _chunks(rows, chunk_size):
+            valid = []
+            for row in chunk:
+                line += 1
+                email = (row.get("email") or "").strip().lower()
+                ticket_type = (row.get("ticket_type") or "").strip().lower()
+                entry = {"line": line, "email": email, "ticket_type": ticket_type,
+                         "status": "rejected", "message": ""}
+                report.append(entry)
+                if not email:
+                    entry["message"] = "Missing email"
+                elif ticket_type not in ticket_ids:
+                    entry["message"] = f"No '{ticket_type}' tickets for this event"
+                elif email in seen:
+                    entry["message"] = "Duplicate row in file"
+                else:
+                    seen.add(email)
+                    valid.append(entry)
+            if not valid:
+                continue
+            emails = [entry["email"] for entry in valid]
+            cursor.execute(
+                f"SELECT LOWER(email), user_id FROM Users WHERE email IN ({_in_clause(emails)})", emails
+            )
+            user_ids = dict(cursor.fetchall())
+            for entry in valid:
+                if entry["email"] in user_ids:
+                    accepted.append((user_ids[entry["email"]], ticket_ids[entry["ticket_type"]], entry))
+                else:
+                    entry["message"] = "Unknown user"
         cursor.close()
-        conn.close()
 
-# ----------------- Feedback -----------------
-def give_feedback(user_id, event_id, rating, comments):
-    conn = get_connection()
-    cursor = conn.cursor()
+    def work(conn, cursor):
+        for _, _, entry in accepted:  # fresh verdicts if this is a retry
+            entry["message"] = ""
+        # Checked inside the transaction; FOR UPDATE keeps it true until commit
+        pending = []
+        for chunk in _chunks(accepted, chunk_size):
+            user_ids = [user_id for user_id, _, _ in chunk]
+            cursor.execute(f"""
+                SELECT user_id FROM Registrations
+                WHERE event_id = %s AND user_id IN ({_in_clause(user_ids)})
+                FOR UPDATE
+            """, [event_id] + user_ids)
+            registered = {row[0] for row in cursor.fetchall()}
+            for item in chunk:
+                if item[0] in registered:
+                    item[2]["message"] = "Already registered for this event"
+                else:
+                    pending.append(item)
+
+        by_ticket = {}
+        for item in pending:
+            by_ticket.setdefault(item[1], []).append(item)
+        to_insert = []
+        for ticket_id in sorted(by_ticket):  # fixed lock order
+            wanted = by_ticket[ticket_id]
+            taken = _take_seats(cursor, ticket_id, len(wanted))
+            to_insert.extend(wanted[:taken])  # earliest rows in the file win
+            for _, _, entry in wanted[taken:]:
+                entry["message"] = "Ticket sold out"
+
+        if not to_insert or (all_or_nothing and len(to_insert) < len(report)):
+            conn.rollback()
+            return 0
+
+        cursor.execute("SET @ems_inventory_move = NULL, @ems_inventory_reserved = 1")
+        for chunk in _chunks(to_insert, chunk_size):
+            cursor.execute(
+                "INSERT INTO Registrations (user_id, event_id, ticket_id, registration_date, status) VALUES "
+                + ", ".join(["(%s, %s, %s, CURDATE(), 'registered')"] * len(chunk)),
+                [value for user_id, ticket_id, _ in chunk for value in (user_id, event_id, ticket_id)]
+            )
+            # Registered now, so out of the event's waitlist, as _leave_waitlist does for one user
+            user_ids = [user_id for user_id, _, _ in chunk]
+            cursor.execute(f"DELETE FROM Waitlist WHERE event_id = %s AND user_id IN ({_in_clause(user_ids)})",
+                           [event_id] + user_ids)
+        conn.commit()
+        for _, _, entry in to_insert:
+            entry.update(status="registered", message="Registered")
+        return len(to_insert)
+
     try:
+        imported = _with_retries(work) if accepted else 0
+    except DatabaseError as err:
+        for _, _, entry in accepted:
+            entry.update(status="rejected", message=f"Not imported: {err}")
+        return False, f"Import failed: {err}", report
+
+    if imported:
+        invalidate_organizer_analytics(organizer_id)
+        invalidate_tickets(event_id)
+    if all_or_nothing and imported < len(report):
+        for entry in report:
+            if not entry["message"]:
+                entry["message"] = "Not imported: other rows were rejected"
+        return False, f"Nothing imported: {len(report) - imported} of {len(report)} rows rejected", report
+    return True, f"Imported {imported} of {len(report)} registrations", report
+
+# ----------------- Payments -----------------
+# make_payment is the only way a payment is recorded. The amount is the
+# ticket price on record, never one the client sends; the payment row and
+# the registration's move to 'attended' (the update_status_after_payment
+# trigger) commit together; and a client that retries an attempt with the
+# same idempotency key gets the payment already made instead of a second
+# charge. Keys are unique across all payments (uq_payments_idempotency_key).
+IDEMPOTENCY_KEY_MAX_LENGTH = 64
+PAYMENT_REPLAYED = "Payment already processed"
+PAYMENT_NOT_FOUND = "Payment failed: registration not found"
+
+
+def _payment_for_key(cursor, idempotency_key):
+    cursor.execute("""
+        SELECT p.registration_id, r.user_id, p.amount
+        FROM Payments p JOIN Registrations r ON r.registration_id = p.registration_id
+        WHERE p.idempotency_key = %s
+    """, (idempotency_key,))
+    return cursor.fetchone()
+
+
+def _replayed_payment(row, user_id, registration_id):
+    if row[0] != registration_id or row[1] != user_id:
+        return False, "Payment failed: idempotency key was already used for another payment", None
+    return True, PAYMENT_REPLAYED, row[2]
+
+
+def make_payment(user_id, registration_id, payment_method, idempotency_key=None):
+    """
+    Pays for one of the user's registrations in a single transaction.
+    Returns (ok, message, amount charged); retrying with the same
+    idempotency_key returns the original payment's amount again.
+    """
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+        return False, f"Payment failed: idempotency key must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} characters", None
+
+    def work(conn, cursor):
+        # Locking the registration serialises attempts to pay for it, so the
+        # checks below still hold when the payment is inserted
         cursor.execute("""
-            INSERT INTO Feedback (user_id, event_id, rating, comments, feedback_date)
-            VALUES (%s, %s, %s, %s, NOW())
-        """, (user_id, event_id, rating, comments))
+            SELECT r.status, t.price
+            FROM Registrations r JOIN Tickets t ON t.ticket_id = r.ticket_id
+            WHERE r.registration_id = %s AND r.user_id = %s
+            FOR UPDATE
+        """, (registration_id, user_id))
+        row = cursor.fetchone()
+        if idempotency_key is not None:
+            previous = _payment_for_key(cursor, idempotency_key)
+            if previous is not None:
+                conn.rollback()
+                return _replayed_payment(previous, user_id, registration_id)
+        if row is None:
+            conn.rollback()
+            return False, PAYMENT_NOT_FOUND, None
+        status, price = row
+        if status == "cancelled":
+            conn.rollback()
+            return False, "Payment failed: registration is cancelled", None
+        cursor.execute(
+            "SELECT 1 FROM Payments WHERE registration_id = %s AND status = 'completed' LIMIT 1",
+            (registration_id,)
+        )
+        if cursor.fetchone():
+            conn.rollback()
+            return False, "Payment failed: registration is already paid", None
+        cursor.execute("""
+            INSERT INTO Payments (registration_id, amount, payment_date, payment_method, status, idempotency_key)
+            VALUES (%s, %s, NOW(), %s, 'completed', %s)
+        """, (registration_id, price, payment_method, idempotency_key))
         conn.commit()
-        return True, "Feedback submitted!"
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+        return True, "Payment successful", price
+
+    try:
+        result = _with_retries(work)
+    except DatabaseError as err:
+        if err.errno == 1062 and idempotency_key is not None:
+            # The same key committed for another registration in the meantime
+            with connection() as conn:
+                cursor = conn.cursor()
+                previous = _payment_for_key(cursor, idempotency_key)
+                cursor.close()
+            if previous is not None:
+                return _replayed_payment(previous, user_id, registration_id)
+        return False, f"Payment failed: {err}", None
+    if result[0]:
+        invalidate_organizer_analytics()
+    return result
+
+# ----------------- Feedback -----------------
+def give_feedback(user_id, event_id, rating, comments):
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO Feedback (user_id, event_id, rating, comments, feedback_date)
+                VALUES (%s, %s, %s, %s, NOW())
+            """, (user_id, event_id, rating, comments))
+            conn.commit()
+            invalidate_organizer_analytics()
+            return True, "Feedback submitted!"
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 def get_tickets_for_event(event_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT ticket_type, price FROM Tickets WHERE event_id=%s AND quantity_available>0", (event_id,))
-    tickets = cursor.fetchall()
-    conn.close()
-    return tickets
+    def load():
+        with connection() as conn:
+            return _prepared_query(
+                conn, "SELECT ticket_type, price FROM Ticket_Inventory WHERE event_id=%s AND quantity_available>0",
+                (event_id,)
+            )
+    return _cached(_ticket_cache, event_id, load)
 
 def get_user_registrations(user_id):
-    """Get all registrations for a user (for My Registrations view)"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT r.registration_id, e.event_name, t.ticket_type, t.ticket_id, r.status
-        FROM Registrations r
-        JOIN Events e ON r.event_id = e.event_id
-        JOIN Tickets t ON r.ticket_id = t.ticket_id
-        WHERE r.user_id = %s
-    """, (user_id,))
-    regs = cursor.fetchall()
-    conn.close()
+    """Get all registrations for a user (for My Registrations view), including ticket price"""
+    with connection() as conn:
+        regs = _prepared_query(conn, """
+            SELECT r.registration_id, e.event_name, t.ticket_type, t.ticket_id, r.status, t.price
+            FROM Registrations r
+            JOIN Events e ON r.event_id = e.event_id
+            JOIN Tickets t ON r.ticket_id = t.ticket_id
+            WHERE r.user_id = %s
+        """, (user_id,))
     return regs
 
 def get_unpaid_registrations(user_id):
-    """Get only unpaid registrations for payment screen"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT r.registration_id, e.event_name, t.ticket_type, t.ticket_id, r.status
-        FROM Registrations r
-        JOIN Events e ON r.event_id = e.event_id
-        JOIN Tickets t ON r.ticket_id = t.ticket_id
-        WHERE r.user_id = %s AND r.status IN ('registered', 'pending')
-    """, (user_id,))
-    regs = cursor.fetchall()
-    conn.close()
+    """Get only unpaid registrations for payment screen, including ticket price"""
+    with connection() as conn:
+        regs = _prepared_query(conn, """
+            SELECT r.registration_id, e.event_name, t.ticket_type, t.ticket_id, r.status, t.price
+            FROM Registrations r
+            JOIN Events e ON r.event_id = e.event_id
+            JOIN Tickets t ON r.ticket_id = t.ticket_id
+            WHERE r.user_id = %s AND r.status IN ('registered', 'pending')
+        """, (user_id,))
     return regs
 
+def get_ticket_options_for_registration(registration_id):
+    """
+    Ticket types still on sale for the event of a registration, as
+    (ticket_id, ticket_type, price) rows. Returns None if the registration doesn't exist.
+    """
+    with connection() as conn:
+        rows = _prepared_query(conn, """
+            SELECT t.ticket_id, t.ticket_type, t.price
+            FROM Registrations r
+            LEFT JOIN Ticket_Inventory t ON t.event_id = r.event_id AND t.quantity_available > 0
+            WHERE r.registration_id = %s
+        """, (registration_id,))
+    if not rows:
+        return None
+    return [row for row in rows if row[0] is not None]
+
 def get_ticket_price(ticket_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT price FROM Tickets WHERE ticket_id=%s", (ticket_id,))
-    price = cursor.fetchone()[0]
-    conn.close()
-    return price
+    with connection() as conn:
+        rows = _prepared_query(conn, "SELECT price FROM Tickets WHERE ticket_id=%s", (ticket_id,))
+    return rows[0][0]
+
+def get_ticket_prices(ticket_ids):
+    """Resolves many ticket prices in one statement. Returns {ticket_id: price}."""
+    ticket_ids = list(dict.fromkeys(ticket_ids))  # de-duplicate, keep order
+    if not ticket_ids:
+        return {}
+    placeholders = ','.join(['%s'] * len(ticket_ids))
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT ticket_id, price FROM Tickets WHERE ticket_id IN ({placeholders})",
+            tuple(ticket_ids)
+        )
+        prices = dict(cursor.fetchall())
+    return prices
 
 def update_registration_status(registration_id, status):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE Registrations SET status=%s WHERE registration_id=%s", (status, registration_id))
-    conn.commit()
-    conn.close()
+    """Sets a registration's status; cancelling one hands its seat to the waitlist."""
+    def work(conn, cursor):
+        cursor.execute(
+            "SELECT status, ticket_id FROM Registrations WHERE registration_id = %s FOR UPDATE",
+            (registration_id,)
+        )
+        row = cursor.fetchone()
+        cursor.execute("UPDATE Registrations SET status=%s WHERE registration_id=%s", (status, registration_id))
+        # trg_registration_cancel has put the seat back
+        if row and status == "cancelled" and row[0] != "cancelled":
+            _promote_waiters(cursor, row[1])
+        conn.commit()
+
+    _with_retries(work)
 
 def delete_registration(registration_id, user_id):
-    """Delete a registration (only if status is 'registered')"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
+    """Delete a registration (only if status is 'registered'); its seat goes to the waitlist"""
+    def work(conn, cursor):
         # Check if registration belongs to user and is in 'registered' status
         cursor.execute("""
-            SELECT status FROM Registrations 
+            SELECT status, event_id, ticket_id FROM Registrations
             WHERE registration_id=%s AND user_id=%s
+            FOR UPDATE
         """, (registration_id, user_id))
         result = cursor.fetchone()
-        
+
         if not result:
+            conn.rollback()
             return False, "Registration not found or doesn't belong to you"
-        
+
         if result[0] != 'registered':
+            conn.rollback()
             return False, "Cannot delete registration - payment already made or status changed"
-        
-        # Delete the registration
+
+        # Delete the registration; trg_registration_delete puts the seat back
         cursor.execute("DELETE FROM Registrations WHERE registration_id=%s", (registration_id,))
+        _promote_waiters(cursor, result[2])
         conn.commit()
+        invalidate_tickets(result[1])  # the seat may be back on sale
         return True, "Registration deleted successfully"
-    except mysql.connector.Error as err:
+
+    try:
+        return _with_retries(work)
+    except DatabaseError as err:
         return False, f"Error deleting registration: {err}"
-    finally:
-        cursor.close()
-        conn.close()
 
 def update_registration_ticket(registration_id, user_id, new_ticket_id):
-    """Update ticket type for a registration (only if status is 'registered')"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
+    """Update ticket type for a registration (only if status is 'registered'); the old seat goes to the waitlist"""
+    def work(conn, cursor):
         # Check if registration belongs to user and is in 'registered' status
         cursor.execute("""
-            SELECT r.status, r.event_id, t.ticket_type 
+            SELECT r.status, r.event_id, t.ticket_type, r.ticket_id
             FROM Registrations r
             JOIN Tickets t ON r.ticket_id = t.ticket_id
             WHERE r.registration_id=%s AND r.user_id=%s
+            FOR UPDATE
         """, (registration_id, user_id))
         result = cursor.fetchone()
-        
+
         if not result:
+            conn.rollback()
             return False, "Registration not found or doesn't belong to you"
-        
+
         if result[0] != 'registered':
+            conn.rollback()
             return False, "Cannot modify ticket - payment already made or status changed"
-        
+
         # Verify new ticket belongs to same event and is available
         cursor.execute("""
-            SELECT ticket_type, quantity_available 
-            FROM Tickets 
+            SELECT ticket_type, quantity_available
+            FROM Ticket_Inventory
             WHERE ticket_id=%s AND event_id=%s
         """, (new_ticket_id, result[1]))
         ticket_info = cursor.fetchone()
-        
+
         if not ticket_info:
+            conn.rollback()
             return False, "Invalid ticket or ticket doesn't belong to this event"
-        
+
         if ticket_info[1] <= 0:
+            conn.rollback()
             return False, f"Ticket type '{ticket_info[0]}' is sold out"
-        
+
         # Update the registration
         cursor.execute("""
-            UPDATE Registrations 
-            SET ticket_id=%s 
+            UPDATE Registrations
+            SET ticket_id=%s
             WHERE registration_id=%s
         """, (new_ticket_id, registration_id))
+        # trg_ticket_change gave the old seat back
+        if new_ticket_id != result[3]:
+            _promote_waiters(cursor, result[3])
         conn.commit()
+        invalidate_tickets(result[1])
         return True, f"Ticket updated to '{ticket_info[0]}' successfully"
-    except mysql.connector.Error as err:
+
+    try:
+        return _with_retries(work)
+    except DatabaseError as err:
         return False, f"Error updating ticket: {err}"
-    finally:
-        cursor.close()
-        conn.close()
 
 def update_feedback(user_id, event_id, rating, comments):
     """Update existing feedback for an event"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Check if feedback exists
-        cursor.execute("""
-            SELECT feedback_id FROM Feedback 
-            WHERE user_id=%s AND event_id=%s
-        """, (user_id, event_id))
-        
-        result = cursor.fetchone()
-        if not result:
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Check if feedback exists
+            cursor.execute("""
+                SELECT feedback_id FROM Feedback
+                WHERE user_id=%s AND event_id=%s
+            """, (user_id, event_id))
+
+            result = cursor.fetchone()
+            if not result:
+                return False, "No existing feedback found for this event"
+
+            # Update feedback
+            cursor.execute("""
+                UPDATE Feedback
+                SET rating=%s, comments=%s, feedback_date=NOW()
+                WHERE user_id=%s AND event_id=%s
+            """, (rating, comments, user_id, event_id))
+            conn.commit()
+            invalidate_organizer_analytics()
+            return True, "Feedback updated successfully"
+        except DatabaseError as err:
+            return False, f"Error updating feedback: {err}"
+        finally:
             cursor.close()
-            conn.close()
-            return False, "No existing feedback found for this event"
-        
-        # Update feedback
-        cursor.execute("""
-            UPDATE Feedback 
-            SET rating=%s, comments=%s, feedback_date=NOW()
-            WHERE user_id=%s AND event_id=%s
-        """, (rating, comments, user_id, event_id))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return True, "Feedback updated successfully"
-    except mysql.connector.Error as err:
-        cursor.close()
-        conn.close()
-        return False, f"Error updating feedback: {err}"
 
 def delete_feedback(user_id, event_id):
     """Delete feedback for an event"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Check if feedback exists
-        cursor.execute("""
-            SELECT feedback_id FROM Feedback 
-            WHERE user_id=%s AND event_id=%s
-        """, (user_id, event_id))
-        
-        result = cursor.fetchone()
-        if not result:
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Check if feedback exists
+            cursor.execute("""
+                SELECT feedback_id FROM Feedback
+                WHERE user_id=%s AND event_id=%s
+            """, (user_id, event_id))
+
+            result = cursor.fetchone()
+            if not result:
+                return False, "No feedback found for this event"
+
+            # Delete feedback
+            cursor.execute("""
+                DELETE FROM Feedback
+                WHERE user_id=%s AND event_id=%s
+            """, (user_id, event_id))
+            conn.commit()
+            invalidate_organizer_analytics()
+            return True, "Feedback deleted successfully"
+        except DatabaseError as err:
+            return False, f"Error deleting feedback: {err}"
+        finally:
             cursor.close()
-            conn.close()
-            return False, "No feedback found for this event"
-        
-        # Delete feedback
-        cursor.execute("""
-            DELETE FROM Feedback 
-            WHERE user_id=%s AND event_id=%s
-        """, (user_id, event_id))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return True, "Feedback deleted successfully"
-    except mysql.connector.Error as err:
-        cursor.close()
-        conn.close()
-        return False, f"Error deleting feedback: {err}"
-    finally:
-        cursor.close()
-        conn.close()
 
 def get_user_feedback(user_id, event_id):
     """Get existing feedback for an event"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT rating, comments FROM Feedback 
-        WHERE user_id=%s AND event_id=%s
-    """, (user_id, event_id))
-    result = cursor.fetchone()
-    conn.close()
-    return result  # Returns (rating, comments) or None
+    with connection() as conn:
+        rows = _prepared_query(conn, """
+            SELECT rating, comments FROM Feedback
+            WHERE user_id=%s AND event_id=%s
+        """, (user_id, event_id))
+    return rows[0] if rows else None  # Returns (rating, comments) or None
 
 
 
-def make_payment(user_id, registration_id, amount, payment_method):
-    try:
-        conn = get_connection()
+def get_attended_events(user_id):
+    with connection() as conn:
         cursor = conn.cursor()
-        # Insert payment record
         cursor.execute("""
-            INSERT INTO Payments (registration_id, amount, payment_date, payment_method, status)
-            VALUES (%s, %s, NOW(), %s, 'completed')
-        """, (registration_id, amount, payment_method))
-        conn.commit()
-        return True, "Payment successful"
-    except mysql.connector.Error as err:
-        return False, f"Payment failed: {err}"
-    finally:
-        conn.close()
-
-
-def get_attended_events(user_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT e.event_id, e.event_name
-        FROM Registrations r
-        JOIN Events e ON r.event_id = e.event_id
-        WHERE r.user_id = %s AND r.status = 'attended'
-    """, (user_id,))
-    events = cursor.fetchall()
-    conn.close()
+            SELECT e.event_id, e.event_name
+            FROM Registrations r
+            JOIN Events e ON r.event_id = e.event_id
+            WHERE r.user_id = %s AND r.status = 'attended'
+        """, (user_id,))
+        events = cursor.fetchall()
     return events
 
 def register_user(fname,lname, email, password_hash, phone, role):
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("""
-            INSERT INTO Users (first_name,last_name, email, password, phone_no, role)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (fname,lname, email, password_hash, phone, role))
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Check if email already exists
+            cursor.execute("SELECT 1 FROM Users WHERE email=%s", (email,))
+            if cursor.fetchone():
+                return False, "Email already registered"
+
+            cursor.execute("""
+                INSERT INTO Users (first_name,last_name, email, password, phone_no, role)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, (fname,lname, email, password_hash, phone, role))
+            conn.commit()
+            return True, "User registered successfully!"
+        except DatabaseError as err:
+            return False, f"Registration failed: {err}"
+
+def find_location_id(location_name):
+    """Return the location_id for a name, or None if it doesn't exist yet."""
+    def load():
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT location_id FROM Locations WHERE location_name=%s", (location_name,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+    return _cached(_location_cache, location_name, load, copy=int)
+
+
+def create_location(location_name, address, city, state, zip_code):
+    """Insert a new location and return its id."""
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO Locations (location_name, address, city, state, zip_code) VALUES (%s,%s,%s,%s,%s)",
+            (location_name, address, city, state, zip_code)
+        )
         conn.commit()
-        return True, "User registered successfully!"
-    except mysql.connector.Error as err:
-        return False, f"Registration failed: {err}"
-    finally:
-        conn.close()
+        _location_cache.invalidate(location_name)
+        return cursor.lastrowid
 
-def get_location_id(location_name):
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    cursor.execute("SELECT location_id FROM Locations WHERE location_name=%s", (location_name,))
-    row = cursor.fetchone()
-
-    if row:  # location already exists
-        conn.close()
-        return row[0]
-
-    # Location doesn’t exist → ask for full details
+def ask_location_details():
+    """Prompt for the details of a new location. Must run on the Tk thread."""
     from tkinter import simpledialog
     address = simpledialog.askstring("Location", "Enter Address:")
     city = simpledialog.askstring("Location", "Enter City:")
     state = simpledialog.askstring("Location", "Enter State:")
     zip_code = simpledialog.askstring("Location", "Enter Zip Code:")
+    return address, city, state, zip_code
 
-    cursor.execute(
-        "INSERT INTO Locations (location_name, address, city, state, zip_code) VALUES (%s,%s,%s,%s,%s)",
-        (location_name, address, city, state, zip_code)
-    )
-    conn.commit()
-    new_id = cursor.lastrowid
-    conn.close()
-    return new_id
+
+def get_location_id(location_name):
+    location_id = find_location_id(location_name)
+    if location_id is not None:  # location already exists
+        return location_id
+
+    # Location doesn’t exist → ask for full details
+    # (asked before borrowing a connection so a slow user doesn't pin one)
+    return create_location(location_name, *ask_location_details())
 
 
 # ----------------- EVENT HELPERS -----------------
@@ -360,205 +2190,262 @@ def create_event(organizer_id, name, description, date, location_id):
     """
     Insert a new event into Events table.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT INTO Events (event_name, description, event_date, organizer_id, location_id) VALUES (%s, %s, %s, %s, %s)",
-            (name, description, date, organizer_id, location_id)
-        )
-        conn.commit()
-        event_id = cursor.lastrowid
-        # CORRECTION: Return success status, a message, and the event_id
-        return True, "Event created successfully!", event_id
-    except mysql.connector.Error as err:
-        # Return False on error with the error message
-        return False, str(err), None
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "INSERT INTO Events (event_name, description, event_date, organizer_id, location_id) VALUES (%s, %s, %s, %s, %s)",
+                (name, description, date, organizer_id, location_id)
+            )
+            conn.commit()
+            invalidate_organizer_analytics(organizer_id)
+            invalidate_event(organizer_id=organizer_id)
+            event_id = cursor.lastrowid
+            # CORRECTION: Return success status, a message, and the event_id
+            return True, "Event created successfully!", event_id
+        except DatabaseError as err:
+            # Return False on error with the error message
+            return False, str(err), None
+        finally:
+            cursor.close()
 
 # In func.py, add these functions:
 
 def get_organizer_events(organizer_id):
     """Retrieves all events owned by the specified organizer."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT event_id, event_name, event_date, description, location_id
-        FROM Events 
-        WHERE organizer_id = %s
-    """, (organizer_id,))
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+    def load():
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT event_id, event_name, event_date, description, location_id
+                FROM Events
+                WHERE organizer_id = %s
+            """, (organizer_id,))
+            return cursor.fetchall()
+    return _cached(_organizer_events_cache, organizer_id, load)
 
 # In func.py, add this new helper function:
 
 def add_ticket_type(event_id, ticket_type, price, quantity):
     """Inserts a new ticket type for an event."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Check if ticket type already exists for this event
-        cursor.execute(
-            "SELECT 1 FROM Tickets WHERE event_id=%s AND ticket_type=%s",
-            (event_id, ticket_type)
-        )
-        if cursor.fetchone():
-            return False, f"Ticket type '{ticket_type}' already exists for this event."
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Check if ticket type already exists for this event
+            cursor.execute(
+                "SELECT 1 FROM Tickets WHERE event_id=%s AND ticket_type=%s",
+                (event_id, ticket_type)
+            )
+            if cursor.fetchone():
+                return False, f"Ticket type '{ticket_type}' already exists for this event."
+
+            cursor.execute(
+                """INSERT INTO Tickets (event_id, ticket_type, price, quantity_available)
+                   VALUES (%s, %s, %s, %s)""",
+                (event_id, ticket_type, price, quantity)
+            )
+            ticket_id = cursor.lastrowid
+            conn.commit()
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
-        cursor.execute(
-            """INSERT INTO Tickets (event_id, ticket_type, price, quantity_available) 
-               VALUES (%s, %s, %s, %s)""",
-            (event_id, ticket_type, price, quantity)
-        )
-        conn.commit()
-        return True, f"Ticket type '{ticket_type}' added successfully!"
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    # Large ticket types get sharded so concurrent buyers don't queue on one row
+    if quantity >= INVENTORY_SHARD_MIN:
+        shard_ticket_inventory(ticket_id)
+    invalidate_tickets(event_id)
+    return True, f"Ticket type '{ticket_type}' added successfully!"
 
 def get_event_details(event_id):
     """Retrieves single event details for modification."""
-    conn = get_connection()
-    # Use dictionary=True for easier access by name in main.py
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("""
-        SELECT event_name, description, event_date 
-        FROM Events 
-        WHERE event_id = %s
-    """, (event_id,))
-    details = cursor.fetchone()
-    conn.close()
-    return details
+    def load():
+        with connection() as conn:
+            # Use dictionary=True for easier access by name in main.py
+            rows = _prepared_query(conn, """
+                SELECT event_name, description, event_date
+                FROM Events
+                WHERE event_id = %s
+            """, (event_id,), dictionary=True)
+            return rows[0] if rows else None
+    return _cached(_event_details_cache, event_id, load, copy=dict)
 
 def update_event(event_id, name, description, date):
     """Updates the core details of an event."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("""
-            UPDATE Events
-            SET event_name = %s, description = %s, event_date = %s
-            WHERE event_id = %s
-        """, (name, description, date, event_id))
-        conn.commit()
-        return True, "Event updated successfully!"
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE Events
+                SET event_name = %s, description = %s, event_date = %s
+                WHERE event_id = %s
+            """, (name, description, date, event_id))
+            conn.commit()
+            invalidate_organizer_analytics()
+            invalidate_event(event_id)
+            return True, "Event updated successfully!"
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 def add_event_schedule(event_id, start_time, end_time, activity_name, description):
     """
     Insert schedule entry for an event.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO Event_Schedule (event_id, start_time, end_time, activity_name, description) VALUES (%s, %s, %s, %s, %s)",
-        (event_id, start_time, end_time, activity_name, description)
-    )
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO Event_Schedule (event_id, start_time, end_time, activity_name, description) VALUES (%s, %s, %s, %s, %s)",
+            (event_id, start_time, end_time, activity_name, description)
+        )
+        conn.commit()
+        cursor.close()
 
-def view_feedback(event_id, organizer_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            U.user_id,                                    -- Attendee's ID
-            CONCAT(U.first_name, ' ', U.last_name) AS user_full_name, -- FIXED: Concatenate first and last name
-            F.event_id,                                   -- Event ID
-            E.event_name,                                 -- Event Name
-            F.rating,                                     -- Rating
-            F.comments,                                   -- Comments
-            F.feedback_date                               -- Date of Feedback
-        FROM Feedback F
-        JOIN Users U ON F.user_id = U.user_id
-        JOIN Events E ON F.event_id = E.event_id
-        WHERE E.organizer_id = %s
-          AND (F.event_id = %s OR %s IS NULL)
-        ORDER BY F.feedback_date DESC
-    """, (organizer_id, event_id, event_id))
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+# ----------------- Feedback Feed -----------------
+# The organizer's Feedback screen reads newest first, one page at a time.
+# Event-scoped and organizer-scoped reads are separate statements so each
+# gets its own plan: one event is a single range of
+# idx_feedback_event_date (migrations/0007), already in page order; the
+# organizer feed walks idx_events_organizer_date and probes the same index
+# per event, and only the rows past the cursor are sorted.
+FEEDBACK_PAGE_SIZE = 50
+
+_FEEDBACK_FEED_SQL = """
+    SELECT U.user_id, CONCAT(U.first_name, ' ', U.last_name) AS user_full_name,
+           F.event_id, E.event_name, F.rating, F.comments, F.feedback_date, F.feedback_id
+    FROM Feedback F
+    JOIN Events E ON E.event_id = F.event_id
+    JOIN Users U ON U.user_id = F.user_id
+"""
+
+
+def get_event_feedback_page(event_id, organizer_id, after=None, limit=FEEDBACK_PAGE_SIZE,
+                            min_rating=None, max_rating=None, date_from=None, date_to=None):
+    """
+    One page of the feedback on one of organizer_id's events, newest first.
+
+    `after` is the (feedback_date, feedback_id) cursor returned by the
+    previous page. Filters: inclusive rating range and inclusive date range.
+    Returns (rows, next_cursor); next_cursor is None on the last page. Rows
+    are (user_id, user_full_name, event_id, event_name, rating, comments,
+    feedback_date, feedback_id). Empty if the event is not the organizer's.
+    """
+    return _feedback_page(["F.event_id = %s", "E.organizer_id = %s"], [event_id, organizer_id],
+                          after, limit, min_rating, max_rating, date_from, date_to)
+
+
+def get_organizer_feedback_page(organizer_id, after=None, limit=FEEDBACK_PAGE_SIZE,
+                                min_rating=None, max_rating=None, date_from=None, date_to=None):
+    """Like get_event_feedback_page, across all of organizer_id's events."""
+    return _feedback_page(["E.organizer_id = %s"], [organizer_id],
+                          after, limit, min_rating, max_rating, date_from, date_to)
+
+
+def _feedback_page(where, params, after, limit, min_rating, max_rating, date_from, date_to):
+    if min_rating is not None:
+        where.append("F.rating >= %s")
+        params.append(min_rating)
+    if max_rating is not None:
+        where.append("F.rating <= %s")
+        params.append(max_rating)
+    if date_from:
+        where.append("F.feedback_date >= %s")
+        params.append(date_from)
+    if date_to:
+        where.append("F.feedback_date <= %s")
+        params.append(date_to)
+    if after is not None:
+        last_date, last_id = after
+        # Expanded form of (feedback_date, feedback_id) < (%s, %s), which
+        # MySQL turns into a range on the index
+        where.append("(F.feedback_date < %s OR (F.feedback_date = %s AND F.feedback_id < %s))")
+        params += [last_date, last_date, last_id]
+
+    # Fetch one extra row to know whether another page exists
+    sql = (_FEEDBACK_FEED_SQL + " WHERE " + " AND ".join(where)
+           + " ORDER BY F.feedback_date DESC, F.feedback_id DESC LIMIT %s")
+    params.append(limit + 1)
+
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, tuple(params))
+        rows = cursor.fetchall()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last[6], last[7])
+    return rows, None
 
 # ----------------- Event Schedule -----------------
 def manage_schedule(event_id, activity_time, activity_name, description=""): # Added description
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Added 'description' to the INSERT statement and values tuple
-        cursor.execute("""
-            INSERT INTO Event_Schedule (event_id, start_time, end_time, activity_name, description)
-            VALUES (%s, %s, DATE_ADD(%s, INTERVAL 1 HOUR), %s, %s)
-        """, (event_id, activity_time, activity_time, activity_name, description))
-        conn.commit()
-        return True, "Schedule updated!"
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Added 'description' to the INSERT statement and values tuple
+            cursor.execute("""
+                INSERT INTO Event_Schedule (event_id, start_time, end_time, activity_name, description)
+                VALUES (%s, %s, DATE_ADD(%s, INTERVAL 1 HOUR), %s, %s)
+            """, (event_id, activity_time, activity_time, activity_name, description))
+            conn.commit()
+            return True, "Schedule updated!"
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 # Add a helper function to create a new sponsor
 def create_new_sponsor(name, contact, email, phone):
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            """INSERT INTO Sponsors (sponsor_name, contact_person, email, phone_no) 
-               VALUES (%s, %s, %s, %s)""",
-            (name, contact, email, phone)
-        )
-        conn.commit()
-        return True, cursor.lastrowid
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                """INSERT INTO Sponsors (sponsor_name, contact_person, email, phone_no)
+                   VALUES (%s, %s, %s, %s)""",
+                (name, contact, email, phone)
+            )
+            conn.commit()
+            invalidate_sponsors(_ALL_SPONSORS)
+            return True, cursor.lastrowid
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 def get_all_sponsors():
     """Get all available sponsors from the database"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT sponsor_id, sponsor_name, contact_person, email FROM Sponsors ORDER BY sponsor_name")
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+    def load():
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT sponsor_id, sponsor_name, contact_person, email FROM Sponsors ORDER BY sponsor_name")
+            return cursor.fetchall()
+    return _cached(_sponsor_cache, _ALL_SPONSORS, load)
 
 
 # ----------------- Sponsors -----------------
 def view_organizer_sponsors(organizer_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            E.event_id,
-            E.event_name,
-            S.sponsor_id,
-            S.sponsor_name,
-            S.contact_person,
-            S.email,
-            S.phone_no,
-            ES.amount_contributed 
-        FROM Events E
-        JOIN Event_Sponsors ES ON E.event_id = ES.event_id
-        JOIN Sponsors S ON ES.sponsor_id = S.sponsor_id
-        WHERE E.organizer_id = %s
-        ORDER BY E.event_id
-    """, (organizer_id,))
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+    def load():
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    E.event_id,
+                    E.event_name,
+                    S.sponsor_id,
+                    S.sponsor_name,
+                    S.contact_person,
+                    S.email,
+                    S.phone_no,
+                    ES.amount_contributed
+                FROM Events E
+                JOIN Event_Sponsors ES ON E.event_id = ES.event_id
+                JOIN Sponsors S ON ES.sponsor_id = S.sponsor_id
+                WHERE E.organizer_id = %s
+                ORDER BY E.event_id
+            """, (organizer_id,))
+            return cursor.fetchall()
+    return _cached(_sponsor_cache, organizer_id, load)
 
 # In func.py, add these functions:
 
@@ -567,163 +2454,464 @@ def update_event_sponsor_amount(event_id, sponsor_id, organizer_id, new_amount):
     Updates the contribution amount in Event_Sponsors, after verifying event ownership.
     This focuses ONLY on modifying amount_contributed.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Check ownership (Essential security check)
-        cursor.execute("SELECT 1 FROM Events WHERE event_id=%s AND organizer_id=%s", (event_id, organizer_id))
-        if not cursor.fetchone():
-            return False, "Error: You can only modify sponsors for events you organize."
-
-        # Update the contribution amount
-        cursor.execute("""
-            UPDATE Event_Sponsors
-            SET amount_contributed = %s
-            WHERE event_id = %s AND sponsor_id = %s
-        """, (new_amount, event_id, sponsor_id))
-        conn.commit()
-
-        if cursor.rowcount == 0:
-            return False, "Sponsor not found for this event."
-
-        return True, "Sponsor contribution amount updated successfully!"
-
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Check ownership (Essential security check)
+            cursor.execute("SELECT 1 FROM Events WHERE event_id=%s AND organizer_id=%s", (event_id, organizer_id))
+            if not cursor.fetchone():
+                return False, "Error: You can only modify sponsors for events you organize."
+
+            # Update the contribution amount
+            cursor.execute("""
+                UPDATE Event_Sponsors
+                SET amount_contributed = %s
+                WHERE event_id = %s AND sponsor_id = %s
+            """, (new_amount, event_id, sponsor_id))
+            conn.commit()
+            invalidate_sponsors(organizer_id)
+            invalidate_sponsorship_coverage(organizer_id)
+
+            if cursor.rowcount == 0:
+                return False, "Sponsor not found for this event."
+
+            return True, "Sponsor contribution amount updated successfully!"
+
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 def delete_event_sponsor(event_id, sponsor_id, organizer_id):
     """
     Deletes a sponsor from an event (deletes from Event_Sponsors), after verifying ownership.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Check ownership (Essential security check)
-        cursor.execute("SELECT 1 FROM Events WHERE event_id=%s AND organizer_id=%s", (event_id, organizer_id))
-        if not cursor.fetchone():
-            return False, "Error: You can only remove sponsors from events you organize."
-
-        # Delete the entry from the junction table
-        cursor.execute("""
-            DELETE FROM Event_Sponsors
-            WHERE event_id = %s AND sponsor_id = %s
-        """, (event_id, sponsor_id))
-        conn.commit()
-
-        if cursor.rowcount == 0:
-            return False, "Sponsor was not assigned to this event."
-
-        return True, "Sponsor successfully removed from event."
-
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Check ownership (Essential security check)
+            cursor.execute("SELECT 1 FROM Events WHERE event_id=%s AND organizer_id=%s", (event_id, organizer_id))
+            if not cursor.fetchone():
+                return False, "Error: You can only remove sponsors from events you organize."
+
+            # Delete the entry from the junction table
+            cursor.execute("""
+                DELETE FROM Event_Sponsors
+                WHERE event_id = %s AND sponsor_id = %s
+            """, (event_id, sponsor_id))
+            conn.commit()
+            invalidate_sponsors(organizer_id)
+            invalidate_sponsorship_coverage(organizer_id)
+
+            if cursor.rowcount == 0:
+                return False, "Sponsor was not assigned to this event."
+
+            return True, "Sponsor successfully removed from event."
+
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 # In func.py, add these functions:
 
 # In func.py, replace get_event_average_rating with this new comprehensive function:
 
-def get_organizer_analytics(organizer_id):
-    """Retrieves name, ID, Average Rating, and Total Revenue for all organized events."""
-    conn = get_connection()
-    # Use dictionary cursor for clear column access in Python
-    cursor = conn.cursor(dictionary=True)
-
-    # CRITICAL: Use the Stored Function and AVG() within the SELECT list
-    cursor.execute("""
-        SELECT
-            E.event_id,
-            E.event_name,
-            -- Aggregate: Calculate Average Rating for each event
-            IFNULL(AVG(F.rating), 0) AS avg_rating,
-            -- Call Stored Function: Calculate Total Revenue for each event
-            CalculateEventRevenue(E.event_id) AS total_revenue
-        FROM Events E
-        LEFT JOIN Feedback F ON E.event_id = F.event_id
-        WHERE E.organizer_id = %s
-        GROUP BY E.event_id, E.event_name
-        ORDER BY E.event_id
-    """, (organizer_id,))
-
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
-
-def get_events_with_no_sponsors(organizer_id):
-    """Nested Query: Finds events organized by the user that have no sponsors."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    # Uses a NOT IN clause with a subquery to find event_ids that are not in Event_Sponsors
-    cursor.execute("""
-        SELECT event_id, event_name, event_date
-        FROM Events
-        WHERE organizer_id = %s
-          AND event_id NOT IN (
-            SELECT DISTINCT event_id
-            FROM Event_Sponsors
-          )
-    """, (organizer_id,))
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+# Per-organizer analytics results, reused for ANALYTICS_CACHE_TTL seconds
+# (0 disables). Writes that change revenue or ratings call
+# invalidate_organizer_analytics() so the dashboard never shows stale totals
+# after the user's own action.
+ANALYTICS_CACHE_TTL = float(os.environ.get("EMS_ANALYTICS_CACHE_TTL", 30))
+_analytics_cache = TTLCache("analytics", ANALYTICS_CACHE_TTL)  # organizer_id -> rows
 
-# In func.py, add this function, perhaps near your create_event function:
+def invalidate_organizer_analytics(organizer_id=None):
+    """Drops cached analytics for one organizer, or for everyone if None."""
+    _analytics_cache.invalidate(organizer_id)
 
-def delete_event_cascading(event_id):
+def get_organizer_analytics(organizer_id, use_cache=True):
+    """Retrieves name, ID, Average Rating, and Total Revenue for all organized events."""
+    if use_cache:
+        return _cached(_analytics_cache, organizer_id, lambda: _load_organizer_analytics(organizer_id),
+                       copy=lambda rows: [dict(row) for row in rows])
+    rows = _load_organizer_analytics(organizer_id)
+    _analytics_cache.put(organizer_id, rows)
+    return [dict(row) for row in rows]
+
+def _load_organizer_analytics(organizer_id):
+    with connection() as conn:
+        # Use dictionary cursor for clear column access in Python
+        cursor = conn.cursor(dictionary=True)
+
+        # Served from the trigger-maintained Event_Stats rows: one primary
+        # key lookup per event instead of aggregating Payments and Feedback
+        cursor.execute("""
+            SELECT
+                E.event_id,
+                E.event_name,
+                IFNULL(1.0 * S.rating_sum / NULLIF(S.rating_count, 0), 0) AS avg_rating,
+                IFNULL(S.revenue, 0.00) AS total_revenue,
+                IFNULL(S.registration_count, 0) AS registration_count,
+                IFNULL(S.tickets_remaining, 0) AS tickets_remaining
+            FROM Events E
+            LEFT JOIN Event_Stats S ON S.event_id = E.event_id
+            WHERE E.organizer_id = %s
+            ORDER BY E.event_id
+        """, (organizer_id,))
+
+        return cursor.fetchall()
+
+# ----------------- Dashboard Summaries -----------------
+# The dashboards show a few counts and sums; these compute them in a single
+# aggregate statement per role instead of fetching the row lists they come
+# from, so the first screen after login costs one round-trip at any volume.
+_ATTENDEE_SUMMARY_SQL = """
+    SELECT COUNT(*) AS registrations,
+           IFNULL(SUM(status = 'attended'), 0) AS attended,
+           (SELECT COUNT(*) FROM Events) AS available_events
+    FROM Registrations
+    WHERE user_id = %s
+"""
+
+# avg_rating averages the events' own averages (unrated events count as 0),
+# the same number the Analytics screen's rows add up to
+_ORGANIZER_SUMMARY_SQL = """
+    SELECT COUNT(*) AS events,
+           IFNULL(SUM(S.revenue), 0) AS total_revenue,
+           IFNULL(AVG(IFNULL(1.0 * S.rating_sum / NULLIF(S.rating_count, 0), 0)), 0) AS avg_rating,
+           IFNULL(SUM(S.registration_count), 0) AS registrations
+    FROM Events E
+    LEFT JOIN Event_Stats S ON S.event_id = E.event_id
+    WHERE E.organizer_id = %s
+"""
+
+
+def get_attendee_summary(user_id):
+    """Attendee dashboard cards: {registrations, attended, available_events}."""
+    with connection() as conn:
+        rows = _prepared_query(conn, _ATTENDEE_SUMMARY_SQL, (user_id,), dictionary=True)
+    return rows[0]
+
+
+def get_organizer_summary(organizer_id):
+    """Organizer dashboard cards: {events, total_revenue, avg_rating, registrations}."""
+    with connection() as conn:
+        rows = _prepared_query(conn, _ORGANIZER_SUMMARY_SQL, (organizer_id,), dictionary=True)
+    return rows[0]
+
+# ----------------- Event Stats -----------------
+# Event_Stats is maintained incrementally by the trg_stats_* triggers. The
+# query below recomputes the same numbers from the raw tables; it is used to
+# rebuild the summary and to check it for drift.
+_EVENT_STATS_COLUMNS = ("registration_count", "attended_count", "tickets_remaining",
+                        "revenue", "rating_sum", "rating_count")
+
+_EVENT_STATS_SOURCE_SQL = """
+    SELECT E.event_id,
+           IFNULL(R.registration_count, 0) AS registration_count,
+           IFNULL(R.attended_count, 0) AS attended_count,
+           IFNULL(T.tickets_remaining, 0) AS tickets_remaining,
+           IFNULL(P.revenue, 0.00) AS revenue,
+           IFNULL(F.rating_sum, 0) AS rating_sum,
+           IFNULL(F.rating_count, 0) AS rating_count
+    FROM Events E
+    LEFT JOIN (
+        SELECT event_id,
+               SUM(status <> 'cancelled') AS registration_count,
+               SUM(status = 'attended') AS attended_count
+        FROM Registrations GROUP BY event_id
+    ) R ON R.event_id = E.event_id
+    LEFT JOIN (
+        SELECT TI.event_id,
+               SUM(TI.quantity_available)
+                 + IFNULL(SUM((SELECT COUNT(*) FROM Ticket_Holds H WHERE H.ticket_id = TI.ticket_id)), 0)
+                 AS tickets_remaining
+        FROM Ticket_Inventory TI GROUP BY TI.event_id
+    ) T ON T.event_id = E.event_id
+    LEFT JOIN (
+        SELECT RR.event_id, SUM(PP.amount) AS revenue
+        FROM Payments PP JOIN Registrations RR ON RR.registration_id = PP.registration_id
+        WHERE PP.status = 'completed'
+        GROUP BY RR.event_id
+    ) P ON P.event_id = E.event_id
+    LEFT JOIN (
+        SELECT event_id, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+        FROM Feedback GROUP BY event_id
+    ) F ON F.event_id = E.event_id
+"""
+
+_EVENT_STATS_ROW_SQL = f"""
+    SELECT event_id, {", ".join(_EVENT_STATS_COLUMNS)}, updated_at
+    FROM Event_Stats
+    WHERE event_id = %s
+"""
+
+
+def _stats_row(row):
+    """Adds the derived avg_rating to an Event_Stats row."""
+    row = dict(row)
+    row["avg_rating"] = row["rating_sum"] / row["rating_count"] if row["rating_count"] else 0
+    return row
+
+def get_event_stats(event_id):
+    """Summary for one event from Event_Stats (single primary key lookup), or None."""
+    with connection() as conn:
+        rows = _prepared_query(conn, _EVENT_STATS_ROW_SQL, (event_id,), dictionary=True)
+    return _stats_row(rows[0]) if rows else None
+
+def rebuild_event_stats(event_id=None):
     """
-    Deletes an event and all associated records (schedules, registrations, tickets, payments, sponsors).
-    This function wraps all deletions in a single transaction.
+    Recomputes Event_Stats from the raw tables, for one event or all of them.
+    Best run while the system is quiet: a write that commits during the
+    rebuild of the same event can be overwritten (verify afterwards).
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        # 1. Delete dependent records (Schedules, Sponsors, Tickets, Registrations)
-
-        # Delete Event Schedules
-        cursor.execute("DELETE FROM Event_Schedule WHERE event_id = %s", (event_id,))
-
-        # Delete Event Sponsors mapping
-        cursor.execute("DELETE FROM Event_Sponsors WHERE event_id = %s", (event_id,))
-
-        # Delete Payments (Requires finding registrations first, but let's assume direct deletion or cascade is set up)
-        # If your database has CASCADE DELETE set up on FKs: Registrations, Tickets, and Payments linked to them will cascade.
-        # ASSUMPTION: Payments are linked to Registrations. We delete Registrations and Tickets.
-
-        # Get registration IDs to delete associated payments if CASCADE is not set on payments
-        cursor.execute("SELECT registration_id FROM Registrations WHERE event_id = %s", (event_id,))
-        registration_ids = [row[0] for row in cursor.fetchall()]
-        if registration_ids:
-            # Delete Payments for these registrations
-            cursor.execute(f"DELETE FROM Payments WHERE registration_id IN ({','.join(['%s']*len(registration_ids))})", tuple(registration_ids))
-
-        # Delete Registrations
-        cursor.execute("DELETE FROM Registrations WHERE event_id = %s", (event_id,))
-
-        # Delete Tickets
-        cursor.execute("DELETE FROM Tickets WHERE event_id = %s", (event_id,))
-
-        # Delete Feedback
-        cursor.execute("DELETE FROM Feedback WHERE event_id = %s", (event_id,))
+    where, params = "", ()
+    if event_id is not None:
+        where, params = " WHERE E.event_id = %s", (event_id,)
+    updates = ", ".join(f"{col} = src.{col}" for col in _EVENT_STATS_COLUMNS)
 
-        # 2. Delete the Event itself (must be last)
-        cursor.execute("DELETE FROM Events WHERE event_id = %s", (event_id,))
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"""
+                INSERT INTO Event_Stats (event_id, {", ".join(_EVENT_STATS_COLUMNS)})
+                SELECT * FROM ({_EVENT_STATS_SOURCE_SQL}{where}) AS src
+                ON DUPLICATE KEY UPDATE {updates}
+            """, params)
+            conn.commit()
+        except DatabaseError as err:
+            conn.rollback()
+            return False, f"Error rebuilding event stats: {err}"
+        finally:
+            cursor.close()
+    invalidate_organizer_analytics()
+    scope = f"event {event_id}" if event_id is not None else "all events"
+    return True, f"Event stats rebuilt for {scope}"
 
-        conn.commit()
-        return True, f"Event ID {event_id} and all related data deleted successfully."
+def verify_event_stats(event_id=None):
+    """
+    Compares Event_Stats with a fresh aggregate of the raw tables.
+    Returns a list of {"event_id", "column", "stored", "actual"} dicts, one per
+    mismatching value; a missing summary row is reported with column "row".
+    """
+    where, params = "", ()
+    if event_id is not None:
+        where, params = " WHERE E.event_id = %s", (event_id,)
+
+    with connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(_EVENT_STATS_SOURCE_SQL + where, params)
+        actual = {row["event_id"]: row for row in cursor.fetchall()}
+        cursor.execute(f"""
+            SELECT event_id, {", ".join(_EVENT_STATS_COLUMNS)}
+            FROM Event_Stats
+            {"WHERE event_id = %s" if event_id is not None else ""}
+        """, params)
+        stored = {row["event_id"]: row for row in cursor.fetchall()}
+
+    drift = []
+    for eid, expected in sorted(actual.items()):
+        row = stored.get(eid)
+        if row is None:
+            drift.append({"event_id": eid, "column": "row", "stored": None, "actual": "present"})
+            continue
+        for col in _EVENT_STATS_COLUMNS:
+            if row[col] != expected[col]:
+                drift.append({"event_id": eid, "column": col,
+                              "stored": row[col], "actual": expected[col]})
+    return drift
+
+# ----------------- Sponsorship Coverage -----------------
+# How well each of an organizer's events is sponsored: no sponsor at all,
+# sponsorship below SPONSORSHIP_TARGET, or at/above it. One statement over
+# the organizer's events (idx_events_organizer_date) left-joined to
+# Event_Sponsors by its primary key, so other organizers' sponsorships are
+# never read; events with no match are the "none" rows. The per-event
+# totals are cached per organizer and dropped by the sponsor and event
+# writes; the target is applied on top, so changing it needs no reload.
+SPONSORSHIP_TARGET = float(os.environ.get("EMS_SPONSORSHIP_TARGET", 250000))
+COVERAGE_NONE, COVERAGE_BELOW, COVERAGE_ABOVE = "none", "below", "above"
+
+_coverage_cache = TTLCache("sponsorship_coverage", REFERENCE_CACHE_TTL)
+
+
+def invalidate_sponsorship_coverage(organizer_id=None):
+    """Drops one organizer's cached coverage, or everyone's if None."""
+    _coverage_cache.invalidate(organizer_id)
+
+
+def get_sponsorship_coverage(organizer_id, target=None, status=None):
+    """
+    Sponsorship of each of organizer_id's events, by event date. Rows are
+    dicts of event_id, event_name, event_date, sponsor_count,
+    total_contributed and status (COVERAGE_NONE / _BELOW / _ABOVE against
+    `target`, SPONSORSHIP_TARGET by default). `status` keeps only those rows.
+    """
+    target = SPONSORSHIP_TARGET if target is None else target
+    rows = _coverage_rows(organizer_id)
+    for row in rows:
+        if not row["sponsor_count"]:
+            row["status"] = COVERAGE_NONE
+        elif row["total_contributed"] < target:
+            row["status"] = COVERAGE_BELOW
+        else:
+            row["status"] = COVERAGE_ABOVE
+    return [row for row in rows if status is None or row["status"] == status]
 
-    except mysql.connector.Error as err:
-        conn.rollback() # CRITICAL: Roll back all changes if any step fails
-        return False, f"Database error during cascade delete: {str(err)}"
 
-    finally:
-        cursor.close()
-        conn.close()
+def get_events_with_no_sponsors(organizer_id):
+    """Events organized by the user that have no sponsors: (event_id, event_name, event_date)."""
+    return [(row["event_id"], row["event_name"], row["event_date"])
+            for row in _coverage_rows(organizer_id) if not row["sponsor_count"]]
+
+
+def _coverage_rows(organizer_id):
+    def load():
+        with connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT E.event_id, E.event_name, E.event_date,
+                       COUNT(ES.sponsor_id) AS sponsor_count,
+                       IFNULL(SUM(ES.amount_contributed), 0) AS total_contributed
+                FROM Events E
+                LEFT JOIN Event_Sponsors ES ON ES.event_id = E.event_id
+                WHERE E.organizer_id = %s
+                GROUP BY E.event_id, E.event_name, E.event_date
+                ORDER BY E.event_date, E.event_id
+            """, (organizer_id,))
+            return cursor.fetchall()
+    return _cached(_coverage_cache, organizer_id, load, copy=lambda rows: [dict(row) for row in rows])
+
+# ----------------- Event Deletion -----------------
+# delete_event_cascading removes an event's rows table by table in batches of
+# DELETE_BATCH_SIZE and commits after each batch, so no single transaction
+# locks (or undo-logs) a big event's whole registration list. Each batch is
+# picked by joining back to the event, so ids never travel to Python and
+# back. What is left of each table after its full batches, plus the tickets
+# and the event row, goes in one final transaction: an event that fits in a
+# batch is still deleted atomically, and registrations that arrive while a
+# large event is being deleted are caught there. If a batch fails, the
+# batches already committed stay deleted and calling it again finishes the job.
+DELETE_BATCH_SIZE = int(os.environ.get("EMS_DELETE_BATCH_SIZE", 1000))
+
+# (table, batch key, FROM/WHERE tail selecting the event's rows as alias x,
+#  columns copied to Archived_<table> in archive mode, None = not archived)
+_EVENT_CASCADE = (
+    ("Payments", "r.registration_id",
+     "JOIN Registrations r ON r.registration_id = x.registration_id WHERE r.event_id = %s",
+     ("payment_id", "registration_id", "amount", "payment_date", "payment_method", "status",
+      "idempotency_key")),
+    ("Registrations", "x.registration_id", "WHERE x.event_id = %s",
+     ("registration_id", "user_id", "event_id", "ticket_id", "registration_date", "status",
+      "checked_in_at")),
+    ("Feedback", "x.feedback_id", "WHERE x.event_id = %s",
+     ("feedback_id", "user_id", "event_id", "rating", "comments", "feedback_date")),
+    ("Event_Schedule", "x.schedule_id", "WHERE x.event_id = %s",
+     ("schedule_id", "event_id", "start_time", "end_time", "activity_name", "description")),
+    ("Event_Sponsors", "x.sponsor_id", "WHERE x.event_id = %s",
+     ("event_id", "sponsor_id", "amount_contributed")),
+    ("Ticket_Holds", "x.hold_id", "WHERE x.event_id = %s", None),  # unconfirmed seats
+    ("Waitlist", "x.waitlist_id", "WHERE x.event_id = %s", None),
+)
+# Only deleted in the final transaction; Ticket_Slots and Event_Stats cascade
+_EVENT_CASCADE_FINAL = (
+    ("Tickets", "x.ticket_id", "WHERE x.event_id = %s",
+     ("ticket_id", "event_id", "ticket_type", "price", "quantity_available")),
+    ("Events", "x.event_id", "WHERE x.event_id = %s",
+     ("event_id", "event_name", "description", "event_date", "location_id", "organizer_id")),
+)
+# Archive the seats left across all slots, not just the unsharded remainder
+_ARCHIVE_SOURCES = {"Tickets": "Ticket_Inventory"}
+
+
+def _cascade_step(cursor, table, key, scope, columns, event_id, archive, limit=None):
+    """
+    Deletes (and with archive=True first copies) the event's rows of one
+    table: all of them, or the first `limit` by key. Returns the number of
+    rows deleted; 0 with a limit means fewer than `limit` rows are left.
+    """
+    bound, params = "", (event_id,)
+    if limit is not None:
+        # The limit-th key is the upper bound of this batch
+        cursor.execute(f"SELECT {key} FROM {table} x {scope} ORDER BY {key} LIMIT %s, 1",
+                       (event_id, limit - 1))
+        row = cursor.fetchone()
+        if row is None:
+            return 0
+        bound, params = f" AND {key} <= %s", (event_id, row[0])
+    if archive and columns:
+        cursor.execute(f"""
+            INSERT INTO Archived_{table} ({", ".join(columns)})
+            SELECT {", ".join("x." + col for col in columns)}
+            FROM {_ARCHIVE_SOURCES.get(table, table)} x {scope}{bound}
+        """, params)
+    cursor.execute(f"DELETE x FROM {table} x {scope}{bound}", params)
+    return cursor.rowcount
+
+
+def delete_event_cascading(event_id, progress=None, archive=False, batch_size=DELETE_BATCH_SIZE):
+    """
+    Deletes an event and all associated records (payments, registrations,
+    feedback, schedules, sponsors, holds, waitlist, tickets) in batches, see
+    Event Deletion above. progress(table, done, total) is called on the
+    calling thread after every committed batch. With archive=True the rows
+    are moved to the Archived_* tables (migrations/0004) instead of being
+    dropped.
+    """
+    verb = "archived" if archive else "deleted"
+    with connection() as conn:
+        cursor = conn.cursor()
+        organizer_id = None
+        committed = 0
+        try:
+            cursor.execute("SELECT organizer_id FROM Events WHERE event_id = %s", (event_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return False, f"Event ID {event_id} not found."
+            organizer_id = row[0]
+
+            totals = {}
+            for table, _, scope, _ in _EVENT_CASCADE:
+                cursor.execute(f"SELECT COUNT(*) FROM {table} x {scope}", (event_id,))
+                totals[table] = cursor.fetchone()[0]
+            conn.commit()  # end the read snapshot so each batch sees current rows
+            done = dict.fromkeys(totals, 0)
+
+            for table, key, scope, columns in _EVENT_CASCADE:
+                while True:
+                    deleted = _cascade_step(cursor, table, key, scope, columns, event_id, archive, batch_size)
+                    if not deleted:
+                        break
+                    conn.commit()
+                    committed += deleted
+                    done[table] += deleted
+                    if progress:
+                        progress(table, done[table], max(totals[table], done[table]))
+
+            # Remainders, stragglers, tickets and the event itself, all or nothing
+            for table, key, scope, columns in _EVENT_CASCADE + _EVENT_CASCADE_FINAL:
+                deleted = _cascade_step(cursor, table, key, scope, columns, event_id, archive)
+                if table in done:
+                    done[table] += deleted
+            conn.commit()
+            if progress:
+                for table, count in done.items():
+                    progress(table, count, max(totals[table], count))
+            return True, f"Event ID {event_id} and all related data {verb} successfully."
+
+        except DatabaseError as err:
+            conn.rollback() # CRITICAL: Roll back all changes if any step fails
+            if committed:
+                return False, (f"Database error during cascade delete: {err}. "
+                               f"{committed} rows were already {verb}; run it again to finish.")
+            return False, f"Database error during cascade delete: {str(err)}"
+
+        finally:
+            cursor.close()
+            if organizer_id is not None:
+                invalidate_organizer_analytics(organizer_id)
+                invalidate_event(event_id, organizer_id)
+                invalidate_tickets(event_id)
+                invalidate_sponsors(organizer_id)
 
 # Modified to accept amount_contributed
 # In func.py
@@ -732,15 +2920,12 @@ def delete_event_cascading(event_id):
 
 def check_event_ownership(event_id, organizer_id):
     """Checks if the given organizer_id owns the event_id."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT COUNT(*) FROM Events WHERE event_id=%s AND organizer_id=%s",
-        (event_id, organizer_id)
-    )
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count > 0 # Returns True if owned, False otherwise
+    with connection() as conn:
+        rows = _prepared_query(
+            conn, "SELECT COUNT(*) FROM Events WHERE event_id=%s AND organizer_id=%s",
+            (event_id, organizer_id)
+        )
+    return rows[0][0] > 0 # Returns True if owned, False otherwise
 
 # In func.py, add these functions, perhaps under the 'Event Schedule' section:
 
@@ -757,109 +2942,130 @@ def get_event_revenue(event_id, organizer_id):  # CRITICAL: Accepts organizer_id
     if not check_event_ownership(event_id, organizer_id):
         return False, "Permission Denied: You can only calculate revenue for events you organize."
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Calls the MySQL Stored Function
-        cursor.execute(f"SELECT CalculateEventRevenue(%s)", (event_id,))
-        revenue = cursor.fetchone()[0]
-        return True, float(revenue)
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Calls the MySQL Stored Function
+            cursor.execute(f"SELECT CalculateEventRevenue(%s)", (event_id,))
+            revenue = cursor.fetchone()[0]
+            return True, float(revenue)
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 def get_event_schedules(event_id, organizer_id):
     """Retrieves all schedules for an event, but only if the organizer owns the event."""
-    conn = get_connection()
-    # Use dictionary cursor to easily get schedule_id and other details
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("""
-        SELECT 
-            ES.schedule_id, 
-            ES.start_time, 
-            ES.end_time, 
-            ES.activity_name, 
-            ES.description
-        FROM Event_Schedule ES
-        JOIN Events E ON ES.event_id = E.event_id
-        WHERE ES.event_id = %s AND E.organizer_id = %s
-        ORDER BY ES.start_time
-    """, (event_id, organizer_id))
-    schedules = cursor.fetchall()
-    conn.close()
+    with connection() as conn:
+        # Use dictionary cursor to easily get schedule_id and other details
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT
+                ES.schedule_id,
+                ES.start_time,
+                ES.end_time,
+                ES.activity_name,
+                ES.description
+            FROM Event_Schedule ES
+            JOIN Events E ON ES.event_id = E.event_id
+            WHERE ES.event_id = %s AND E.organizer_id = %s
+            ORDER BY ES.start_time
+        """, (event_id, organizer_id))
+        schedules = cursor.fetchall()
     return schedules
 
 def update_schedule(schedule_id, start_time, activity_name, description):
     """Updates an existing schedule entry."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Note: We reuse the logic from manage_schedule to calculate end_time (+1 Hour)
-        cursor.execute("""
-            UPDATE Event_Schedule
-            SET start_time = %s, 
-                end_time = DATE_ADD(%s, INTERVAL 1 HOUR), 
-                activity_name = %s, 
-                description = %s
-            WHERE schedule_id = %s
-        """, (start_time, start_time, activity_name, description, schedule_id))
-        conn.commit()
-        return True, "Schedule updated successfully!"
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Note: We reuse the logic from manage_schedule to calculate end_time (+1 Hour)
+            cursor.execute("""
+                UPDATE Event_Schedule
+                SET start_time = %s,
+                    end_time = DATE_ADD(%s, INTERVAL 1 HOUR),
+                    activity_name = %s,
+                    description = %s
+                WHERE schedule_id = %s
+            """, (start_time, start_time, activity_name, description, schedule_id))
+            conn.commit()
+            return True, "Schedule updated successfully!"
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 def delete_schedule(schedule_id):
     """Deletes an existing schedule entry."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM Event_Schedule WHERE schedule_id = %s", (schedule_id,))
-        conn.commit()
-        if cursor.rowcount == 0:
-            return False, "Schedule ID not found."
-        return True, "Schedule deleted successfully!"
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM Event_Schedule WHERE schedule_id = %s", (schedule_id,))
+            conn.commit()
+            if cursor.rowcount == 0:
+                return False, "Schedule ID not found."
+            return True, "Schedule deleted successfully!"
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
 def assign_sponsor(organizer_id, event_id, sponsor_id, amount_contributed):
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        # Step 1: Check if the organizer OWNS the event (RELIABLE CHECK)
-        cursor.execute(
-            "SELECT COUNT(*) FROM Events WHERE event_id=%s AND organizer_id=%s",
-            (event_id, organizer_id)
-        )
-        # Fetch the count (it will be a single integer)
-        event_count = cursor.fetchone()[0]
-
-        if event_count == 0:
-            return False, "Error: You can only assign sponsors to events you organize."
-
-        # Step 2: Check if sponsor is already assigned to THIS event
-        cursor.execute("SELECT 1 FROM Event_Sponsors WHERE event_id=%s AND sponsor_id=%s", (event_id, sponsor_id))
-        if cursor.fetchone():
-            return False, "Sponsor is already assigned to this event."
-
-        # Step 3: Insert event_sponsor mapping with contribution amount
-        cursor.execute(
-            """INSERT INTO Event_Sponsors (event_id, sponsor_id, amount_contributed)
-               VALUES (%s, %s, %s)""",
-            (event_id, sponsor_id, amount_contributed)
-        )
-        conn.commit()
-        return True, "Sponsor assigned successfully!"
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Step 1: Check if the organizer OWNS the event (RELIABLE CHECK)
+            cursor.execute(
+                "SELECT COUNT(*) FROM Events WHERE event_id=%s AND organizer_id=%s",
+                (event_id, organizer_id)
+            )
+            # Fetch the count (it will be a single integer)
+            event_count = cursor.fetchone()[0]
+
+            if event_count == 0:
+                return False, "Error: You can only assign sponsors to events you organize."
+
+            # Step 2: Check if sponsor is already assigned to THIS event
+            cursor.execute("SELECT 1 FROM Event_Sponsors WHERE event_id=%s AND sponsor_id=%s", (event_id, sponsor_id))
+            if cursor.fetchone():
+                return False, "Sponsor is already assigned to this event."
+
+            # Step 3: Insert event_sponsor mapping with contribution amount
+            cursor.execute(
+                """INSERT INTO Event_Sponsors (event_id, sponsor_id, amount_contributed)
+                   VALUES (%s, %s, %s)""",
+                (event_id, sponsor_id, amount_contributed)
+            )
+            conn.commit()
+            invalidate_sponsors(organizer_id)
+            invalidate_sponsorship_coverage(organizer_id)
+            return True, "Sponsor assigned successfully!"
+
+        except DatabaseError as err:
+            return False, str(err)
+        finally:
+            cursor.close()
 
-    except mysql.connector.Error as err:
-        return False, str(err)
-    finally:
-        cursor.close()
-        conn.close()
+# ----------------- Instrumentation hookup -----------------
+# Wraps every public function defined above with @instrumented. Helpers that
+# don't talk to the database, or that report on the instrumentation itself,
+# are left alone.
+_NOT_INSTRUMENTED = {
+    "load_db_config", "get_backend", "get_connection", "get_pool", "close_pool", "pool_stats", "connection",
+    "cache_stats", "clear_caches", "invalidate_search", "ask_location_details", "instrumented",
+    "query_stats", "slow_queries", "reset_query_stats", "metrics_json", "metrics_prometheus",
+    "prepared_statement_stats", "registration_code", "parse_registration_code", "checkin_enabled",
+}
+
+
+def _instrument_module():
+    namespace = globals()
+    for name, value in list(namespace.items()):
+        if (inspect.isfunction(value) and value.__module__ == __name__ and not name.startswith("_")
+                and not name.startswith("invalidate_") and name not in _NOT_INSTRUMENTED
+                and not getattr(value, "instrumented", False)):
+            namespace[name] = instrumented(value)
+
+
+if INSTRUMENT:
+    _instrument_module()
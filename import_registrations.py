@@ -0,0 +1,67 @@
+"""
+Bulk-registers attendees for one event from a CSV file.
+
+    python import_registrations.py EVENT_ID attendees.csv
+    python import_registrations.py EVENT_ID attendees.csv --all-or-nothing --report result.csv
+
+The CSV needs a header row with `email` and `ticket_type` columns (other
+columns are ignored). Users must already have accounts. Exit code 0 if
+every row was registered, 1 if some were rejected, 2 if nothing was written
+because of an error or --all-or-nothing.
+"""
+import argparse
+import csv
+import sys
+
+import func as db
+
+REPORT_FIELDS = ["line", "email", "ticket_type", "status", "message"]
+
+
+def write_report(report, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(report)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-register attendees for an event from a CSV file.")
+    parser.add_argument("event_id", type=int, help="event to register everyone for")
+    parser.add_argument("csv_file", help="CSV with email and ticket_type columns")
+    parser.add_argument("--chunk-size", type=int, default=db.IMPORT_CHUNK_SIZE,
+                        help="rows validated / inserted per statement (default %(default)s)")
+    parser.add_argument("--all-or-nothing", action="store_true",
+                        help="write nothing unless every row can be registered")
+    parser.add_argument("--report", metavar="PATH", help="write the per-row result to this CSV")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.csv_file, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            # Accept "Email" / " Ticket_Type " style headers
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+            missing = {"email", "ticket_type"} - set(reader.fieldnames)
+            if missing:
+                print(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+                return 2
+            ok, msg, report = db.bulk_register(args.event_id, reader, args.chunk_size, args.all_or_nothing)
+    finally:
+        db.close_pool()
+
+    print(msg)
+    if args.report:
+        write_report(report, args.report)
+        print(f"Per-row results written to {args.report}")
+    else:
+        for entry in report:
+            if entry["status"] != "registered":
+                print(f"  line {entry['line']:>6}  {entry['email'] or '-':<40} {entry['message']}")
+
+    if not ok:
+        return 2
+    return 0 if all(entry["status"] == "registered" for entry in report) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
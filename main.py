@@ -1,8 +1,16 @@
 import tkinter as tk
-from tkinter import messagebox, ttk, simpledialog
+from tkinter import messagebox, ttk, simpledialog, filedialog
 from tkinter import font as tkfont
 import hashlib
+from datetime import datetime
+import queue
+import time
+import uuid
+from decimal import Decimal
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 import func as db
+import checkin
 
 # ==================== THEME CONFIGURATION ====================
 class DarkTheme:
@@ -23,6 +31,40 @@ class DarkTheme:
     SIDEBAR = "#0f1419"
 
 VALID_TICKET_TYPES = ['regular', 'vip', 'student']
+SEARCH_DEBOUNCE_MS = 300
+CHECKIN_AUTO_SYNC_MS = 15000
+CHECKIN_RECENT_SCANS = 200
+
+# Screens whose data a write changes; they reload the next time they are shown.
+# Writes not listed here mark every screen.
+_ATTENDEE_REGISTRATION_SCREENS = ("attendee_dashboard", "browse_events", "my_registrations", "payment")
+_ORGANIZER_EVENT_SCREENS = ("organizer_dashboard", "my_events", "schedules", "sponsors",
+                            "organizer_feedback", "analytics")
+WRITE_DIRTIES = {
+    "register_for_event": _ATTENDEE_REGISTRATION_SCREENS,
+    "delete_registration": _ATTENDEE_REGISTRATION_SCREENS,
+    "join_waitlist": _ATTENDEE_REGISTRATION_SCREENS,
+    "leave_waitlist": ("my_registrations",),
+    "update_registration_ticket": _ATTENDEE_REGISTRATION_SCREENS,
+    "update_registration_status": _ATTENDEE_REGISTRATION_SCREENS + ("feedback",),
+    "make_payment": _ATTENDEE_REGISTRATION_SCREENS + ("feedback",),
+    "give_feedback": ("feedback",),
+    "update_feedback": ("feedback",),
+    "delete_feedback": ("feedback",),
+    "create_event": _ORGANIZER_EVENT_SCREENS,
+    "update_event": _ORGANIZER_EVENT_SCREENS,
+    "delete_event_cascading": _ORGANIZER_EVENT_SCREENS,
+    "add_ticket_type": ("organizer_dashboard", "analytics"),
+    "manage_schedule": ("schedules",),
+    "update_schedule": ("schedules",),
+    "delete_schedule": ("schedules",),
+    "create_new_sponsor": ("sponsors",),
+    "assign_sponsor": ("sponsors", "analytics"),
+    "update_event_sponsor_amount": ("sponsors",),
+    "delete_event_sponsor": ("sponsors", "analytics"),
+    "create_location": (),
+    "sync": (),  # checkin.CheckinSession.sync: check-in times show on no other screen
+}
 
 # ==================== CUSTOM WIDGETS ====================
 class HoverButton(tk.Button):
@@ -156,6 +198,371 @@ class ScrollableFrame(tk.Frame):
     def _on_mousewheel(self, event):
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
 
+def _sort_key(value):
+    """Orders numbers (including "$12.50"-style cells) numerically, the rest case-insensitively."""
+    if value is None:
+        return (2, 0, "")
+    if isinstance(value, (int, float, Decimal)):
+        return (0, float(value), "")
+    text = str(value)
+    try:
+        return (0, float(text.replace("$", "").replace(",", "").split(" ")[0]), "")
+    except ValueError:
+        return (1, 0, text.lower())
+
+class VirtualTreeview(tk.Frame):
+    """
+    A headings-only Treeview that keeps the whole dataset in Python and only
+    creates Tk items for the rows currently on screen. Scrolling re-fills the
+    same handful of items, so opening a screen costs the same for 20 rows or
+    20,000.
+
+    Rows come from set_rows(), from a lazy iterable given to set_source()
+    (pulled a few screens ahead as the user scrolls), or from an
+    `on_need_more` callback that answers with append_rows() - e.g. the next
+    page of a keyset query. Sorting (click a heading) and selection work on
+    the full dataset; selection()/item() mirror ttk.Treeview so existing
+    handlers keep working, with row indexes as item ids.
+    """
+    PREFETCH_SCREENS = 2
+    WHEEL_ROWS = 3
+
+    def __init__(self, parent, columns, height=18, on_need_more=None, **kwargs):
+        kwargs.setdefault('bg', DarkTheme.BG_PRIMARY)
+        super().__init__(parent, **kwargs)
+        self.columns = tuple(columns)
+        self.on_need_more = on_need_more
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings",
+                                 height=height, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._rows = []        # full dataset, in arrival order
+        self._order = []       # indexes into _rows, in display order
+        self._source = None    # iterator for set_source()
+        self._complete = True
+        self._top = 0          # display position of the first visible row
+        self._visible = height
+        self._items = []       # Treeview item ids, one per visible row
+        self._item_rows = {}   # item id -> row index
+        self._selected = None  # row index
+        self._sort = None      # (column index, reverse)
+        self._headings = {}
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-self.WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(self.WHEEL_ROWS))
+        for key, step in (("<Up>", -1), ("<Down>", 1)):
+            self.tree.bind(key, lambda e, s=step: self._move_selection(s))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible))
+        self.tree.bind("<Home>", lambda e: self._move_selection(-len(self._order)))
+        self.tree.bind("<End>", lambda e: self._move_selection(len(self._order)))
+
+    # ---- Treeview-like configuration ----
+    def heading(self, column, text=None, **kwargs):
+        if text is not None:
+            self._headings[column] = text
+            kwargs["text"] = text
+        return self.tree.heading(column, command=lambda c=column: self.sort_by(c), **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    def bind_rows(self, sequence, func):
+        """Binds an event on the rows (e.g. "<Double-1>")."""
+        return self.tree.bind(sequence, func)
+
+    # ---- data ----
+    def set_rows(self, rows, complete=True):
+        """Replaces the dataset. complete=False means on_need_more can supply more."""
+        self._source = None
+        self._reset(list(rows), complete)
+
+    def set_source(self, iterable):
+        """Replaces the dataset with rows pulled lazily from an iterable."""
+        self._source = iter(iterable)
+        self._reset([], False)
+
+    def append_rows(self, rows, complete=False):
+        """Adds rows delivered by on_need_more; complete=True once there are no more."""
+        start = len(self._rows)
+        self._rows.extend(rows)
+        self._complete = complete
+        if self._sort:
+            self._reorder()
+        else:
+            self._order.extend(range(start, len(self._rows)))
+        self._render()
+
+    def clear(self):
+        self.set_rows([])
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def complete(self):
+        return self._complete
+
+    # ---- Treeview-like selection ----
+    def selection(self):
+        return () if self._selected is None else (str(self._selected),)
+
+    def item(self, iid, option=None):
+        values = list(self._rows[int(iid)])
+        return values if option == "values" else {"values": values}
+
+    # ---- sorting ----
+    def sort_by(self, column):
+        index = self.columns.index(column)
+        reverse = self._sort is not None and self._sort == (index, False)
+        if self._source is not None:
+            self._pull(None)  # sorting needs every row of a lazy source
+        self._sort = (index, reverse)
+        for col in self.columns:
+            text = self._headings.get(col, col)
+            if col == column:
+                text += " ▼" if reverse else " ▲"
+            self.tree.heading(col, text=text)
+        self._reorder()
+        if self._selected is not None:
+            self._top = self._order.index(self._selected) - self._visible // 2
+        self._render()
+
+    # ---- internals ----
+    def _reset(self, rows, complete):
+        self._rows = rows
+        self._complete = complete
+        self._selected = None
+        self._top = 0
+        self._reorder()
+        self._render()
+
+    def _reorder(self):
+        self._order = list(range(len(self._rows)))
+        if self._sort:
+            index, reverse = self._sort
+            self._order.sort(key=lambda i: _sort_key(self._rows[i][index]), reverse=reverse)
+
+    def _pull(self, count):
+        """Moves up to `count` rows (all if None) from the lazy source into the dataset."""
+        start = len(self._rows)
+        self._rows.extend(self._source if count is None else islice(self._source, count))
+        if count is None or len(self._rows) - start < count:
+            self._source = None
+            self._complete = True
+        if self._sort:
+            self._reorder()
+        else:
+            self._order.extend(range(start, len(self._rows)))
+
+    def _want_rows(self, upto):
+        if self._complete or len(self._rows) >= upto:
+            return
+        if self._source is not None:
+            self._pull(upto - len(self._rows))
+        elif self.on_need_more:
+            # The owner is expected to ignore repeat calls while a load is running
+            self.on_need_more()
+
+    def _render(self):
+        if not self.tree.winfo_exists():
+            return
+        self._want_rows(self._top + self._visible * (1 + self.PREFETCH_SCREENS))
+        total = len(self._order)
+        self._top = max(0, min(self._top, total - self._visible))
+        shown = min(self._visible, total - self._top)
+
+        while len(self._items) < shown:
+            self._items.append(self.tree.insert("", tk.END))
+        while len(self._items) > shown:
+            self.tree.delete(self._items.pop())
+
+        self._item_rows = {}
+        selected_item = None
+        for item, position in zip(self._items, range(self._top, self._top + shown)):
+            row = self._order[position]
+            self._item_rows[item] = row
+            self.tree.item(item, values=self._rows[row])
+            if row == self._selected:
+                selected_item = item
+        current = self.tree.selection()
+        if selected_item is None and current:
+            self.tree.selection_remove(*current)
+        elif selected_item is not None and current != (selected_item,):
+            self.tree.selection_set(selected_item)
+
+        if total:
+            self.scrollbar.set(self._top / total, (self._top + shown) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _scroll_to(self, top):
+        self._top = max(0, top)
+        self._render()
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self._top + rows)
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self._order)))
+        elif action == "scroll":
+            step = self._visible if unit == "pages" else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_wheel(self, event):
+        return self._scroll_by(-self.WHEEL_ROWS if event.delta > 0 else self.WHEEL_ROWS)
+
+    def _on_select(self, event):
+        current = self.tree.selection()
+        # Empty selections come from _render scrolling the selected row away
+        if current and current[0] in self._item_rows:
+            self._selected = self._item_rows[current[0]]
+
+    def _move_selection(self, step):
+        if not self._order:
+            return "break"
+        if self._selected is None:
+            position = self._top
+        else:
+            position = self._order.index(self._selected) + step
+        self._want_rows(position + self._visible)
+        position = max(0, min(position, len(self._order) - 1))
+        self._selected = self._order[position]
+        if position < self._top:
+            self._top = position
+        elif position >= self._top + self._visible:
+            self._top = position - self._visible + 1
+        self._render()
+        return "break"
+
+    def _on_resize(self, event):
+        # Fit as many rows as the widget is tall, measured from a real row
+        if not self._items:
+            return
+        bbox = self.tree.bbox(self._items[0])
+        if not bbox:
+            return
+        visible = max(1, (event.height - bbox[1]) // bbox[3])
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+# ==================== BACKGROUND DB WORKER ====================
+class DBWorker:
+    """
+    Runs func.py calls on a small thread pool so the Tk main loop never blocks.
+
+    Finished calls are pushed onto a queue that is drained on the Tk thread via
+    root.after, so callbacks may touch widgets freely. Identical calls that are
+    already in flight are coalesced into one query, and callbacks belonging to
+    a window that has been torn down (login/logout) are dropped (see
+    cancel_pending).
+    """
+    POLL_MS = 25
+
+    def __init__(self, root, max_workers=4, on_error=None):
+        self.root = root
+        self.on_error = on_error
+        self.generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._inflight = {}  # key -> {"future": Future, "waiters": [(on_done, on_error, generation)]}
+        self._poll_id = None
+
+    def submit(self, func, *args, on_done=None, on_error=None, bound=True, coalesce=True,
+               cancellable=True):
+        """
+        Queues func(*args) on a worker thread.
+
+        on_done(result) / on_error(exc) run on the Tk thread. With bound=True the
+        callbacks are skipped if cancel_pending() is called before the result
+        arrives. With coalesce=True a call identical to one already in flight
+        shares that call's result instead of hitting the database again.
+        Writes pass cancellable=False so leaving the screen never drops them.
+        """
+        waiter = (on_done, on_error, self.generation if bound else None)
+        key = (func, args)
+        try:
+            hash(key)
+        except TypeError:
+            coalesce = False
+        if not coalesce:
+            key = object()
+
+        entry = self._inflight.get(key)
+        if entry is not None:
+            entry["waiters"].append(waiter)
+            entry["cancellable"] = entry["cancellable"] and cancellable
+            return
+
+        future = self._executor.submit(func, *args)
+        self._inflight[key] = {"future": future, "waiters": [waiter], "cancellable": cancellable}
+        future.add_done_callback(lambda f, key=key: self._results.put((key, f)))
+        self._schedule_poll()
+
+    def cancel_pending(self):
+        """Invalidates callbacks of the current screen and cancels queries not yet started."""
+        self.generation += 1
+        for key, entry in list(self._inflight.items()):
+            if entry["cancellable"] and all(gen is not None for _, _, gen in entry["waiters"]):
+                if entry["future"].cancel():
+                    # Forget it now so the same call submitted again gets a
+                    # fresh future instead of coalescing onto this dead one
+                    del self._inflight[key]
+
+    def shutdown(self):
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_MS, self._drain)
+
+    def _drain(self):
+        self._poll_id = None
+        try:
+            while True:
+                try:
+                    key, future = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                entry = self._inflight.get(key)
+                if entry is None or entry["future"] is not future:
+                    continue  # cancelled, and possibly submitted again since
+                del self._inflight[key]
+                error = future.exception()
+                for on_done, on_error, generation in entry["waiters"]:
+                    if generation is not None and generation != self.generation:
+                        continue  # the screen that asked for this is gone
+                    try:
+                        if error is not None:
+                            (on_error or self.on_error or self._default_error)(error)
+                        elif on_done is not None:
+                            on_done(future.result())
+                    except tk.TclError:
+                        pass  # a dialog the callback targets was closed meanwhile
+                    except Exception as exc:
+                        # A broken callback must not starve the other waiters
+                        # or the results still queued behind it
+                        (self.on_error or self._default_error)(exc)
+        finally:
+            if self._inflight or not self._results.empty():
+                self._schedule_poll()
+
+    @staticmethod
+    def _default_error(error):
+        messagebox.showerror("Database Error", str(error))
+
 def style_treeview():
     style = ttk.Style()
     style.theme_use('clam')
@@ -187,6 +594,101 @@ def style_treeview():
                     arrowcolor=DarkTheme.TEXT_PRIMARY,
                     borderwidth=0)
 
+# ==================== SCREEN REGISTRY ====================
+class Screen:
+    """One sidebar screen: a frame built once per session plus its data refresher."""
+
+    def __init__(self, name, frame):
+        self.name = name
+        self.frame = frame
+        self.body = None
+        self.refresh = None
+        self.dirty = False
+        self.loaded_at = 0.0
+
+    def new_body(self):
+        """
+        Replaces the screen's data area with an empty frame. Results still on
+        their way to the old one hit a destroyed widget and are dropped.
+        """
+        if self.body is not None:
+            self.body.destroy()
+        self.body = tk.Frame(self.frame, bg=DarkTheme.BG_PRIMARY)
+        self.body.pack(fill=tk.BOTH, expand=True)
+        return self.body
+
+
+class ScreenRegistry:
+    """
+    Keeps every screen visited this session alive and swaps them in and out
+    of `host` instead of destroying and rebuilding them.
+
+    A builder is called once with the new Screen: it creates the static
+    widgets (headers, filter bars, buttons) and returns a refresh() that
+    (re)loads the data. Showing a screen re-runs refresh() only if the screen
+    was marked dirty by a write, its data is older than STALE_AFTER seconds,
+    or it is already the visible one (a second click means "reload").
+    Navigation time, from the click to the frame being laid out, is kept per
+    screen in latency().
+    """
+    STALE_AFTER = 60
+
+    def __init__(self, host, on_navigate=None):
+        self.host = host
+        self.on_navigate = on_navigate
+        self.screens = {}
+        self.current = None
+        self._latency = {}
+
+    def show(self, name, build):
+        started = time.perf_counter()
+        screen = self.screens.get(name)
+        built = screen is None
+        if built:
+            screen = Screen(name, tk.Frame(self.host, bg=DarkTheme.BG_PRIMARY))
+            self.screens[name] = screen
+            screen.refresh = build(screen)
+
+        reload = (built or screen is self.current or screen.dirty
+                  or time.monotonic() - screen.loaded_at > self.STALE_AFTER)
+        if self.current is not None and self.current is not screen:
+            self.current.frame.pack_forget()
+        self.current = screen
+        screen.frame.pack(fill=tk.BOTH, expand=True)
+        screen.frame.tkraise()
+        if reload:
+            self.refresh(screen)
+
+        self.host.update_idletasks()
+        self._record(name, (time.perf_counter() - started) * 1000, built)
+
+    def refresh(self, screen):
+        screen.dirty = False
+        screen.loaded_at = time.monotonic()
+        screen.refresh()
+
+    def mark_dirty(self, names=None):
+        """Flags screens (all if names is None) to reload their data when next shown."""
+        for name, screen in self.screens.items():
+            if names is None or name in names:
+                screen.dirty = True
+
+    def latency(self):
+        """Per-screen navigation timings in milliseconds."""
+        return {name: dict(entry, avg_ms=entry["total_ms"] / entry["visits"])
+                for name, entry in self._latency.items()}
+
+    def _record(self, name, elapsed_ms, built):
+        entry = self._latency.setdefault(name, {"visits": 0, "builds": 0, "total_ms": 0.0,
+                                                "max_ms": 0.0, "last_ms": 0.0})
+        entry["visits"] += 1
+        entry["builds"] += built
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["last_ms"] = elapsed_ms
+        if self.on_navigate:
+            self.on_navigate(name, elapsed_ms, built)
+
 # ==================== MAIN APPLICATION ====================
 class EventManagementApp:
     def __init__(self, root):
@@ -201,10 +703,56 @@ class EventManagementApp:
         self.current_user = None
         self.current_role = None
         self.sidebar_buttons = []
+        self.screens = None
+        self.schedule_event_id = None
+        self.schedule_results = None
+
+        self.worker = DBWorker(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.show_login()
 
+    def on_close(self):
+        self.worker.shutdown()
+        self.root.destroy()
+
+    def run_db(self, func, *args, on_done=None, on_error=None, bound=True, write=False):
+        """
+        Runs a func.py call off the Tk thread; on_done(result) runs back on it.
+        Only reads are coalesced: a write submitted twice (a double-clicked
+        Register or Pay) runs twice, and func.py decides what the second does.
+        """
+        if write:
+            on_done = self._marking_dirty(func, on_done)
+        self.worker.submit(func, *args, on_done=on_done, on_error=on_error, bound=bound,
+                           coalesce=not write, cancellable=not write)
+
+    def _marking_dirty(self, func, on_done):
+        """Wraps a write's callback so screens showing the changed data reload."""
+        def done(result):
+            if self.screens is not None:
+                self.screens.mark_dirty(WRITE_DIRTIES.get(func.__name__))
+            if on_done is not None:
+                on_done(result)
+        return done
+
+    def show_screen(self, name, menu_index, build):
+        self.set_active_menu(menu_index)
+        self.screens.show(name, build)
+
+    def show_nav_latency(self, name, elapsed_ms, built):
+        self.nav_label.config(text=f"⏱ {elapsed_ms:.0f} ms" + (" (built)" if built else ""))
+
+    def show_loading(self, parent=None, text="Loading..."):
+        """Placeholder shown while a screen's data is being fetched."""
+        label = tk.Label(parent or self.main_content, text=f"⏳ {text}",
+                         bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_DIM,
+                         font=("Segoe UI", 11, "italic"))
+        label.pack(pady=40)
+        return label
+
     def clear_window(self):
+        self.worker.cancel_pending()
         for widget in self.root.winfo_children():
             widget.destroy()
 
@@ -300,8 +848,9 @@ class EventManagementApp:
             return
 
         password_hash = hashlib.sha256(password.encode()).hexdigest()
-        user = db.login_user(email, password_hash)
+        self.run_db(db.login_user, email, password_hash, on_done=self.on_login_result)
 
+    def on_login_result(self, user):
         if user:
             self.current_user = user['user_id']
             self.current_role = user['role']
@@ -452,40 +1001,17 @@ class EventManagementApp:
             password_hash = hashlib.sha256(password.encode()).hexdigest()
 
             # --- Call database function to register user ---
-            try:
-                # Note: You need to replace this block with a call to your backend function
-                # which takes fname, lname, email, password_hash, phone, role
-
-                # Example using the provided backend signature:
-                # success, message = db.register_user(fname, lname, email, password_hash, phone, role)
-
-                # Mock database check (since I don't have your db module)
-                conn = db.get_connection()
-                cursor = conn.cursor()
-
-                # Check if email already exists
-                cursor.execute("SELECT email FROM Users WHERE email=%s", (email,))
-                if cursor.fetchone():
-                    messagebox.showerror("Error", "Email already registered")
-                    cursor.close()
-                    conn.close()
-                    return
-
-                # Insert new user - UPDATED QUERY AND TUPLE
-                cursor.execute(
-                    "INSERT INTO Users (first_name, last_name, email, password, phone_no, role) VALUES (%s, %s, %s, %s, %s, %s)",
-                    (fname, lname, email, password_hash, phone, role) # **KEY CHANGE: passing all 6 arguments**
-                )
-                conn.commit()
-                cursor.close()
-                conn.close()
-                # End Mock
-
-                messagebox.showinfo("Success", f"Account created successfully as {role.title()}!\nPlease login to continue.")
-                self.show_login()
+            def on_registered(result):
+                success, msg = result
+                if success:
+                    messagebox.showinfo("Success", f"Account created successfully as {role.title()}!\nPlease login to continue.")
+                    self.show_login()
+                else:
+                    messagebox.showerror("Error", msg)
 
-            except Exception as e:
-                messagebox.showerror("Error", f"Registration failed: {str(e)}")
+            self.run_db(db.register_user, fname, lname, email, password_hash, phone, role,
+                        on_done=on_registered, write=True,
+                        on_error=lambda e: messagebox.showerror("Error", f"Registration failed: {str(e)}"))
 
         # Bind Enter key
         password_entry.bind("<Return>", lambda e: register_user())
@@ -539,9 +1065,14 @@ class EventManagementApp:
         menu_frame = tk.Frame(sidebar, bg=DarkTheme.SIDEBAR)
         menu_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Main Content Area
+        # Main Content Area - screens are built into it once and swapped
         self.main_content = tk.Frame(self.root, bg=DarkTheme.BG_PRIMARY)
         self.main_content.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        self.nav_label = tk.Label(sidebar, text="", bg=DarkTheme.SIDEBAR, fg=DarkTheme.TEXT_DIM,
+                                  font=("Segoe UI", 8))
+        self.screens = ScreenRegistry(self.main_content, on_navigate=self.show_nav_latency)
+        self.schedule_event_id = None
+        self.schedule_results = None
 
         if self.current_role == "attendee":
             self.setup_attendee_menu(menu_frame)
@@ -556,6 +1087,8 @@ class EventManagementApp:
         logout_btn = SidebarButton(logout_frame, text="🚪  Logout", command=self.logout)
         logout_btn.pack(fill=tk.X, padx=10, pady=10)
 
+        self.nav_label.pack(side=tk.BOTTOM, pady=(0, 4))
+
     def setup_attendee_menu(self, menu_frame):
         menus = [
             ("🏠  Dashboard", self.show_attendee_dashboard),
@@ -580,6 +1113,8 @@ class EventManagementApp:
             ("💼  Sponsors", self.show_sponsors),
             ("💬  Feedback", self.show_organizer_feedback),
             ("📈  Analytics", self.show_analytics),
+            ("🚪  Check-in", self.show_checkin),
+            ("🩺  Diagnostics", self.show_diagnostics),
         ]
 
         for text, command in menus:
@@ -596,278 +1131,237 @@ class EventManagementApp:
             else:
                 btn.set_inactive()
 
-    def clear_content(self):
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-
     def logout(self):
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
             self.current_user = None
             self.current_role = None
             self.sidebar_buttons = []
+            self.screens = None
             self.show_login()
 
     # ==================== ATTENDEE SCREENS ====================
     def show_attendee_dashboard(self):
-        self.set_active_menu(0)
-        self.clear_content()
+        self.show_screen("attendee_dashboard", 0, self.build_attendee_dashboard)
 
+    def build_attendee_dashboard(self, screen):
         # Header
-        tk.Label(self.main_content, text="Dashboard", bg=DarkTheme.BG_PRIMARY,
+        tk.Label(screen.frame, text="Dashboard", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(anchor=tk.W, padx=40, pady=(30, 10))
 
-        tk.Label(self.main_content, text="Welcome back! Here's your activity overview.",
+        tk.Label(screen.frame, text="Welcome back! Here's your activity overview.",
                 bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
                 font=("Segoe UI", 11)).pack(anchor=tk.W, padx=40, pady=(0, 30))
 
         # Stats Cards
-        cards_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
+        cards_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
         cards_frame.pack(fill=tk.X, padx=40, pady=20)
 
-        # Get stats
-        regs = db.get_user_registrations(self.current_user)
-        attended = db.get_attended_events(self.current_user)
-
+        # All three cards come from one summary query
         stats = [
-            ("🎫", "Total Registrations", len(regs) if regs else 0, DarkTheme.ACCENT),
-            ("✅", "Attended Events", len(attended) if attended else 0, DarkTheme.SUCCESS),
-            ("📅", "Available Events", len(db.get_events()) if db.get_events() else 0, DarkTheme.WARNING),
+            ("🎫", "Total Registrations", "registrations", DarkTheme.ACCENT),
+            ("✅", "Attended Events", "attended", DarkTheme.SUCCESS),
+            ("📅", "Available Events", "available_events", DarkTheme.WARNING),
         ]
 
-        for icon, label, value, color in stats:
+        cards = []
+        for icon, label, key, color in stats:
             card = tk.Frame(cards_frame, bg=DarkTheme.BG_CARD, bd=0, relief=tk.FLAT)
             card.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
 
             tk.Label(card, text=icon, bg=DarkTheme.BG_CARD, font=("Segoe UI", 36)).pack(pady=(25, 10))
-            tk.Label(card, text=str(value), bg=DarkTheme.BG_CARD, fg=color,
-                    font=("Segoe UI", 32, "bold")).pack()
+            value_label = tk.Label(card, text="…", bg=DarkTheme.BG_CARD, fg=color,
+                                   font=("Segoe UI", 32, "bold"))
+            value_label.pack()
             tk.Label(card, text=label, bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
                     font=("Segoe UI", 10)).pack(pady=(5, 25))
+            cards.append((value_label, key))
+
+        def fill(summary):
+            for value_label, key in cards:
+                value_label.config(text=str(summary[key]))
+
+        def refresh():
+            self.run_db(db.get_attendee_summary, self.current_user, on_done=fill)
+
+        return refresh
 
     def show_browse_events(self):
-        self.set_active_menu(1)
-        self.clear_content()
+        self.show_screen("browse_events", 1, self.build_browse_events)
 
+    def build_browse_events(self, screen):
         # Header
-        header_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
+        header_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
         header_frame.pack(fill=tk.X, padx=40, pady=(30, 20))
 
         tk.Label(header_frame, text="Browse Events", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(side=tk.LEFT)
 
-        # Get events
-        events = db.get_events()
-
-        if not events:
-            tk.Label(self.main_content, text="No events available at the moment",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
-                    font=("Segoe UI", 12)).pack(pady=50)
-            return
+        search_entry = ModernEntry(header_frame, placeholder="🔍 Search events", width=32,
+                                   font=("Segoe UI", 11))
+        search_entry.pack(side=tk.RIGHT, ipady=7)
+
+        # Filters
+        filter_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_CARD)
+        filter_frame.pack(fill=tk.X, padx=40, pady=(0, 15))
+
+        tk.Label(filter_frame, text="From", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(20, 5), pady=12)
+        from_entry = ModernEntry(filter_frame, placeholder="YYYY-MM-DD", width=12)
+        from_entry.pack(side=tk.LEFT, ipady=5)
+
+        tk.Label(filter_frame, text="To", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        to_entry = ModernEntry(filter_frame, placeholder="YYYY-MM-DD", width=12)
+        to_entry.pack(side=tk.LEFT, ipady=5)
+
+        tk.Label(filter_frame, text="City", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        city_var = tk.StringVar(value="All cities")
+        city_combo = ttk.Combobox(filter_frame, textvariable=city_var, values=["All cities"],
+                                  state="readonly", width=18, font=("Segoe UI", 10))
+        city_combo.pack(side=tk.LEFT, ipady=3)
+
+        available_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(filter_frame, text="Tickets available", variable=available_var,
+                      bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_PRIMARY,
+                      selectcolor=DarkTheme.BG_TERTIARY, activebackground=DarkTheme.BG_CARD,
+                      activeforeground=DarkTheme.ACCENT,
+                      font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=15)
 
         # Table frame
-        table_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 30))
+        table_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 10))
 
-        columns = ("ID", "Name", "Date", "Actions")
-        tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=20)
+        columns = ("ID", "Name", "Date", "City", "Actions")
+        # Asks for the next page itself when the user scrolls near the end
+        tree = VirtualTreeview(table_frame, columns, height=18, on_need_more=lambda: load_page())
 
         tree.heading("ID", text="Event ID")
         tree.column("ID", width=100, anchor=tk.CENTER)
         tree.heading("Name", text="Event Name")
-        tree.column("Name", width=500)
+        tree.column("Name", width=420)
         tree.heading("Date", text="Date")
-        tree.column("Date", width=200, anchor=tk.CENTER)
+        tree.column("Date", width=160, anchor=tk.CENTER)
+        tree.heading("City", text="City")
+        tree.column("City", width=160, anchor=tk.CENTER)
         tree.heading("Actions", text="Actions")
-        tree.column("Actions", width=200, anchor=tk.CENTER)
-
-        for row in events:
-            tree.insert("", tk.END, values=(row[0], row[1], row[2], "→ Register"))
+        tree.column("Actions", width=160, anchor=tk.CENTER)
 
-        tree.bind("<Double-1>", lambda e: self.register_for_event_inline(tree))
+        tree.bind_rows("<Double-1>", lambda e: self.register_for_event_inline(tree))
 
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(fill=tk.BOTH, expand=True)
 
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        status_label = tk.Label(screen.frame, text="", bg=DarkTheme.BG_PRIMARY,
+                                fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10))
+        status_label.pack()
 
-        # Action buttons for sponsors: Create Sponsor, Assign, Modify Amount, Remove
-        action_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        action_frame.pack(pady=12)
-
-        def create_sponsor_flow():
-            dialog = tk.Toplevel(self.root)
-            dialog.title("Create Sponsor")
-            dialog.geometry("520x420")
-            dialog.configure(bg=DarkTheme.BG_PRIMARY)
-            dialog.transient(self.root)
-            dialog.grab_set()
-
-            tk.Label(dialog, text="Create New Sponsor", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 14, "bold")).pack(pady=10)
-
-            tk.Label(dialog, text="Sponsor Name", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
-            name_entry = ModernEntry(dialog, width=50)
-            name_entry.pack(padx=20, ipady=6)
-
-            tk.Label(dialog, text="Contact Person", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
-            contact_entry = ModernEntry(dialog, width=50)
-            contact_entry.pack(padx=20, ipady=6)
-
-            tk.Label(dialog, text="Email", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
-            email_entry = ModernEntry(dialog, width=50)
-            email_entry.pack(padx=20, ipady=6)
-
-            tk.Label(dialog, text="Phone", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
-            phone_entry = ModernEntry(dialog, width=50)
-            phone_entry.pack(padx=20, ipady=6)
-
-            def submit_new():
-                name = name_entry.get()
-                contact = contact_entry.get()
-                email = email_entry.get()
-                phone = phone_entry.get()
-                if not name:
-                    messagebox.showerror("Error", "Sponsor name required")
-                    return
-                ok, result = db.create_new_sponsor(name, contact, email, phone)
-                if ok:
-                    messagebox.showinfo("Success", f"Sponsor created with ID {result}")
-                    dialog.destroy()
-                    self.show_sponsors()
-                else:
-                    messagebox.showerror("Error", result)
+        tk.Label(screen.frame, text="💡 Tip: Double-click on an event to register",
+                bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_DIM,
+                font=("Segoe UI", 9, "italic")).pack(pady=(0, 20))
 
-            HoverButton(dialog, text="Create Sponsor", command=submit_new).pack(pady=14)
+        # Paging state: `cursor` is the (event_date, event_id) of the last row
+        # shown; `query` bumps whenever the filters or the search text change
+        # so a page that arrives for the old ones is thrown away. While there
+        # is search text the table shows the ranked matches in one go.
+        state = {"cursor": None, "done": False, "loading": False, "query": 0,
+                 "filters": (None, None, None, False), "search": "", "debounce": None}
 
-        def assign_sponsor_flow():
-            # Get organizer's events for combobox
-            my_events = db.get_organizer_events(self.current_user)
-            if not my_events:
-                messagebox.showerror("Error", "You don't have any events. Create an event first.")
+        def load_page():
+            if state["loading"] or state["done"]:
                 return
-            
-            # Get all available sponsors
-            all_sponsors = db.get_all_sponsors()
-            if not all_sponsors:
-                messagebox.showerror("Error", "No sponsors available. Create a sponsor first using the 'Create Sponsor' button.")
+            state["loading"] = True
+            status_label.config(text="⏳ Loading...")
+            query = state["query"]
+            if state["search"]:
+                self.run_db(db.search_events, state["search"], db.SEARCH_RESULTS_LIMIT, *state["filters"],
+                            on_done=lambda rows: add_page(query, (rows, None)),
+                            on_error=lambda err: page_failed(query, err))
                 return
-            
-            dialog = tk.Toplevel(self.root)
-            dialog.title("Assign Sponsor to Event")
-            dialog.geometry("550x380")
-            dialog.configure(bg=DarkTheme.BG_PRIMARY)
-            dialog.transient(self.root)
-            dialog.grab_set()
-
-            tk.Label(dialog, text="Assign Sponsor", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 14, "bold")).pack(pady=10)
-
-            tk.Label(dialog, text="Select Event *", bg=DarkTheme.BG_PRIMARY, 
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
-            tk.Label(dialog, text="💡 Choose from your events", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_DIM, font=("Segoe UI", 8, "italic")).pack(anchor=tk.W, padx=20)
-            
-            event_options = [f"{e[0]} - {e[1]}" for e in my_events]
-            event_var = tk.StringVar(value=event_options[0] if event_options else "")
-            event_combo = ttk.Combobox(dialog, textvariable=event_var, values=event_options,
-                                      state="readonly", width=47, font=("Segoe UI", 10))
-            event_combo.pack(padx=20, pady=(0, 10))
-
-            tk.Label(dialog, text="Select Sponsor *", bg=DarkTheme.BG_PRIMARY, 
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
-            tk.Label(dialog, text="💡 Choose from available sponsors", 
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_DIM, 
-                    font=("Segoe UI", 8, "italic")).pack(anchor=tk.W, padx=20)
-            
-            sponsor_options = [f"{s[0]} - {s[1]} ({s[2]})" for s in all_sponsors]
-            sponsor_var = tk.StringVar(value=sponsor_options[0] if sponsor_options else "")
-            sponsor_combo = ttk.Combobox(dialog, textvariable=sponsor_var, values=sponsor_options,
-                                        state="readonly", width=47, font=("Segoe UI", 10))
-            sponsor_combo.pack(padx=20, pady=(0, 10))
-
-            tk.Label(dialog, text="Contribution Amount ($) *", bg=DarkTheme.BG_PRIMARY, 
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
-            amount_entry = ModernEntry(dialog, width=30)
-            amount_entry.pack(padx=20, ipady=6)
-
-            def submit_assign():
-                selected_event = event_var.get()
-                selected_sponsor = sponsor_var.get()
-                
-                if not selected_event or not selected_sponsor:
-                    messagebox.showerror("Error", "Please select both event and sponsor")
-                    return
-                    
-                try:
-                    event_id_val = int(selected_event.split(" - ")[0])
-                    sponsor_id_val = int(selected_sponsor.split(" - ")[0])
-                    amount_val = float(amount_entry.get().strip())
-                except Exception:
-                    messagebox.showerror("Error", "Invalid amount - ensure it's a valid number")
-                    return
-                
-                if amount_val < 0:
-                    messagebox.showerror("Error", "Amount must be positive")
-                    return
-                    
-                ok, msg = db.assign_sponsor(self.current_user, event_id_val, sponsor_id_val, amount_val)
-                if ok:
-                    messagebox.showinfo("Success", msg)
-                    dialog.destroy()
-                    self.show_sponsors()
-                else:
-                    messagebox.showerror("Error", msg)
-
-            HoverButton(dialog, text="Assign Sponsor", command=submit_assign).pack(pady=12)
-
-        def modify_sponsor_amount():
-            selection = tree.selection()
-            if not selection:
-                messagebox.showerror("Error", "Please select a sponsor mapping to modify")
-                return
-            vals = tree.item(selection[0])['values']
-            event_id_val = vals[0]
-            sponsor_id_val = vals[2]
+            self.run_db(db.get_events_page, state["cursor"], db.EVENTS_PAGE_SIZE, *state["filters"],
+                        on_done=lambda result: add_page(query, result),
+                        on_error=lambda err: page_failed(query, err))
 
-            new_amount = simpledialog.askstring("Modify Amount", "Enter new amount:")
-            if new_amount is None:
-                return
-            try:
-                amt = float(new_amount)
-            except Exception:
-                messagebox.showerror("Error", "Invalid amount")
+        def add_page(query, result):
+            if query != state["query"]:
                 return
-            ok, msg = db.update_event_sponsor_amount(event_id_val, sponsor_id_val, self.current_user, amt)
-            if ok:
-                messagebox.showinfo("Success", msg)
-                self.show_sponsors()
+            rows, next_cursor = result
+            state["loading"] = False
+            state["cursor"] = next_cursor
+            state["done"] = next_cursor is None
+
+            shown = len(tree) + len(rows)
+            if state["search"]:
+                status_label.config(text=f"{shown} best matches for '{state['search']}'"
+                                    if shown else f"No events match '{state['search']}'")
+            elif not shown:
+                filtered = state["filters"] != (None, None, None, False)
+                status_label.config(text="No events match these filters" if filtered
+                                    else "No events available at the moment")
+            elif state["done"]:
+                status_label.config(text=f"Showing all {shown} events")
             else:
-                messagebox.showerror("Error", msg)
+                status_label.config(text=f"Showing {shown} events - scroll for more")
 
-        def remove_sponsor_mapping():
-            selection = tree.selection()
-            if not selection:
-                messagebox.showerror("Error", "Please select a sponsor mapping to remove")
-                return
-            vals = tree.item(selection[0])['values']
-            event_id_val = vals[0]
-            sponsor_id_val = vals[2]
-            if messagebox.askyesno("Confirm", f"Remove sponsor ID {sponsor_id_val} from event {event_id_val}?"):
-                ok, msg = db.delete_event_sponsor(event_id_val, sponsor_id_val, self.current_user)
-                if ok:
-                    messagebox.showinfo("Success", msg)
-                    self.show_sponsors()
-                else:
-                    messagebox.showerror("Error", msg)
+            # May call load_page() again straight away if the table isn't full yet
+            tree.append_rows([(row[0], row[1], row[2], row[3], "→ Register") for row in rows],
+                             complete=state["done"])
 
-        tk.Label(self.main_content, text="💡 Tip: Double-click on an event to register",
-                bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_DIM,
-                font=("Segoe UI", 9, "italic")).pack(pady=(0, 20))
+        def page_failed(query, err):
+            if query != state["query"]:
+                return
+            state["loading"] = False
+            status_label.config(text=f"Could not load events: {err}")
+
+        def entry_value(entry):
+            value = entry.get().strip()
+            return "" if value == entry.placeholder else value
+
+        def apply_filters():
+            date_from, date_to = entry_value(from_entry), entry_value(to_entry)
+            for value in (date_from, date_to):
+                if value:
+                    try:
+                        datetime.strptime(value, "%Y-%m-%d")
+                    except ValueError:
+                        messagebox.showerror("Error", f"Invalid date '{value}' - use YYYY-MM-DD")
+                        return
+            city = city_var.get()
+            state["filters"] = (date_from or None, date_to or None,
+                                None if city == "All cities" else city, available_var.get())
+            restart()
+
+        def restart():
+            state.update(cursor=None, done=False, loading=False, query=state["query"] + 1)
+            tree.clear()
+            load_page()
+
+        HoverButton(filter_frame, text="Apply", command=apply_filters).pack(side=tk.LEFT, padx=10)
+
+        # Search as you type, but only once typing pauses for SEARCH_DEBOUNCE_MS
+        def search_now(event=None):
+            if state["debounce"] is not None:
+                search_entry.after_cancel(state["debounce"])
+                state["debounce"] = None
+            text = entry_value(search_entry)
+            if text != state["search"]:
+                state["search"] = text
+                restart()
+
+        def search_soon(event=None):
+            if state["debounce"] is not None:
+                search_entry.after_cancel(state["debounce"])
+            state["debounce"] = search_entry.after(SEARCH_DEBOUNCE_MS, search_now)
+
+        search_entry.bind("<KeyRelease>", search_soon)
+        search_entry.bind("<Return>", search_now)
+
+        def refresh():
+            # Keeps the filters; only the rows are reloaded
+            self.run_db(db.get_event_cities,
+                        on_done=lambda cities: city_combo.config(values=["All cities"] + list(cities)))
+            restart()
+
+        return refresh
 
     def register_for_event_inline(self, tree):
         selection = tree.selection()
@@ -876,497 +1370,626 @@ class EventManagementApp:
 
         event_id = tree.item(selection[0])['values'][0]
 
-        # Get tickets
-        tickets = db.get_tickets_for_event(event_id)
-        if not tickets:
-            messagebox.showerror("Error", "No tickets available for this event")
-            return
+        def open_dialog(tickets, sold_out):
+            if not tickets and not sold_out:
+                messagebox.showerror("Error", "No tickets available for this event")
+                return
 
-        # Show ticket selection dialog
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Select Ticket")
-        dialog.geometry("400x300")
-        dialog.configure(bg=DarkTheme.BG_PRIMARY)
-        dialog.transient(self.root)
-        dialog.grab_set()
+            # Show ticket selection dialog
+            dialog = tk.Toplevel(self.root)
+            dialog.title("Select Ticket")
+            dialog.geometry("440x320")
+            dialog.configure(bg=DarkTheme.BG_PRIMARY)
+            dialog.transient(self.root)
+            dialog.grab_set()
 
-        tk.Label(dialog, text="🎫 Select Ticket Type", bg=DarkTheme.BG_PRIMARY,
-                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 16, "bold")).pack(pady=20)
+            tk.Label(dialog, text="🎫 Select Ticket Type", bg=DarkTheme.BG_PRIMARY,
+                    fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 16, "bold")).pack(pady=20)
+
+            ticket_var = tk.StringVar()
+            for ticket_type, price in tickets:
+                rb = tk.Radiobutton(dialog, text=f"{ticket_type.upper()} - ${price}",
+                                   variable=ticket_var, value=ticket_type,
+                                   bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_PRIMARY,
+                                   selectcolor=DarkTheme.BG_TERTIARY,
+                                   font=("Segoe UI", 11),
+                                   activebackground=DarkTheme.BG_PRIMARY,
+                                   activeforeground=DarkTheme.ACCENT)
+                rb.pack(pady=8)
 
-        ticket_var = tk.StringVar()
-        for ticket_type, price in tickets:
-            rb = tk.Radiobutton(dialog, text=f"{ticket_type.upper()} - ${price}",
+            # Sold-out types can still be picked: that joins their waitlist
+            for ticket_type, price in sold_out:
+                tk.Radiobutton(dialog, text=f"{ticket_type.upper()} - ${price} (sold out, join waitlist)",
                                variable=ticket_var, value=ticket_type,
-                               bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_PRIMARY,
+                               bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
                                selectcolor=DarkTheme.BG_TERTIARY,
                                font=("Segoe UI", 11),
                                activebackground=DarkTheme.BG_PRIMARY,
-                               activeforeground=DarkTheme.ACCENT)
-            rb.pack(pady=8)
+                               activeforeground=DarkTheme.WARNING).pack(pady=8)
+            waitlist_types = {ticket_type for ticket_type, _ in sold_out}
 
-        if tickets:
-            ticket_var.set(tickets[0][0])
-
-        def confirm():
-            ticket_type = ticket_var.get()
-            success, msg = db.register_for_event(self.current_user, event_id, ticket_type)
-            if success:
-                messagebox.showinfo("Success", msg)
-                dialog.destroy()
-                self.show_browse_events()
-            else:
-                messagebox.showerror("Error", msg)
+            ticket_var.set(tickets[0][0] if tickets else sold_out[0][0])
 
-        HoverButton(dialog, text="Register Now", command=confirm).pack(pady=30)
-
-    def show_my_registrations(self):
-        self.set_active_menu(2)
-        self.clear_content()
-
-        header_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        header_frame.pack(fill=tk.X, padx=40, pady=(30, 20))
+            def confirm():
+                ticket_type = ticket_var.get()
+                if ticket_type in waitlist_types:
+                    join_waitlist(ticket_type)
+                    return
+                self.run_db(db.register_for_event, self.current_user, event_id, ticket_type,
+                            on_done=lambda result: on_registered(ticket_type, result), write=True)
 
-        tk.Label(header_frame, text="My Registrations", bg=DarkTheme.BG_PRIMARY,
-                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(side=tk.LEFT)
+            def on_registered(ticket_type, result):
+                success, msg = result
+                if success:
+                    messagebox.showinfo("Success", msg)
+                    dialog.destroy()
+                    self.show_browse_events()
+                elif "sold out" in msg and messagebox.askyesno(
+                        "Sold Out", f"{msg}\n\nJoin the waitlist? You will be registered automatically "
+                                    "as soon as a seat frees up."):
+                    join_waitlist(ticket_type)
+                else:
+                    messagebox.showerror("Error", msg)
 
-        regs = db.get_user_registrations(self.current_user)
+            def join_waitlist(ticket_type):
+                self.run_db(db.join_waitlist, self.current_user, event_id, ticket_type,
+                            on_done=on_joined, write=True)
 
-        if not regs:
-            tk.Label(self.main_content, text="You haven't registered for any events yet",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
-                    font=("Segoe UI", 12)).pack(pady=50)
-            return
+            def on_joined(result):
+                success, msg, position = result
+                if success:
+                    messagebox.showinfo("Success", msg if position is None else f"{msg} - you are #{position} in line")
+                    dialog.destroy()
+                    self.show_browse_events()
+                else:
+                    messagebox.showerror("Error", msg)
 
-        table_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 30))
+            HoverButton(dialog, text="Register Now", command=confirm).pack(pady=30)
 
-        columns = ("Reg ID", "Event", "Ticket", "Price", "Status")
-        tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=20)
+        self.run_db(db.get_tickets_for_event, event_id,
+                    on_done=lambda tickets: self.run_db(db.get_sold_out_ticket_types, event_id,
+                                                        on_done=lambda sold_out: open_dialog(tickets, sold_out)))
 
-        tree.heading("Reg ID", text="Reg ID")
-        tree.column("Reg ID", width=100, anchor=tk.CENTER)
-        tree.heading("Event", text="Event Name")
-        tree.column("Event", width=400)
-        tree.heading("Ticket", text="Ticket Type")
-        tree.column("Ticket", width=150, anchor=tk.CENTER)
-        tree.heading("Price", text="Price")
-        tree.column("Price", width=120, anchor=tk.CENTER)
-        tree.heading("Status", text="Status")
-        tree.column("Status", width=150, anchor=tk.CENTER)
+    def show_my_registrations(self):
+        self.show_screen("my_registrations", 2, self.build_my_registrations)
 
-        for reg in regs:
-            price = db.get_ticket_price(reg[3])
-            tree.insert("", tk.END, values=(reg[0], reg[1], reg[2].upper(), f"${price}", reg[4].upper()))
+    def build_my_registrations(self, screen):
+        header_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
+        header_frame.pack(fill=tk.X, padx=40, pady=(30, 20))
 
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+        tk.Label(header_frame, text="My Registrations", bg=DarkTheme.BG_PRIMARY,
+                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(side=tk.LEFT)
 
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        def refresh():
+            body = screen.new_body()
+            # Filled in by its own query; packed at the bottom so it stays
+            # below the registrations whichever query returns first
+            waitlist_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+            waitlist_frame.pack(side=tk.BOTTOM, fill=tk.X)
+            loading = self.show_loading(body)
 
-        # Action buttons for registrations
-        action_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        action_frame.pack(pady=20)
+            def render_waitlist(entries):
+                if not entries:
+                    return
+                tk.Label(waitlist_frame, text="⏳ Waitlist", bg=DarkTheme.BG_PRIMARY,
+                        fg=DarkTheme.WARNING, font=("Segoe UI", 16, "bold")).pack(anchor=tk.W, padx=40, pady=(10, 5))
+                tk.Label(waitlist_frame, text="You are registered automatically when a seat frees up",
+                        bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
+                        font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(0, 10))
+
+                table_frame = tk.Frame(waitlist_frame, bg=DarkTheme.BG_PRIMARY)
+                table_frame.pack(fill=tk.X, padx=40)
+
+                columns = ("Event ID", "Event", "Ticket", "Position", "Joined")
+                waitlist_tree = VirtualTreeview(table_frame, columns, height=4)
+                widths = [100, 400, 150, 120, 180]
+                for col, width in zip(columns, widths):
+                    waitlist_tree.heading(col, text=col)
+                    waitlist_tree.column(col, width=width, anchor=tk.W if col == "Event" else tk.CENTER)
+                waitlist_tree.set_source((entry[0], entry[1], entry[2].upper(), f"#{entry[3]}", entry[4])
+                                         for entry in entries)
+                waitlist_tree.pack(fill=tk.BOTH, expand=True)
+
+                def leave_waitlist():
+                    selection = waitlist_tree.selection()
+                    if not selection:
+                        messagebox.showerror("Error", "Please select a waitlist entry to leave")
+                        return
+                    vals = waitlist_tree.item(selection[0])['values']
+                    if messagebox.askyesno("Leave Waitlist", f"Give up your place in line for '{vals[1]}'?"):
+                        self.run_db(db.leave_waitlist, self.current_user, vals[0], on_done=on_left, write=True)
+
+                def on_left(result):
+                    success, msg = result
+                    if success:
+                        messagebox.showinfo("Success", msg)
+                        self.show_my_registrations()
+                    else:
+                        messagebox.showerror("Error", msg)
+
+                HoverButton(waitlist_frame, text="🚪 Leave Waitlist", command=leave_waitlist,
+                           bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(pady=(10, 30))
+
+            def render(regs):
+                loading.destroy()
+
+                if not regs:
+                    tk.Label(body, text="You haven't registered for any events yet",
+                            bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
+                            font=("Segoe UI", 12)).pack(pady=50)
+                    return
 
-        def modify_ticket():
-            selection = tree.selection()
-            if not selection:
-                messagebox.showerror("Error", "Please select a registration to modify")
-                return
-            
-            vals = tree.item(selection[0])['values']
-            reg_id = vals[0]
-            event_name = vals[1]
-            current_ticket = vals[2]
-            status = vals[4].lower()
-            
-            if status != 'registered':
-                messagebox.showerror("Error", "Can only modify registrations with 'registered' status")
-                return
-            
-            # Get event_id from registration
-            from func import get_connection
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT event_id FROM Registrations WHERE registration_id=%s", (reg_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            
-            if not result:
-                messagebox.showerror("Error", "Event not found")
-                return
+                table_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+                table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 30))
+
+                columns = ("Reg ID", "Event", "Ticket", "Price", "Status")
+                tree = VirtualTreeview(table_frame, columns, height=20)
+
+                tree.heading("Reg ID", text="Reg ID")
+                tree.column("Reg ID", width=100, anchor=tk.CENTER)
+                tree.heading("Event", text="Event Name")
+                tree.column("Event", width=400)
+                tree.heading("Ticket", text="Ticket Type")
+                tree.column("Ticket", width=150, anchor=tk.CENTER)
+                tree.heading("Price", text="Price")
+                tree.column("Price", width=120, anchor=tk.CENTER)
+                tree.heading("Status", text="Status")
+                tree.column("Status", width=150, anchor=tk.CENTER)
+
+                tree.set_source((reg[0], reg[1], reg[2].upper(), f"${reg[5]}", reg[4].upper()) for reg in regs)
+                tree.pack(fill=tk.BOTH, expand=True)
+
+                # Action buttons for registrations
+                action_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+                action_frame.pack(pady=20)
+
+                def modify_ticket():
+                    selection = tree.selection()
+                    if not selection:
+                        messagebox.showerror("Error", "Please select a registration to modify")
+                        return
             
-            event_id = result[0]
+                    vals = tree.item(selection[0])['values']
+                    reg_id = vals[0]
+                    event_name = vals[1]
+                    current_ticket = vals[2]
+                    status = vals[4].lower()
             
-            # Create dialog for ticket selection
-            dialog = tk.Toplevel(self.root)
-            dialog.title("Modify Ticket Type")
-            dialog.geometry("500x350")
-            dialog.configure(bg=DarkTheme.BG_PRIMARY)
-            dialog.transient(self.root)
-            dialog.grab_set()
+                    if status != 'registered':
+                        messagebox.showerror("Error", "Can only modify registrations with 'registered' status")
+                        return
             
-            tk.Label(dialog, text=f"Change Ticket for {event_name}", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 14, "bold")).pack(pady=15)
+                    # Get the open ticket types of this registration's event
+                    self.run_db(db.get_ticket_options_for_registration, reg_id,
+                                on_done=lambda options: open_ticket_dialog(reg_id, event_name, current_ticket, options))
+
+                def open_ticket_dialog(reg_id, event_name, current_ticket, tickets_with_id):
+                    if tickets_with_id is None:
+                        messagebox.showerror("Error", "Event not found")
+                        return
+
+                    if not tickets_with_id:
+                        messagebox.showerror("Error", "No available tickets for this event")
+                        return
             
-            tk.Label(dialog, text=f"Current Ticket: {current_ticket}", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 11)).pack(pady=5)
+                    # Create dialog for ticket selection
+                    dialog = tk.Toplevel(self.root)
+                    dialog.title("Modify Ticket Type")
+                    dialog.geometry("500x350")
+                    dialog.configure(bg=DarkTheme.BG_PRIMARY)
+                    dialog.transient(self.root)
+                    dialog.grab_set()
             
-            tk.Label(dialog, text="Select New Ticket Type", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=30, pady=(15, 5))
+                    tk.Label(dialog, text=f"Change Ticket for {event_name}", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 14, "bold")).pack(pady=15)
             
-            # Get ticket IDs
-            from func import get_connection
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT ticket_id, ticket_type, price FROM Tickets WHERE event_id=%s AND quantity_available>0", (event_id,))
-            tickets_with_id = cursor.fetchall()
-            cursor.close()
-            conn.close()
+                    tk.Label(dialog, text=f"Current Ticket: {current_ticket}", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 11)).pack(pady=5)
             
-            if not tickets_with_id:
-                messagebox.showerror("Error", "No available tickets for this event")
-                dialog.destroy()
-                return
+                    tk.Label(dialog, text="Select New Ticket Type", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=30, pady=(15, 5))
             
-            ticket_var = tk.StringVar()
-            ticket_frame = tk.Frame(dialog, bg=DarkTheme.BG_PRIMARY)
-            ticket_frame.pack(padx=30, pady=10, fill=tk.BOTH, expand=True)
+                    ticket_var = tk.StringVar()
+                    ticket_frame = tk.Frame(dialog, bg=DarkTheme.BG_PRIMARY)
+                    ticket_frame.pack(padx=30, pady=10, fill=tk.BOTH, expand=True)
             
-            for ticket_id, ticket_type, price in tickets_with_id:
-                rb = tk.Radiobutton(ticket_frame, text=f"{ticket_type} - ${price}",
-                                   variable=ticket_var, value=str(ticket_id),
-                                   bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_PRIMARY,
-                                   selectcolor=DarkTheme.BG_TERTIARY, font=("Segoe UI", 11),
-                                   activebackground=DarkTheme.BG_PRIMARY,
-                                   activeforeground=DarkTheme.ACCENT)
-                rb.pack(anchor=tk.W, pady=8)
+                    for ticket_id, ticket_type, price in tickets_with_id:
+                        rb = tk.Radiobutton(ticket_frame, text=f"{ticket_type} - ${price}",
+                                           variable=ticket_var, value=str(ticket_id),
+                                           bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_PRIMARY,
+                                           selectcolor=DarkTheme.BG_TERTIARY, font=("Segoe UI", 11),
+                                           activebackground=DarkTheme.BG_PRIMARY,
+                                           activeforeground=DarkTheme.ACCENT)
+                        rb.pack(anchor=tk.W, pady=8)
             
-            if tickets_with_id:
-                ticket_var.set(str(tickets_with_id[0][0]))
+                    if tickets_with_id:
+                        ticket_var.set(str(tickets_with_id[0][0]))
             
-            def confirm_change():
-                new_ticket_id = int(ticket_var.get())
-                success, msg = db.update_registration_ticket(reg_id, self.current_user, new_ticket_id)
-                if success:
-                    messagebox.showinfo("Success", msg)
-                    dialog.destroy()
-                    self.show_my_registrations()
-                else:
-                    messagebox.showerror("Error", msg)
+                    def confirm_change():
+                        new_ticket_id = int(ticket_var.get())
+                        self.run_db(db.update_registration_ticket, reg_id, self.current_user, new_ticket_id,
+                                    on_done=on_changed, write=True)
+
+                    def on_changed(result):
+                        success, msg = result
+                        if success:
+                            messagebox.showinfo("Success", msg)
+                            dialog.destroy()
+                            self.show_my_registrations()
+                        else:
+                            messagebox.showerror("Error", msg)
             
-            HoverButton(dialog, text="✓ Update Ticket", command=confirm_change).pack(pady=20)
+                    HoverButton(dialog, text="✓ Update Ticket", command=confirm_change).pack(pady=20)
 
-        def delete_registration():
-            selection = tree.selection()
-            if not selection:
-                messagebox.showerror("Error", "Please select a registration to delete")
-                return
+                def delete_registration():
+                    selection = tree.selection()
+                    if not selection:
+                        messagebox.showerror("Error", "Please select a registration to delete")
+                        return
             
-            vals = tree.item(selection[0])['values']
-            reg_id = vals[0]
-            event_name = vals[1]
-            status = vals[4].lower()
+                    vals = tree.item(selection[0])['values']
+                    reg_id = vals[0]
+                    event_name = vals[1]
+                    status = vals[4].lower()
             
-            if status != 'registered':
-                messagebox.showerror("Error", "Can only delete registrations with 'registered' status")
-                return
+                    if status != 'registered':
+                        messagebox.showerror("Error", "Can only delete registrations with 'registered' status")
+                        return
             
-            if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete registration for '{event_name}'?\n\nThis action cannot be undone."):
-                success, msg = db.delete_registration(reg_id, self.current_user)
-                if success:
-                    messagebox.showinfo("Success", msg)
-                    self.show_my_registrations()
-                else:
-                    messagebox.showerror("Error", msg)
-
-        HoverButton(action_frame, text="✏️ Modify Ticket Type", command=modify_ticket,
-                   bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(side=tk.LEFT, padx=8)
-        HoverButton(action_frame, text="🗑️ Delete Registration", command=delete_registration,
-                   bg=DarkTheme.DANGER, hover_bg="#c0392b").pack(side=tk.LEFT, padx=8)
-
+                    if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete registration for '{event_name}'?\n\nThis action cannot be undone."):
+                        self.run_db(db.delete_registration, reg_id, self.current_user, on_done=on_deleted, write=True)
+
+                def on_deleted(result):
+                    success, msg = result
+                    if success:
+                        messagebox.showinfo("Success", msg)
+                        self.show_my_registrations()
+                    else:
+                        messagebox.showerror("Error", msg)
+
+                def show_door_code():
+                    selection = tree.selection()
+                    if not selection:
+                        messagebox.showerror("Error", "Please select a registration")
+                        return
+                    vals = tree.item(selection[0])['values']
+                    self.run_db(db.get_registration_code, vals[0], self.current_user,
+                                on_done=lambda result: show_code(vals[1], result))
+
+                def show_code(event_name, result):
+                    success, msg, code = result
+                    if not success:
+                        messagebox.showerror("Error", msg)
+                        return
+                    self.root.clipboard_clear()
+                    self.root.clipboard_append(code)
+                    messagebox.showinfo("Door Code", f"{event_name}\n\n{code}\n\n"
+                                        "Show this code at the entrance. It has been copied to the clipboard.")
+
+                HoverButton(action_frame, text="🎫 Door Code", command=show_door_code).pack(side=tk.LEFT, padx=8)
+                HoverButton(action_frame, text="✏️ Modify Ticket Type", command=modify_ticket,
+                           bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(side=tk.LEFT, padx=8)
+                HoverButton(action_frame, text="🗑️ Delete Registration", command=delete_registration,
+                           bg=DarkTheme.DANGER, hover_bg="#c0392b").pack(side=tk.LEFT, padx=8)
+
+            self.run_db(db.get_user_registrations, self.current_user, on_done=render)
+            self.run_db(db.get_user_waitlist, self.current_user, on_done=render_waitlist)
+
+        return refresh
 
     def show_payment_screen(self):
-        self.set_active_menu(3)
-        self.clear_content()
+        self.show_screen("payment", 3, self.build_payment_screen)
 
-        tk.Label(self.main_content, text="Make Payment", bg=DarkTheme.BG_PRIMARY,
+    def build_payment_screen(self, screen):
+        tk.Label(screen.frame, text="Make Payment", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(anchor=tk.W, padx=40, pady=(30, 10))
 
-        regs = db.get_unpaid_registrations(self.current_user)
-
-        if not regs:
-            tk.Label(self.main_content, text="No unpaid registrations found. All payments are up to date! ✓",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
-                    font=("Segoe UI", 12)).pack(pady=50)
-            return
-
-        # Payment form in center
-        form_container = tk.Frame(self.main_content, bg=DarkTheme.BG_CARD, bd=0)
-        form_container.place(relx=0.5, rely=0.5, anchor=tk.CENTER, width=600, height=600)
-
-        tk.Label(form_container, text="💳 Payment Details", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 18, "bold")).pack(pady=20)
-
-        # Registration Selection
-        tk.Label(form_container, text="Select Registration", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
-
-        reg_options = [f"RegID {r[0]} - {r[1]} ({r[2]}) - {r[4]}" for r in regs]
-        reg_var = tk.StringVar(value=reg_options[0])
-
-        reg_combo = ttk.Combobox(form_container, textvariable=reg_var, values=reg_options,
-                                state="readonly", width=50, font=("Segoe UI", 10))
-        reg_combo.pack(padx=40, pady=(0, 15))
-
-        # Price Display
-        tk.Label(form_container, text="Amount to Pay", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
-
-        price_label = tk.Label(form_container, text="$0.00", bg=DarkTheme.BG_CARD,
-                              fg=DarkTheme.ACCENT, font=("Segoe UI", 24, "bold"))
-        price_label.pack(padx=40, pady=(0, 15))
+        def refresh():
+            body = screen.new_body()
+            loading = self.show_loading(body)
 
-        # Payment Method
-        tk.Label(form_container, text="Payment Method", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
+            def render(regs):
+                loading.destroy()
 
-        payment_var = tk.StringVar(value="credit_card")
-        payment_methods = [
-            ("💳 Credit Card", "credit_card"),
-            ("💳 Debit Card", "debit_card"),
-            ("🅿️ PayPal", "paypal"),
-            ("📱 UPI", "upi")
-        ]
-
-        method_frame = tk.Frame(form_container, bg=DarkTheme.BG_CARD)
-        method_frame.pack(padx=40, pady=(0, 15))
-
-        for text, value in payment_methods:
-            rb = tk.Radiobutton(method_frame, text=text, variable=payment_var, value=value,
-                               bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_PRIMARY,
-                               selectcolor=DarkTheme.BG_TERTIARY, font=("Segoe UI", 10),
-                               activebackground=DarkTheme.BG_CARD,
-                               activeforeground=DarkTheme.ACCENT)
-            rb.pack(anchor=tk.W, pady=3)
-
-        def update_price(*args):
-            selected = reg_var.get()
-            # Extract reg_id from the string (e.g., "RegID 123 - Event Name...")
-            try:
-                reg_id = int(selected.split()[1])
-                # Find the corresponding ticket_id (index 3) from the regs list
-                ticket_id = next(r[3] for r in regs if r[0] == reg_id)
-                price = db.get_ticket_price(ticket_id)
-                price_label.config(text=f"${price}")
-            except (IndexError, ValueError, StopIteration):
-                 price_label.config(text="$0.00")
-
-
-        reg_combo.bind("<<ComboboxSelected>>", update_price)
-        update_price()
-
-        def process_payment():
-            selected = reg_var.get()
-            reg_id = int(selected.split()[1])
-            amount_text = price_label.cget("text")
-            if amount_text.strip() == "$0.00":
-                messagebox.showerror("Error", "Please select a valid registration with a price.")
-                return
-
-            try:
-                amount = float(amount_text.replace('$',''))
-            except ValueError:
-                messagebox.showerror("Error", "Invalid amount detected.")
-                return
-
-            method = payment_var.get()
-
-            success, msg = db.make_payment(self.current_user, reg_id, amount, method)
-            if success:
-                # Update status to 'attended' after successful payment
-                db.update_registration_status(reg_id, "attended")
-                messagebox.showinfo("Success", msg)
-                self.show_payment_screen()
-            else:
-                messagebox.showerror("Error", msg)
+                if not regs:
+                    tk.Label(body, text="No unpaid registrations found. All payments are up to date! ✓",
+                            bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
+                            font=("Segoe UI", 12)).pack(pady=50)
+                    return
 
-        # Payment Button - Ensure it's visible!
-        HoverButton(form_container, text="💰 Process Payment", command=process_payment).pack(pady=15)
+                # Payment form in center
+                form_container = tk.Frame(body, bg=DarkTheme.BG_CARD, bd=0)
+                form_container.place(relx=0.5, rely=0.5, anchor=tk.CENTER, width=600, height=600)
+
+                tk.Label(form_container, text="💳 Payment Details", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 18, "bold")).pack(pady=20)
+
+                # Registration Selection
+                tk.Label(form_container, text="Select Registration", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
+
+                reg_options = [f"RegID {r[0]} - {r[1]} ({r[2]}) - {r[4]}" for r in regs]
+                reg_var = tk.StringVar(value=reg_options[0])
+
+                reg_combo = ttk.Combobox(form_container, textvariable=reg_var, values=reg_options,
+                                        state="readonly", width=50, font=("Segoe UI", 10))
+                reg_combo.pack(padx=40, pady=(0, 15))
+
+                # Price Display
+                tk.Label(form_container, text="Amount to Pay", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
+
+                price_label = tk.Label(form_container, text="$0.00", bg=DarkTheme.BG_CARD,
+                                      fg=DarkTheme.ACCENT, font=("Segoe UI", 24, "bold"))
+                price_label.pack(padx=40, pady=(0, 15))
+
+                # Payment Method
+                tk.Label(form_container, text="Payment Method", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
+
+                payment_var = tk.StringVar(value="credit_card")
+                payment_methods = [
+                    ("💳 Credit Card", "credit_card"),
+                    ("💳 Debit Card", "debit_card"),
+                    ("🅿️ PayPal", "paypal"),
+                    ("📱 UPI", "upi")
+                ]
+
+                method_frame = tk.Frame(form_container, bg=DarkTheme.BG_CARD)
+                method_frame.pack(padx=40, pady=(0, 15))
+
+                for text, value in payment_methods:
+                    rb = tk.Radiobutton(method_frame, text=text, variable=payment_var, value=value,
+                                       bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_PRIMARY,
+                                       selectcolor=DarkTheme.BG_TERTIARY, font=("Segoe UI", 10),
+                                       activebackground=DarkTheme.BG_CARD,
+                                       activeforeground=DarkTheme.ACCENT)
+                    rb.pack(anchor=tk.W, pady=3)
+
+                def update_price(*args):
+                    selected = reg_var.get()
+                    # Extract reg_id from the string (e.g., "RegID 123 - Event Name...")
+                    try:
+                        reg_id = int(selected.split()[1])
+                        # Price (index 5) comes back with the registration rows
+                        price = next(r[5] for r in regs if r[0] == reg_id)
+                        price_label.config(text=f"${price}")
+                    except (IndexError, ValueError, StopIteration):
+                         price_label.config(text="$0.00")
+
+
+                reg_combo.bind("<<ComboboxSelected>>", update_price)
+                update_price()
+
+                # One idempotency key per registration for the life of this form:
+                # pressing the button again after an error or a slow response
+                # can't charge twice
+                payment_keys = {}
+
+                def process_payment():
+                    selected = reg_var.get()
+                    reg_id = int(selected.split()[1])
+                    if price_label.cget("text").strip() == "$0.00":
+                        messagebox.showerror("Error", "Please select a valid registration with a price.")
+                        return
+
+                    method = payment_var.get()
+                    key = payment_keys.setdefault(reg_id, uuid.uuid4().hex)
+
+                    def on_paid(result):
+                        success, msg, amount = result
+                        if success:
+                            # The amount charged is the price on record, which may differ from the label
+                            messagebox.showinfo("Success", f"{msg}: ${amount}")
+                            self.show_payment_screen()
+                        else:
+                            messagebox.showerror("Error", msg)
+
+                    self.run_db(db.make_payment, self.current_user, reg_id, method, key, on_done=on_paid, write=True)
+
+                # Payment Button - Ensure it's visible!
+                HoverButton(form_container, text="💰 Process Payment", command=process_payment).pack(pady=15)
+
+            self.run_db(db.get_unpaid_registrations, self.current_user, on_done=render)
+
+        return refresh
 
     def show_feedback_screen(self):
-        self.set_active_menu(4)
-        self.clear_content()
+        self.show_screen("feedback", 4, self.build_feedback_screen)
 
-        tk.Label(self.main_content, text="Give Feedback", bg=DarkTheme.BG_PRIMARY,
+    def build_feedback_screen(self, screen):
+        tk.Label(screen.frame, text="Give Feedback", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(anchor=tk.W, padx=40, pady=(30, 10))
 
-        attended_events = db.get_attended_events(self.current_user)
+        def refresh():
+            body = screen.new_body()
+            loading = self.show_loading(body)
 
-        if not attended_events:
-            tk.Label(self.main_content, text="You haven't attended any events yet",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
-                    font=("Segoe UI", 12)).pack(pady=50)
-            return
+            def render(attended_events):
+                loading.destroy()
 
-        # Feedback form
-        form_container = tk.Frame(self.main_content, bg=DarkTheme.BG_CARD, bd=0)
-        form_container.place(relx=0.5, rely=0.5, anchor=tk.CENTER, width=700, height=550)
-
-        tk.Label(form_container, text="⭐ Share Your Experience", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 18, "bold")).pack(pady=30)
-
-        # Event Selection
-        tk.Label(form_container, text="Select Event", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
-
-        event_options = [f"{e[0]} - {e[1]}" for e in attended_events]
-        event_var = tk.StringVar(value=event_options[0])
-
-        event_combo = ttk.Combobox(form_container, textvariable=event_var, values=event_options,
-                                   state="readonly", width=60, font=("Segoe UI", 10))
-        event_combo.pack(padx=40, pady=(0, 20))
-
-        # Rating
-        tk.Label(form_container, text="Rating (1-5 stars)", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
-
-        rating_frame = tk.Frame(form_container, bg=DarkTheme.BG_CARD)
-        rating_frame.pack(padx=40, pady=(0, 20))
-
-        rating_var = tk.IntVar(value=5)
-        for i in range(1, 6):
-            rb = tk.Radiobutton(rating_frame, text=f"{'⭐' * i}", variable=rating_var, value=i,
-                               bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_PRIMARY,
-                               selectcolor=DarkTheme.BG_TERTIARY, font=("Segoe UI", 12),
-                               activebackground=DarkTheme.BG_CARD,
-                               activeforeground=DarkTheme.ACCENT)
-            rb.pack(side=tk.LEFT, padx=10)
-
-        # Comments
-        tk.Label(form_container, text="Comments", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
-
-        comments_text = tk.Text(form_container, height=8, width=60, bg=DarkTheme.BG_TERTIARY,
-                               fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 10),
-                               relief=tk.FLAT, insertbackground=DarkTheme.TEXT_PRIMARY,
-                               wrap=tk.WORD)
-        comments_text.pack(padx=40, pady=(0, 20))
-
-        # Load existing feedback if available
-        def load_existing_feedback(*args):
-            selected = event_var.get()
-            event_id = int(selected.split(" - ")[0])
-            existing = db.get_user_feedback(self.current_user, event_id)
-            
-            if existing:
-                rating_var.set(existing[0])
-                comments_text.delete("1.0", tk.END)
-                comments_text.insert("1.0", existing[1])
-                submit_btn.config(text="📝 Update Feedback")
-                delete_btn.pack(side=tk.LEFT, padx=10)
-            else:
-                rating_var.set(5)
-                comments_text.delete("1.0", tk.END)
-                submit_btn.config(text="Submit Feedback")
-                delete_btn.pack_forget()
+                if not attended_events:
+                    tk.Label(body, text="You haven't attended any events yet",
+                            bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
+                            font=("Segoe UI", 12)).pack(pady=50)
+                    return
+
+                # Feedback form
+                form_container = tk.Frame(body, bg=DarkTheme.BG_CARD, bd=0)
+                form_container.place(relx=0.5, rely=0.5, anchor=tk.CENTER, width=700, height=550)
+
+                tk.Label(form_container, text="⭐ Share Your Experience", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 18, "bold")).pack(pady=30)
+
+                # Event Selection
+                tk.Label(form_container, text="Select Event", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
+
+                event_options = [f"{e[0]} - {e[1]}" for e in attended_events]
+                event_var = tk.StringVar(value=event_options[0])
+
+                event_combo = ttk.Combobox(form_container, textvariable=event_var, values=event_options,
+                                           state="readonly", width=60, font=("Segoe UI", 10))
+                event_combo.pack(padx=40, pady=(0, 20))
+
+                # Rating
+                tk.Label(form_container, text="Rating (1-5 stars)", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
+
+                rating_frame = tk.Frame(form_container, bg=DarkTheme.BG_CARD)
+                rating_frame.pack(padx=40, pady=(0, 20))
+
+                rating_var = tk.IntVar(value=5)
+                for i in range(1, 6):
+                    rb = tk.Radiobutton(rating_frame, text=f"{'⭐' * i}", variable=rating_var, value=i,
+                                       bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_PRIMARY,
+                                       selectcolor=DarkTheme.BG_TERTIARY, font=("Segoe UI", 12),
+                                       activebackground=DarkTheme.BG_CARD,
+                                       activeforeground=DarkTheme.ACCENT)
+                    rb.pack(side=tk.LEFT, padx=10)
+
+                # Comments
+                tk.Label(form_container, text="Comments", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(10, 5))
+
+                comments_text = tk.Text(form_container, height=8, width=60, bg=DarkTheme.BG_TERTIARY,
+                                       fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 10),
+                                       relief=tk.FLAT, insertbackground=DarkTheme.TEXT_PRIMARY,
+                                       wrap=tk.WORD)
+                comments_text.pack(padx=40, pady=(0, 20))
+
+                # Load existing feedback if available
+                def load_existing_feedback(*args):
+                    selected = event_var.get()
+                    event_id = int(selected.split(" - ")[0])
+                    self.run_db(db.get_user_feedback, self.current_user, event_id,
+                                on_done=lambda existing: show_existing_feedback(event_id, existing))
+
+                def show_existing_feedback(event_id, existing):
+                    if int(event_var.get().split(" - ")[0]) != event_id:
+                        return  # user picked another event while this one was loading
+
+                    if existing:
+                        rating_var.set(existing[0])
+                        comments_text.delete("1.0", tk.END)
+                        comments_text.insert("1.0", existing[1])
+                        submit_btn.config(text="📝 Update Feedback")
+                        delete_btn.pack(side=tk.LEFT, padx=10)
+                    else:
+                        rating_var.set(5)
+                        comments_text.delete("1.0", tk.END)
+                        submit_btn.config(text="Submit Feedback")
+                        delete_btn.pack_forget()
         
-        event_combo.bind("<<ComboboxSelected>>", load_existing_feedback)
+                event_combo.bind("<<ComboboxSelected>>", load_existing_feedback)
+
+                def submit_feedback():
+                    selected = event_var.get()
+                    event_id = int(selected.split(" - ")[0])
+                    rating = rating_var.get()
+                    comments = comments_text.get("1.0", tk.END).strip()
+
+                    if not comments:
+                        messagebox.showerror("Error", "Please enter your comments")
+                        return
+
+                    # Check if updating or creating new
+                    def save(existing):
+                        if existing:
+                            self.run_db(db.update_feedback, self.current_user, event_id, rating, comments,
+                                        on_done=on_saved, write=True)
+                        else:
+                            self.run_db(db.give_feedback, self.current_user, event_id, rating, comments,
+                                        on_done=on_saved, write=True)
+
+                    self.run_db(db.get_user_feedback, self.current_user, event_id, on_done=save)
+
+                def on_saved(result):
+                    success, msg = result
+                    if success:
+                        messagebox.showinfo("Success", msg)
+                        self.show_feedback_screen()
+                    else:
+                        messagebox.showerror("Error", msg)
+
+                def delete_feedback():
+                    selected = event_var.get()
+                    event_id = int(selected.split(" - ")[0])
+                    event_name = selected.split(" - ")[1]
+            
+                    if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete your feedback for '{event_name}'?"):
+                        self.run_db(db.delete_feedback, self.current_user, event_id, on_done=on_saved, write=True)
 
-        def submit_feedback():
-            selected = event_var.get()
-            event_id = int(selected.split(" - ")[0])
-            rating = rating_var.get()
-            comments = comments_text.get("1.0", tk.END).strip()
+                button_frame = tk.Frame(form_container, bg=DarkTheme.BG_CARD)
+                button_frame.pack(pady=10)
 
-            if not comments:
-                messagebox.showerror("Error", "Please enter your comments")
-                return
+                submit_btn = HoverButton(button_frame, text="Submit Feedback", command=submit_feedback)
+                submit_btn.pack(side=tk.LEFT, padx=10)
 
-            # Check if updating or creating new
-            existing = db.get_user_feedback(self.current_user, event_id)
-            
-            if existing:
-                success, msg = db.update_feedback(self.current_user, event_id, rating, comments)
-            else:
-                success, msg = db.give_feedback(self.current_user, event_id, rating, comments)
-            
-            if success:
-                messagebox.showinfo("Success", msg)
-                self.show_feedback_screen()
-            else:
-                messagebox.showerror("Error", msg)
-
-        def delete_feedback():
-            selected = event_var.get()
-            event_id = int(selected.split(" - ")[0])
-            event_name = selected.split(" - ")[1]
-            
-            if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete your feedback for '{event_name}'?"):
-                success, msg = db.delete_feedback(self.current_user, event_id)
-                if success:
-                    messagebox.showinfo("Success", msg)
-                    self.show_feedback_screen()
-                else:
-                    messagebox.showerror("Error", msg)
+                delete_btn = HoverButton(button_frame, text="🗑️ Delete Feedback", command=delete_feedback,
+                                         bg=DarkTheme.DANGER, hover_bg="#c0392b")
+                # delete_btn will be packed conditionally by load_existing_feedback
+        
+                # Load feedback for first event
+                load_existing_feedback()
 
-        button_frame = tk.Frame(form_container, bg=DarkTheme.BG_CARD)
-        button_frame.pack(pady=10)
+            # ==================== ORGANIZER SCREENS ====================
 
-        submit_btn = HoverButton(button_frame, text="Submit Feedback", command=submit_feedback)
-        submit_btn.pack(side=tk.LEFT, padx=10)
+            self.run_db(db.get_attended_events, self.current_user, on_done=render)
 
-        delete_btn = HoverButton(button_frame, text="🗑️ Delete Feedback", command=delete_feedback,
-                                 bg=DarkTheme.DANGER, hover_bg="#c0392b")
-        # delete_btn will be packed conditionally by load_existing_feedback
-        
-        # Load feedback for first event
-        load_existing_feedback()
+        return refresh
 
-    # ==================== ORGANIZER SCREENS ====================
     def show_organizer_dashboard(self):
-        self.set_active_menu(0)
-        self.clear_content()
+        self.show_screen("organizer_dashboard", 0, self.build_organizer_dashboard)
 
-        tk.Label(self.main_content, text="Organizer Dashboard", bg=DarkTheme.BG_PRIMARY,
+    def build_organizer_dashboard(self, screen):
+        tk.Label(screen.frame, text="Organizer Dashboard", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(anchor=tk.W, padx=40, pady=(30, 10))
 
-        tk.Label(self.main_content, text="Manage your events and track performance.",
+        tk.Label(screen.frame, text="Manage your events and track performance.",
                 bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
                 font=("Segoe UI", 11)).pack(anchor=tk.W, padx=40, pady=(0, 30))
 
         # Stats Cards
-        cards_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
+        cards_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
         cards_frame.pack(fill=tk.X, padx=40, pady=20)
 
-        events = db.get_organizer_events(self.current_user)
-        analytics = db.get_organizer_analytics(self.current_user)
-
-        total_revenue = sum(a['total_revenue'] for a in analytics) if analytics else 0
-        avg_rating = sum(a['avg_rating'] for a in analytics) / len(analytics) if analytics else 0
-
         stats = [
-            ("🎪", "Total Events", len(events) if events else 0, DarkTheme.ACCENT),
-            ("💰", "Total Revenue", f"${total_revenue:.2f}", DarkTheme.SUCCESS),
-            ("⭐", "Avg Rating", f"{avg_rating:.1f}/5.0", DarkTheme.WARNING),
+            ("🎪", "Total Events", DarkTheme.ACCENT),
+            ("💰", "Total Revenue", DarkTheme.SUCCESS),
+            ("⭐", "Avg Rating", DarkTheme.WARNING),
         ]
 
-        for icon, label, value, color in stats:
+        value_labels = []
+        for icon, label, color in stats:
             card = tk.Frame(cards_frame, bg=DarkTheme.BG_CARD, bd=0, relief=tk.FLAT)
             card.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
 
             tk.Label(card, text=icon, bg=DarkTheme.BG_CARD, font=("Segoe UI", 36)).pack(pady=(25, 10))
-            tk.Label(card, text=str(value), bg=DarkTheme.BG_CARD, fg=color,
-                    font=("Segoe UI", 28, "bold")).pack()
+            value_label = tk.Label(card, text="…", bg=DarkTheme.BG_CARD, fg=color,
+                                   font=("Segoe UI", 28, "bold"))
+            value_label.pack()
+            value_labels.append(value_label)
             tk.Label(card, text=label, bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
                     font=("Segoe UI", 10)).pack(pady=(5, 25))
 
+        events_label, revenue_label, rating_label = value_labels
+
+        def fill(summary):
+            events_label.config(text=str(summary["events"]))
+            revenue_label.config(text=f"${summary['total_revenue']:.2f}")
+            rating_label.config(text=f"{summary['avg_rating']:.1f}/5.0")
+
+        def refresh():
+            self.run_db(db.get_organizer_summary, self.current_user, on_done=fill)
+
+        return refresh
+
     def show_my_events(self):
-        self.set_active_menu(1)
-        self.clear_content()
+        self.show_screen("my_events", 1, self.build_my_events)
 
-        header_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
+    def build_my_events(self, screen):
+        header_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
         header_frame.pack(fill=tk.X, padx=40, pady=(30, 20))
 
         tk.Label(header_frame, text="My Events", bg=DarkTheme.BG_PRIMARY,
@@ -1375,76 +1998,110 @@ class EventManagementApp:
         HoverButton(header_frame, text="➕ Create New Event",
                    command=self.create_event_flow).pack(side=tk.RIGHT)
 
-        events = db.get_organizer_events(self.current_user)
-
-        if not events:
-            tk.Label(self.main_content, text="You haven't created any events yet",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
-                    font=("Segoe UI", 12)).pack(pady=50)
-            return
-
-        table_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 30))
-
-        columns = ("ID", "Name", "Date", "Description", "Location")
-        tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=18)
-
-        tree.heading("ID", text="ID")
-        tree.column("ID", width=70, anchor=tk.CENTER)
-        tree.heading("Name", text="Event Name")
-        tree.column("Name", width=250)
-        tree.heading("Date", text="Date")
-        tree.column("Date", width=150, anchor=tk.CENTER)
-        tree.heading("Description", text="Description")
-        tree.column("Description", width=400)
-        tree.heading("Location", text="Loc ID")
-        tree.column("Location", width=80, anchor=tk.CENTER)
-
-        for row in events:
-            tree.insert("", tk.END, values=row)
-
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # Action buttons
-        action_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        action_frame.pack(pady=20)
-
-        def modify_event():
-            selection = tree.selection()
-            if not selection:
-                messagebox.showerror("Error", "Please select an event to modify")
-                return
-            event_id = tree.item(selection[0])['values'][0]
-            self.modify_event_flow(event_id)
-
-        def delete_event():
-            selection = tree.selection()
-            if not selection:
-                messagebox.showerror("Error", "Please select an event to delete")
-                return
-            event_id = tree.item(selection[0])['values'][0]
+        def refresh():
+            body = screen.new_body()
+            loading = self.show_loading(body)
 
-            if not db.check_event_ownership(event_id, self.current_user):
-                messagebox.showerror("Permission Denied", "You can only delete events you organize.")
-                return
+            def render(events):
+                loading.destroy()
 
-            if messagebox.askyesno("Confirm Delete",
-                                  f"Delete Event ID {event_id} and ALL related data?"):
-                success, msg = db.delete_event_cascading(event_id)
-                if success:
-                    messagebox.showinfo("Success", msg)
-                    self.show_my_events()
-                else:
-                    messagebox.showerror("Error", msg)
+                if not events:
+                    tk.Label(body, text="You haven't created any events yet",
+                            bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
+                            font=("Segoe UI", 12)).pack(pady=50)
+                    return
 
-        HoverButton(action_frame, text="✏️ Modify", command=modify_event,
-                   bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(side=tk.LEFT, padx=10)
-        HoverButton(action_frame, text="🗑️ Delete", command=delete_event,
-                   bg=DarkTheme.DANGER, hover_bg="#c0392b").pack(side=tk.LEFT, padx=10)
+                table_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+                table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 30))
+
+                columns = ("ID", "Name", "Date", "Description", "Location")
+                tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=18)
+
+                tree.heading("ID", text="ID")
+                tree.column("ID", width=70, anchor=tk.CENTER)
+                tree.heading("Name", text="Event Name")
+                tree.column("Name", width=250)
+                tree.heading("Date", text="Date")
+                tree.column("Date", width=150, anchor=tk.CENTER)
+                tree.heading("Description", text="Description")
+                tree.column("Description", width=400)
+                tree.heading("Location", text="Loc ID")
+                tree.column("Location", width=80, anchor=tk.CENTER)
+
+                for row in events:
+                    tree.insert("", tk.END, values=row)
+
+                scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+                tree.configure(yscrollcommand=scrollbar.set)
+
+                tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+                scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+                # Action buttons
+                action_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+                action_frame.pack(pady=20)
+
+                def modify_event():
+                    selection = tree.selection()
+                    if not selection:
+                        messagebox.showerror("Error", "Please select an event to modify")
+                        return
+                    event_id = tree.item(selection[0])['values'][0]
+                    self.modify_event_flow(event_id)
+
+                def delete_event():
+                    selection = tree.selection()
+                    if not selection:
+                        messagebox.showerror("Error", "Please select an event to delete")
+                        return
+                    event_id = tree.item(selection[0])['values'][0]
+
+                    def confirm_delete(is_owner):
+                        if not is_owner:
+                            messagebox.showerror("Permission Denied", "You can only delete events you organize.")
+                            return
+
+                        if not messagebox.askyesno("Confirm Delete",
+                                                   f"Delete Event ID {event_id} and ALL related data?"):
+                            return
+                        status = tk.Label(action_frame, text="⏳ Deleting...", bg=DarkTheme.BG_PRIMARY,
+                                          fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 9))
+                        status.pack(side=tk.LEFT, padx=10)
+                        latest = {}
+
+                        def progress(table, done, total):  # called on the DB worker thread
+                            latest["text"] = f"⏳ Deleting {table.replace('_', ' ').lower()}: {done:,} / {total:,}"
+
+                        def show_progress():
+                            if status.winfo_exists():
+                                status.config(text=latest.get("text", status.cget("text")))
+                                status.after(200, show_progress)
+
+                        def done(result):
+                            status.destroy()
+                            on_deleted(result)
+
+                        show_progress()
+                        self.run_db(db.delete_event_cascading, event_id, progress, on_done=done, write=True)
+
+                    self.run_db(db.check_event_ownership, event_id, self.current_user, on_done=confirm_delete)
+
+                def on_deleted(result):
+                    success, msg = result
+                    if success:
+                        messagebox.showinfo("Success", msg)
+                        self.show_my_events()
+                    else:
+                        messagebox.showerror("Error", msg)
+
+                HoverButton(action_frame, text="✏️ Modify", command=modify_event,
+                           bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(side=tk.LEFT, padx=10)
+                HoverButton(action_frame, text="🗑️ Delete", command=delete_event,
+                           bg=DarkTheme.DANGER, hover_bg="#c0392b").pack(side=tk.LEFT, padx=10)
+
+            self.run_db(db.get_organizer_events, self.current_user, on_done=render)
+
+        return refresh
 
     def create_event_flow(self):
         # Simple dialog for event creation
@@ -1484,9 +2141,19 @@ class EventManagementApp:
                 messagebox.showerror("Error", "Please fill all fields")
                 return
 
-            loc_id = db.get_location_id(location)
-            success, msg, event_id = db.create_event(self.current_user, name, desc, date, loc_id)
+            def with_location(loc_id):
+                if loc_id is None:
+                    # New location: prompt here, insert on the worker
+                    self.run_db(db.create_location, location, *db.ask_location_details(),
+                                on_done=with_location, write=True)
+                    return
+                self.run_db(db.create_event, self.current_user, name, desc, date, loc_id,
+                            on_done=on_created, write=True)
+
+            self.run_db(db.find_location_id, location, on_done=with_location)
 
+        def on_created(result):
+            success, msg, event_id = result
             if success:
                 messagebox.showinfo("Success", f"Event created! Now add tickets.")
                 dialog.destroy()
@@ -1525,7 +2192,11 @@ class EventManagementApp:
                 messagebox.showerror("Error", f"Invalid ticket type. Choose from: {', '.join(VALID_TICKET_TYPES)}")
                 return
 
-            ok, msg = db.add_ticket_type(event_id, ticket_type.lower(), price, quantity)
+            self.run_db(db.add_ticket_type, event_id, ticket_type.lower(), price, quantity,
+                        on_done=on_added, write=True)
+
+        def on_added(result):
+            ok, msg = result
             if ok:
                 messagebox.showinfo("Success", msg)
                 ticket_added[0] = True
@@ -1566,11 +2237,15 @@ class EventManagementApp:
                    bg=DarkTheme.SUCCESS, hover_bg="#0d9668").pack(pady=20)
 
     def modify_event_flow(self, event_id):
-        if not db.check_event_ownership(event_id, self.current_user):
-            messagebox.showerror("Permission Denied", "You can only modify your own events")
-            return
+        def check_owner(is_owner):
+            if not is_owner:
+                messagebox.showerror("Permission Denied", "You can only modify your own events")
+                return
+            self.run_db(db.get_event_details, event_id, on_done=lambda current: self.open_modify_event_dialog(event_id, current))
+
+        self.run_db(db.check_event_ownership, event_id, self.current_user, on_done=check_owner)
 
-        current = db.get_event_details(event_id)
+    def open_modify_event_dialog(self, event_id, current):
         if not current:
             messagebox.showerror("Error", "Event not found")
             return
@@ -1605,7 +2280,10 @@ class EventManagementApp:
             desc = entries['description'].get()
             date = entries['event_date'].get()
 
-            success, msg = db.update_event(event_id, name, desc, date)
+            self.run_db(db.update_event, event_id, name, desc, date, on_done=on_updated, write=True)
+
+        def on_updated(result):
+            success, msg = result
             if success:
                 messagebox.showinfo("Success", msg)
                 dialog.destroy()
@@ -1616,63 +2294,88 @@ class EventManagementApp:
         HoverButton(dialog, text="Update Event", command=submit).pack(pady=30)
 
     def show_schedules(self):
-        self.set_active_menu(2)
-        self.clear_content()
+        self.show_screen("schedules", 2, self.build_schedules)
 
-        tk.Label(self.main_content, text="Event Schedules", bg=DarkTheme.BG_PRIMARY,
+    def build_schedules(self, screen):
+        tk.Label(screen.frame, text="Event Schedules", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(anchor=tk.W, padx=40, pady=(30, 20))
 
-        tk.Label(self.main_content, text="💡 Select an event to view and manage its schedules",
+        tk.Label(screen.frame, text="💡 Select an event to view and manage its schedules",
                 bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
                 font=("Segoe UI", 11)).pack(anchor=tk.W, padx=40, pady=(0, 20))
 
         # Get organizer's events for combobox
-        my_events = db.get_organizer_events(self.current_user)
+        def refresh():
+            body = screen.new_body()
+            loading = self.show_loading(body)
+
+            def render(my_events):
+                loading.destroy()
         
-        if not my_events:
-            tk.Label(self.main_content, text="You don't have any events yet. Create an event first.",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
-                    font=("Segoe UI", 12)).pack(pady=50)
-            return
+                if not my_events:
+                    tk.Label(body, text="You don't have any events yet. Create an event first.",
+                            bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
+                            font=("Segoe UI", 12)).pack(pady=50)
+                    return
 
-        # Input form
-        input_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_CARD)
-        input_frame.pack(padx=40, pady=20, fill=tk.X)
+                # Input form
+                input_frame = tk.Frame(body, bg=DarkTheme.BG_CARD)
+                input_frame.pack(padx=40, pady=20, fill=tk.X)
 
-        tk.Label(input_frame, text="Select Event:", bg=DarkTheme.BG_CARD,
-                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 11)).pack(side=tk.LEFT, padx=20, pady=15)
+                tk.Label(input_frame, text="Select Event:", bg=DarkTheme.BG_CARD,
+                        fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 11)).pack(side=tk.LEFT, padx=20, pady=15)
 
-        event_options = [f"{e[0]} - {e[1]}" for e in my_events]
-        event_var = tk.StringVar(value=event_options[0] if event_options else "")
-        event_combo = ttk.Combobox(input_frame, textvariable=event_var, values=event_options,
-                                   state="readonly", width=50, font=("Segoe UI", 10))
-        event_combo.pack(side=tk.LEFT, padx=10, ipady=5)
+                event_options = [f"{e[0]} - {e[1]}" for e in my_events]
+                event_var = tk.StringVar(value=event_options[0] if event_options else "")
+                event_combo = ttk.Combobox(input_frame, textvariable=event_var, values=event_options,
+                                           state="readonly", width=50, font=("Segoe UI", 10))
+                event_combo.pack(side=tk.LEFT, padx=10, ipady=5)
 
-        def load_schedules():
-            selected = event_var.get()
-            if not selected:
-                messagebox.showerror("Error", "Please select an event")
-                return
+                def load_schedules():
+                    selected = event_var.get()
+                    if not selected:
+                        messagebox.showerror("Error", "Please select an event")
+                        return
             
-            try:
-                event_id = int(selected.split(" - ")[0])
-            except:
-                messagebox.showerror("Error", "Invalid Event selection")
-                return
+                    try:
+                        event_id = int(selected.split(" - ")[0])
+                    except:
+                        messagebox.showerror("Error", "Invalid Event selection")
+                        return
 
-            schedules = db.get_event_schedules(event_id, self.current_user)
-            self.display_schedules(event_id, schedules)
+                    self.reload_schedules(event_id)
 
-        HoverButton(input_frame, text="Load Schedules", command=load_schedules).pack(side=tk.LEFT, padx=10)
+                HoverButton(input_frame, text="Load Schedules", command=load_schedules).pack(side=tk.LEFT, padx=10)
+
+                # display_schedules() renders below the selector
+                self.schedule_results = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+                self.schedule_results.pack(fill=tk.BOTH, expand=True)
+
+                # Coming back to the screen keeps showing the event picked last time
+                previous = [option for option in event_options
+                            if option.split(" - ")[0] == str(self.schedule_event_id)]
+                if previous:
+                    event_var.set(previous[0])
+                    self.reload_schedules(self.schedule_event_id)
+
+            self.run_db(db.get_organizer_events, self.current_user, on_done=render)
+
+        return refresh
+
+    def reload_schedules(self, event_id):
+        self.schedule_event_id = event_id
+        self.run_db(db.get_event_schedules, event_id, self.current_user,
+                    on_done=lambda schedules: self.display_schedules(event_id, schedules))
 
     def display_schedules(self, event_id, schedules):
+        results = self.schedule_results
         # Clear previous results
-        for widget in self.main_content.winfo_children()[3:]:
+        for widget in results.winfo_children():
             widget.destroy()
 
         # Show table only if schedules exist
         if schedules:
-            table_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
+            table_frame = tk.Frame(results, bg=DarkTheme.BG_PRIMARY)
             table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
 
             columns = ("ID", "Start", "End", "Activity", "Description")
@@ -1701,12 +2404,12 @@ class EventManagementApp:
             tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         else:
-            tk.Label(self.main_content, text="No schedules found for this event - Create one below!",
+            tk.Label(results, text="No schedules found for this event - Create one below!",
                     bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
                     font=("Segoe UI", 12)).pack(pady=30)
 
         # Action buttons for schedules: Create, Modify, Delete
-        action_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
+        action_frame = tk.Frame(results, bg=DarkTheme.BG_PRIMARY)
         action_frame.pack(pady=20)
 
         def create_schedule():
@@ -1767,12 +2470,15 @@ class EventManagementApp:
                     messagebox.showerror("Invalid Format", error_msg)
                     return
                 
-                ok, msg = db.manage_schedule(event_id, start_time, activity, desc)
+                self.run_db(db.manage_schedule, event_id, start_time, activity, desc,
+                            on_done=on_saved, write=True)
+
+            def on_saved(result):
+                ok, msg = result
                 if ok:
                     messagebox.showinfo("Success", msg)
                     dialog.destroy()
-                    schedules_new = db.get_event_schedules(event_id, self.current_user)
-                    self.display_schedules(event_id, schedules_new)
+                    self.reload_schedules(event_id)
                 else:
                     messagebox.showerror("Error", msg)
 
@@ -1849,12 +2555,15 @@ class EventManagementApp:
                     messagebox.showerror("Invalid Format", error_msg)
                     return
                 
-                ok, msg = db.update_schedule(schedule_id, new_start, new_activity, new_desc)
+                self.run_db(db.update_schedule, schedule_id, new_start, new_activity, new_desc,
+                            on_done=on_saved, write=True)
+
+            def on_saved(result):
+                ok, msg = result
                 if ok:
                     messagebox.showinfo("Success", msg)
                     dialog.destroy()
-                    schedules_new = db.get_event_schedules(event_id, self.current_user)
-                    self.display_schedules(event_id, schedules_new)
+                    self.reload_schedules(event_id)
                 else:
                     messagebox.showerror("Error", msg)
 
@@ -1870,13 +2579,15 @@ class EventManagementApp:
                 return
             schedule_id = tree.item(selection[0])['values'][0]
             if messagebox.askyesno("Confirm", f"Delete schedule ID {schedule_id}?"):
-                ok, msg = db.delete_schedule(schedule_id)
-                if ok:
-                    messagebox.showinfo("Success", msg)
-                    schedules_new = db.get_event_schedules(event_id, self.current_user)
-                    self.display_schedules(event_id, schedules_new)
-                else:
-                    messagebox.showerror("Error", msg)
+                self.run_db(db.delete_schedule, schedule_id, on_done=on_deleted, write=True)
+
+        def on_deleted(result):
+            ok, msg = result
+            if ok:
+                messagebox.showinfo("Success", msg)
+                self.reload_schedules(event_id)
+            else:
+                messagebox.showerror("Error", msg)
 
         HoverButton(action_frame, text="➕ Create Schedule", command=create_schedule).pack(side=tk.LEFT, padx=8)
         HoverButton(action_frame, text="✏️ Modify Schedule", command=modify_schedule,
@@ -1885,351 +2596,784 @@ class EventManagementApp:
                    bg=DarkTheme.DANGER, hover_bg="#c0392b").pack(side=tk.LEFT, padx=8)
 
     def show_sponsors(self):
-        self.set_active_menu(3)
-        self.clear_content()
+        self.show_screen("sponsors", 3, self.build_sponsors)
 
-        header_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
+    def build_sponsors(self, screen):
+        header_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
         header_frame.pack(fill=tk.X, padx=40, pady=(30, 20))
 
         tk.Label(header_frame, text="Event Sponsors", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(side=tk.LEFT)
 
-        sponsors = db.view_organizer_sponsors(self.current_user)
-
-        # Create table frame and tree
-        table_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 20))
-
-        if not sponsors:
-            tk.Label(table_frame, text="No sponsors assigned yet. Create a sponsor or assign one to your events.",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
-                    font=("Segoe UI", 12)).pack(pady=50)
-            tree = None
-        else:
-            columns = ("E.ID", "Event", "S.ID", "Sponsor", "Contact", "Email", "Phone", "Amount")
-            tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=18)
-
-            widths = [70, 200, 70, 150, 140, 180, 110, 120]
-            for i, col in enumerate(columns):
-                tree.heading(col, text=col)
-                tree.column(col, width=widths[i], anchor=tk.E if col == "Amount" else tk.W)
-
-            for row in sponsors:
-                tree.insert("", tk.END, values=row)
-
-            scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
-            tree.configure(yscrollcommand=scrollbar.set)
-
-            tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        def refresh():
+            body = screen.new_body()
+            loading = self.show_loading(body)
 
-        # Action buttons for sponsors - ALWAYS SHOW
-        action_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        action_frame.pack(pady=12)
+            def render(sponsors):
+                loading.destroy()
 
-        def create_sponsor_flow():
-            dialog = tk.Toplevel(self.root)
-            dialog.title("Create Sponsor")
-            dialog.geometry("520x420")
-            dialog.configure(bg=DarkTheme.BG_PRIMARY)
-            dialog.transient(self.root)
-            dialog.grab_set()
+                # Create table frame and tree
+                table_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+                table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 20))
 
-            tk.Label(dialog, text="Create New Sponsor", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 14, "bold")).pack(pady=10)
-
-            tk.Label(dialog, text="Sponsor Name *", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
-            name_entry = ModernEntry(dialog, width=50)
-            name_entry.pack(padx=20, ipady=6)
-
-            tk.Label(dialog, text="Contact Person", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
-            contact_entry = ModernEntry(dialog, width=50)
-            contact_entry.pack(padx=20, ipady=6)
-
-            tk.Label(dialog, text="Email", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
-            email_entry = ModernEntry(dialog, width=50)
-            email_entry.pack(padx=20, ipady=6)
-
-            tk.Label(dialog, text="Phone", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
-            phone_entry = ModernEntry(dialog, width=50)
-            phone_entry.pack(padx=20, ipady=6)
-
-            def submit_new():
-                name = name_entry.get().strip()
-                contact = contact_entry.get().strip()
-                email = email_entry.get().strip()
-                phone = phone_entry.get().strip()
-                if not name:
-                    messagebox.showerror("Error", "Sponsor name is required")
-                    return
-                ok, result = db.create_new_sponsor(name, contact, email, phone)
-                if ok:
-                    messagebox.showinfo("Success", f"Sponsor created with ID {result}")
-                    dialog.destroy()
-                    self.show_sponsors()
+                if not sponsors:
+                    tk.Label(table_frame, text="No sponsors assigned yet. Create a sponsor or assign one to your events.",
+                            bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
+                            font=("Segoe UI", 12)).pack(pady=50)
+                    tree = None
                 else:
-                    messagebox.showerror("Error", result)
-
-            HoverButton(dialog, text="Create Sponsor", command=submit_new).pack(pady=14)
-
-        def assign_sponsor_flow():
-            # Get organizer's events for combobox
-            my_events = db.get_organizer_events(self.current_user)
-            if not my_events:
-                messagebox.showerror("Error", "You don't have any events. Create an event first.")
-                return
+                    columns = ("E.ID", "Event", "S.ID", "Sponsor", "Contact", "Email", "Phone", "Amount")
+                    tree = VirtualTreeview(table_frame, columns, height=18)
+
+                    widths = [70, 200, 70, 150, 140, 180, 110, 120]
+                    for i, col in enumerate(columns):
+                        tree.heading(col, text=col)
+                        tree.column(col, width=widths[i], anchor=tk.E if col == "Amount" else tk.W)
+
+                    tree.set_rows(sponsors)
+                    tree.pack(fill=tk.BOTH, expand=True)
+
+                # Action buttons for sponsors - ALWAYS SHOW
+                action_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+                action_frame.pack(pady=12)
+
+                def create_sponsor_flow():
+                    dialog = tk.Toplevel(self.root)
+                    dialog.title("Create Sponsor")
+                    dialog.geometry("520x420")
+                    dialog.configure(bg=DarkTheme.BG_PRIMARY)
+                    dialog.transient(self.root)
+                    dialog.grab_set()
+
+                    tk.Label(dialog, text="Create New Sponsor", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 14, "bold")).pack(pady=10)
+
+                    tk.Label(dialog, text="Sponsor Name *", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
+                    name_entry = ModernEntry(dialog, width=50)
+                    name_entry.pack(padx=20, ipady=6)
+
+                    tk.Label(dialog, text="Contact Person", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
+                    contact_entry = ModernEntry(dialog, width=50)
+                    contact_entry.pack(padx=20, ipady=6)
+
+                    tk.Label(dialog, text="Email", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
+                    email_entry = ModernEntry(dialog, width=50)
+                    email_entry.pack(padx=20, ipady=6)
+
+                    tk.Label(dialog, text="Phone", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(8, 0))
+                    phone_entry = ModernEntry(dialog, width=50)
+                    phone_entry.pack(padx=20, ipady=6)
+
+                    def submit_new():
+                        name = name_entry.get().strip()
+                        contact = contact_entry.get().strip()
+                        email = email_entry.get().strip()
+                        phone = phone_entry.get().strip()
+                        if not name:
+                            messagebox.showerror("Error", "Sponsor name is required")
+                            return
+                        self.run_db(db.create_new_sponsor, name, contact, email, phone, on_done=on_created, write=True)
+
+                    def on_created(outcome):
+                        ok, result = outcome
+                        if ok:
+                            messagebox.showinfo("Success", f"Sponsor created with ID {result}")
+                            dialog.destroy()
+                            self.show_sponsors()
+                        else:
+                            messagebox.showerror("Error", result)
+
+                    HoverButton(dialog, text="Create Sponsor", command=submit_new).pack(pady=14)
+
+                def assign_sponsor_flow():
+                    # Get organizer's events for combobox
+                    def got_events(my_events):
+                        if not my_events:
+                            messagebox.showerror("Error", "You don't have any events. Create an event first.")
+                            return
+
+                        # Get all available sponsors
+                        self.run_db(db.get_all_sponsors,
+                                    on_done=lambda all_sponsors: open_assign_dialog(my_events, all_sponsors))
+
+                    self.run_db(db.get_organizer_events, self.current_user, on_done=got_events)
+
+                def open_assign_dialog(my_events, all_sponsors):
+                    if not all_sponsors:
+                        messagebox.showerror("Error", "No sponsors available. Create a sponsor first using the 'Create Sponsor' button.")
+                        return
+
+                    dialog = tk.Toplevel(self.root)
+                    dialog.title("Assign Sponsor to Event")
+                    dialog.geometry("550x380")
+                    dialog.configure(bg=DarkTheme.BG_PRIMARY)
+                    dialog.transient(self.root)
+                    dialog.grab_set()
+
+                    tk.Label(dialog, text="Assign Sponsor", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 14, "bold")).pack(pady=10)
+
+                    tk.Label(dialog, text="Select Event *", bg=DarkTheme.BG_PRIMARY, 
+                            fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
+                    tk.Label(dialog, text="💡 Choose from your events", bg=DarkTheme.BG_PRIMARY,
+                            fg=DarkTheme.TEXT_DIM, font=("Segoe UI", 8, "italic")).pack(anchor=tk.W, padx=20)
             
-            # Get all available sponsors
-            all_sponsors = db.get_all_sponsors()
-            if not all_sponsors:
-                messagebox.showerror("Error", "No sponsors available. Create a sponsor first using the 'Create Sponsor' button.")
-                return
-            
-            dialog = tk.Toplevel(self.root)
-            dialog.title("Assign Sponsor to Event")
-            dialog.geometry("550x380")
-            dialog.configure(bg=DarkTheme.BG_PRIMARY)
-            dialog.transient(self.root)
-            dialog.grab_set()
-
-            tk.Label(dialog, text="Assign Sponsor", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 14, "bold")).pack(pady=10)
-
-            tk.Label(dialog, text="Select Event *", bg=DarkTheme.BG_PRIMARY, 
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
-            tk.Label(dialog, text="💡 Choose from your events", bg=DarkTheme.BG_PRIMARY,
-                    fg=DarkTheme.TEXT_DIM, font=("Segoe UI", 8, "italic")).pack(anchor=tk.W, padx=20)
-            
-            event_options = [f"{e[0]} - {e[1]}" for e in my_events]
-            event_var = tk.StringVar(value=event_options[0] if event_options else "")
-            event_combo = ttk.Combobox(dialog, textvariable=event_var, values=event_options,
-                                      state="readonly", width=47, font=("Segoe UI", 10))
-            event_combo.pack(padx=20, pady=(0, 10))
-
-            tk.Label(dialog, text="Select Sponsor *", bg=DarkTheme.BG_PRIMARY, 
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
-            tk.Label(dialog, text="💡 Choose from available sponsors", 
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_DIM, 
-                    font=("Segoe UI", 8, "italic")).pack(anchor=tk.W, padx=20)
+                    event_options = [f"{e[0]} - {e[1]}" for e in my_events]
+                    event_var = tk.StringVar(value=event_options[0] if event_options else "")
+                    event_combo = ttk.Combobox(dialog, textvariable=event_var, values=event_options,
+                                              state="readonly", width=47, font=("Segoe UI", 10))
+                    event_combo.pack(padx=20, pady=(0, 10))
+
+                    tk.Label(dialog, text="Select Sponsor *", bg=DarkTheme.BG_PRIMARY, 
+                            fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
+                    tk.Label(dialog, text="💡 Choose from available sponsors", 
+                            bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_DIM, 
+                            font=("Segoe UI", 8, "italic")).pack(anchor=tk.W, padx=20)
             
-            sponsor_options = [f"{s[0]} - {s[1]} ({s[2]})" for s in all_sponsors]
-            sponsor_var = tk.StringVar(value=sponsor_options[0] if sponsor_options else "")
-            sponsor_combo = ttk.Combobox(dialog, textvariable=sponsor_var, values=sponsor_options,
-                                        state="readonly", width=47, font=("Segoe UI", 10))
-            sponsor_combo.pack(padx=20, pady=(0, 10))
-
-            tk.Label(dialog, text="Contribution Amount ($) *", bg=DarkTheme.BG_PRIMARY, 
-                    fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
-            amount_entry = ModernEntry(dialog, width=30)
-            amount_entry.pack(padx=20, ipady=6)
-
-            def submit_assign():
-                selected_event = event_var.get()
-                selected_sponsor = sponsor_var.get()
+                    sponsor_options = [f"{s[0]} - {s[1]} ({s[2]})" for s in all_sponsors]
+                    sponsor_var = tk.StringVar(value=sponsor_options[0] if sponsor_options else "")
+                    sponsor_combo = ttk.Combobox(dialog, textvariable=sponsor_var, values=sponsor_options,
+                                                state="readonly", width=47, font=("Segoe UI", 10))
+                    sponsor_combo.pack(padx=20, pady=(0, 10))
+
+                    tk.Label(dialog, text="Contribution Amount ($) *", bg=DarkTheme.BG_PRIMARY, 
+                            fg=DarkTheme.TEXT_SECONDARY).pack(anchor=tk.W, padx=20, pady=(10, 5))
+                    amount_entry = ModernEntry(dialog, width=30)
+                    amount_entry.pack(padx=20, ipady=6)
+
+                    def submit_assign():
+                        selected_event = event_var.get()
+                        selected_sponsor = sponsor_var.get()
                 
-                if not selected_event or not selected_sponsor:
-                    messagebox.showerror("Error", "Please select both event and sponsor")
-                    return
+                        if not selected_event or not selected_sponsor:
+                            messagebox.showerror("Error", "Please select both event and sponsor")
+                            return
                     
-                try:
-                    event_id_val = int(selected_event.split(" - ")[0])
-                    sponsor_id_val = int(selected_sponsor.split(" - ")[0])
-                    amount_val = float(amount_entry.get().strip())
-                except Exception:
-                    messagebox.showerror("Error", "Invalid amount - ensure it's a valid number")
-                    return
+                        try:
+                            event_id_val = int(selected_event.split(" - ")[0])
+                            sponsor_id_val = int(selected_sponsor.split(" - ")[0])
+                            amount_val = float(amount_entry.get().strip())
+                        except Exception:
+                            messagebox.showerror("Error", "Invalid amount - ensure it's a valid number")
+                            return
                 
-                if amount_val < 0:
-                    messagebox.showerror("Error", "Amount must be positive")
-                    return
+                        if amount_val < 0:
+                            messagebox.showerror("Error", "Amount must be positive")
+                            return
                     
-                ok, msg = db.assign_sponsor(self.current_user, event_id_val, sponsor_id_val, amount_val)
-                if ok:
-                    messagebox.showinfo("Success", msg)
-                    dialog.destroy()
-                    self.show_sponsors()
-                else:
-                    messagebox.showerror("Error", msg)
-
-            HoverButton(dialog, text="Assign Sponsor", command=submit_assign).pack(pady=12)
-
-        def modify_sponsor_amount():
-            if tree is None:
-                messagebox.showerror("Error", "No sponsor mappings to modify")
-                return
-            selection = tree.selection()
-            if not selection:
-                messagebox.showerror("Error", "Please select a sponsor mapping to modify")
-                return
-            vals = tree.item(selection[0])['values']
-            event_id_val = vals[0]
-            sponsor_id_val = vals[2]
-            current_amount = vals[7]
-
-            new_amount = simpledialog.askstring("Modify Amount", 
-                                               f"Current amount: ${current_amount}\nEnter new amount:")
-            if new_amount is None:
-                return
-            try:
-                amt = float(new_amount.strip())
-                if amt < 0:
-                    messagebox.showerror("Error", "Amount must be positive")
-                    return
-            except Exception:
-                messagebox.showerror("Error", "Invalid amount - must be a number")
-                return
-            ok, msg = db.update_event_sponsor_amount(event_id_val, sponsor_id_val, self.current_user, amt)
-            if ok:
-                messagebox.showinfo("Success", msg)
-                self.show_sponsors()
-            else:
-                messagebox.showerror("Error", msg)
-
-        def remove_sponsor_mapping():
-            if tree is None:
-                messagebox.showerror("Error", "No sponsor mappings to remove")
-                return
-            selection = tree.selection()
-            if not selection:
-                messagebox.showerror("Error", "Please select a sponsor mapping to remove")
-                return
-            vals = tree.item(selection[0])['values']
-            event_id_val = vals[0]
-            event_name = vals[1]
-            sponsor_id_val = vals[2]
-            sponsor_name = vals[3]
+                        self.run_db(db.assign_sponsor, self.current_user, event_id_val, sponsor_id_val, amount_val,
+                                    on_done=on_assigned, write=True)
+
+                    def on_assigned(result):
+                        ok, msg = result
+                        if ok:
+                            messagebox.showinfo("Success", msg)
+                            dialog.destroy()
+                            self.show_sponsors()
+                        else:
+                            messagebox.showerror("Error", msg)
+
+                    HoverButton(dialog, text="Assign Sponsor", command=submit_assign).pack(pady=12)
+
+                def modify_sponsor_amount():
+                    if tree is None:
+                        messagebox.showerror("Error", "No sponsor mappings to modify")
+                        return
+                    selection = tree.selection()
+                    if not selection:
+                        messagebox.showerror("Error", "Please select a sponsor mapping to modify")
+                        return
+                    vals = tree.item(selection[0])['values']
+                    event_id_val = vals[0]
+                    sponsor_id_val = vals[2]
+                    current_amount = vals[7]
+
+                    new_amount = simpledialog.askstring("Modify Amount", 
+                                                       f"Current amount: ${current_amount}\nEnter new amount:")
+                    if new_amount is None:
+                        return
+                    try:
+                        amt = float(new_amount.strip())
+                        if amt < 0:
+                            messagebox.showerror("Error", "Amount must be positive")
+                            return
+                    except Exception:
+                        messagebox.showerror("Error", "Invalid amount - must be a number")
+                        return
+                    self.run_db(db.update_event_sponsor_amount, event_id_val, sponsor_id_val, self.current_user, amt,
+                                on_done=on_changed, write=True)
+
+                def remove_sponsor_mapping():
+                    if tree is None:
+                        messagebox.showerror("Error", "No sponsor mappings to remove")
+                        return
+                    selection = tree.selection()
+                    if not selection:
+                        messagebox.showerror("Error", "Please select a sponsor mapping to remove")
+                        return
+                    vals = tree.item(selection[0])['values']
+                    event_id_val = vals[0]
+                    event_name = vals[1]
+                    sponsor_id_val = vals[2]
+                    sponsor_name = vals[3]
             
-            if messagebox.askyesno("Confirm", 
-                                  f"Remove sponsor '{sponsor_name}' (ID {sponsor_id_val})\nfrom event '{event_name}' (ID {event_id_val})?"):
-                ok, msg = db.delete_event_sponsor(event_id_val, sponsor_id_val, self.current_user)
-                if ok:
-                    messagebox.showinfo("Success", msg)
-                    self.show_sponsors()
-                else:
-                    messagebox.showerror("Error", msg)
-
-        HoverButton(action_frame, text="➕ Create Sponsor", command=create_sponsor_flow).pack(side=tk.LEFT, padx=8)
-        HoverButton(action_frame, text="🔗 Assign Sponsor", command=assign_sponsor_flow,
-                   bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(side=tk.LEFT, padx=8)
-        HoverButton(action_frame, text="✏️ Modify Amount", command=modify_sponsor_amount,
-                   bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(side=tk.LEFT, padx=8)
-        HoverButton(action_frame, text="🗑️ Remove Sponsor", command=remove_sponsor_mapping,
-                   bg=DarkTheme.DANGER, hover_bg="#c0392b").pack(side=tk.LEFT, padx=8)
+                    if messagebox.askyesno("Confirm", 
+                                          f"Remove sponsor '{sponsor_name}' (ID {sponsor_id_val})\nfrom event '{event_name}' (ID {event_id_val})?"):
+                        self.run_db(db.delete_event_sponsor, event_id_val, sponsor_id_val, self.current_user,
+                                    on_done=on_changed, write=True)
+
+                def on_changed(result):
+                    ok, msg = result
+                    if ok:
+                        messagebox.showinfo("Success", msg)
+                        self.show_sponsors()
+                    else:
+                        messagebox.showerror("Error", msg)
+
+                HoverButton(action_frame, text="➕ Create Sponsor", command=create_sponsor_flow).pack(side=tk.LEFT, padx=8)
+                HoverButton(action_frame, text="🔗 Assign Sponsor", command=assign_sponsor_flow,
+                           bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(side=tk.LEFT, padx=8)
+                HoverButton(action_frame, text="✏️ Modify Amount", command=modify_sponsor_amount,
+                           bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(side=tk.LEFT, padx=8)
+                HoverButton(action_frame, text="🗑️ Remove Sponsor", command=remove_sponsor_mapping,
+                           bg=DarkTheme.DANGER, hover_bg="#c0392b").pack(side=tk.LEFT, padx=8)
+
+            self.run_db(db.view_organizer_sponsors, self.current_user, on_done=render)
+
+        return refresh
 
     def show_organizer_feedback(self):
-        self.set_active_menu(4)
-        self.clear_content()
+        self.show_screen("organizer_feedback", 4, self.build_organizer_feedback)
 
-        tk.Label(self.main_content, text="Event Feedback", bg=DarkTheme.BG_PRIMARY,
+    def build_organizer_feedback(self, screen):
+        tk.Label(screen.frame, text="Event Feedback", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(anchor=tk.W, padx=40, pady=(30, 20))
 
-        feedback = db.view_feedback(None, self.current_user)
+        # Filters
+        filter_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_CARD)
+        filter_frame.pack(fill=tk.X, padx=40, pady=(0, 15))
+
+        tk.Label(filter_frame, text="Event", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(20, 5), pady=12)
+        event_var = tk.StringVar(value="All events")
+        event_combo = ttk.Combobox(filter_frame, textvariable=event_var, values=["All events"],
+                                   state="readonly", width=28, font=("Segoe UI", 10))
+        event_combo.pack(side=tk.LEFT, ipady=3)
+
+        ratings = ["Any", "1", "2", "3", "4", "5"]
+        tk.Label(filter_frame, text="Rating", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        min_var = tk.StringVar(value="Any")
+        ttk.Combobox(filter_frame, textvariable=min_var, values=ratings, state="readonly",
+                     width=4, font=("Segoe UI", 10)).pack(side=tk.LEFT, ipady=3)
+        tk.Label(filter_frame, text="to", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=5)
+        max_var = tk.StringVar(value="Any")
+        ttk.Combobox(filter_frame, textvariable=max_var, values=ratings, state="readonly",
+                     width=4, font=("Segoe UI", 10)).pack(side=tk.LEFT, ipady=3)
+
+        tk.Label(filter_frame, text="From", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        from_entry = ModernEntry(filter_frame, placeholder="YYYY-MM-DD", width=12)
+        from_entry.pack(side=tk.LEFT, ipady=5)
+
+        tk.Label(filter_frame, text="To", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        to_entry = ModernEntry(filter_frame, placeholder="YYYY-MM-DD", width=12)
+        to_entry.pack(side=tk.LEFT, ipady=5)
 
-        if not feedback:
-            tk.Label(self.main_content, text="No feedback received yet",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
-                    font=("Segoe UI", 12)).pack(pady=50)
-            return
-
-        table_frame = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-        table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 30))
+        # Table frame
+        table_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 10))
 
         columns = ("U.ID", "User", "E.ID", "Event", "Rating", "Comments", "Date")
-        tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=18)
+        # Asks for the next page itself when the user scrolls near the end
+        tree = VirtualTreeview(table_frame, columns, height=18, on_need_more=lambda: load_page())
 
         widths = [70, 150, 70, 200, 80, 400, 120]
         for i, col in enumerate(columns):
             tree.heading(col, text=col)
             tree.column(col, width=widths[i], anchor=tk.CENTER if col in ["U.ID", "E.ID", "Rating"] else tk.W)
 
-        for row in feedback:
-            tree.insert("", tk.END, values=row)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        status_label = tk.Label(screen.frame, text="", bg=DarkTheme.BG_PRIMARY,
+                                fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10))
+        status_label.pack(pady=(0, 20))
+
+        # Paging state, as on Browse Events: `cursor` is the (feedback_date,
+        # feedback_id) of the last row shown and `query` bumps whenever the
+        # filters change so a page that arrives for the old ones is dropped.
+        # `events` maps the event picker's labels to event ids.
+        state = {"cursor": None, "done": False, "loading": False, "query": 0,
+                 "event_id": None, "filters": (None, None, None, None), "events": {}}
+
+        def load_page():
+            if state["loading"] or state["done"]:
+                return
+            state["loading"] = True
+            status_label.config(text="⏳ Loading...")
+            query = state["query"]
+            if state["event_id"] is None:
+                fetch, scope = db.get_organizer_feedback_page, (self.current_user,)
+            else:
+                fetch, scope = db.get_event_feedback_page, (state["event_id"], self.current_user)
+            self.run_db(fetch, *scope, state["cursor"], db.FEEDBACK_PAGE_SIZE, *state["filters"],
+                        on_done=lambda result: add_page(query, result),
+                        on_error=lambda err: page_failed(query, err))
+
+        def add_page(query, result):
+            if query != state["query"]:
+                return
+            rows, next_cursor = result
+            state["loading"] = False
+            state["cursor"] = next_cursor
+            state["done"] = next_cursor is None
+
+            shown = len(tree) + len(rows)
+            if not shown:
+                filtered = state["event_id"] is not None or state["filters"] != (None, None, None, None)
+                status_label.config(text="No feedback matches these filters" if filtered
+                                    else "No feedback received yet")
+            elif state["done"]:
+                status_label.config(text=f"Showing all {shown} reviews")
+            else:
+                status_label.config(text=f"Showing {shown} reviews - scroll for more")
 
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+            # May call load_page() again straight away if the table isn't full yet
+            tree.append_rows([row[:7] for row in rows], complete=state["done"])
 
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        def page_failed(query, err):
+            if query != state["query"]:
+                return
+            state["loading"] = False
+            status_label.config(text=f"Could not load feedback: {err}")
+
+        def entry_value(entry):
+            value = entry.get().strip()
+            return "" if value == entry.placeholder else value
+
+        def apply_filters():
+            date_from, date_to = entry_value(from_entry), entry_value(to_entry)
+            for value in (date_from, date_to):
+                if value:
+                    try:
+                        datetime.strptime(value, "%Y-%m-%d")
+                    except ValueError:
+                        messagebox.showerror("Error", f"Invalid date '{value}' - use YYYY-MM-DD")
+                        return
+            min_rating = None if min_var.get() == "Any" else int(min_var.get())
+            max_rating = None if max_var.get() == "Any" else int(max_var.get())
+            state["event_id"] = state["events"].get(event_var.get())
+            state["filters"] = (min_rating, max_rating, date_from or None, date_to or None)
+            restart()
+
+        def restart():
+            state.update(cursor=None, done=False, loading=False, query=state["query"] + 1)
+            tree.clear()
+            load_page()
+
+        HoverButton(filter_frame, text="Apply", command=apply_filters).pack(side=tk.LEFT, padx=10)
+
+        def fill_events(events):
+            state["events"] = {f"{event[0]} - {event[1]}": event[0] for event in events}
+            event_combo.config(values=["All events"] + list(state["events"]))
+
+        def refresh():
+            # Keeps the filters; only the rows are reloaded
+            self.run_db(db.get_organizer_events, self.current_user, on_done=fill_events)
+            restart()
+
+        return refresh
 
     def show_analytics(self):
-        self.set_active_menu(5)
-        self.clear_content()
+        self.show_screen("analytics", 5, self.build_analytics)
 
-        tk.Label(self.main_content, text="Analytics & Reports", bg=DarkTheme.BG_PRIMARY,
+    def build_analytics(self, screen):
+        tk.Label(screen.frame, text="Analytics & Reports", bg=DarkTheme.BG_PRIMARY,
                 fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(anchor=tk.W, padx=40, pady=(30, 20))
 
-        # Revenue & Rating Analytics
-        analytics = db.get_organizer_analytics(self.current_user)
-
-        if analytics:
-            tk.Label(self.main_content, text="📊 Financial & Rating Summary",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.ACCENT,
-                    font=("Segoe UI", 16, "bold")).pack(anchor=tk.W, padx=40, pady=(20, 10))
-
-            table_frame1 = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-            table_frame1.pack(fill=tk.X, padx=40, pady=(0, 30))
-
-            columns1 = ("ID", "Event Name", "Avg Rating", "Total Revenue")
-            tree1 = ttk.Treeview(table_frame1, columns=columns1, show="headings", height=8)
-
-            tree1.heading("ID", text="E.ID")
-            tree1.column("ID", width=80, anchor=tk.CENTER)
-            tree1.heading("Event Name", text="Event Name")
-            tree1.column("Event Name", width=500)
-            tree1.heading("Avg Rating", text="Avg Rating")
-            tree1.column("Avg Rating", width=150, anchor=tk.CENTER)
-            tree1.heading("Total Revenue", text="Total Revenue")
-            tree1.column("Total Revenue", width=180, anchor=tk.E)
-
-            for row in analytics:
-                tree1.insert("", tk.END, values=(
-                    row['event_id'], row['event_name'],
-                    f"{row['avg_rating']:.2f} ⭐", f"${row['total_revenue']:.2f}"
-                ))
-
-            scrollbar1 = ttk.Scrollbar(table_frame1, orient=tk.VERTICAL, command=tree1.yview)
-            tree1.configure(yscrollcommand=scrollbar1.set)
+        def refresh():
+            body = screen.new_body()
 
-            tree1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            scrollbar1.pack(side=tk.RIGHT, fill=tk.Y)
+            # Both sections load in parallel; each fills its own frame so the
+            # page order doesn't depend on which query returns first
+            summary_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+            summary_frame.pack(fill=tk.X)
+            coverage_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+            coverage_frame.pack(fill=tk.X)
 
-        # Events without sponsors
-        no_sponsors = db.get_events_with_no_sponsors(self.current_user)
+            # Revenue & Rating Analytics
+            def render_summary(analytics):
+                if analytics:
+                    tk.Label(summary_frame, text="📊 Financial & Rating Summary",
+                            bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.ACCENT,
+                            font=("Segoe UI", 16, "bold")).pack(anchor=tk.W, padx=40, pady=(20, 10))
+
+                    table_frame1 = tk.Frame(summary_frame, bg=DarkTheme.BG_PRIMARY)
+                    table_frame1.pack(fill=tk.X, padx=40, pady=(0, 30))
+
+                    columns1 = ("ID", "Event Name", "Registrations", "Seats Left", "Avg Rating", "Total Revenue")
+                    tree1 = VirtualTreeview(table_frame1, columns1, height=8)
+
+                    tree1.heading("ID", text="E.ID")
+                    tree1.column("ID", width=80, anchor=tk.CENTER)
+                    tree1.heading("Event Name", text="Event Name")
+                    tree1.column("Event Name", width=360)
+                    tree1.heading("Registrations", text="Registrations")
+                    tree1.column("Registrations", width=120, anchor=tk.CENTER)
+                    tree1.heading("Seats Left", text="Seats Left")
+                    tree1.column("Seats Left", width=110, anchor=tk.CENTER)
+                    tree1.heading("Avg Rating", text="Avg Rating")
+                    tree1.column("Avg Rating", width=130, anchor=tk.CENTER)
+                    tree1.heading("Total Revenue", text="Total Revenue")
+                    tree1.column("Total Revenue", width=160, anchor=tk.E)
+
+                    tree1.set_source((
+                        row['event_id'], row['event_name'],
+                        row['registration_count'], row['tickets_remaining'],
+                        f"{row['avg_rating']:.2f} ⭐", f"${row['total_revenue']:.2f}"
+                    ) for row in analytics)
+                    tree1.pack(fill=tk.BOTH, expand=True)
+
+            # Sponsorship coverage: unsponsored events first, then those below target
+            def render_coverage(coverage):
+                if not coverage:
+                    return
+                counts = {status: 0 for status in (db.COVERAGE_NONE, db.COVERAGE_BELOW, db.COVERAGE_ABOVE)}
+                for row in coverage:
+                    counts[row['status']] += 1
+
+                tk.Label(coverage_frame, text=f"🤝 Sponsorship Coverage (target ${db.SPONSORSHIP_TARGET:,.2f})",
+                        bg=DarkTheme.BG_PRIMARY,
+                        fg=DarkTheme.WARNING if counts[db.COVERAGE_NONE] else DarkTheme.SUCCESS,
+                        font=("Segoe UI", 16, "bold")).pack(anchor=tk.W, padx=40, pady=(20, 5))
+                tk.Label(coverage_frame,
+                        text=f"{counts[db.COVERAGE_NONE]} without sponsors  •  "
+                             f"{counts[db.COVERAGE_BELOW]} below target  •  "
+                             f"{counts[db.COVERAGE_ABOVE]} at or above target",
+                        bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.TEXT_SECONDARY,
+                        font=("Segoe UI", 10)).pack(anchor=tk.W, padx=40, pady=(0, 10))
+
+                table_frame2 = tk.Frame(coverage_frame, bg=DarkTheme.BG_PRIMARY)
+                table_frame2.pack(fill=tk.X, padx=40, pady=(0, 30))
+
+                columns2 = ("ID", "Event Name", "Date", "Sponsors", "Total", "Status")
+                tree2 = VirtualTreeview(table_frame2, columns2, height=6)
+
+                tree2.heading("ID", text="Event ID")
+                tree2.column("ID", width=100, anchor=tk.CENTER)
+                tree2.heading("Event Name", text="Event Name")
+                tree2.column("Event Name", width=360)
+                tree2.heading("Date", text="Date")
+                tree2.column("Date", width=140, anchor=tk.CENTER)
+                tree2.heading("Sponsors", text="Sponsors")
+                tree2.column("Sponsors", width=100, anchor=tk.CENTER)
+                tree2.heading("Total", text="Total")
+                tree2.column("Total", width=160, anchor=tk.E)
+                tree2.heading("Status", text="Status")
+                tree2.column("Status", width=160, anchor=tk.CENTER)
+
+                labels = {db.COVERAGE_NONE: "⚠️ No sponsors", db.COVERAGE_BELOW: "⬇️ Below target",
+                          db.COVERAGE_ABOVE: "✅ On target"}
+                order = {db.COVERAGE_NONE: 0, db.COVERAGE_BELOW: 1, db.COVERAGE_ABOVE: 2}
+                tree2.set_source((
+                    row['event_id'], row['event_name'], row['event_date'], row['sponsor_count'],
+                    f"${row['total_contributed']:,.2f}", labels[row['status']]
+                ) for row in sorted(coverage, key=lambda row: order[row['status']]))
+                tree2.pack(fill=tk.BOTH, expand=True)
+
+            self.run_db(db.get_organizer_analytics, self.current_user, on_done=render_summary)
+            self.run_db(db.get_sponsorship_coverage, self.current_user, on_done=render_coverage)
+
+        return refresh
+
+    # ==================== CHECK-IN ====================
+    def show_checkin(self):
+        self.show_screen("checkin", 6, self.build_checkin)
+
+    def build_checkin(self, screen):
+        tk.Label(screen.frame, text="Door Check-in", bg=DarkTheme.BG_PRIMARY,
+                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(anchor=tk.W, padx=40, pady=(30, 20))
 
-        if no_sponsors:
-            tk.Label(self.main_content, text="⚠️ Events Without Sponsors",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.WARNING,
-                    font=("Segoe UI", 16, "bold")).pack(anchor=tk.W, padx=40, pady=(20, 10))
+        event_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_CARD)
+        event_frame.pack(fill=tk.X, padx=40, pady=(0, 15))
+
+        tk.Label(event_frame, text="Event", bg=DarkTheme.BG_CARD, fg=DarkTheme.TEXT_SECONDARY,
+                font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(20, 5), pady=12)
+        event_var = tk.StringVar()
+        event_combo = ttk.Combobox(event_frame, textvariable=event_var, state="readonly",
+                                   width=36, font=("Segoe UI", 10))
+        event_combo.pack(side=tk.LEFT, ipady=3)
+
+        list_label = tk.Label(event_frame, text="Pick an event", bg=DarkTheme.BG_CARD,
+                              fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10))
+        list_label.pack(side=tk.LEFT, padx=15)
+
+        # Scanners type the code and send Enter, so the entry keeps the focus
+        scan_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
+        scan_frame.pack(fill=tk.X, padx=40)
+        scan_entry = ModernEntry(scan_frame, placeholder="Scan or type a door code", width=40)
+        scan_entry.pack(side=tk.LEFT, ipady=8)
+
+        result_label = tk.Label(screen.frame, text="", bg=DarkTheme.BG_PRIMARY,
+                                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 28, "bold"))
+        result_label.pack(anchor=tk.W, padx=40, pady=20)
+
+        table_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 10))
+        columns = ("Time", "Code", "Reg ID", "Result")
+        tree = VirtualTreeview(table_frame, columns, height=12)
+        for col, width in zip(columns, (120, 320, 100, 260)):
+            tree.heading(col, text=col)
+            tree.column(col, width=width, anchor=tk.W if col == "Code" else tk.CENTER)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        sync_label = tk.Label(screen.frame, text="", bg=DarkTheme.BG_PRIMARY,
+                              fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 10))
+        sync_label.pack(pady=(0, 20))
+
+        # `session` is the checkin.CheckinSession of the picked event; scans are
+        # answered from its local list on this thread, only download and sync
+        # go through the worker. `recent` holds the rows of the scans table.
+        state = {"session": None, "events": {}, "recent": [], "syncing": False, "job": None}
+        outcomes = {
+            checkin.SCAN_OK: ("✅ Welcome!", DarkTheme.SUCCESS),
+            checkin.SCAN_DUPLICATE: ("⚠️ Already checked in", DarkTheme.WARNING),
+            checkin.SCAN_UNKNOWN: ("⛔ Not on the list", DarkTheme.DANGER),
+            checkin.SCAN_INVALID: ("⛔ Invalid code", DarkTheme.DANGER),
+        }
 
-            table_frame2 = tk.Frame(self.main_content, bg=DarkTheme.BG_PRIMARY)
-            table_frame2.pack(fill=tk.X, padx=40, pady=(0, 30))
+        def show_list_status():
+            session = state["session"]
+            if session is None:
+                list_label.config(text="Pick an event")
+            elif not session.ready:
+                list_label.config(text="No check-in list on this computer yet - download it")
+            else:
+                downloaded = datetime.fromtimestamp(session.downloaded_at).strftime("%Y-%m-%d %H:%M")
+                list_label.config(text=f"{session.size} registrations, downloaded {downloaded}")
+            pending = session.pending() if session is not None else 0
+            sync_label.config(text=f"{pending} check-ins waiting to sync" if pending else "All check-ins synced")
+
+        def pick_event(event=None):
+            event_id = state["events"].get(event_var.get())
+            if event_id is None:
+                return
+            if not db.checkin_enabled():
+                messagebox.showerror("Check-in disabled", db.CHECKIN_DISABLED)
+                return
+            if state["session"] is not None:
+                state["session"].close()
+            state["session"] = checkin.CheckinSession(event_id, self.current_user)
+            state["recent"] = []
+            tree.clear()
+            result_label.config(text="")
+            show_list_status()
+            # Always fetch a fresh list; offline, the saved one keeps the door going
+            download()
+            scan_entry.focus_set()
+
+        def download():
+            session = state["session"]
+            if session is None:
+                messagebox.showerror("Error", "Please pick an event first")
+                return
+            list_label.config(text="⏳ Downloading...")
+            self.run_db(session.download, on_done=lambda result: downloaded(session, result))
 
-            columns2 = ("ID", "Event Name", "Date")
-            tree2 = ttk.Treeview(table_frame2, columns=columns2, show="headings", height=6)
+        def downloaded(session, result):
+            if session is not state["session"]:
+                return
+            success, msg = result
+            show_list_status()
+            if success:
+                return
+            if session.ready:
+                list_label.config(text=f"{list_label.cget('text')} (saved copy: {msg})")
+            else:
+                messagebox.showerror("Error", msg)
 
-            tree2.heading("ID", text="Event ID")
-            tree2.column("ID", width=100, anchor=tk.CENTER)
-            tree2.heading("Event Name", text="Event Name")
-            tree2.column("Event Name", width=600)
-            tree2.heading("Date", text="Date")
-            tree2.column("Date", width=200, anchor=tk.CENTER)
+        def scan(event=None):
+            session = state["session"]
+            code = scan_entry.get().strip()
+            scan_entry.delete(0, tk.END)
+            if session is None or not code or code == scan_entry.placeholder:
+                return
+            outcome, registration_id = session.scan(code)
+            text, color = outcomes[outcome]
+            result_label.config(text=text, fg=color)
+            state["recent"].insert(0, (time.strftime("%H:%M:%S"), code, registration_id or "-", text))
+            del state["recent"][CHECKIN_RECENT_SCANS:]
+            tree.set_rows(state["recent"])
+            show_list_status()
+
+        def sync():
+            session = state["session"]
+            if session is None or state["syncing"] or not session.pending():
+                return
+            state["syncing"] = True
+            sync_label.config(text="⏳ Syncing...")
+            self.run_db(session.sync, on_done=lambda result: synced(session, result),
+                        on_error=lambda err: synced(session, (False, str(err))), write=True)
+
+        def synced(session, result):
+            state["syncing"] = False
+            if session is not state["session"]:
+                return
+            success, msg = result
+            show_list_status()
+            if not success:
+                sync_label.config(text=f"{msg} - {session.pending()} check-ins kept for the next sync")
+
+        # Queued scans go out on their own every CHECKIN_AUTO_SYNC_MS while the
+        # screen exists, also when another screen is being shown
+        def auto_sync():
+            sync()
+            state["job"] = screen.frame.after(CHECKIN_AUTO_SYNC_MS, auto_sync)
+
+        def teardown(event):
+            if event.widget is not screen.frame:
+                return
+            if state["job"] is not None:
+                screen.frame.after_cancel(state["job"])
+            if state["session"] is not None:
+                state["session"].close()
+
+        event_combo.bind("<<ComboboxSelected>>", pick_event)
+        scan_entry.bind("<Return>", scan)
+        screen.frame.bind("<Destroy>", teardown)
+        HoverButton(scan_frame, text="Check In", command=scan).pack(side=tk.LEFT, padx=10)
+        HoverButton(event_frame, text="⬇ Download List", command=download).pack(side=tk.RIGHT, padx=10, pady=8)
+        HoverButton(screen.frame, text="⟳ Sync Now", command=sync,
+                   bg=DarkTheme.BG_TERTIARY, hover_bg=DarkTheme.BORDER).pack(pady=(0, 20))
+        state["job"] = screen.frame.after(CHECKIN_AUTO_SYNC_MS, auto_sync)
+
+        def fill_events(events):
+            state["events"] = {f"{event[0]} - {event[1]}": event[0] for event in events}
+            event_combo.config(values=list(state["events"]))
+
+        def refresh():
+            # The check-in list itself only changes on Download; this just
+            # picks up new events
+            self.run_db(db.get_organizer_events, self.current_user, on_done=fill_events)
+            show_list_status()
+
+        return refresh
+
+    # ==================== DIAGNOSTICS ====================
+    def show_diagnostics(self):
+        self.show_screen("diagnostics", 7, self.build_diagnostics)
+
+    def build_diagnostics(self, screen):
+        header_frame = tk.Frame(screen.frame, bg=DarkTheme.BG_PRIMARY)
+        header_frame.pack(fill=tk.X, padx=40, pady=(30, 20))
 
-            for row in no_sponsors:
-                tree2.insert("", tk.END, values=row)
+        tk.Label(header_frame, text="Diagnostics", bg=DarkTheme.BG_PRIMARY,
+                fg=DarkTheme.TEXT_PRIMARY, font=("Segoe UI", 24, "bold")).pack(side=tk.LEFT)
 
-            scrollbar2 = ttk.Scrollbar(table_frame2, orient=tk.VERTICAL, command=tree2.yview)
-            tree2.configure(yscrollcommand=scrollbar2.set)
+        def export(kind):
+            extension = ".json" if kind == "json" else ".prom"
+            path = filedialog.asksaveasfilename(parent=self.root, defaultextension=extension,
+                                                initialfile=f"ems-metrics{extension}")
+            if not path:
+                return
+            text = db.metrics_json() if kind == "json" else db.metrics_prometheus()
+            try:
+                with open(path, "w", encoding="utf-8") as handle:
+                    handle.write(text)
+            except OSError as err:
+                messagebox.showerror("Export failed", str(err))
+
+        def reset():
+            db.reset_query_stats()
+            refresh()
+
+        HoverButton(header_frame, text="Export Prometheus",
+                   command=lambda: export("prometheus")).pack(side=tk.RIGHT)
+        HoverButton(header_frame, text="Export JSON",
+                   command=lambda: export("json")).pack(side=tk.RIGHT, padx=10)
+        HoverButton(header_frame, text="Reset Counters", command=reset).pack(side=tk.RIGHT)
+        HoverButton(header_frame, text="⟳ Refresh", command=lambda: refresh()).pack(side=tk.RIGHT, padx=10)
+
+        # Everything shown here is in-process counters, so it is read directly
+        # instead of going through the database worker
+        def refresh():
+            body = screen.new_body()
+
+            pool = db.pool_stats()
+            caches = db.cache_stats()
+            hits = sum(cache["hits"] for cache in caches.values())
+            lookups = hits + sum(cache["misses"] for cache in caches.values())
+            navigation = self.screens.latency()
+            visits = sum(entry["visits"] for entry in navigation.values())
+            nav_ms = sum(entry["total_ms"] for entry in navigation.values())
+
+            summary = tk.Frame(body, bg=DarkTheme.BG_SECONDARY)
+            summary.pack(fill=tk.X, padx=40, pady=(0, 20))
+            lines = [
+                f"Pool: {pool['in_use']} in use, {pool['idle']} idle of {pool['size']} · "
+                f"{pool['checkouts']} checkouts, {pool['waits']} waits (avg {pool['avg_wait_ms']:.1f} ms), "
+                f"{pool['timeouts']} timeouts",
+                f"Caches: {hits}/{lookups} hits ({hits / lookups:.0%})" if lookups else "Caches: no lookups yet",
+                f"Navigation: {visits} screen visits, avg {nav_ms / visits:.1f} ms" if visits
+                else "Navigation: no screen visits yet",
+                f"Slow query threshold: {db.SLOW_QUERY_MS:g} ms"
+                + ("" if db.INSTRUMENT else " (instrumentation disabled, EMS_INSTRUMENT=0)"),
+            ]
+            for line in lines:
+                tk.Label(summary, text=line, bg=DarkTheme.BG_SECONDARY, fg=DarkTheme.TEXT_PRIMARY,
+                        font=("Segoe UI", 11), anchor=tk.W).pack(fill=tk.X, padx=20, pady=3)
+
+            tk.Label(body, text="⏱️ Database Functions", bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.ACCENT,
+                    font=("Segoe UI", 16, "bold")).pack(anchor=tk.W, padx=40, pady=(0, 10))
+            functions_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+            functions_frame.pack(fill=tk.X, padx=40, pady=(0, 20))
+
+            columns = ("Function", "Calls", "Errors", "Avg ms", "Max ms", "Wait ms", "Queries", "Rows", "Slow")
+            tree = VirtualTreeview(functions_frame, columns, height=10)
+            widths = (260, 80, 80, 100, 100, 100, 90, 100, 70)
+            for column, width in zip(columns, widths):
+                tree.heading(column, text=column)
+                tree.column(column, width=width, anchor=tk.W if column == "Function" else tk.E)
+
+            stats = db.query_stats()
+            tree.set_rows([
+                (name, entry["calls"], entry["errors"], f"{entry['avg_ms']:.1f}",
+                 f"{entry['max_seconds'] * 1000:.1f}", f"{entry['acquire_seconds'] * 1000:.1f}",
+                 entry["queries"], entry["rows"], entry["slow_queries"])
+                for name, entry in sorted(stats.items(), key=lambda item: item[1]["seconds"], reverse=True)
+            ])
+            tree.pack(fill=tk.BOTH, expand=True)
+
+            tk.Label(body, text="🐢 Slow Queries", bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.WARNING,
+                    font=("Segoe UI", 16, "bold")).pack(anchor=tk.W, padx=40, pady=(0, 10))
+            slow = db.slow_queries()
+            if not slow:
+                tk.Label(body, text="No statements over the threshold", bg=DarkTheme.BG_PRIMARY,
+                        fg=DarkTheme.TEXT_SECONDARY, font=("Segoe UI", 12)).pack(pady=20)
+                return
 
-            tree2.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            scrollbar2.pack(side=tk.RIGHT, fill=tk.Y)
-        else:
-            tk.Label(self.main_content, text="✅ All events have sponsors!",
-                    bg=DarkTheme.BG_PRIMARY, fg=DarkTheme.SUCCESS,
-                    font=("Segoe UI", 14)).pack(pady=30)
+            slow_frame = tk.Frame(body, bg=DarkTheme.BG_PRIMARY)
+            slow_frame.pack(fill=tk.X, padx=40, pady=(0, 30))
+            columns = ("Time", "Function", "ms", "Rows", "Statement")
+            slow_tree = VirtualTreeview(slow_frame, columns, height=8)
+            widths = (90, 200, 80, 80, 560)
+            for column, width in zip(columns, widths):
+                slow_tree.heading(column, text=column)
+                slow_tree.column(column, width=width, anchor=tk.E if column in ("ms", "Rows") else tk.W)
+            slow_tree.set_rows([
+                (datetime.fromtimestamp(entry["at"]).strftime("%H:%M:%S"), entry["function"],
+                 f"{entry['ms']:.1f}", entry["rows"], entry["sql"])
+                for entry in slow
+            ])
+            slow_tree.pack(fill=tk.BOTH, expand=True)
+
+        return refresh
 
 # ==================== MAIN ====================
 if __name__ == "__main__":
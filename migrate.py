@@ -0,0 +1,224 @@
+"""
+Applies the versioned schema migrations in migrations/ in order.
+
+    python migrate.py            # apply everything pending
+    python migrate.py status     # list applied / pending migrations
+    python migrate.py --dry-run  # print the statements without running them
+
+Each file is named NNNN_description.sql and may use DELIMITER blocks like
+event_management_database.sql. Applied versions are recorded in the
+schema_migrations table. MySQL commits DDL implicitly, so a migration is not
+atomic. Instead, CREATE INDEX / DROP INDEX statements are skipped when the
+index already exists or is already gone, which lets a half-applied migration
+simply be re-run.
+
+With the embedded SQLite backend (backend = sqlite in db_config.ini) there is
+no migration history: event_management_sqlite.sql already is the fully
+migrated schema, so `python migrate.py` just creates it, and
+`python migrate.py --sample` also loads the sample rows of
+event_management_database.sql.
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+import func as db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+_FILE_RE = re.compile(r"^(\d{4})_([\w-]+)\.sql$")
+_CREATE_INDEX_RE = re.compile(r"^CREATE\s+(?:UNIQUE\s+|FULLTEXT\s+)?INDEX\s+`?(\w+)`?\s+ON\s+`?(\w+)`?", re.I)
+_DROP_INDEX_RE = re.compile(r"^DROP\s+INDEX\s+`?(\w+)`?\s+ON\s+`?(\w+)`?", re.I)
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """Returns [(version, name, path)] sorted by version."""
+    found = []
+    for filename in sorted(os.listdir(directory)):
+        match = _FILE_RE.match(filename)
+        if match:
+            found.append((match.group(1), match.group(2), os.path.join(directory, filename)))
+    return found
+
+
+def split_statements(sql):
+    """Splits a script on its current delimiter, honouring DELIMITER lines."""
+    statements, buf, delimiter = [], [], ";"
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        buf.append(line)
+        if stripped.endswith(delimiter) and not stripped.startswith("--"):
+            statement = "\n".join(buf).rstrip()[:-len(delimiter)].strip()
+            buf = []
+            if _strip_comments(statement):
+                statements.append(statement)
+    tail = "\n".join(buf).strip()
+    if _strip_comments(tail):
+        statements.append(tail)
+    return statements
+
+
+def _strip_comments(statement):
+    lines = [l for l in statement.splitlines() if not l.strip().startswith("--")]
+    return "\n".join(lines).strip()
+
+
+def _index_exists(cursor, table, index):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, index))
+    return cursor.fetchone() is not None
+
+
+def _already_done(cursor, statement):
+    """True for index DDL whose effect is already in place."""
+    body = _strip_comments(statement)
+    match = _CREATE_INDEX_RE.match(body)
+    if match:
+        return _index_exists(cursor, match.group(2), match.group(1))
+    match = _DROP_INDEX_RE.match(body)
+    if match:
+        return not _index_exists(cursor, match.group(2), match.group(1))
+    return False
+
+
+def ensure_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(16) PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def _checksum(sql):
+    return hashlib.sha256(sql.encode("utf-8")).hexdigest()
+
+
+def apply(dry_run=False, directory=MIGRATIONS_DIR):
+    conn = db.get_connection()
+    cursor = conn.cursor(buffered=True)
+    try:
+        ensure_table(cursor)
+        done = applied_versions(cursor)
+        pending = [m for m in discover(directory) if m[0] not in done]
+        if not pending:
+            print("Schema is up to date.")
+            return 0
+
+        for version, name, path in pending:
+            with open(path, encoding="utf-8") as f:
+                sql = f.read()
+            print(f"Applying {version}_{name}")
+            for statement in split_statements(sql):
+                first_line = _strip_comments(statement).splitlines()[0]
+                if _already_done(cursor, statement):
+                    print(f"  skip (already in place): {first_line}")
+                    continue
+                print(f"  {first_line}")
+                if not dry_run:
+                    try:
+                        cursor.execute(statement)
+                    except db.DatabaseError as err:
+                        print(f"  FAILED: {err}")
+                        print(f"  {version}_{name} was not recorded; fix the problem and re-run.")
+                        return 1
+            if not dry_run:
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                    (version, name, _checksum(sql))
+                )
+                conn.commit()
+        return 0
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def status(directory=MIGRATIONS_DIR):
+    conn = db.get_connection()
+    cursor = conn.cursor(buffered=True)
+    try:
+        ensure_table(cursor)
+        done = applied_versions(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+
+    for version, name, path in discover(directory):
+        if version not in done:
+            state = "pending"
+        else:
+            with open(path, encoding="utf-8") as f:
+                edited = _checksum(f.read()) != done[version]
+            state = "applied (file changed since)" if edited else "applied"
+        print(f"{version}_{name:<40} {state}")
+    return 0
+
+
+def init_sqlite(backend, sample=False):
+    """Creates the embedded database's schema (and sample rows) if it is empty."""
+    if not backend.initialize(sample=sample):
+        print(f"{backend.describe()} already has schema version {backend.schema_version()}.")
+        if sample:
+            print("Sample rows are only loaded into an empty database.")
+        return 0
+    print(f"Created schema in {backend.describe()}")
+    if not sample:
+        return 0
+
+    ok, msg = db.rebuild_event_stats()
+    print(msg)
+    # Shard the large sample ticket types, as migration 0003 does on MySQL
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT ticket_id FROM Tickets WHERE quantity_available >= %s",
+                       (db.INVENTORY_SHARD_MIN,))
+        ticket_ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+    for ticket_id in ticket_ids:
+        sharded, shard_msg = db.shard_ticket_inventory(ticket_id)
+        if not sharded:
+            print(f"Ticket {ticket_id}: {shard_msg}")
+            ok = False
+    print(f"Sharded {len(ticket_ids)} ticket types into {db.INVENTORY_SLOTS} slots")
+    return 0 if ok else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations.")
+    parser.add_argument("command", nargs="?", default="apply", choices=("apply", "status"))
+    parser.add_argument("--dry-run", action="store_true", help="print statements without executing them")
+    parser.add_argument("--sample", action="store_true",
+                        help="sqlite backend: load the sample data into a new database")
+    args = parser.parse_args(argv)
+    backend = db.get_backend()
+    if backend.name == "sqlite":
+        try:
+            if args.command == "status":
+                print(f"{backend.describe()}: schema version {backend.schema_version()}")
+                return 0
+            return init_sqlite(backend, sample=args.sample)
+        finally:
+            db.close_pool()
+    if args.command == "status":
+        return status()
+    return apply(dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
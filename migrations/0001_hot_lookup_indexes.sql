@@ -0,0 +1,52 @@
+-- 0001: indexes for the hot lookups in func.py
+--
+-- The base schema only has primary keys and the single-column indexes
+-- InnoDB creates for foreign keys. Every index below is named so
+-- migrate.py can skip it if it already exists.
+
+-- One registration per user per event. This turns the duplicate check
+-- into a unique-key probe and also closes the race two concurrent inserts
+-- had with the trigger's check-then-insert. It covers WHERE user_id = ?
+-- (My Registrations, Payments, Feedback screens) as a left prefix.
+CREATE UNIQUE INDEX uq_registrations_user_event ON Registrations (user_id, event_id);
+
+-- One feedback per user per event (give_feedback vs update_feedback)
+CREATE UNIQUE INDEX uq_feedback_user_event ON Feedback (user_id, event_id);
+
+-- One row per ticket type per event; register_user_for_event and
+-- add_ticket_type look tickets up by exactly this pair
+CREATE UNIQUE INDEX uq_tickets_event_type ON Tickets (event_id, ticket_type);
+
+-- Organizer screens: WHERE organizer_id = ? (My Events, analytics, sponsors)
+CREATE INDEX idx_events_organizer_date ON Events (organizer_id, event_date);
+
+-- Browse catalogue keyset pagination ORDER BY (event_date, event_id)
+CREATE INDEX idx_events_date_id ON Events (event_date, event_id);
+
+-- Revenue: Payments joined by registration and filtered on status; amount
+-- is included so SUM(amount) is answered from the index alone
+CREATE INDEX idx_payments_registration_status ON Payments (registration_id, status, amount);
+
+-- find_location_id() on every event creation
+CREATE INDEX idx_locations_name ON Locations (location_name);
+
+-- The duplicate check now stops at the first unique-key match instead of
+-- counting rows; the unique key above is what actually guarantees it.
+-- PRECEDES keeps it ahead of CheckTicketAvailability as before, so a
+-- duplicate is rejected before a seat is taken.
+DROP TRIGGER IF EXISTS prevent_duplicate_registration;
+
+DELIMITER //
+
+CREATE TRIGGER prevent_duplicate_registration
+BEFORE INSERT ON Registrations
+FOR EACH ROW PRECEDES CheckTicketAvailability
+BEGIN
+    IF EXISTS (SELECT 1 FROM Registrations
+               WHERE user_id = NEW.user_id AND event_id = NEW.event_id) THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'User already registered for this event';
+    END IF;
+END //
+
+DELIMITER ;
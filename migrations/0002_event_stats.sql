@@ -0,0 +1,250 @@
+-- 0002: Event_Stats, a per-event summary kept up to date by triggers
+--
+-- Dashboards read one row per event instead of re-aggregating Payments,
+-- Feedback, Registrations and Tickets on every view. If it ever drifts,
+-- `python event_stats.py verify` reports the difference and
+-- `python event_stats.py rebuild` recomputes it. 0003 replaces
+-- trg_stats_ticket_update, so this must run before it. Every statement
+-- can be re-run: the table is created only if missing, each trigger is
+-- dropped before it is created and the backfill overwrites existing rows.
+CREATE TABLE IF NOT EXISTS Event_Stats (
+    event_id INT PRIMARY KEY,
+    registration_count INT NOT NULL DEFAULT 0,    -- registrations not cancelled
+    attended_count INT NOT NULL DEFAULT 0,        -- registrations with status 'attended'
+    tickets_remaining INT NOT NULL DEFAULT 0,     -- SUM(Tickets.quantity_available)
+    revenue DECIMAL(15,2) NOT NULL DEFAULT 0.00,  -- SUM of completed payments
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES Events(event_id) ON DELETE CASCADE
+);
+
+DELIMITER //
+
+DROP TRIGGER IF EXISTS trg_stats_event_insert //
+
+CREATE TRIGGER trg_stats_event_insert
+AFTER INSERT ON Events
+FOR EACH ROW
+BEGIN
+    INSERT INTO Event_Stats (event_id) VALUES (NEW.event_id);
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_ticket_insert //
+
+CREATE TRIGGER trg_stats_ticket_insert
+AFTER INSERT ON Tickets
+FOR EACH ROW
+BEGIN
+    UPDATE Event_Stats
+    SET tickets_remaining = tickets_remaining + NEW.quantity_available
+    WHERE event_id = NEW.event_id;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_ticket_update //
+
+-- Also covers the quantity changes made by CheckTicketAvailability,
+-- trg_registration_delete, trg_ticket_change and trg_registration_cancel
+CREATE TRIGGER trg_stats_ticket_update
+AFTER UPDATE ON Tickets
+FOR EACH ROW
+BEGIN
+    IF NEW.event_id = OLD.event_id THEN
+        IF NEW.quantity_available <> OLD.quantity_available THEN
+            UPDATE Event_Stats
+            SET tickets_remaining = tickets_remaining + NEW.quantity_available - OLD.quantity_available
+            WHERE event_id = NEW.event_id;
+        END IF;
+    ELSE
+        UPDATE Event_Stats
+        SET tickets_remaining = tickets_remaining - OLD.quantity_available
+        WHERE event_id = OLD.event_id;
+        UPDATE Event_Stats
+        SET tickets_remaining = tickets_remaining + NEW.quantity_available
+        WHERE event_id = NEW.event_id;
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_ticket_delete //
+
+CREATE TRIGGER trg_stats_ticket_delete
+AFTER DELETE ON Tickets
+FOR EACH ROW
+BEGIN
+    UPDATE Event_Stats
+    SET tickets_remaining = tickets_remaining - OLD.quantity_available
+    WHERE event_id = OLD.event_id;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_registration_insert //
+
+CREATE TRIGGER trg_stats_registration_insert
+AFTER INSERT ON Registrations
+FOR EACH ROW
+BEGIN
+    UPDATE Event_Stats
+    SET registration_count = registration_count + (NEW.status <> 'cancelled'),
+        attended_count = attended_count + (NEW.status = 'attended')
+    WHERE event_id = NEW.event_id;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_registration_update //
+
+CREATE TRIGGER trg_stats_registration_update
+AFTER UPDATE ON Registrations
+FOR EACH ROW
+BEGIN
+    IF NEW.event_id <> OLD.event_id OR NEW.status <> OLD.status THEN
+        UPDATE Event_Stats
+        SET registration_count = registration_count - (OLD.status <> 'cancelled'),
+            attended_count = attended_count - (OLD.status = 'attended')
+        WHERE event_id = OLD.event_id;
+        UPDATE Event_Stats
+        SET registration_count = registration_count + (NEW.status <> 'cancelled'),
+            attended_count = attended_count + (NEW.status = 'attended')
+        WHERE event_id = NEW.event_id;
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_registration_delete //
+
+CREATE TRIGGER trg_stats_registration_delete
+AFTER DELETE ON Registrations
+FOR EACH ROW
+BEGIN
+    UPDATE Event_Stats
+    SET registration_count = registration_count - (OLD.status <> 'cancelled'),
+        attended_count = attended_count - (OLD.status = 'attended')
+    WHERE event_id = OLD.event_id;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_payment_insert //
+
+CREATE TRIGGER trg_stats_payment_insert
+AFTER INSERT ON Payments
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'completed' THEN
+        UPDATE Event_Stats S
+        JOIN Registrations R ON R.event_id = S.event_id
+        SET S.revenue = S.revenue + NEW.amount
+        WHERE R.registration_id = NEW.registration_id;
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_payment_update //
+
+CREATE TRIGGER trg_stats_payment_update
+AFTER UPDATE ON Payments
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'completed' THEN
+        UPDATE Event_Stats S
+        JOIN Registrations R ON R.event_id = S.event_id
+        SET S.revenue = S.revenue - OLD.amount
+        WHERE R.registration_id = OLD.registration_id;
+    END IF;
+    IF NEW.status = 'completed' THEN
+        UPDATE Event_Stats S
+        JOIN Registrations R ON R.event_id = S.event_id
+        SET S.revenue = S.revenue + NEW.amount
+        WHERE R.registration_id = NEW.registration_id;
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_payment_delete //
+
+CREATE TRIGGER trg_stats_payment_delete
+AFTER DELETE ON Payments
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'completed' THEN
+        UPDATE Event_Stats S
+        JOIN Registrations R ON R.event_id = S.event_id
+        SET S.revenue = S.revenue - OLD.amount
+        WHERE R.registration_id = OLD.registration_id;
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_feedback_insert //
+
+CREATE TRIGGER trg_stats_feedback_insert
+AFTER INSERT ON Feedback
+FOR EACH ROW
+BEGIN
+    UPDATE Event_Stats
+    SET rating_sum = rating_sum + NEW.rating,
+        rating_count = rating_count + 1
+    WHERE event_id = NEW.event_id;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_feedback_update //
+
+CREATE TRIGGER trg_stats_feedback_update
+AFTER UPDATE ON Feedback
+FOR EACH ROW
+BEGIN
+    UPDATE Event_Stats
+    SET rating_sum = rating_sum - OLD.rating,
+        rating_count = rating_count - 1
+    WHERE event_id = OLD.event_id;
+    UPDATE Event_Stats
+    SET rating_sum = rating_sum + NEW.rating,
+        rating_count = rating_count + 1
+    WHERE event_id = NEW.event_id;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_feedback_delete //
+
+CREATE TRIGGER trg_stats_feedback_delete
+AFTER DELETE ON Feedback
+FOR EACH ROW
+BEGIN
+    UPDATE Event_Stats
+    SET rating_sum = rating_sum - OLD.rating,
+        rating_count = rating_count - 1
+    WHERE event_id = OLD.event_id;
+END //
+
+DELIMITER ;
+
+-- Backfill for the events that already exist (same query as func.rebuild_event_stats)
+INSERT INTO Event_Stats (event_id, registration_count, attended_count, tickets_remaining,
+                         revenue, rating_sum, rating_count)
+SELECT * FROM (
+    SELECT E.event_id,
+           IFNULL(R.registration_count, 0) AS registration_count,
+           IFNULL(R.attended_count, 0) AS attended_count,
+           IFNULL(T.tickets_remaining, 0) AS tickets_remaining,
+           IFNULL(P.revenue, 0.00) AS revenue,
+           IFNULL(F.rating_sum, 0) AS rating_sum,
+           IFNULL(F.rating_count, 0) AS rating_count
+    FROM Events E
+    LEFT JOIN (
+        SELECT event_id,
+               SUM(status <> 'cancelled') AS registration_count,
+               SUM(status = 'attended') AS attended_count
+        FROM Registrations GROUP BY event_id
+    ) R ON R.event_id = E.event_id
+    LEFT JOIN (
+        SELECT event_id, SUM(quantity_available) AS tickets_remaining
+        FROM Tickets GROUP BY event_id
+    ) T ON T.event_id = E.event_id
+    LEFT JOIN (
+        SELECT RR.event_id, SUM(PP.amount) AS revenue
+        FROM Payments PP JOIN Registrations RR ON RR.registration_id = PP.registration_id
+        WHERE PP.status = 'completed'
+        GROUP BY RR.event_id
+    ) P ON P.event_id = E.event_id
+    LEFT JOIN (
+        SELECT event_id, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+        FROM Feedback GROUP BY event_id
+    ) F ON F.event_id = E.event_id
+) AS src
+ON DUPLICATE KEY UPDATE
+    registration_count = src.registration_count,
+    attended_count = src.attended_count,
+    tickets_remaining = src.tickets_remaining,
+    revenue = src.revenue,
+    rating_sum = src.rating_sum,
+    rating_count = src.rating_count;
@@ -0,0 +1,212 @@
+-- 0003: sharded ticket inventory, seat holds and atomic seat taking
+--
+-- A ticket's seats may be split across Ticket_Slots rows so concurrent
+-- buyers update different rows instead of queueing on one Tickets row.
+-- Seats available = Tickets.quantity_available (unsharded remainder; seats
+-- returned by cancellations land here) + SUM(Ticket_Slots.quantity_available).
+-- The Ticket_Inventory view exposes that total.
+--
+-- Two session variables let func.py's reservation engine tell the triggers
+-- what it has already done:
+--   @ems_inventory_move = 1      seats are being moved between Tickets,
+--                                Ticket_Slots and Ticket_Holds; Event_Stats
+--                                must not change (they are still unsold)
+--   @ems_inventory_reserved = 1  the registration being written already owns
+--                                a seat (taken from a slot or a hold), so
+--                                the trigger must not take another one
+
+CREATE TABLE Ticket_Slots (
+    ticket_id INT NOT NULL,
+    slot_no SMALLINT NOT NULL,
+    quantity_available INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (ticket_id, slot_no),
+    FOREIGN KEY (ticket_id) REFERENCES Tickets(ticket_id) ON DELETE CASCADE
+);
+
+-- A seat set aside for one user until expires_at. slot_no is where the seat
+-- came from (-1 = Tickets.quantity_available) so it can be put back there.
+CREATE TABLE Ticket_Holds (
+    hold_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    ticket_id INT NOT NULL,
+    slot_no SMALLINT NOT NULL,
+    user_id INT NOT NULL,
+    event_id INT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    UNIQUE KEY uq_holds_user_event (user_id, event_id),
+    KEY idx_holds_expires (expires_at),
+    KEY idx_holds_ticket (ticket_id),
+    FOREIGN KEY (ticket_id) REFERENCES Tickets(ticket_id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES Users(user_id),
+    FOREIGN KEY (event_id) REFERENCES Events(event_id) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE VIEW Ticket_Inventory AS
+SELECT t.ticket_id, t.event_id, t.ticket_type, t.price,
+       t.quantity_available
+         + IFNULL((SELECT SUM(s.quantity_available)
+                   FROM Ticket_Slots s WHERE s.ticket_id = t.ticket_id), 0) AS quantity_available
+FROM Tickets t;
+
+-- Moving seats between Tickets and slots/holds is not a sale
+DROP TRIGGER IF EXISTS trg_stats_ticket_update;
+
+DELIMITER //
+
+CREATE TRIGGER trg_stats_ticket_update
+AFTER UPDATE ON Tickets
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@ems_inventory_move, 0) = 0 THEN
+        IF NEW.event_id = OLD.event_id THEN
+            IF NEW.quantity_available <> OLD.quantity_available THEN
+                UPDATE Event_Stats
+                SET tickets_remaining = tickets_remaining + NEW.quantity_available - OLD.quantity_available
+                WHERE event_id = NEW.event_id;
+            END IF;
+        ELSE
+            UPDATE Event_Stats
+            SET tickets_remaining = tickets_remaining - OLD.quantity_available
+            WHERE event_id = OLD.event_id;
+            UPDATE Event_Stats
+            SET tickets_remaining = tickets_remaining + NEW.quantity_available
+            WHERE event_id = NEW.event_id;
+        END IF;
+    END IF;
+END //
+
+-- Takes one seat for a registration written without the engine. Each step
+-- is a single conditional UPDATE, so there is no read-then-decrement window
+-- and no shared-then-exclusive lock upgrade to deadlock on.
+CREATE PROCEDURE take_ticket_seat(IN p_ticket_id INT, IN p_event_id INT)
+BEGIN
+    UPDATE Tickets
+    SET quantity_available = quantity_available - 1
+    WHERE ticket_id = p_ticket_id AND quantity_available > 0;
+
+    IF ROW_COUNT() = 0 THEN
+        UPDATE Ticket_Slots
+        SET quantity_available = quantity_available - 1
+        WHERE ticket_id = p_ticket_id AND quantity_available > 0
+        LIMIT 1;
+
+        IF ROW_COUNT() = 0 THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Registration failed: Ticket type is sold out.';
+        END IF;
+
+        -- Slot updates have no stats trigger of their own
+        UPDATE Event_Stats
+        SET tickets_remaining = tickets_remaining - 1
+        WHERE event_id = p_event_id;
+    END IF;
+END //
+
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS CheckTicketAvailability;
+
+DELIMITER //
+
+CREATE TRIGGER CheckTicketAvailability
+BEFORE INSERT ON Registrations
+FOR EACH ROW FOLLOWS prevent_duplicate_registration
+BEGIN
+    IF IFNULL(@ems_inventory_reserved, 0) = 1 THEN
+        -- The engine already took the seat without touching Event_Stats
+        UPDATE Event_Stats
+        SET tickets_remaining = tickets_remaining - 1
+        WHERE event_id = NEW.event_id;
+    ELSE
+        CALL take_ticket_seat(NEW.ticket_id, NEW.event_id);
+    END IF;
+END //
+
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS trg_ticket_change;
+
+DELIMITER //
+
+CREATE TRIGGER trg_ticket_change
+AFTER UPDATE ON Registrations
+FOR EACH ROW
+BEGIN
+    -- If ticket_id is modified
+    IF NEW.ticket_id <> OLD.ticket_id THEN
+
+        -- Give the old seat back
+        UPDATE Tickets
+        SET quantity_available = quantity_available + 1
+        WHERE ticket_id = OLD.ticket_id;
+
+        -- Take a seat of the new type (fails the update if it sold out)
+        IF IFNULL(@ems_inventory_reserved, 0) = 1 THEN
+            UPDATE Event_Stats
+            SET tickets_remaining = tickets_remaining - 1
+            WHERE event_id = NEW.event_id;
+        ELSE
+            CALL take_ticket_seat(NEW.ticket_id, NEW.event_id);
+        END IF;
+
+    END IF;
+END //
+
+DELIMITER ;
+
+-- The availability check must count sharded seats too
+DROP PROCEDURE IF EXISTS register_user_for_event;
+
+DELIMITER //
+
+CREATE PROCEDURE register_user_for_event(
+    IN p_user_id INT,
+    IN p_event_id INT,
+    IN p_ticket_type VARCHAR(50)
+)
+BEGIN
+    DECLARE v_ticket_id INT;
+    DECLARE v_quantity INT;
+
+    -- Fetch ticket details
+    SELECT ticket_id, quantity_available
+    INTO v_ticket_id, v_quantity
+    FROM Ticket_Inventory
+    WHERE event_id = p_event_id AND ticket_type = p_ticket_type
+    LIMIT 1;
+
+    -- Ticket not found
+    IF v_ticket_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Ticket not found';
+    END IF;
+
+    -- Ticket sold out
+    IF v_quantity <= 0 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Ticket sold out';
+    END IF;
+
+    -- Register the user (CheckTicketAvailability takes the seat)
+    INSERT INTO Registrations (user_id, event_id, ticket_id, registration_date, status)
+    VALUES (p_user_id, p_event_id, v_ticket_id, NOW(), 'registered');
+
+END //
+
+DELIMITER ;
+
+-- Shard the existing large ticket types into 8 slots. The remainder of the
+-- division goes to the lowest-numbered slots.
+SET @ems_inventory_move = 1;
+
+INSERT INTO Ticket_Slots (ticket_id, slot_no, quantity_available)
+SELECT t.ticket_id, n.slot_no,
+       FLOOR(t.quantity_available / 8) + (n.slot_no < MOD(t.quantity_available, 8))
+FROM Tickets t
+CROSS JOIN (SELECT 0 AS slot_no UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
+            UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7) n
+WHERE t.quantity_available >= 50;
+
+UPDATE Tickets SET quantity_available = 0 WHERE quantity_available >= 50;
+
+SET @ems_inventory_move = NULL;
@@ -0,0 +1,80 @@
+-- 0004: archive tables for delete_event_cascading(..., archive=True)
+--
+-- An archived event's rows are moved here instead of being dropped, with
+-- their original ids and the time they were archived. There are no foreign
+-- keys (the rows they pointed to are archived or gone too) and ENUM columns
+-- are plain strings so old rows never stop fitting a changed ENUM.
+
+CREATE TABLE IF NOT EXISTS Archived_Events (
+    event_id INT PRIMARY KEY,
+    event_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    event_date DATE NOT NULL,
+    location_id INT NOT NULL,
+    organizer_id INT NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_archived_events_organizer (organizer_id)
+);
+
+CREATE TABLE IF NOT EXISTS Archived_Tickets (
+    ticket_id INT PRIMARY KEY,
+    event_id INT NOT NULL,
+    ticket_type VARCHAR(20) NOT NULL,
+    price DECIMAL(10,2) NOT NULL,
+    quantity_available INT NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_archived_tickets_event (event_id)
+);
+
+CREATE TABLE IF NOT EXISTS Archived_Registrations (
+    registration_id INT PRIMARY KEY,
+    user_id INT NOT NULL,
+    event_id INT NOT NULL,
+    ticket_id INT NOT NULL,
+    registration_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_archived_registrations_event (event_id),
+    KEY idx_archived_registrations_user (user_id)
+);
+
+CREATE TABLE IF NOT EXISTS Archived_Payments (
+    payment_id INT PRIMARY KEY,
+    registration_id INT NOT NULL,
+    amount DECIMAL(10,2) NOT NULL,
+    payment_date DATE NOT NULL,
+    payment_method VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_archived_payments_registration (registration_id)
+);
+
+CREATE TABLE IF NOT EXISTS Archived_Feedback (
+    feedback_id INT PRIMARY KEY,
+    user_id INT NOT NULL,
+    event_id INT NOT NULL,
+    rating INT NOT NULL,
+    comments TEXT,
+    feedback_date DATE NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_archived_feedback_event (event_id)
+);
+
+CREATE TABLE IF NOT EXISTS Archived_Event_Schedule (
+    schedule_id INT PRIMARY KEY,
+    event_id INT NOT NULL,
+    start_time DATETIME NOT NULL,
+    end_time DATETIME NOT NULL,
+    activity_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_archived_schedule_event (event_id)
+);
+
+CREATE TABLE IF NOT EXISTS Archived_Event_Sponsors (
+    event_id INT NOT NULL,
+    sponsor_id INT NOT NULL,
+    amount_contributed DECIMAL(15,2),
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (event_id, sponsor_id)
+);
@@ -0,0 +1,8 @@
+-- 0005: FULLTEXT indexes for func.search_events
+--
+-- The combined index answers the match on name + description; the one on
+-- the name alone scores name matches higher. Adding the first FULLTEXT index
+-- rebuilds Events, so apply this when the system is quiet.
+CREATE FULLTEXT INDEX ft_events_name_description ON Events (event_name, description);
+
+CREATE FULLTEXT INDEX ft_events_name ON Events (event_name);
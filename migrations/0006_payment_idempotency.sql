@@ -0,0 +1,9 @@
+-- 0006: idempotency keys for func.make_payment
+--
+-- A client sends the same key again when it retries a payment (after a
+-- timeout, a double click, a dropped connection) and make_payment returns
+-- the payment already recorded under it instead of charging twice. Payments
+-- made before this have no key; the unique index allows any number of NULLs.
+ALTER TABLE Payments ADD COLUMN idempotency_key VARCHAR(64) NULL;
+
+CREATE UNIQUE INDEX uq_payments_idempotency_key ON Payments (idempotency_key);
@@ -0,0 +1,8 @@
+-- 0007: index for the paginated feedback feed
+--
+-- get_event_feedback_page / get_organizer_feedback_page read an event's
+-- feedback newest first and seek past a (feedback_date, feedback_id)
+-- cursor. With this index that is one backward range scan per event with
+-- no sort. It also covers WHERE event_id = ?, so InnoDB drops the
+-- single-column index it created for the foreign key by itself.
+CREATE INDEX idx_feedback_event_date ON Feedback (event_id, feedback_date, feedback_id);
@@ -0,0 +1,20 @@
+-- 0008: waitlist for sold-out ticket types
+--
+-- One row per user waiting for a seat of a ticket type, served in
+-- waitlist_id order (first come, first served) by func._promote_waiters
+-- inside the transaction that gives a seat back. The promoted user gets a
+-- normal 'registered' registration and their row is deleted.
+CREATE TABLE IF NOT EXISTS Waitlist (
+    waitlist_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    ticket_id INT NOT NULL,
+    event_id INT NOT NULL,
+    user_id INT NOT NULL,
+    joined_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- One place in line per user per event
+    UNIQUE KEY uq_waitlist_user_event (user_id, event_id),
+    -- The queue of a ticket type in order; promotion reads its head
+    KEY idx_waitlist_ticket_queue (ticket_id, waitlist_id),
+    FOREIGN KEY (ticket_id) REFERENCES Tickets(ticket_id) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES Events(event_id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES Users(user_id)
+);
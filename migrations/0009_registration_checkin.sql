@@ -0,0 +1,6 @@
+-- 0009: door check-in
+--
+-- When the attendee was checked in at the event, stamped by
+-- func.sync_checkins from the scans made in check-in mode. NULL until then;
+-- a registration keeps its first check-in time.
+ALTER TABLE Registrations ADD COLUMN checked_in_at DATETIME NULL;
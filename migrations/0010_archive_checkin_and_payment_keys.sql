@@ -0,0 +1,9 @@
+-- 0010: archive the columns added since 0004
+--
+-- delete_event_cascading(..., archive=True) copies Payments.idempotency_key
+-- (0006) and Registrations.checked_in_at (0009) along with the other
+-- columns. No unique index on the archived keys: they are history, and
+-- make_payment never looks them up.
+ALTER TABLE Archived_Registrations ADD COLUMN checked_in_at DATETIME NULL;
+
+ALTER TABLE Archived_Payments ADD COLUMN idempotency_key VARCHAR(64) NULL;
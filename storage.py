@@ -0,0 +1,724 @@
+"""
+Storage backends for func.py.
+
+func.py talks to its database through DB-API connections shaped like
+mysql.connector's (cursor(dictionary=True), %s placeholders, commit/rollback,
+ping, callproc). A backend opens those connections:
+
+    MySQLBackend   the MySQL server described in db_config.ini (default)
+    SQLiteBackend  an embedded SQLite file in WAL mode, for single-site
+                   kiosks that run without a server and for running the
+                   benchmarks locally
+
+SQLiteBackend wraps sqlite3 in SQLiteConnection/SQLiteCursor, which give it
+the mysql.connector surface func.py relies on: each statement is translated
+from the MySQL dialect func.py writes (see translate()), MySQL session
+variables become per-connection flags the triggers in
+event_management_sqlite.sql read through ems_session(), stored procedures
+are implemented in Python, and sqlite3 errors are re-raised as storage.Error
+carrying the MySQL errno func.py already checks (1062 duplicate key, 1644
+trigger SIGNAL, 1205 lock wait timeout, ...).
+"""
+import os
+import re
+import random
+import sqlite3
+import hashlib
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SQLITE_SCHEMA_FILE = os.path.join(HERE, "event_management_sqlite.sql")
+SAMPLE_DATA_FILE = os.path.join(HERE, "event_management_database.sql")
+
+# Statements that bring a database created from an older version of
+# event_management_sqlite.sql up to date, keyed by the version they produce.
+# Add a step here whenever the schema file changes.
+SQLITE_UPGRADES = {
+    2: (
+        "ALTER TABLE Payments ADD COLUMN idempotency_key VARCHAR(64)",
+        "CREATE UNIQUE INDEX uq_payments_idempotency_key ON Payments (idempotency_key)",
+    ),
+    3: (
+        "DROP INDEX IF EXISTS idx_feedback_event",
+        "CREATE INDEX idx_feedback_event_date ON Feedback (event_id, feedback_date, feedback_id)",
+    ),
+    4: (
+        """CREATE TABLE Waitlist (
+            waitlist_id INTEGER PRIMARY KEY,
+            ticket_id INT NOT NULL REFERENCES Tickets(ticket_id) ON DELETE CASCADE,
+            event_id INT NOT NULL REFERENCES Events(event_id) ON DELETE CASCADE,
+            user_id INT NOT NULL REFERENCES Users(user_id),
+            joined_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )""",
+        "CREATE UNIQUE INDEX uq_waitlist_user_event ON Waitlist (user_id, event_id)",
+        "CREATE INDEX idx_waitlist_ticket_queue ON Waitlist (ticket_id, waitlist_id)",
+    ),
+    5: (
+        "ALTER TABLE Registrations ADD COLUMN checked_in_at DATETIME",
+    ),
+    6: (
+        "ALTER TABLE Archived_Registrations ADD COLUMN checked_in_at DATETIME",
+        "ALTER TABLE Archived_Payments ADD COLUMN idempotency_key VARCHAR(64)",
+    ),
+}
+SQLITE_SCHEMA_VERSION = max(SQLITE_UPGRADES)
+
+# Splits the SQLite schema into the part run before the sample rows are
+# loaded (tables, views, indexes) and the part run after (triggers)
+TRIGGERS_MARKER = "-- ==================== triggers ===================="
+
+SAMPLE_PASSWORD = "password123"
+
+# Compiled statements sqlite3 keeps per connection (its default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+
+# ----------------- Errors -----------------
+class Error(Exception):
+    """
+    Database error raised by the embedded backend, shaped like
+    mysql.connector.Error: errno and sqlstate use MySQL's codes so func.py
+    handles both backends the same way.
+    """
+
+    def __init__(self, msg, errno=None, sqlstate=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.errno = errno
+        self.sqlstate = sqlstate
+
+    def __str__(self):
+        if self.errno is None:
+            return self.msg
+        if self.sqlstate:
+            return f"{self.errno} ({self.sqlstate}): {self.msg}"
+        return f"{self.errno}: {self.msg}"
+
+
+class PoolError(Error):
+    """No pooled connection could be handed out (pool closed or exhausted)."""
+
+
+def error_types():
+    """Exception classes to catch around database calls, for `except` clauses."""
+    try:
+        import mysql.connector
+    except ImportError:
+        return (Error,)
+    return (Error, mysql.connector.Error)
+
+
+# ----------------- Backends -----------------
+class Backend:
+    """Opens connections to one database; see create_backend()."""
+
+    name = None
+
+    def connect(self):
+        raise NotImplementedError
+
+    def describe(self):
+        return self.name
+
+
+class MySQLBackend(Backend):
+    name = "mysql"
+
+    def __init__(self, **connect_args):
+        # Buffered cursors guarantee no unread result set leaks to the next borrower
+        self.connect_args = dict(connect_args, buffered=True)
+
+    def connect(self):
+        import mysql.connector
+        return mysql.connector.connect(**self.connect_args)
+
+    def describe(self):
+        args = self.connect_args
+        return f"mysql://{args.get('user')}@{args.get('host')}:{args.get('port')}/{args.get('database')}"
+
+
+class SQLiteBackend(Backend):
+    """
+    Embedded SQLite database in WAL mode, so readers never block the single
+    writer. The schema is created the first time an empty file is opened;
+    ":memory:" gives a private in-memory database shared by every
+    connection of this backend (kept alive by an anchor connection).
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, timeout=10.0):
+        self.path = path
+        self.timeout = timeout
+        self._uri = False
+        self._anchor = None
+        if path == ":memory:":
+            self.path = f"file:ems-memory-{id(self)}?mode=memory&cache=shared"
+            self._uri = True
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def describe(self):
+        return f"sqlite:///{self.path}"
+
+    def _open(self):
+        raw = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None,
+            check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES, uri=self._uri,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        if not self._uri:
+            raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA synchronous = NORMAL")
+        raw.execute("PRAGMA foreign_keys = ON")
+        return SQLiteConnection(raw)
+
+    def connect(self):
+        conn = self._open()
+        if not self._schema_ready:
+            self.initialize()
+        return conn
+
+    def schema_version(self):
+        conn = self._open()
+        try:
+            return conn.raw.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+
+    def initialize(self, sample=False):
+        """
+        Creates the schema if the database is empty, optionally with the
+        sample rows from event_management_database.sql, or upgrades one
+        created from an older schema. Returns True if the schema was created
+        by this call. Event_Stats and the ticket slots of
+        the sample rows are left for the caller to rebuild (migrate.py does).
+        """
+        with self._schema_lock:
+            conn = self._open()
+            if self._uri and self._anchor is None:
+                self._anchor = conn
+            try:
+                raw = conn.raw
+                version = raw.execute("PRAGMA user_version").fetchone()[0]
+                if version:
+                    if version < SQLITE_SCHEMA_VERSION:
+                        self._upgrade(raw, version)
+                    self._schema_ready = True
+                    return False
+                with open(SQLITE_SCHEMA_FILE, encoding="utf-8") as f:
+                    tables, triggers = f.read().split(TRIGGERS_MARKER, 1)
+                raw.execute("BEGIN IMMEDIATE")
+                try:
+                    # executescript() would commit first; run statement by statement instead
+                    for statement in _split_script(tables):
+                        raw.execute(statement)
+                    if sample:
+                        load_sample_data(raw)
+                    for statement in _split_script(triggers):
+                        raw.execute(statement)
+                    raw.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+                    raw.execute("COMMIT")
+                except BaseException:
+                    raw.execute("ROLLBACK")
+                    raise
+                self._schema_ready = True
+                return True
+            finally:
+                if conn is not self._anchor:
+                    conn.close()
+
+    def _upgrade(self, raw, version):
+        raw.execute("BEGIN IMMEDIATE")
+        try:
+            for target in range(version + 1, SQLITE_SCHEMA_VERSION + 1):
+                for statement in SQLITE_UPGRADES.get(target, ()):
+                    raw.execute(statement)
+            raw.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+            raw.execute("COMMIT")
+        except BaseException:
+            raw.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
+            self._schema_ready = False
+
+
+def create_backend(db_settings):
+    """Builds the backend named by db_settings["backend"] ("mysql" or "sqlite")."""
+    settings = dict(db_settings)
+    name = str(settings.pop("backend", "mysql")).strip().lower()
+    path = settings.pop("path", "")
+    if name == "mysql":
+        return MySQLBackend(**settings)
+    if name == "sqlite":
+        if path != ":memory:" and not path.startswith("file:") and not os.path.isabs(path):
+            path = os.path.join(HERE, path)
+        return SQLiteBackend(path)
+    raise ValueError(f"Unknown database backend {name!r} (expected 'mysql' or 'sqlite')")
+
+
+def _split_script(script):
+    """Splits a SQL script into complete statements (trigger bodies included)."""
+    statements, buffer = [], ""
+    for line in script.splitlines(keepends=True):
+        if not buffer and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        statements.append(buffer.strip())
+    return statements
+
+
+# ----------------- Sample Data -----------------
+_SAMPLE_INSERT_RE = re.compile(r"^INSERT INTO (\w+)\s*\(([^)]*)\)\s*VALUES\b")
+
+
+def load_sample_data(raw):
+    """
+    Copies the sample rows of event_management_database.sql into an empty
+    SQLite schema. The MySQL script adds the password and sponsorship
+    amount columns in later ALTERs, so they are filled in here the same way.
+    """
+    with open(SAMPLE_DATA_FILE, encoding="utf-8") as f:
+        script = f.read().split("ALTER TABLE", 1)[0]
+
+    password = hashlib.sha256(SAMPLE_PASSWORD.encode()).hexdigest()
+    rng = random.Random(0)
+    scratch = sqlite3.connect(":memory:")
+    try:
+        for statement in _split_script(script):
+            match = _SAMPLE_INSERT_RE.match(statement)
+            if not match:
+                continue
+            table = match.group(1)
+            columns = [col.strip() for col in match.group(2).split(",")]
+            scratch.execute(f"DROP TABLE IF EXISTS {table}")
+            scratch.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+            scratch.execute(statement)
+            rows = scratch.execute(f"SELECT * FROM {table}").fetchall()
+
+            target = [row[1] for row in raw.execute(f"PRAGMA table_info({table})")]
+            keep = [i for i, col in enumerate(columns) if col in target]
+            names = [columns[i] for i in keep]
+            extra = []
+            if table == "Users" and "password" not in names:
+                extra = ["password"]
+            elif table == "Event_Sponsors" and "amount_contributed" not in names:
+                extra = ["amount_contributed"]
+            values = []
+            for row in rows:
+                picked = [row[i] for i in keep]
+                if extra == ["password"]:
+                    picked.append(password)
+                elif extra:
+                    picked.append(rng.randint(50000, 1000000))
+                values.append(picked)
+            placeholders = ", ".join("?" * (len(names) + len(extra)))
+            raw.executemany(
+                f"INSERT INTO {table} ({', '.join(names + extra)}) VALUES ({placeholders})", values
+            )
+    finally:
+        scratch.close()
+
+
+# ----------------- SQLite Type Conversion -----------------
+# Values come back as the same Python types mysql.connector returns
+
+def _convert_date(value):
+    return date.fromisoformat(value[:10].decode())
+
+
+def _convert_datetime(value):
+    text = value.decode()
+    if len(text) == 10:
+        text += " 00:00:00"
+    return datetime.fromisoformat(text)
+
+
+def _convert_decimal(value):
+    return Decimal(value.decode()).quantize(Decimal("0.01"))
+
+
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("DATETIME", _convert_datetime)
+sqlite3.register_converter("TIMESTAMP", _convert_datetime)
+sqlite3.register_converter("DECIMAL", _convert_decimal)
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.strftime("%Y-%m-%d %H:%M:%S"))
+sqlite3.register_adapter(Decimal, str)
+
+
+# ----------------- MySQL Functions -----------------
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _curdate():
+    return date.today().isoformat()
+
+
+def _concat(*args):
+    if any(arg is None for arg in args):
+        return None
+    return "".join(str(arg) for arg in args)
+
+
+def _mod(a, b):
+    if a is None or not b:
+        return None
+    return a - b * int(a / b)
+
+
+def _elt(n, *args):
+    if n is None or not 1 <= n <= len(args):
+        return None
+    return args[n - 1]
+
+
+def _greatest(*args):
+    return None if any(arg is None for arg in args) else max(args)
+
+
+def _least(*args):
+    return None if any(arg is None for arg in args) else min(args)
+
+
+def _maketime(hour, minute, second):
+    if None in (hour, minute, second):
+        return None
+    return f"{int(hour):02d}:{int(minute):02d}:{int(second):02d}"
+
+
+def _timestamp(day, time_of_day="00:00:00"):
+    if day is None or time_of_day is None:
+        return None
+    return f"{str(day)[:10]} {time_of_day}"
+
+
+def _sha2(value, bits):
+    if value is None:
+        return None
+    algorithm = {0: "sha256", 224: "sha224", 256: "sha256", 384: "sha384", 512: "sha512"}.get(bits)
+    return hashlib.new(algorithm, str(value).encode()).hexdigest() if algorithm else None
+
+
+_FUNCTIONS = (
+    ("NOW", 0, _now, False),
+    ("CURDATE", 0, _curdate, False),
+    ("CONCAT", -1, _concat, True),
+    ("MOD", 2, _mod, True),
+    ("ELT", -1, _elt, True),
+    ("GREATEST", -1, _greatest, True),
+    ("LEAST", -1, _least, True),
+    ("MAKETIME", 3, _maketime, True),
+    ("TIMESTAMP", -1, _timestamp, True),
+    ("SHA2", 2, _sha2, True),
+)
+
+
+# ----------------- MySQL Dialect Translation -----------------
+_FULLTEXT_RE = re.compile(r"\bMATCH\s*\([^)]*\)\s*AGAINST\b", re.I)
+_FOR_UPDATE_RE = re.compile(r"\s+FOR\s+UPDATE\b", re.I)
+_DELETE_JOIN_RE = re.compile(r"^\s*DELETE\s+(\w+)\s+FROM\s+(\w+)\s+(?:AS\s+)?(\w+)\b(.*)$", re.I | re.S)
+_DELETE_LIMIT_RE = re.compile(r"^\s*DELETE\s+FROM\s+(\w+)\s+(WHERE\b.*\bLIMIT\b.*)$", re.I | re.S)
+_INTERVAL_RE = re.compile(
+    r"(\w+\(\)|%s)\s*\+\s*INTERVAL\s+(%s|\d+)\s+(SECOND|MINUTE|HOUR|DAY)\b", re.I
+)
+_DATE_ADD_RE = re.compile(
+    r"\bDATE_ADD\(\s*(\w+\(\)|%s)\s*,\s*INTERVAL\s+(%s|\d+)\s+(SECOND|MINUTE|HOUR|DAY)\s*\)", re.I
+)
+_IF_RE = re.compile(r"\bIF\(", re.I)
+_INSERT_IGNORE_RE = re.compile(r"^\s*INSERT\s+IGNORE\b", re.I)
+_REVENUE_RE = re.compile(r"\bCalculateEventRevenue\(([^()]+)\)")
+_UPSERT_RE = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I)
+_UPSERT_VALUES_RE = re.compile(r"\bVALUES\((\w+)\)", re.I)
+_DERIVED_ALIAS_RE = re.compile(r"\)\s*AS\s+(\w+)\s*$", re.I)
+_SET_VARIABLES_RE = re.compile(r"^\s*SET\s+@", re.I)
+_SET_ASSIGNMENT_RE = re.compile(r"^@(\w+)\s*=\s*(NULL|-?\d+|%s)$", re.I)
+_READ_KEYWORDS = ("SELECT", "WITH", "EXPLAIN", "PRAGMA")
+
+# Body of the CalculateEventRevenue() stored function
+_REVENUE_SQL = (
+    "(SELECT IFNULL(SUM(P.amount), 0) FROM Payments P "
+    "JOIN Registrations R ON P.registration_id = R.registration_id "
+    "WHERE R.event_id = {} AND P.status = 'completed')"
+)
+
+
+def _interval(match):
+    base, amount, unit = match.groups()
+    return f"datetime({base}, '+' || {amount} || ' {unit.lower()}s')"
+
+
+@lru_cache(maxsize=1024)
+def translate(sql, has_params=True):
+    """
+    Rewrites one MySQL statement as SQLite. Returns (sql, writes) where
+    writes says the statement needs the write lock (it modifies data or was
+    a locking read). Only the constructs func.py and the scripts use are
+    covered; FULLTEXT MATCH ... AGAINST raises errno 1191 (no FULLTEXT
+    index) so search_events() falls back to its in-process index.
+    """
+    if _FULLTEXT_RE.search(sql):
+        raise Error("Can't find FULLTEXT index matching the column list", 1191, "HY000")
+
+    text, locking = _FOR_UPDATE_RE.subn("", sql)
+    keyword = text.lstrip().split(None, 1)[0].upper() if text.strip() else ""
+
+    match = _DELETE_JOIN_RE.match(text)
+    if match and match.group(1) == match.group(3):
+        alias, table, _, tail = match.groups()
+        text = (f"DELETE FROM {table} WHERE rowid IN "
+                f"(SELECT {alias}.rowid FROM {table} {alias}{tail})")
+    else:
+        match = _DELETE_LIMIT_RE.match(text)
+        if match:
+            table, tail = match.groups()
+            text = f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} {tail})"
+
+    text = _INTERVAL_RE.sub(_interval, text)
+    text = _DATE_ADD_RE.sub(_interval, text)
+    text = _REVENUE_RE.sub(lambda m: _REVENUE_SQL.format(m.group(1)), text)
+    text = _IF_RE.sub("iif(", text)
+    text = _INSERT_IGNORE_RE.sub("INSERT OR IGNORE", text)
+
+    parts = _UPSERT_RE.split(text, 1)
+    if len(parts) == 2:
+        head, updates = parts
+        updates = _UPSERT_VALUES_RE.sub(r"excluded.\1", updates)
+        alias = _DERIVED_ALIAS_RE.search(head.rstrip())
+        if alias:
+            # INSERT ... SELECT needs a WHERE before ON CONFLICT to parse
+            updates = re.sub(rf"\b{alias.group(1)}\.", "excluded.", updates)
+            head = head.rstrip() + " WHERE true"
+        text = f"{head} ON CONFLICT DO UPDATE SET {updates}"
+
+    if has_params:
+        text = text.replace("%%", "\0").replace("%s", "?").replace("\0", "%")
+    return text, bool(locking) or keyword not in _READ_KEYWORDS
+
+
+def _map_error(exc, sql):
+    """Re-raises a sqlite3 error as storage.Error with the matching MySQL errno."""
+    name = getattr(exc, "sqlite_errorname", "")
+    msg = str(exc)
+    if name == "SQLITE_CONSTRAINT_TRIGGER" or (not name and isinstance(exc, sqlite3.IntegrityError)
+                                               and "constraint failed" not in msg):
+        return Error(msg, 1644, "45000")
+    if name in ("SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY") or "UNIQUE constraint" in msg:
+        return Error(f"Duplicate entry ({msg})", 1062, "23000")
+    if name == "SQLITE_CONSTRAINT_FOREIGNKEY" or "FOREIGN KEY constraint" in msg:
+        if sql.lstrip()[:6].upper() in ("DELETE", "UPDATE"):
+            return Error(f"Cannot delete or update a parent row ({msg})", 1451, "23000")
+        return Error(f"Cannot add or update a child row ({msg})", 1452, "23000")
+    if name == "SQLITE_CONSTRAINT_NOTNULL" or "NOT NULL constraint" in msg:
+        return Error(msg, 1048, "23000")
+    if name == "SQLITE_CONSTRAINT_CHECK" or "CHECK constraint" in msg:
+        return Error(f"Data truncated ({msg})", 1265, "01000")
+    if name.startswith(("SQLITE_BUSY", "SQLITE_LOCKED")) or "database is locked" in msg:
+        return Error(f"Lock wait timeout exceeded ({msg})", 1205, "HY000")
+    if "no such table" in msg:
+        return Error(msg, 1146, "42S02")
+    if "no such column" in msg:
+        return Error(msg, 1054, "42S22")
+    if "syntax error" in msg:
+        return Error(msg, 1064, "42000")
+    return Error(msg, 1105, "HY000")
+
+
+# ----------------- SQLite Connection Adapter -----------------
+class SQLiteConnection:
+    """
+    A sqlite3 connection with the mysql.connector surface func.py uses.
+    Reads outside a transaction run in autocommit; the first write (or
+    FOR UPDATE read) opens BEGIN IMMEDIATE, which takes the database's
+    write lock up front the way FOR UPDATE takes row locks, and lasts until
+    commit() or rollback().
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        # MySQL session variables (SET @name = ...), readable from triggers
+        self.session = {}
+        raw.create_function("ems_session", 1, self.session.get)
+        for name, nargs, func, deterministic in _FUNCTIONS:
+            raw.create_function(name, nargs, func, deterministic=deterministic)
+
+    @property
+    def in_transaction(self):
+        return self.raw.in_transaction
+
+    def cursor(self, dictionary=False, **_options):
+        return SQLiteCursor(self, dictionary)
+
+    def begin(self):
+        if not self.raw.in_transaction:
+            try:
+                self.raw.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error as exc:
+                raise _map_error(exc, "BEGIN") from exc
+
+    def commit(self):
+        if self.raw.in_transaction:
+            try:
+                self.raw.execute("COMMIT")
+            except sqlite3.Error as exc:
+                raise _map_error(exc, "COMMIT") from exc
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        try:
+            self.raw.execute("SELECT 1")
+        except sqlite3.Error as exc:
+            raise _map_error(exc, "SELECT 1") from exc
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except Error:
+            return False
+
+    def close(self):
+        self.raw.close()
+
+
+class SQLiteCursor:
+    """Buffered cursor: result sets are fetched in full when executed."""
+
+    def __init__(self, connection, dictionary=False):
+        self._connection = connection
+        self._dictionary = dictionary
+        self._rows = []
+        self._position = 0
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    @property
+    def column_names(self):
+        return tuple(col[0] for col in self.description or ())
+
+    def _set_variables(self, sql, params):
+        params = list(params or ())
+        for assignment in sql.strip().rstrip(";")[3:].split(","):
+            match = _SET_ASSIGNMENT_RE.match(assignment.strip())
+            if not match:
+                raise Error(f"Unsupported session assignment: {assignment.strip()}", 1064, "42000")
+            name, value = match.groups()
+            if value.upper() == "NULL":
+                value = None
+            elif value == "%s":
+                value = params.pop(0)
+            else:
+                value = int(value)
+            self._connection.session[name] = value
+        self._store(None)
+
+    def _store(self, cursor):
+        self._position = 0
+        if cursor is not None and cursor.description:
+            self.description = cursor.description
+            rows = cursor.fetchall()
+            if self._dictionary:
+                names = self.column_names
+                rows = [dict(zip(names, row)) for row in rows]
+            self._rows = rows
+            self.rowcount = len(rows)
+        else:
+            self.description = None
+            self._rows = []
+            self.rowcount = cursor.rowcount if cursor is not None else 0
+            if cursor is not None and cursor.lastrowid:
+                self.lastrowid = cursor.lastrowid
+
+    def execute(self, sql, params=None, multi=False):
+        if _SET_VARIABLES_RE.match(sql):
+            return self._set_variables(sql, params)
+        text, writes = translate(sql, params is not None)
+        if writes:
+            self._connection.begin()
+        try:
+            cursor = self._connection.raw.execute(text, tuple(params or ()))
+        except sqlite3.Error as exc:
+            raise _map_error(exc, sql) from exc
+        self._store(cursor)
+
+    def executemany(self, sql, seq_params):
+        text, writes = translate(sql, True)
+        if writes:
+            self._connection.begin()
+        try:
+            cursor = self._connection.raw.executemany(text, [tuple(p) for p in seq_params])
+        except sqlite3.Error as exc:
+            raise _map_error(exc, sql) from exc
+        self._store(cursor)
+
+    def callproc(self, name, args=()):
+        try:
+            procedure = _PROCEDURES[name]
+        except KeyError:
+            raise Error(f"PROCEDURE {name} does not exist", 1305, "42000") from None
+        procedure(self, *args)
+        return args
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._rows = []
+
+
+# ----------------- Stored Procedures -----------------
+def _register_user_for_event(cursor, user_id, event_id, ticket_type):
+    """register_user_for_event from event_management_database.sql."""
+    cursor.execute("""
+        SELECT ticket_id, quantity_available FROM Ticket_Inventory
+        WHERE event_id = %s AND ticket_type = %s
+        LIMIT 1
+    """, (event_id, ticket_type))
+    row = cursor.fetchone()
+    if row is None:
+        raise Error("Ticket not found", 1644, "45000")
+    ticket_id, quantity = (row["ticket_id"], row["quantity_available"]) if isinstance(row, dict) else row
+    if quantity <= 0:
+        raise Error("Ticket sold out", 1644, "45000")
+    cursor.execute("""
+        INSERT INTO Registrations (user_id, event_id, ticket_id, registration_date, status)
+        VALUES (%s, %s, %s, NOW(), 'registered')
+    """, (user_id, event_id, ticket_id))
+
+
+_PROCEDURES = {
+    "register_user_for_event": _register_user_for_event,
+}